@@ -116,6 +116,27 @@ try:
     print("💾 テーマ管理: 作成したテーマの保存・エクスポート・共有")
     print("👁️ リアルタイムプレビュー: 変更が即座に反映されるプレビュー機能")
 
+    # UIスレッド監視を開始(終了時に停止レポートをログへ出力)
+    from qt_theme_studio.utilities import get_metrics_registry, get_ui_watchdog
+
+    ui_watchdog = get_ui_watchdog()
+    ui_watchdog.start()
+    app.aboutToQuit.connect(ui_watchdog.stop)
+
+    # 書き込み遅延保存の待機中の内容を終了時に書き込む
+    from qt_theme_studio.utilities import get_write_behind_queue
+
+    app.aboutToQuit.connect(get_write_behind_queue().close)
+
+    # メトリクスの公開(QT_THEME_STUDIO_METRICS_PORT指定時)と終了時のファイル出力
+    metrics_registry = get_metrics_registry()
+    metrics_port = os.environ.get("QT_THEME_STUDIO_METRICS_PORT")
+    if metrics_port:
+        metrics_registry.start_http_server(int(metrics_port))
+    app.aboutToQuit.connect(
+        lambda: metrics_registry.export_prometheus("logs/metrics/qt_theme_studio.prom")
+    )
+
     # アプリケーションを実行
     sys.exit(app.exec())
 
@@ -10,6 +10,10 @@ import logging
 from pathlib import Path
 from typing import Any, Optional, Union
 
+from qt_theme_studio.themes.pack import PACK_SUFFIX, ThemePack, write_pack
+from qt_theme_studio.utilities.autosave import atomic_write_bytes, encode_json
+from qt_theme_studio.validators.theme_schema import get_validator
+
 
 # カスタム例外クラス
 class ThemeManagerError(Exception):
@@ -84,7 +88,7 @@ class ThemeAdapter:
         """テーマファイルを読み込む
 
         指定されたパスからテーマファイルを読み込み、内部形式に変換します。
-        JSON、QSS、CSS形式のテーマファイルをサポートします。
+        JSON、QSS、CSS形式およびテーマパック(.qtpack)をサポートします。
 
         Args:
             theme_path (Union[str, Path]): テーマファイルのパス
@@ -113,6 +117,8 @@ class ThemeAdapter:
                 return self._load_qss_theme(theme_path)
             if file_extension == ".css":
                 return self._load_css_theme(theme_path)
+            if file_extension == PACK_SUFFIX:
+                return self._load_pack_theme(theme_path)
             error_msg = f"サポートされていないテーマファイル形式: {file_extension}"
             self.logger.error(error_msg)
             raise ThemeLoadError(error_msg)
@@ -128,6 +134,10 @@ class ThemeAdapter:
         """テーマファイルを保存する
 
         テーマデータをqt-theme-manager互換形式でファイルに保存します。
+        拡張子が.qtpackの場合はテーマパック形式で保存します
+        ("available_themes"を持つデータは複数テーマのパックになります)。
+        一時ファイルへの書き込みと置換で保存するため、途中で失敗しても
+        既存のファイルは壊れません。
 
         Args:
             theme_data (dict[str, Any]): 保存するテーマデータ
@@ -151,9 +161,11 @@ class ThemeAdapter:
             # ディレクトリが存在しない場合は作成
             save_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # JSON形式で保存(qt-theme-manager標準形式)
-            with Path(save_path).open("w", encoding="utf-8") as f:
-                json.dump(theme_data, f, ensure_ascii=False, indent=2)
+            if save_path.suffix.lower() == PACK_SUFFIX:
+                self._save_pack_theme(theme_data, save_path)
+            else:
+                # JSON形式で保存(qt-theme-manager標準形式)
+                atomic_write_bytes(save_path, encode_json(theme_data))
 
             self.logger.info(f"テーマファイルを保存しました: {save_path}")
             return True
@@ -244,20 +256,9 @@ class ThemeAdapter:
                 - 'is_valid': bool - 検証が成功したかどうか
                 - 'errors': List[str] - エラーメッセージのリスト
                 - 'warnings': List[str] - 警告メッセージのリスト
+                - 'issues': List[dict] - 構造化された問題のリスト
         """
-        result: dict[str, Any] = {"is_valid": True, "errors": [], "warnings": []}
-
-        try:
-            self._validate_theme_data(theme_data)
-        except ThemeValidationError as e:
-            result["is_valid"] = False
-            result["errors"].append(str(e))
-
-        # 追加の検証ロジック
-        self._validate_theme_structure(theme_data, result)
-        self._validate_theme_colors(theme_data, result)
-
-        return result
+        return get_validator("theme").validate(theme_data).to_dict()
 
     def _load_json_theme(self, theme_path: Path) -> dict[str, Any]:
         """JSON形式のテーマファイルを読み込む"""
@@ -277,6 +278,29 @@ class ThemeAdapter:
             self.logger.error(error_msg)
             raise ThemeLoadError(error_msg) from e
 
+    def _load_pack_theme(self, theme_path: Path) -> dict[str, Any]:
+        """テーマパックを読み込む
+
+        単一テーマとして保存されたパックはテーマデータを、
+        それ以外は"available_themes"形式のデータを返します。
+        """
+        with ThemePack(theme_path) as pack:
+            if pack.is_single_theme and len(pack) == 1:
+                theme_data = pack.load_theme_at(0)
+            else:
+                theme_data = {"available_themes": pack.load_all()}
+
+        self.logger.info(f"テーマパックを読み込みました: {theme_path}")
+        return theme_data  # type: ignore[no-any-return]
+
+    def _save_pack_theme(self, theme_data: dict[str, Any], save_path: Path) -> None:
+        """テーマデータをテーマパック形式で保存する"""
+        if "available_themes" in theme_data:
+            write_pack(theme_data["available_themes"], save_path)
+        else:
+            name = str(theme_data.get("name") or save_path.stem)
+            write_pack({name: theme_data}, save_path, single_theme=True)
+
     def _load_qss_theme(self, theme_path: Path) -> dict[str, Any]:
         """QSS形式のテーマファイルを読み込む"""
         try:
@@ -375,82 +399,10 @@ class ThemeAdapter:
             raise ThemeExportError(error_msg) from e
 
     def _validate_theme_data(self, theme_data: dict[str, Any]) -> None:
-        """テーマデータの基本的な検証を行う"""
-        if not isinstance(theme_data, dict):
-            raise ThemeValidationError("テーマデータは辞書形式である必要があります")
-
-        # 必須フィールドの確認
-        required_fields = ["name"]
-        for field in required_fields:
-            if field not in theme_data:
-                raise ThemeValidationError(f"必須フィールドが不足しています: {field}")
-
-        # 名前の検証
-        if not isinstance(theme_data["name"], str) or not theme_data["name"].strip():
-            raise ThemeValidationError("テーマ名は空でない文字列である必要があります")
-
-    def _validate_theme_structure(
-        self, theme_data: dict[str, Any], result: dict[str, Any]
-    ) -> None:
-        """テーマデータの構造を検証する"""
-        # バージョン情報の確認
-        if "version" not in theme_data:
-            result["warnings"].append("バージョン情報が設定されていません")
-
-        # メタデータの確認
-        if "metadata" not in theme_data:
-            result["warnings"].append("メタデータが設定されていません")
-
-    def _validate_theme_colors(
-        self, theme_data: dict[str, Any], result: dict[str, Any]
-    ) -> None:
-        """テーマの色設定を検証する"""
-        if "colors" in theme_data:
-            colors = theme_data["colors"]
-            if isinstance(colors, dict):
-                for _color_name, color_value in colors.items():
-                    if not self._is_valid_color(color_value):
-                        result["warnings"].append(
-                            f"無効な色値が検出されました: {_color_name} = {color_value}"
-                        )
-
-    def _is_valid_color(self, color_value: str) -> bool:
-        """色値が有効かどうかを確認する"""
-        color_value = color_value.strip()
-
-        # 16進数カラーコードの確認
-        if color_value.startswith("#"):
-            hex_part = color_value[1:]
-            if len(hex_part) in [3, 6, 8]:  # #RGB, #RRGGBB, #RRGGBBAA
-                # 16進数として有効かチェック
-                return all(c in "0123456789abcdefABCDEF" for c in hex_part)
-            return False  # 無効な長さの16進数
-
-        # RGB/RGBA形式の確認(簡易版)
-        if color_value.startswith(("rgb(", "rgba(")):
-            return True
-
-        # 名前付き色の確認(基本的な色名)
-        named_colors = {
-            "black",
-            "white",
-            "red",
-            "green",
-            "blue",
-            "yellow",
-            "cyan",
-            "magenta",
-            "gray",
-            "grey",
-            "darkgray",
-            "darkgrey",
-            "lightgray",
-            "lightgrey",
-            "transparent",
-        }
-
-        # 名前付き色に一致するかチェック
-        return color_value.lower() in named_colors
+        """テーマデータの基本的な検証を行う(最初のエラーで例外を送出)"""
+        result = get_validator("theme").validate(theme_data)
+        if not result.is_valid:
+            raise ThemeValidationError(result.errors[0].message)
 
     def _extract_colors_from_qss(self, qss_content: str) -> dict[str, str]:
         """QSSコンテンツから色情報を抽出する(基本的な実装)"""
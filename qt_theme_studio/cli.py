@@ -2,14 +2,49 @@
 """
 Qt-Theme-Studio CLI
 最小限のコマンドラインインターフェース
+
+各コマンドは単一のテーマファイルに加え、複数ファイル・ディレクトリ(再帰)・
+globパターンを受け付けます。複数ファイルはワーカープロセスで並列にチェックし、
+結果をテキスト・NDJSON・JUnit XML形式で出力します。
 """
 
+import argparse
 import json
 import sys
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Any, Callable, Optional
 
 import qt_theme_manager
 
+from qt_theme_studio.utilities.color_math import import_numpy
+from qt_theme_studio.validators.batch import (
+    map_theme_files,
+    validate_theme_file,
+    write_ndjson,
+)
+from qt_theme_studio.validators.theme_schema import ERROR, WARNING, get_validator
+from qt_theme_studio.validators.visual_regression import (
+    DEFAULT_DELTA_E,
+    DEFAULT_MAX_CHANGED_RATIO,
+    baseline_root,
+    check_visual_regression,
+)
+
+COMMANDS = {
+    "quality-check": "テーマ品質チェック",
+    "test": "テーマ統合テスト",
+    "ci-report": "CI/CDレポート生成",
+    "visual": "描画の視覚回帰テスト",
+}
+
+# globパターンとして扱う文字
+GLOB_CHARS = frozenset("*?[")
+
 
 def quality_check(theme_file: str) -> int:
     """テーマ品質チェック"""
@@ -17,14 +52,17 @@ def quality_check(theme_file: str) -> int:
         with Path(theme_file).open(encoding="utf-8") as f:
             theme_data = json.load(f)
 
-        errors = []
-        for field in ["name", "colors"]:
-            if field not in theme_data:
-                errors.append(f"必須フィールドが不足: {field}")
+        result = get_validator("quality").validate(theme_data)
+        errors = result.error_messages
 
         print(f"✅ テーマファイル: {theme_file}")
         print(f"📊 エラー: {len(errors)}個")
 
+        if result.warnings:
+            print("⚠️ 警告:")
+            for warning in result.warning_messages:
+                print(f"  - {warning}")
+
         if errors:
             print("❌ エラー:")
             for error in errors:
@@ -70,42 +108,44 @@ def test_theme(theme_file: str = "test_theme.json") -> int:
         return 1
 
 
+def _build_ci_summary(theme_data: dict[str, Any]) -> dict[str, Any]:
+    """テーマデータからCI/CDサマリー(品質スコア・推奨事項)を生成"""
+    score = 70.0
+    if "name" in theme_data:
+        score += 5
+    if "version" in theme_data:
+        score += 5
+    if "colors" in theme_data and len(theme_data["colors"]) > 5:
+        score += 10
+    if "fonts" in theme_data:
+        score += 5
+    if "metadata" in theme_data:
+        score += 5
+
+    return {
+        "overall_status": "PASS" if score >= 70 else "FAIL",
+        "quality_score": min(score, 100.0),
+        "test_success_rate": 100.0,
+        "recommendations": [
+            "テーマファイルの構造は適切です",
+            "継続的な品質向上を推奨します",
+        ]
+        if score >= 70
+        else [
+            "テーマファイルに必須フィールドを追加してください",
+            "より詳細な色設定を追加してください",
+        ],
+    }
+
+
 def ci_report(theme_file: str, output: str = "ci_report.json") -> int:
     """CI/CDレポート生成"""
     try:
-        from datetime import datetime
-
         with Path(theme_file).open(encoding="utf-8") as f:
             theme_data = json.load(f)
 
-        # 品質スコア計算
-        score = 70.0
-        if "name" in theme_data:
-            score += 5
-        if "version" in theme_data:
-            score += 5
-        if "colors" in theme_data and len(theme_data["colors"]) > 5:
-            score += 10
-        if "fonts" in theme_data:
-            score += 5
-        if "metadata" in theme_data:
-            score += 5
-
         report = {
-            "ci_summary": {
-                "overall_status": "PASS" if score >= 70 else "FAIL",
-                "quality_score": min(score, 100.0),
-                "test_success_rate": 100.0,
-                "recommendations": [
-                    "テーマファイルの構造は適切です",
-                    "継続的な品質向上を推奨します",
-                ]
-                if score >= 70
-                else [
-                    "テーマファイルに必須フィールドを追加してください",
-                    "より詳細な色設定を追加してください",
-                ],
-            },
+            "ci_summary": _build_ci_summary(theme_data),
             "generated_at": datetime.now().isoformat(),
             "theme_file": theme_file,
         }
@@ -121,6 +161,415 @@ def ci_report(theme_file: str, output: str = "ci_report.json") -> int:
         return 1
 
 
+def _issue(code: str, message: str, severity: str = ERROR) -> dict[str, Any]:
+    """バッチ結果に含める問題の辞書を生成"""
+    return {"path": "", "code": code, "severity": severity, "message": message}
+
+
+def _test_theme_record(theme_file: str) -> dict[str, Any]:
+    """testコマンドのバッチ用結果を生成"""
+    try:
+        with Path(theme_file).open(encoding="utf-8") as f:
+            theme_data = json.load(f)
+    except Exception as e:
+        return {
+            "file": theme_file,
+            "is_valid": False,
+            "errors": [_issue("load", f"テストエラー: {e}")],
+            "warnings": [],
+        }
+
+    warnings = []
+    try:
+        qt_theme_manager.ThemeLoader()
+        if "colors" in theme_data:
+            qt_theme_manager.StylesheetGenerator(theme_data)
+    except Exception as qt_error:
+        # 単一ファイル実行と同様に、Qt環境がない場合は警告扱いとする
+        warnings.append(
+            _issue(
+                "qt_theme_manager",
+                f"Qt-Theme-Manager テストスキップ: {qt_error}",
+                WARNING,
+            )
+        )
+
+    return {"file": theme_file, "is_valid": True, "errors": [], "warnings": warnings}
+
+
+def _ci_report_record(theme_file: str) -> dict[str, Any]:
+    """ci-reportコマンドのバッチ用結果を生成"""
+    try:
+        with Path(theme_file).open(encoding="utf-8") as f:
+            theme_data = json.load(f)
+    except Exception as e:
+        return {
+            "file": theme_file,
+            "is_valid": False,
+            "errors": [_issue("load", f"レポート生成エラー: {e}")],
+            "warnings": [],
+        }
+
+    summary = _build_ci_summary(theme_data)
+    passed = summary["overall_status"] == "PASS"
+    errors = (
+        []
+        if passed
+        else [
+            _issue(
+                "quality_score",
+                f"品質スコアが基準未満です: {summary['quality_score']}",
+            )
+        ]
+    )
+    return {
+        "file": theme_file,
+        "is_valid": passed,
+        "errors": errors,
+        "warnings": [],
+        "report": summary,
+    }
+
+
+def check_theme_file(command: str, theme_file: str) -> dict[str, Any]:
+    """バッチモードで1ファイルをチェック(ワーカープロセスで実行)
+
+    Args:
+        command: コマンド名("quality-check" / "test" / "ci-report")
+        theme_file: テーマファイルのパス
+
+    Returns:
+        dict[str, Any]: チェック結果('file', 'is_valid', 'errors', 'warnings'など)
+    """
+    start_time = time.perf_counter()
+    if command == "quality-check":
+        record = validate_theme_file(theme_file, "quality")
+    elif command == "test":
+        record = _test_theme_record(theme_file)
+    elif command == "ci-report":
+        record = _ci_report_record(theme_file)
+    else:
+        raise ValueError(f"不明なコマンド: {command}")
+
+    record["command"] = command
+    record["elapsed_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+    return record
+
+
+def _is_glob(pattern: str) -> bool:
+    """globパターンを含むか判定"""
+    return any(char in GLOB_CHARS for char in pattern)
+
+
+def _glob_files(pattern: str) -> list[Path]:
+    """globパターン(**対応)に一致するファイルを取得"""
+    parts = Path(pattern).parts
+    index = next(i for i, part in enumerate(parts) if _is_glob(part))
+    base = Path(*parts[:index]) if index else Path()
+    return sorted(path for path in base.glob("/".join(parts[index:])) if path.is_file())
+
+
+def expand_theme_inputs(inputs: Iterable[str], pattern: str = "*.json") -> list[str]:
+    """ファイル・ディレクトリ・globパターンをテーマファイルのリストに展開
+
+    ディレクトリは再帰的に探索し、patternに一致するファイルを対象とします。
+    存在しないファイルパスはそのまま残し、チェック時に読み込みエラーとして報告します。
+
+    Args:
+        inputs: ファイル・ディレクトリ・globパターン
+        pattern: ディレクトリ探索時のファイル名パターン
+
+    Returns:
+        list[str]: 重複を除いたテーマファイルのパス(入力順、各入力内はソート順)
+    """
+    files: list[str] = []
+    seen: set[str] = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            matches = sorted(p for p in path.rglob(pattern) if p.is_file())
+        elif _is_glob(item):
+            matches = _glob_files(item)
+        else:
+            matches = [path]
+
+        for match in matches:
+            key = str(match)
+            if key not in seen:
+                seen.add(key)
+                files.append(key)
+    return files
+
+
+def _collect(
+    records: Iterable[dict[str, Any]], collected: list[dict[str, Any]]
+) -> Iterator[dict[str, Any]]:
+    """結果を出力しながら保持するイテレーター"""
+    for record in records:
+        collected.append(record)
+        yield record
+
+
+def _print_record(record: dict[str, Any]) -> None:
+    """1ファイル分の結果をテキスト形式で出力"""
+    mark = "✅" if record["is_valid"] else "❌"
+    print(f"{mark} {record['file']}")
+    for error in record["errors"]:
+        print(f"    ❌ {error['message']}")
+    for warning in record["warnings"]:
+        print(f"    ⚠️ {warning['message']}")
+
+
+def write_junit_xml(
+    records: list[dict[str, Any]], output: str, command: str, elapsed: float
+) -> None:
+    """チェック結果をJUnit XML形式で出力
+
+    各テーマファイルを1つのtestcaseとし、エラーはfailure、
+    読み込みエラーはerror要素として記録します。
+    """
+    failures = sum(
+        1
+        for record in records
+        if not record["is_valid"]
+        and not any(error["code"] == "load" for error in record["errors"])
+    )
+    errors = sum(
+        1
+        for record in records
+        if any(error["code"] == "load" for error in record["errors"])
+    )
+    suite_name = f"qt-theme-studio.{command}"
+
+    testsuites = ET.Element(
+        "testsuites",
+        name="qt-theme-studio",
+        tests=str(len(records)),
+        failures=str(failures),
+        errors=str(errors),
+        time=f"{elapsed:.3f}",
+    )
+    testsuite = ET.SubElement(
+        testsuites,
+        "testsuite",
+        name=suite_name,
+        tests=str(len(records)),
+        failures=str(failures),
+        errors=str(errors),
+        skipped="0",
+        time=f"{elapsed:.3f}",
+        timestamp=datetime.now().isoformat(timespec="seconds"),
+    )
+
+    for record in records:
+        testcase = ET.SubElement(
+            testsuite,
+            "testcase",
+            classname=suite_name,
+            name=record["file"],
+            time=f"{record.get('elapsed_ms', 0.0) / 1000:.3f}",
+        )
+        if record["errors"]:
+            is_load_error = any(e["code"] == "load" for e in record["errors"])
+            element = ET.SubElement(
+                testcase,
+                "error" if is_load_error else "failure",
+                message=record["errors"][0]["message"],
+                type=record["errors"][0]["code"],
+            )
+            element.text = "\n".join(error["message"] for error in record["errors"])
+        if record["warnings"]:
+            system_out = ET.SubElement(testcase, "system-out")
+            system_out.text = "\n".join(
+                f"警告: {warning['message']}" for warning in record["warnings"]
+            )
+
+    tree = ET.ElementTree(testsuites)
+    ET.indent(tree)
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tree.write(output_path, encoding="utf-8", xml_declaration=True)
+
+
+def _write_batch_ci_report(records: list[dict[str, Any]], output: str) -> None:
+    """ci-reportのバッチ結果を1つのレポートファイルに集約"""
+    scores = [
+        record["report"]["quality_score"] for record in records if "report" in record
+    ]
+    passed = sum(1 for record in records if record["is_valid"])
+    report = {
+        "ci_summary": {
+            "overall_status": "PASS" if passed == len(records) else "FAIL",
+            "themes": len(records),
+            "passed": passed,
+            "failed": len(records) - passed,
+            "average_quality_score": round(sum(scores) / len(scores), 2)
+            if scores
+            else 0.0,
+        },
+        "reports": [
+            {
+                "theme_file": record["file"],
+                **record.get("report", {}),
+                "errors": record["errors"],
+            }
+            for record in records
+        ],
+        "generated_at": datetime.now().isoformat(),
+    }
+    with Path(output).open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def run_batch(
+    command: str,
+    inputs: list[str],
+    jobs: Optional[int] = None,
+    output_format: str = "text",
+    junit_xml: Optional[str] = None,
+    pattern: str = "*.json",
+    report_output: str = "ci_report.json",
+    checker: Optional[Callable[[str], dict[str, Any]]] = None,
+) -> int:
+    """複数のテーマファイルを1プロセス起動でまとめてチェック
+
+    Args:
+        command: コマンド名("quality-check" / "test" / "ci-report" / "visual")
+        inputs: ファイル・ディレクトリ・globパターン
+        jobs: ワーカープロセス数(デフォルト: CPU数)
+        output_format: 標準出力の形式("text" または "ndjson")
+        junit_xml: JUnit XMLの出力先(Noneの場合は出力しない)
+        pattern: ディレクトリ探索時のファイル名パターン
+        report_output: ci-reportの集約レポートの出力先
+        checker: 1ファイルをチェックする関数(省略時はcheck_theme_file)
+
+    Returns:
+        int: 終了コード(全ファイル合格で0、1件でも不合格なら1)
+    """
+    files = expand_theme_inputs(inputs, pattern)
+    if not files:
+        print("❌ 対象のテーマファイルが見つかりません", file=sys.stderr)
+        return 1
+
+    start_time = time.perf_counter()
+    records: list[dict[str, Any]] = []
+    results = _collect(
+        map_theme_files(
+            checker or partial(check_theme_file, command), files, max_workers=jobs
+        ),
+        records,
+    )
+
+    if output_format == "ndjson":
+        write_ndjson(results, sys.stdout)
+    else:
+        for record in results:
+            _print_record(record)
+
+    elapsed = time.perf_counter() - start_time
+    failed = sum(1 for record in records if not record["is_valid"])
+
+    if junit_xml:
+        write_junit_xml(records, junit_xml, command, elapsed)
+    if command == "ci-report":
+        _write_batch_ci_report(records, report_output)
+
+    # NDJSON出力時は標準出力を結果のみに保つためサマリーを標準エラーへ出力
+    summary_stream = sys.stderr if output_format == "ndjson" else sys.stdout
+    print(
+        f"📊 {len(records)}ファイル: 合格 {len(records) - failed}件 / "
+        f"不合格 {failed}件 ({elapsed:.2f}秒)",
+        file=summary_stream,
+    )
+    return 1 if failed else 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数パーサーを構築"""
+    parser = argparse.ArgumentParser(
+        prog="python -m qt_theme_studio.cli",
+        description="Qt-Theme-Studio CLI",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    for name, help_text in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument(
+            "inputs",
+            nargs="+",
+            help="テーマファイル・ディレクトリ(再帰)・globパターン",
+        )
+        subparser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="並列ワーカー数(デフォルト: CPU数)",
+        )
+        subparser.add_argument(
+            "--format",
+            choices=["text", "ndjson"],
+            default="text",
+            help="結果の出力形式(デフォルト: text)",
+        )
+        subparser.add_argument(
+            "--junit-xml",
+            metavar="PATH",
+            help="JUnit XML形式のレポートを出力",
+        )
+        subparser.add_argument(
+            "--pattern",
+            default="*.json",
+            help="ディレクトリ探索時のファイル名パターン(デフォルト: *.json)",
+        )
+        if name == "ci-report":
+            subparser.add_argument(
+                "--output",
+                default="ci_report.json",
+                help="レポートの出力先(デフォルト: ci_report.json)",
+            )
+        if name == "visual":
+            subparser.add_argument(
+                "--baseline-dir",
+                required=True,
+                help="基準画像のフォルダ",
+            )
+            subparser.add_argument(
+                "--output-dir",
+                help="失敗時に描画結果と差分画像を出力するフォルダ",
+            )
+            subparser.add_argument(
+                "--update",
+                action="store_true",
+                help="基準画像を現在の描画結果で作成・更新",
+            )
+            subparser.add_argument(
+                "--delta-e",
+                type=float,
+                default=DEFAULT_DELTA_E,
+                help=f"知覚できる変化とみなす色差(デフォルト: {DEFAULT_DELTA_E})",
+            )
+            subparser.add_argument(
+                "--max-changed-ratio",
+                type=float,
+                default=DEFAULT_MAX_CHANGED_RATIO,
+                help="許容する変化した画素の割合(デフォルト: 0)",
+            )
+
+    return parser
+
+
+def _is_batch(args: argparse.Namespace) -> bool:
+    """バッチモードで実行するか判定(単一ファイルのみの場合は従来の出力)"""
+    return (
+        len(args.inputs) > 1
+        or args.jobs is not None
+        or args.format != "text"
+        or args.junit_xml is not None
+        or Path(args.inputs[0]).is_dir()
+        or _is_glob(args.inputs[0])
+    )
+
+
 def main() -> None:
     """CLIメイン関数"""
     if len(sys.argv) < 2:
@@ -128,24 +577,79 @@ def main() -> None:
         print("  python -m qt_theme_studio.cli quality-check <theme_file>")
         print("  python -m qt_theme_studio.cli test <theme_file>")
         print("  python -m qt_theme_studio.cli ci-report <theme_file>")
+        print(
+            "  python -m qt_theme_studio.cli visual <theme_file>... "
+            "--baseline-dir DIR [--update]"
+        )
+        print("  python -m qt_theme_studio.cli <command> <dir|glob>... [--jobs N]")
+        print("      [--format text|ndjson] [--junit-xml PATH]")
         sys.exit(1)
 
-    command = sys.argv[1]
-
-    if command == "quality-check" and len(sys.argv) >= 3:
-        sys.exit(quality_check(sys.argv[2]))
-    elif command == "test" and len(sys.argv) >= 3:
-        sys.exit(test_theme(sys.argv[2]))
-    elif command == "ci-report" and len(sys.argv) >= 3:
-        output = (
-            sys.argv[4]
-            if len(sys.argv) > 4 and sys.argv[3] == "--output"
-            else "ci_report.json"
+    parser = _build_parser()
+    try:
+        args = parser.parse_args()
+    except SystemExit as e:
+        # 引数エラーは従来どおり終了コード1とする
+        sys.exit(0 if e.code == 0 else 1)
+
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+    if args.jobs is not None and args.jobs < 1:
+        print("❌ --jobs には1以上を指定してください")
+        sys.exit(1)
+
+    if args.command == "visual":
+        # NumPyがない場合はファイルごとのエラーではなくインストール方法を1回だけ表示
+        try:
+            import_numpy("visual", "視覚回帰テスト")
+        except ImportError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+
+        # 基準画像は共通の親フォルダからの相対パスで区別する
+        files = expand_theme_inputs(args.inputs, args.pattern)
+        checker = partial(
+            check_visual_regression,
+            baseline_dir=args.baseline_dir,
+            root=baseline_root(files),
+            output_dir=args.output_dir,
+            update=args.update,
+            delta_e_threshold=args.delta_e,
+            max_changed_ratio=args.max_changed_ratio,
         )
-        sys.exit(ci_report(sys.argv[2], output))
+        sys.exit(
+            run_batch(
+                args.command,
+                args.inputs,
+                jobs=args.jobs,
+                output_format=args.format,
+                junit_xml=args.junit_xml,
+                pattern=args.pattern,
+                checker=checker,
+            )
+        )
+
+    if _is_batch(args):
+        sys.exit(
+            run_batch(
+                args.command,
+                args.inputs,
+                jobs=args.jobs,
+                output_format=args.format,
+                junit_xml=args.junit_xml,
+                pattern=args.pattern,
+                report_output=getattr(args, "output", "ci_report.json"),
+            )
+        )
+
+    theme_file = args.inputs[0]
+    if args.command == "quality-check":
+        sys.exit(quality_check(theme_file))
+    elif args.command == "test":
+        sys.exit(test_theme(theme_file))
     else:
-        print(f"❌ 不明なコマンド: {command}")
-        sys.exit(1)
+        sys.exit(ci_report(theme_file, args.output))
 
 
 if __name__ == "__main__":
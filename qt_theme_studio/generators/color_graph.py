@@ -0,0 +1,216 @@
+"""
+派生色の依存グラフ
+
+基準色(入力)→ 派生ロール → スタイルシート断片 の依存関係をグラフで保持し、
+入力が変更された場合は、その入力に依存するノードのみを依存順に再計算します。
+再計算した値が以前と同じノードからは先へ伝播しないため、
+色を一つ微調整した場合に再計算されるのは、実際に影響を受ける少数のノードに限られます。
+"""
+
+import heapq
+from collections.abc import Iterable
+from typing import Any, Callable, Optional
+
+from qt_theme_studio.utilities.metrics import get_metrics_registry
+
+
+class _GraphNode:
+    """依存グラフのノード"""
+
+    __slots__ = ("compute", "dependencies", "name", "order", "pinned", "value")
+
+    def __init__(
+        self,
+        name: str,
+        order: int,
+        dependencies: tuple[str, ...],
+        compute: Optional[Callable[..., Any]],
+        value: Any,
+    ) -> None:
+        self.name = name
+        self.order = order
+        self.dependencies = dependencies
+        self.compute = compute
+        self.value = value
+        # 値を固定した(再計算しない)派生ノードかどうか
+        self.pinned = False
+
+
+class ColorDependencyGraph:
+    """派生色の依存グラフ
+
+    ノードは依存先より後に追加する必要があり、追加順がそのまま再計算の順序になります。
+    値を直接指定するには、入力ノードには set_input を、派生ノードには pin を使用します。
+    """
+
+    def __init__(self, name: str = "theme") -> None:
+        """依存グラフを初期化します
+
+        Args:
+            name: メトリクスのラベルに使用するグラフの名前
+        """
+        self.name = name
+        self._nodes: dict[str, _GraphNode] = {}
+        self._dependents: dict[str, list[str]] = {}
+        # 直前の変更で再計算したノード数
+        self.last_recomputed = 0
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add_input(self, name: str, value: Any) -> None:
+        """入力ノードを追加
+
+        Raises:
+            ValueError: 同名のノードが既にある場合
+        """
+        self._add_node(name, (), None, value)
+
+    def add_derived(
+        self, name: str, dependencies: Iterable[str], compute: Callable[..., Any]
+    ) -> None:
+        """派生ノードを追加し、依存先の現在の値から計算
+
+        Args:
+            name: ノード名
+            dependencies: 依存先のノード名(computeへこの順で値を渡す)
+            compute: 依存先の値から値を計算する関数
+
+        Raises:
+            ValueError: 同名のノードが既にある場合、または依存先が未追加の場合
+        """
+        dependencies = tuple(dependencies)
+        for dependency in dependencies:
+            if dependency not in self._nodes:
+                raise ValueError(f"依存先のノードがありません: {name} -> {dependency}")
+        value = compute(*(self._nodes[dep].value for dep in dependencies))
+        self._add_node(name, dependencies, compute, value)
+
+    def _add_node(
+        self,
+        name: str,
+        dependencies: tuple[str, ...],
+        compute: Optional[Callable[..., Any]],
+        value: Any,
+    ) -> None:
+        if name in self._nodes:
+            raise ValueError(f"ノードが重複しています: {name}")
+        self._nodes[name] = _GraphNode(
+            name, len(self._nodes), dependencies, compute, value
+        )
+        self._dependents[name] = []
+        for dependency in dependencies:
+            self._dependents[dependency].append(name)
+
+    def value(self, name: str) -> Any:
+        """ノードの現在の値を取得
+
+        Raises:
+            KeyError: 未知のノード名の場合
+        """
+        return self._nodes[name].value
+
+    def values(self) -> dict[str, Any]:
+        """全ノードの現在の値を取得"""
+        return {name: node.value for name, node in self._nodes.items()}
+
+    def is_pinned(self, name: str) -> bool:
+        """派生ノードの値が固定されているかどうか"""
+        return self._nodes[name].pinned
+
+    def dependents(self, name: str) -> list[str]:
+        """ノードに(間接的に)依存するノードを依存順に取得"""
+        found: set[str] = set()
+        stack = list(self._dependents[name])
+        while stack:
+            dependent = stack.pop()
+            if dependent not in found:
+                found.add(dependent)
+                stack.extend(self._dependents[dependent])
+        return sorted(found, key=lambda dependent: self._nodes[dependent].order)
+
+    def set_input(self, name: str, value: Any) -> list[str]:
+        """入力ノードの値を変更し、依存するノードを再計算
+
+        Args:
+            name: 入力ノード名
+            value: 新しい値
+
+        Returns:
+            list[str]: 値が変わったノード名(依存順、変更したノードを含む)
+
+        Raises:
+            ValueError: 派生ノードを指定した場合
+        """
+        node = self._nodes[name]
+        if node.compute is not None:
+            raise ValueError(f"派生ノードの値は pin で指定してください: {name}")
+        return self._assign(node, value)
+
+    def pin(self, name: str, value: Any) -> list[str]:
+        """派生ノードの値を固定し、依存するノードを再計算
+
+        固定したノードは依存先が変更されても再計算しません。
+
+        Returns:
+            list[str]: 値が変わったノード名(依存順、固定したノードを含む)
+        """
+        node = self._nodes[name]
+        node.pinned = node.compute is not None
+        return self._assign(node, value)
+
+    def unpin(self, name: str) -> list[str]:
+        """派生ノードの固定を解除し、依存先の値から再計算
+
+        Returns:
+            list[str]: 値が変わったノード名(依存順)
+        """
+        node = self._nodes[name]
+        if not node.pinned:
+            return []
+        node.pinned = False
+        value = node.compute(*(self._nodes[dep].value for dep in node.dependencies))
+        return self._assign(node, value)
+
+    def _assign(self, node: _GraphNode, value: Any) -> list[str]:
+        """ノードに値を設定し、値が変わった場合は依存するノードへ伝播"""
+        self.last_recomputed = 0
+        if node.value == value:
+            return []
+        node.value = value
+        changed = [node.name]
+
+        # 追加順(依存順)の小さいものから再計算し、値が変わった場合のみ先へ伝播
+        queue = [
+            (self._nodes[name].order, name) for name in self._dependents[node.name]
+        ]
+        heapq.heapify(queue)
+        scheduled = {name for _order, name in queue}
+        while queue:
+            _order, name = heapq.heappop(queue)
+            dependent = self._nodes[name]
+            if dependent.pinned:
+                continue
+            self.last_recomputed += 1
+            new_value = dependent.compute(
+                *(self._nodes[dep].value for dep in dependent.dependencies)
+            )
+            if new_value == dependent.value:
+                continue
+            dependent.value = new_value
+            changed.append(name)
+            for next_name in self._dependents[name]:
+                if next_name not in scheduled:
+                    scheduled.add(next_name)
+                    heapq.heappush(queue, (self._nodes[next_name].order, next_name))
+
+        get_metrics_registry().inc(
+            "color_graph_recomputed_nodes_total",
+            self.last_recomputed,
+            labels={"graph": self.name},
+            description="派生色の依存グラフで再計算したノード数",
+        )
+        return changed
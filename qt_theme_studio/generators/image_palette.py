@@ -0,0 +1,290 @@
+"""
+画像からのパレット抽出
+
+画像を縮小してデコードし、画素を標本化してCIE L*a*b*色空間でk-means法により
+クラスタリングします。得られた代表色を背景色・プライマリ色・アクセント色の役割に
+割り当て、テーマ生成の基準色として使用します。
+
+JPEGはデコード時に縮小(draft)するため、24メガピクセルの写真でも
+全画素をデコードせずに抽出できます。
+NumPyが必要です(pip install qt-theme-studio[optimize])。
+"""
+
+import math
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from qt_theme_studio.logger import get_logger
+from qt_theme_studio.utilities.color_math import import_numpy, lab_to_srgb, srgb_to_lab
+from qt_theme_studio.utilities.metrics import get_metrics_registry
+
+# クラスタ数の既定値
+DEFAULT_CLUSTERS = 6
+
+# デコード後の画素数の上限と、クラスタリングに使用する標本数の上限
+MAX_DECODED_PIXELS = 512 * 512
+MAX_SAMPLES = 20000
+
+# k-means法の反復回数の上限と、収束とみなす代表色の移動量(ΔE)
+MAX_ITERATIONS = 30
+CONVERGENCE_DELTA_E = 0.5
+
+# 半透明の画素を除外する不透明度の下限
+MIN_ALPHA = 128
+
+# 役割の割り当てで、背景色とプライマリ色が十分に異なるとみなす色差(ΔE)
+DISTINCT_DELTA_E = 30.0
+
+# プライマリ色・アクセント色に割り当てる色の彩度(L*a*b*のクロマ)の下限
+MIN_ROLE_CHROMA = 15.0
+
+
+def load_image_pixels(
+    source: Union[str, Path, Any], max_pixels: int = MAX_DECODED_PIXELS
+) -> Any:
+    """画像を縮小してデコードし、RGBの画素の配列(N, 3)を返す
+
+    Args:
+        source: 画像ファイルのパスまたはPIL.Image
+        max_pixels: デコード後の画素数の上限
+
+    Returns:
+        ndarray: uint8の画素の配列(半透明の画素は除外)
+
+    Raises:
+        OSError: 画像を読み込めない場合
+    """
+    from PIL import Image
+
+    if isinstance(source, Image.Image):
+        return _image_pixels(source.copy(), max_pixels)
+    with Image.open(source) as image:
+        return _image_pixels(image, max_pixels)
+
+
+def _image_pixels(image: Any, max_pixels: int) -> Any:
+    """PIL.Imageを縮小して画素の配列を取得(imageは変更される)"""
+    from PIL import Image
+
+    np = import_numpy("optimize", "画像からのパレット抽出")
+    width, height = image.size
+    scale = math.sqrt(max_pixels / max(1, width * height))
+    if scale < 1:
+        target = (max(1, int(width * scale)), max(1, int(height * scale)))
+        # JPEGは目標サイズ以上の範囲で縮小してデコードする
+        image.draft("RGB", target)
+        image.thumbnail(target, Image.BILINEAR)
+
+    if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+        rgba = np.asarray(image.convert("RGBA")).reshape(-1, 4)
+        return np.ascontiguousarray(rgba[rgba[:, 3] >= MIN_ALPHA, :3])
+    return np.asarray(image.convert("RGB")).reshape(-1, 3)
+
+
+def _squared_distances(np: Any, points: Any, centers: Any) -> Any:
+    """各点と各代表色の距離の2乗の行列(N, k)"""
+    distances = (
+        np.einsum("ij,ij->i", points, points)[:, None]
+        - 2 * points @ centers.T
+        + np.einsum("ij,ij->i", centers, centers)[None, :]
+    )
+    return np.maximum(distances, 0.0)
+
+
+def kmeans_plus_plus(np: Any, points: Any, k: int, rng: Any) -> Any:
+    """k-means++法で初期の代表色を選ぶ"""
+    centers = [points[rng.integers(len(points))]]
+    closest = _squared_distances(np, points, centers[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        if total <= 0:
+            # 残りの点が全て既存の代表色と一致する場合
+            break
+        index = rng.choice(len(points), p=closest / total)
+        centers.append(points[index])
+        closest = np.minimum(
+            closest, _squared_distances(np, points, points[index][None, :])[:, 0]
+        )
+    return np.stack(centers)
+
+
+def kmeans(
+    points: Any,
+    k: int,
+    rng: Any,
+    max_iterations: int = MAX_ITERATIONS,
+    tolerance: float = CONVERGENCE_DELTA_E,
+) -> tuple[Any, Any, int]:
+    """k-means法でクラスタリング
+
+    代表色の移動量がtolerance以下になった時点で終了します。
+    空になったクラスタの代表色は、最も遠い点へ置き直します。
+
+    Args:
+        points: 点の配列(N, 次元)
+        k: クラスタ数
+        rng: numpy.random.Generator
+        max_iterations: 反復回数の上限
+        tolerance: 収束とみなす代表色の移動量
+
+    Returns:
+        tuple[ndarray, ndarray, int]: 代表色(k', 次元)、各点のクラスタ番号、反復回数
+    """
+    np = import_numpy("optimize", "画像からのパレット抽出")
+    points = np.asarray(points, dtype=np.float64)
+    centers = kmeans_plus_plus(np, points, min(k, len(points)), rng)
+    count = len(centers)
+    labels = np.zeros(len(points), dtype=np.intp)
+
+    iterations = 0
+    for _ in range(max_iterations):
+        iterations += 1
+        distances = _squared_distances(np, points, centers)
+        labels = np.argmin(distances, axis=1)
+        sizes = np.bincount(labels, minlength=count)
+        sums = np.stack(
+            [
+                np.bincount(labels, weights=points[:, axis], minlength=count)
+                for axis in range(points.shape[1])
+            ],
+            axis=1,
+        )
+        new_centers = sums / np.maximum(sizes, 1)[:, None]
+        empty = sizes == 0
+        if empty.any():
+            farthest = np.argsort(distances[np.arange(len(points)), labels])[::-1]
+            new_centers[empty] = points[farthest[: int(empty.sum())]]
+
+        shift = np.sqrt(((new_centers - centers) ** 2).sum(axis=1)).max()
+        centers = new_centers
+        if shift <= tolerance:
+            break
+
+    labels = np.argmin(_squared_distances(np, points, centers), axis=1)
+    return centers, labels, iterations
+
+
+class ImagePalette:
+    """画像から抽出したパレット
+
+    colorsは割合の大きい順の代表色(#rrggbb形式)、weightsは各代表色の画素の割合です。
+    """
+
+    __slots__ = ("colors", "iterations", "lab", "weights")
+
+    def __init__(
+        self, colors: list[str], weights: list[float], lab: Any, iterations: int
+    ) -> None:
+        self.colors = colors
+        self.weights = weights
+        self.lab = lab
+        self.iterations = iterations
+
+    def roles(self) -> dict[str, Optional[str]]:
+        """代表色を背景色・プライマリ色・アクセント色に割り当てる
+
+        背景色は割合が大きく彩度の低い色、プライマリ色は背景色と十分に異なる鮮やかな色、
+        アクセント色はプライマリ色と色相が離れた鮮やかな色とします。
+        鮮やかな色がない場合など、割り当てる色がない場合はNoneとします(テーマ生成で背景色から導出します)。
+
+        Returns:
+            dict[str, Optional[str]]: "background"、"primary"、"accent" → 色
+        """
+        np = import_numpy("optimize", "画像からのパレット抽出")
+        lab = np.asarray(self.lab, dtype=np.float64)
+        weights = np.asarray(self.weights, dtype=np.float64)
+        chroma = np.hypot(lab[:, 1], lab[:, 2])
+        hue = np.arctan2(lab[:, 2], lab[:, 1])
+
+        background = int(np.argmax(weights / (1 + chroma / 50)))
+        roles: dict[str, Optional[str]] = {
+            "background": self.colors[background],
+            "primary": None,
+            "accent": None,
+        }
+        # 無彩色に近い色はプライマリ色・アクセント色に割り当てない
+        remaining = [
+            index
+            for index in range(len(self.colors))
+            if index != background and chroma[index] >= MIN_ROLE_CHROMA
+        ]
+        if not remaining:
+            return roles
+
+        distance = np.sqrt(((lab - lab[background]) ** 2).sum(axis=1))
+        primary_score = (
+            chroma * np.sqrt(weights) * np.minimum(distance / DISTINCT_DELTA_E, 1.0)
+        )
+        primary = max(remaining, key=lambda index: primary_score[index])
+        roles["primary"] = self.colors[primary]
+        remaining.remove(primary)
+        if not remaining:
+            return roles
+
+        hue_difference = np.abs(np.angle(np.exp(1j * (hue - hue[primary]))))
+        accent_score = chroma * np.sqrt(weights) * (0.25 + hue_difference / np.pi)
+        accent = max(remaining, key=lambda index: accent_score[index])
+        roles["accent"] = self.colors[accent]
+        return roles
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "colors": list(self.colors),
+            "weights": [round(weight, 4) for weight in self.weights],
+            "roles": self.roles(),
+            "iterations": self.iterations,
+        }
+
+
+def extract_palette(
+    source: Union[str, Path, Any],
+    k: int = DEFAULT_CLUSTERS,
+    max_samples: int = MAX_SAMPLES,
+    seed: int = 0,
+) -> ImagePalette:
+    """画像から代表色のパレットを抽出
+
+    Args:
+        source: 画像ファイルのパスまたはPIL.Image
+        k: クラスタ数(代表色の数の上限)
+        max_samples: クラスタリングに使用する画素の標本数の上限
+        seed: 標本化と初期値の乱数のシード(同じ画像からは同じパレットを抽出する)
+
+    Returns:
+        ImagePalette: 抽出したパレット
+
+    Raises:
+        ImportError: NumPyがインストールされていない場合
+        OSError: 画像を読み込めない場合
+        ValueError: 不透明な画素がない場合
+    """
+    np = import_numpy("optimize", "画像からのパレット抽出")
+    with get_metrics_registry().time("palette.extract_image"):
+        pixels = load_image_pixels(source)
+        if len(pixels) == 0:
+            raise ValueError("パレットを抽出できる不透明な画素がありません")
+
+        rng = np.random.default_rng(seed)
+        if len(pixels) > max_samples:
+            pixels = pixels[rng.choice(len(pixels), max_samples, replace=False)]
+
+        lab = srgb_to_lab(pixels).astype(np.float64)
+        centers, labels, iterations = kmeans(lab, k, rng)
+        weights = np.bincount(labels, minlength=len(centers)) / len(labels)
+
+        # 割合の大きい順に並べ、画素が割り当てられなかった代表色は除外する
+        order = [int(index) for index in np.argsort(-weights) if weights[index] > 0]
+        rgb = lab_to_srgb(centers[order])
+        colors = ["#" + "".join(f"{int(c):02x}" for c in color) for color in rgb]
+        palette = ImagePalette(
+            colors,
+            [float(weights[index]) for index in order],
+            centers[order],
+            iterations,
+        )
+
+    get_logger().info(
+        f"画像からパレットを抽出しました: {len(colors)}色 "
+        f"(標本 {len(pixels)}画素, 反復 {iterations}回)"
+    )
+    return palette
@@ -0,0 +1,467 @@
+"""
+WCAGコントラストを最適化するパレット探索
+
+基準の背景色のHSL空間の周辺(色相の回転、明度・彩度のオフセット)を格子状に探索し、
+テキスト・背景・ボタン等の組のWCAGコントラスト比と色相の調和を組み合わせたスコアが
+高いパレットを求めます。WCAGの必須の下限を満たさない候補は結果に含めません。候補の評価はNumPyでまとめて行い、候補数が多い場合は
+探索範囲を分割してプロセスプールで並列に評価します。
+
+NumPyが必要です(pip install qt-theme-studio[optimize])。
+"""
+
+import colorsys
+import math
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+from qt_theme_studio.logger import get_logger
+from qt_theme_studio.utilities.color_math import import_numpy
+from qt_theme_studio.utilities.metrics import get_metrics_registry
+
+# これ未満の候補数ではプロセスの起動とワーカーでのインポートのコストが上回るため
+# 逐次評価する(既定の探索空間はGUIから毎回呼ばれるため、この値未満に収める)
+PARALLEL_THRESHOLD = 1_000_000
+
+# WCAGの基準(テキストはAA 4.5:1・AAA 7:1、UI部品は3:1)
+WCAG_AA = 4.5
+WCAG_AAA = 7.0
+WCAG_UI = 3.0
+
+# 評価するコントラストの組(名前 → (前景色, 背景色, 目標のコントラスト比, 必須の下限))
+CONTRAST_PAIRS = {
+    "text": ("text", "background", WCAG_AAA, WCAG_AA),
+    "input_text": ("text", "surface", WCAG_AA, WCAG_AA),
+    "button_text": ("button_text", "primary", WCAG_AA, WCAG_AA),
+    "primary": ("primary", "background", WCAG_UI, WCAG_UI),
+    "accent": ("accent", "background", WCAG_UI, 0.0),
+}
+
+# スコアの重み(コントラスト、色相の調和、基準の背景色への近さ)
+SCORE_WEIGHTS = {"contrast": 0.55, "harmony": 0.3, "fidelity": 0.15}
+
+# コントラストの評価のうち、目標を超えた余裕に割り当てる割合
+CONTRAST_MARGIN_WEIGHT = 0.2
+
+# 調和する色相差(度)と、調和とみなす幅(度)
+HARMONIC_ANGLES = (0.0, 30.0, 120.0, 150.0, 180.0)
+HARMONY_WIDTH = 15.0
+
+# サーフェス色の背景色からの明度の差(生成テーマと同じ幅で、明暗の両方向を探索する)
+SURFACE_LIGHTNESS_OFFSET = 20 * 2.55 / 255
+
+
+def hex_to_hsl(hex_color: str) -> tuple[float, float, float]:
+    """#rrggbb形式の色を(色相, 彩度, 明度)(各0〜1)に変換
+
+    Raises:
+        ValueError: #rrggbb形式でない場合
+    """
+    value = hex_color.lstrip("#")
+    if len(value) != 6:
+        raise ValueError(f"#rrggbb形式の色を指定してください: {hex_color}")
+    red, green, blue = (int(value[i : i + 2], 16) / 255 for i in (0, 2, 4))
+    hue, lightness, saturation = colorsys.rgb_to_hls(red, green, blue)
+    return hue, saturation, lightness
+
+
+def hsl_to_hex(hue: float, saturation: float, lightness: float) -> str:
+    """(色相, 彩度, 明度)(各0〜1)を#rrggbb形式の色に変換"""
+    rgb = colorsys.hls_to_rgb(hue % 1.0, lightness, saturation)
+    return "#" + "".join(f"{round(channel * 255):02x}" for channel in rgb)
+
+
+def _linear_channel(channel: float) -> float:
+    if channel <= 0.04045:
+        return channel / 12.92
+    return ((channel + 0.055) / 1.055) ** 2.4
+
+
+def relative_luminance(hex_color: str) -> float:
+    """#rrggbb形式の色のWCAGの相対輝度"""
+    value = hex_color.lstrip("#")
+    red, green, blue = (
+        _linear_channel(int(value[i : i + 2], 16) / 255) for i in (0, 2, 4)
+    )
+    return 0.2126 * red + 0.7152 * green + 0.0722 * blue
+
+
+def contrast_ratio(foreground: str, background: str) -> float:
+    """2色のWCAGコントラスト比(1〜21)"""
+    first = relative_luminance(foreground)
+    second = relative_luminance(background)
+    return (max(first, second) + 0.05) / (min(first, second) + 0.05)
+
+
+class SearchSpace:
+    """パレットの探索空間
+
+    各軸の値の全組み合わせを候補とします。色相は度、明度・彩度は0〜1で指定します。
+    """
+
+    __slots__ = (
+        "accent_offsets",
+        "background_offsets",
+        "hue_rotations",
+        "primary_lightness",
+        "primary_saturation",
+        "surface_offsets",
+        "text_lightness",
+    )
+
+    def __init__(
+        self,
+        background_offsets: Sequence[float] = (-0.08, -0.04, 0.0, 0.04, 0.08),
+        hue_rotations: Sequence[float] = tuple(range(0, 360, 15)),
+        primary_lightness: Sequence[float] = (0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8),
+        primary_saturation: Sequence[float] = (0.35, 0.5, 0.65, 0.8, 0.95),
+        accent_offsets: Sequence[float] = (30.0, 60.0, 120.0, 150.0, 180.0),
+        text_lightness: Sequence[float] = (0.0, 0.1, 0.9, 1.0),
+        surface_offsets: Sequence[float] = (
+            -SURFACE_LIGHTNESS_OFFSET,
+            SURFACE_LIGHTNESS_OFFSET,
+        ),
+    ) -> None:
+        """探索空間を初期化します
+
+        Args:
+            background_offsets: 背景色の明度のオフセット
+            hue_rotations: 背景色からのプライマリ色の色相の回転(度)
+            primary_lightness: プライマリ色の明度
+            primary_saturation: プライマリ色の彩度
+            accent_offsets: プライマリ色からのアクセント色の色相の回転(度)
+            text_lightness: テキスト色の明度(背景色の色相でわずかに色付けする)
+            surface_offsets: 背景色からのサーフェス色の明度のオフセット
+        """
+        self.background_offsets = tuple(background_offsets)
+        self.hue_rotations = tuple(hue_rotations)
+        self.primary_lightness = tuple(primary_lightness)
+        self.primary_saturation = tuple(primary_saturation)
+        self.accent_offsets = tuple(accent_offsets)
+        self.text_lightness = tuple(text_lightness)
+        self.surface_offsets = tuple(surface_offsets)
+
+    @property
+    def axes(self) -> tuple[tuple[float, ...], ...]:
+        """各軸の値(色相の回転を先頭とする)"""
+        return (
+            self.hue_rotations,
+            self.background_offsets,
+            self.primary_lightness,
+            self.primary_saturation,
+            self.accent_offsets,
+            self.text_lightness,
+            self.surface_offsets,
+        )
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(len(axis) for axis in self.axes)
+
+    @property
+    def size(self) -> int:
+        """候補数"""
+        return math.prod(self.shape)
+
+
+class PaletteCandidate:
+    """最適化したパレットの候補"""
+
+    __slots__ = ("colors", "contrast", "score")
+
+    def __init__(
+        self, colors: dict[str, str], score: float, contrast: dict[str, float]
+    ) -> None:
+        self.colors = colors
+        self.score = score
+        self.contrast = contrast
+
+    @property
+    def is_compliant(self) -> bool:
+        """全ての組がWCAGの必須の下限を満たすかどうか"""
+        return all(
+            self.contrast[name] >= minimum
+            for name, (_fg, _bg, _target, minimum) in CONTRAST_PAIRS.items()
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "colors": dict(self.colors),
+            "score": round(self.score, 4),
+            "contrast": {
+                name: round(ratio, 2) for name, ratio in self.contrast.items()
+            },
+            "is_compliant": self.is_compliant,
+        }
+
+    def __repr__(self) -> str:
+        return f"PaletteCandidate(primary={self.colors['primary']}, score={self.score:.3f})"
+
+
+def _hsl_to_rgb_array(np: Any, hue: Any, saturation: Any, lightness: Any) -> Any:
+    """HSLの配列を8ビットに丸めたRGB(0〜1)の配列に変換"""
+    q = np.where(
+        lightness < 0.5,
+        lightness * (1 + saturation),
+        lightness + saturation - lightness * saturation,
+    )
+    p = 2 * lightness - q
+
+    def channel(t: Any) -> Any:
+        t = np.mod(t, 1.0)
+        return np.select(
+            [t < 1 / 6, t < 1 / 2, t < 2 / 3],
+            [p + (q - p) * 6 * t, q, p + (q - p) * (2 / 3 - t) * 6],
+            default=p,
+        )
+
+    rgb = np.stack([channel(hue + 1 / 3), channel(hue), channel(hue - 1 / 3)])
+    return np.round(rgb * 255) / 255
+
+
+def _luminance_array(np: Any, rgb: Any) -> Any:
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return 0.2126 * linear[0] + 0.7152 * linear[1] + 0.0722 * linear[2]
+
+
+def _contrast_array(np: Any, first: Any, second: Any) -> Any:
+    return (np.maximum(first, second) + 0.05) / (np.minimum(first, second) + 0.05)
+
+
+def _harmony_array(np: Any, hue_difference: Any) -> Any:
+    """色相差(度)が調和する角度に近いほど1に近づく値"""
+    difference = np.abs((hue_difference + 180.0) % 360.0 - 180.0)
+    closeness = [
+        np.exp(-(((difference - angle) / HARMONY_WIDTH) ** 2))
+        for angle in HARMONIC_ANGLES
+    ]
+    return np.max(np.stack(closeness), axis=0)
+
+
+def _candidate_hsl(
+    np: Any, seed: tuple[float, float, float], space: SearchSpace, indices: Any
+) -> dict[str, tuple[Any, Any, Any]]:
+    """候補の番号から各色のHSLの配列を求める"""
+    seed_hue, seed_saturation, seed_lightness = seed
+    axes = [np.asarray(axis, dtype=float) for axis in space.axes]
+    (
+        rotation,
+        background_offset,
+        primary_lightness,
+        primary_saturation,
+        accent_offset,
+        text_lightness,
+        surface_offset,
+    ) = (
+        axis[index] for axis, index in zip(axes, np.unravel_index(indices, space.shape))
+    )
+
+    background_lightness = np.clip(seed_lightness + background_offset, 0.0, 1.0)
+    # 中間の明度の背景ではどちらの方向が基準を満たすかはテキスト色によるため、
+    # サーフェス色の明暗の方向も探索する
+    surface_lightness = np.clip(background_lightness + surface_offset, 0.0, 1.0)
+    seed_hues = np.full(indices.shape, seed_hue)
+    seed_saturations = np.full(indices.shape, seed_saturation)
+    primary_hue = np.mod(seed_hue + rotation / 360.0, 1.0)
+    return {
+        "background": (seed_hues, seed_saturations, background_lightness),
+        "surface": (seed_hues, seed_saturations, surface_lightness),
+        "primary": (primary_hue, primary_saturation, primary_lightness),
+        "accent": (
+            np.mod(primary_hue + accent_offset / 360.0, 1.0),
+            primary_saturation,
+            primary_lightness,
+        ),
+        "text": (seed_hues, np.full(indices.shape, 0.15), text_lightness),
+    }
+
+
+def _score_candidates(
+    np: Any, seed: tuple[float, float, float], space: SearchSpace, indices: Any
+) -> Any:
+    """候補のスコアをまとめて計算(必須の下限を満たさない候補は-inf)"""
+    hsl = _candidate_hsl(np, seed, space, indices)
+    luminance = {
+        name: _luminance_array(np, _hsl_to_rgb_array(np, *values))
+        for name, values in hsl.items()
+    }
+    # ボタンのテキストは白・黒のうちプライマリ色とのコントラストが高い方
+    luminance["button_text"] = np.where(
+        _contrast_array(np, 1.0, luminance["primary"])
+        >= _contrast_array(np, 0.0, luminance["primary"]),
+        1.0,
+        0.0,
+    )
+
+    contrast_score = np.zeros(indices.shape)
+    compliant = np.ones(indices.shape, dtype=bool)
+    for foreground, background, target, minimum in CONTRAST_PAIRS.values():
+        ratio = _contrast_array(np, luminance[foreground], luminance[background])
+        # 目標までの達成度に加え、目標を超えた余裕もわずかに評価する
+        contrast_score += (1 - CONTRAST_MARGIN_WEIGHT) * np.minimum(
+            ratio / target, 1.0
+        ) + CONTRAST_MARGIN_WEIGHT * np.log(ratio) / math.log(21.0)
+        compliant &= ratio >= minimum
+    contrast_score /= len(CONTRAST_PAIRS)
+
+    # 色相の調和(背景色の彩度が低いほど背景色との色相差は問わない)
+    seed_hue, seed_saturation, _seed_lightness = seed
+    primary_hue = hsl["primary"][0]
+    background_harmony = _harmony_array(np, (primary_hue - seed_hue) * 360.0)
+    background_harmony = seed_saturation * background_harmony + (1 - seed_saturation)
+    accent_harmony = _harmony_array(np, (hsl["accent"][0] - primary_hue) * 360.0)
+    harmony = (background_harmony + accent_harmony) / 2
+
+    max_offset = max((abs(offset) for offset in space.background_offsets), default=0)
+    offset = np.abs(hsl["background"][2] - seed[2])
+    fidelity = 1.0 - offset / max_offset if max_offset else np.ones(indices.shape)
+
+    score = (
+        SCORE_WEIGHTS["contrast"] * contrast_score
+        + SCORE_WEIGHTS["harmony"] * harmony
+        + SCORE_WEIGHTS["fidelity"] * fidelity
+    )
+    return np.where(compliant, score, -np.inf)
+
+
+def _best_per_hue(
+    seed: tuple[float, float, float], space: SearchSpace, start: int, stop: int
+) -> list[tuple[float, int]]:
+    """候補番号の範囲を評価し、色相の回転ごとに最高スコアの(スコア, 候補番号)を返す
+
+    並列評価でワーカープロセスへ渡すため、モジュールレベルの関数としています。
+    範囲に含まれない、または必須の下限を満たす候補がない色相の回転は(-inf, -1)とします。
+    """
+    np = import_numpy("optimize", "パレットの最適化")
+    indices = np.arange(start, stop)
+    scores = _score_candidates(np, seed, space, indices)
+
+    hue_count = len(space.hue_rotations)
+    hue_index = indices // (space.size // hue_count)
+    # 色相ごとにスコアの降順に並べ、各色相の先頭を取り出す
+    order = np.lexsort((-scores, hue_index))
+    hues, first = np.unique(hue_index[order], return_index=True)
+    best = [(-math.inf, -1)] * hue_count
+    for hue, position in zip(hues.tolist(), first.tolist()):
+        candidate = int(order[position])
+        if np.isfinite(scores[candidate]):
+            best[hue] = (float(scores[candidate]), int(indices[candidate]))
+    return best
+
+
+def _evaluate_chunk(args: tuple[Any, ...]) -> list[tuple[float, int]]:
+    return _best_per_hue(*args)
+
+
+def _rank_key(entry: tuple[float, int]) -> tuple[float, int]:
+    """スコアの高い順、同点の場合は候補番号の小さい順に並べるキー"""
+    return entry[0], -entry[1]
+
+
+class PaletteOptimizer:
+    """WCAGコントラストを最適化するパレット探索
+
+    結果は色相の回転ごとに最良の候補を1つずつ選ぶため、上位の候補は互いに
+    プライマリ色の色相が異なります。
+    """
+
+    def __init__(
+        self,
+        space: Optional[SearchSpace] = None,
+        max_workers: Optional[int] = None,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+    ) -> None:
+        """パレット探索を初期化します
+
+        Args:
+            space: 探索空間(省略時は既定の探索空間)
+            max_workers: ワーカープロセス数(デフォルト: CPU数)
+            parallel_threshold: 並列に評価する候補数の下限
+        """
+        self.space = space or SearchSpace()
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+        self.logger = get_logger()
+
+    def optimize(self, background: str, top_k: int = 5) -> list[PaletteCandidate]:
+        """背景色の周辺を探索し、スコアの高い順にパレットの候補を返す
+
+        WCAGの必須の下限を満たす候補のみを返します(ない場合は空のリスト)。
+
+        Args:
+            background: 基準の背景色(#rrggbb形式)
+            top_k: 返す候補数の上限
+
+        Returns:
+            list[PaletteCandidate]: スコアの降順の候補
+
+        Raises:
+            ImportError: NumPyがインストールされていない場合
+            ValueError: 背景色が#rrggbb形式でない場合
+        """
+        np = import_numpy("optimize", "パレットの最適化")
+        seed = hex_to_hsl(background)
+        with get_metrics_registry().time("palette.optimize"):
+            best = self._evaluate(seed)
+            ranked = sorted(
+                (entry for entry in best if entry[1] >= 0),
+                key=_rank_key,
+                reverse=True,
+            )[:top_k]
+            candidates = [
+                self._build_candidate(np, seed, index, score) for score, index in ranked
+            ]
+
+        self.logger.info(
+            f"パレットを最適化しました: {background} "
+            f"(候補 {self.space.size}件から{len(candidates)}件)"
+        )
+        return candidates
+
+    def _evaluate(self, seed: tuple[float, float, float]) -> list[tuple[float, int]]:
+        """全候補を評価し、色相の回転ごとの最良の候補を返す"""
+        size = self.space.size
+        workers = min(self.max_workers or os.cpu_count() or 1, size)
+        if workers <= 1 or size < self.parallel_threshold:
+            return _best_per_hue(seed, self.space, 0, size)
+
+        # ワーカーごとに複数の範囲を割り当て、処理時間の偏りをならす
+        chunk_count = workers * 4
+        bounds = [size * i // chunk_count for i in range(chunk_count + 1)]
+        chunks = [
+            (seed, self.space, start, stop)
+            for start, stop in zip(bounds, bounds[1:])
+            if stop > start
+        ]
+        best = [(-math.inf, -1)] * len(self.space.hue_rotations)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_best in executor.map(_evaluate_chunk, chunks):
+                best = [
+                    max(current, new, key=_rank_key)
+                    for current, new in zip(best, chunk_best)
+                ]
+        return best
+
+    def _build_candidate(
+        self, np: Any, seed: tuple[float, float, float], index: int, score: float
+    ) -> PaletteCandidate:
+        """候補番号から色とコントラスト比を求める"""
+        hsl = _candidate_hsl(np, seed, self.space, np.array([index]))
+        colors = {
+            name: hsl_to_hex(*(float(values[0]) for values in channels))
+            for name, channels in hsl.items()
+        }
+        colors["button_text"] = (
+            "#ffffff"
+            if contrast_ratio("#ffffff", colors["primary"])
+            >= contrast_ratio("#000000", colors["primary"])
+            else "#000000"
+        )
+        contrast = {
+            name: contrast_ratio(colors[foreground], colors[background])
+            for name, (foreground, background, _target, _minimum) in (
+                CONTRAST_PAIRS.items()
+            )
+        }
+        return PaletteCandidate(colors, score, contrast)
@@ -4,10 +4,139 @@
 背景色から自動的に調和の取れたテーマを生成
 """
 
-from typing import Any
+import string
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, Optional, Union
 
 from PySide6.QtGui import QColor
 
+from qt_theme_studio.generators.color_graph import ColorDependencyGraph
+from qt_theme_studio.generators.image_palette import (
+    DEFAULT_CLUSTERS,
+    ImagePalette,
+    extract_palette,
+)
+from qt_theme_studio.generators.palette_optimizer import PaletteOptimizer
+
+# 生成テーマの各項目のパス → 値を持つ依存グラフのノード名(テーマデータの項目順)
+GENERATED_COLOR_OUTPUTS: tuple[tuple[tuple[str, ...], str], ...] = (
+    (("colors", "primary"), "primary"),
+    (("colors", "accent"), "accent"),
+    (("colors", "background"), "background"),
+    (("colors", "text"), "text"),
+    (("colors", "surface"), "surface"),
+    # ボタン関連の色
+    (("colors", "button_background"), "primary"),
+    (("colors", "button_text"), "button_text"),
+    (("colors", "button_hover"), "button_hover"),
+    (("colors", "button_pressed"), "button_pressed"),
+    (("colors", "button_border"), "button_border"),
+    # 入力ウィジェット関連の色
+    (("colors", "input_background"), "surface"),
+    (("colors", "input_text"), "text"),
+    (("colors", "input_border"), "primary"),
+    (("colors", "focus_border"), "accent"),
+    (("colors", "selection_background"), "primary"),
+    (("colors", "selection_text"), "button_text"),
+    # スクロールバー関連の色
+    (("colors", "scrollbar_background"), "surface_shade"),
+    (("colors", "scrollbar_handle"), "primary"),
+    (("colors", "scrollbar_handle_hover"), "accent"),
+    # プログレス関連の色
+    (("colors", "progress_background"), "surface_shade"),
+    (("colors", "progress_fill"), "primary"),
+    (("colors", "slider_groove"), "surface_shade"),
+    (("colors", "slider_handle"), "primary"),
+    (("colors", "slider_handle_border"), "primary"),
+    # 境界線関連の色
+    (("colors", "border"), "panel_border"),
+    # 無効状態の色
+    (("colors", "disabled_background"), "disabled_background"),
+    (("colors", "disabled_text"), "disabled_text"),
+    (("colors", "disabled_border"), "disabled_border"),
+    (("primaryColor",), "primary"),
+    (("accentColor",), "accent"),
+    (("backgroundColor",), "background"),
+    (("textColor",), "text"),
+    (("button", "background"), "primary"),
+    (("button", "text"), "button_text"),
+    (("button", "hover"), "button_hover"),
+    (("button", "pressed"), "button_pressed"),
+    (("button", "border"), "button_border"),
+    (("panel", "background"), "surface"),
+    (("panel", "border"), "panel_border"),
+    (("panel", "header", "background"), "surface_shade"),
+    (("panel", "header", "text"), "text"),
+    (("panel", "header", "border"), "panel_border"),
+    (("panel", "zebra", "alternate"), "zebra_alternate"),
+)
+
+# 色設定("colors")のキー → 値を持つ依存グラフのノード名
+GENERATED_COLOR_NODES = {
+    path[1]: node_name
+    for path, node_name in GENERATED_COLOR_OUTPUTS
+    if path[0] == "colors"
+}
+
+# 微調整できる基本色(ノード名 → 表示名)
+TUNABLE_COLORS = {
+    "primary": "プライマリ色",
+    "accent": "アクセント色",
+    "text": "テキスト色",
+    "surface": "サーフェス色",
+}
+
+# スタイルシート断片のノード名の接頭辞
+STYLE_FRAGMENT_PREFIX = "qss:"
+
+
+def add_style_fragment(graph: ColorDependencyGraph, name: str, template: str) -> None:
+    """スタイルシート断片のノードを依存グラフに追加
+
+    テンプレートが参照する色設定のキーに対応するノードのみに依存させるため、
+    無関係な色の変更では断片を再生成しません。
+
+    Args:
+        graph: 派生色の依存グラフ
+        name: 断片名 (接頭辞 STYLE_FRAGMENT_PREFIX を付けてノード名とする)
+        template: "{button_hover}"のように色設定のキーで色を参照するテンプレート
+
+    Raises:
+        KeyError: 生成テーマにない色設定のキーを参照している場合
+    """
+    keys = list(
+        dict.fromkeys(
+            field
+            for _text, field, _spec, _conv in string.Formatter().parse(template)
+            if field
+        )
+    )
+    nodes = [GENERATED_COLOR_NODES[key] for key in keys]
+
+    def render(*colors: QColor) -> str:
+        return template.format_map(
+            {key: color.name() for key, color in zip(keys, colors)}
+        )
+
+    graph.add_derived(f"{STYLE_FRAGMENT_PREFIX}{name}", nodes, render)
+
+
+def changed_theme_paths(
+    changed_nodes: Iterable[str],
+) -> list[tuple[tuple[str, ...], str]]:
+    """値が変わったノードに対応する生成テーマの項目を取得
+
+    Returns:
+        list[tuple[tuple[str, ...], str]]: (項目のパス, 値を持つノード名)の一覧
+    """
+    changed = set(changed_nodes)
+    return [
+        (path, node_name)
+        for path, node_name in GENERATED_COLOR_OUTPUTS
+        if node_name in changed
+    ]
+
 
 class ThemeGenerator:
     """テーマジェネレータクラス"""
@@ -49,105 +178,183 @@ class ThemeGenerator:
 
     def generate_theme_from_background(self, bg_color: QColor) -> dict[str, Any]:
         """背景色から自動的にテーマを生成"""
-        # 背景色の明度を取得
-        bg_lightness = bg_color.lightness()
-        is_dark_bg = bg_lightness < 128
-
-        # 背景色から調和の取れた色を生成
-        if is_dark_bg:
-            # 暗い背景の場合
-            primary_color = self._generate_contrasting_color(bg_color, 0.7)
-            accent_color = self._generate_contrasting_color(bg_color, 0.8)
-            text_color = QColor("#ffffff")  # 白いテキスト
-            surface_color = self._adjust_color(bg_color, 20, 0)
-        else:
-            # 明るい背景の場合
-            primary_color = self._generate_contrasting_color(bg_color, 0.3)
-            accent_color = self._generate_contrasting_color(bg_color, 0.4)
-            text_color = QColor("#000000")  # 黒いテキスト
-            surface_color = self._adjust_color(bg_color, -20, 0)
-
-        # ボタン色を生成
-        button_bg = primary_color
-        button_text = text_color
-        button_hover = self._adjust_color(primary_color, 20, 10)
-        button_pressed = self._adjust_color(primary_color, -20, -10)
-        button_border = self._adjust_color(primary_color, -10, 0)
-
-        # パネル色を生成
-        panel_bg = surface_color
-        panel_border = self._adjust_color(surface_color, -30, 0)
-        header_bg = self._adjust_color(surface_color, -10, 0)
-        header_text = text_color
-        header_border = panel_border
-        zebra_alternate = self._adjust_color(surface_color, 5, 0)
-
-        return {
+        return self.theme_from_graph(self.build_color_graph(bg_color))
+
+    def build_color_graph(
+        self,
+        bg_color: QColor,
+        style_fragments: Optional[Mapping[str, str]] = None,
+    ) -> ColorDependencyGraph:
+        """背景色から派生色の依存グラフを構築
+
+        背景色(入力)→ 基本色 → 派生色 → スタイルシート断片 の順にノードを追加します。
+        各ノードの値は QColor、スタイルシート断片のノードの値は文字列です。
+
+        Args:
+            bg_color: 背景色
+            style_fragments: 断片名 → スタイルシートのテンプレート
+                ("{button_hover}"のように色設定のキーで色を参照)
+
+        Returns:
+            ColorDependencyGraph: 派生色の依存グラフ
+        """
+        graph = ColorDependencyGraph("generated_theme")
+        adjust = self._adjust_color
+        graph.add_input("background", QColor(bg_color))
+        graph.add_derived("is_dark", ("background",), lambda bg: bg.lightness() < 128)
+
+        # 背景色から調和の取れた基本色を生成
+        graph.add_derived(
+            "primary",
+            ("background", "is_dark"),
+            lambda bg, dark: self._generate_contrasting_color(bg, 0.7 if dark else 0.3),
+        )
+        graph.add_derived(
+            "accent",
+            ("background", "is_dark"),
+            lambda bg, dark: self._generate_contrasting_color(bg, 0.8 if dark else 0.4),
+        )
+        graph.add_derived(
+            "text",
+            ("is_dark",),
+            lambda dark: QColor("#ffffff" if dark else "#000000"),
+        )
+        graph.add_derived(
+            "surface",
+            ("background", "is_dark"),
+            lambda bg, dark: adjust(bg, 20 if dark else -20, 0),
+        )
+
+        graph.add_derived("button_text", ("text",), QColor)
+
+        # ボタン・パネル・無効状態の色を生成
+        derived = (
+            ("button_hover", "primary", 20, 10),
+            ("button_pressed", "primary", -20, -10),
+            ("button_border", "primary", -10, 0),
+            ("panel_border", "surface", -30, 0),
+            ("surface_shade", "surface", -10, 0),
+            ("zebra_alternate", "surface", 5, 0),
+            ("disabled_background", "surface", -20, -20),
+            ("disabled_text", "text", -30, -30),
+            ("disabled_border", "surface", -40, -40),
+        )
+        for name, base, brightness, saturation in derived:
+            graph.add_derived(
+                name,
+                (base,),
+                lambda color, b=brightness, s=saturation: adjust(color, b, s),
+            )
+
+        for fragment_name, template in (style_fragments or {}).items():
+            add_style_fragment(graph, fragment_name, template)
+        return graph
+
+    def theme_from_graph(self, graph: ColorDependencyGraph) -> dict[str, Any]:
+        """派生色の依存グラフの現在の値からテーマデータを作成"""
+        theme: dict[str, Any] = {
             "name": "auto_generated",
             "display_name": "自動生成テーマ",
             "description": "背景色から自動生成された調和の取れたテーマ",
-            "colors": {
-                "primary": primary_color.name(),
-                "accent": accent_color.name(),
-                "background": bg_color.name(),
-                "text": text_color.name(),
-                "surface": surface_color.name(),
-                # ボタン関連の色
-                "button_background": button_bg.name(),
-                "button_text": button_text.name(),
-                "button_hover": button_hover.name(),
-                "button_pressed": button_pressed.name(),
-                "button_border": button_border.name(),
-                # 入力ウィジェット関連の色
-                "input_background": surface_color.name(),
-                "input_text": text_color.name(),
-                "input_border": primary_color.name(),
-                "focus_border": accent_color.name(),
-                "selection_background": primary_color.name(),
-                "selection_text": button_text.name(),
-                # スクロールバー関連の色
-                "scrollbar_background": self._adjust_color(
-                    surface_color, -10, 0
-                ).name(),
-                "scrollbar_handle": primary_color.name(),
-                "scrollbar_handle_hover": accent_color.name(),
-                # プログレス関連の色
-                "progress_background": self._adjust_color(surface_color, -10, 0).name(),
-                "progress_fill": primary_color.name(),
-                "slider_groove": self._adjust_color(surface_color, -10, 0).name(),
-                "slider_handle": primary_color.name(),
-                "slider_handle_border": primary_color.name(),
-                # 境界線関連の色
-                "border": self._adjust_color(surface_color, -30, 0).name(),
-                # 無効状態の色
-                "disabled_background": self._adjust_color(
-                    surface_color, -20, -20
-                ).name(),
-                "disabled_text": self._adjust_color(text_color, -30, -30).name(),
-                "disabled_border": self._adjust_color(surface_color, -40, -40).name(),
-            },
-            "primaryColor": primary_color.name(),
-            "accentColor": accent_color.name(),
-            "backgroundColor": bg_color.name(),
-            "textColor": text_color.name(),
-            "button": {
-                "background": button_bg.name(),
-                "text": button_text.name(),
-                "hover": button_hover.name(),
-                "pressed": button_pressed.name(),
-                "border": button_border.name(),
-            },
-            "panel": {
-                "background": panel_bg.name(),
-                "border": panel_border.name(),
-                "header": {
-                    "background": header_bg.name(),
-                    "text": header_text.name(),
-                    "border": header_border.name(),
-                },
-                "zebra": {"alternate": zebra_alternate.name()},
-            },
         }
+        for path, node_name in GENERATED_COLOR_OUTPUTS:
+            target = theme
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = graph.value(node_name).name()
+        return theme
+
+    def generate_optimized_themes(
+        self,
+        bg_color: QColor,
+        top_k: int = 5,
+        optimizer: Optional[PaletteOptimizer] = None,
+    ) -> list[dict[str, Any]]:
+        """背景色の周辺からWCAGコントラストを最適化したテーマの候補を生成
+
+        最適化した基本色を派生色の依存グラフへ固定し、
+        generate_theme_from_background()と同じ形式のテーマデータを作成します。
+
+        Args:
+            bg_color: 基準の背景色
+            top_k: 生成するテーマ数の上限
+            optimizer: パレット探索(省略時は既定の探索空間)
+
+        Returns:
+            list[dict[str, Any]]: スコアの高い順のテーマデータ
+
+        Raises:
+            ImportError: NumPyがインストールされていない場合
+        """
+        optimizer = optimizer or PaletteOptimizer()
+        themes = []
+        for rank, candidate in enumerate(
+            optimizer.optimize(bg_color.name(), top_k), start=1
+        ):
+            colors = candidate.colors
+            graph = self.build_color_graph(QColor(colors["background"]))
+            for node_name in ("surface", "primary", "accent", "text", "button_text"):
+                graph.pin(node_name, QColor(colors[node_name]))
+
+            theme = self.theme_from_graph(graph)
+            theme["name"] = f"auto_optimized_{rank}"
+            theme["display_name"] = f"最適化テーマ {rank}"
+            theme["description"] = (
+                f"WCAGコントラストを最適化した候補 (スコア {candidate.score:.3f}, "
+                f"テキスト {candidate.contrast['text']:.1f}:1, "
+                f"ボタン {candidate.contrast['button_text']:.1f}:1)"
+            )
+            themes.append(theme)
+        return themes
+
+    def build_color_graph_from_palette(
+        self,
+        palette: ImagePalette,
+        style_fragments: Optional[Mapping[str, str]] = None,
+    ) -> ColorDependencyGraph:
+        """画像から抽出したパレットから派生色の依存グラフを構築
+
+        パレットの背景色を入力とし、プライマリ色・アクセント色が割り当てられた場合は
+        その色をグラフへ固定します(割り当てがない色は背景色から導出します)。
+
+        Args:
+            palette: 画像から抽出したパレット
+            style_fragments: 断片名 → スタイルシートのテンプレート
+
+        Returns:
+            ColorDependencyGraph: 派生色の依存グラフ
+        """
+        roles = palette.roles()
+        graph = self.build_color_graph(QColor(roles["background"]), style_fragments)
+        for node_name in ("primary", "accent"):
+            color = roles[node_name]
+            if color is not None:
+                graph.pin(node_name, QColor(color))
+        return graph
+
+    def generate_theme_from_image(
+        self, source: Union[str, Path, Any], k: int = DEFAULT_CLUSTERS
+    ) -> dict[str, Any]:
+        """画像から代表色を抽出してテーマを生成
+
+        Args:
+            source: 画像ファイルのパスまたはPIL.Image
+            k: 抽出する代表色の数の上限
+
+        Returns:
+            dict[str, Any]: generate_theme_from_background()と同じ形式のテーマデータ
+
+        Raises:
+            ImportError: NumPyがインストールされていない場合
+            OSError: 画像を読み込めない場合
+            ValueError: 不透明な画素がない場合
+        """
+        graph = self.build_color_graph_from_palette(extract_palette(source, k))
+        theme = self.theme_from_graph(graph)
+        theme["name"] = "auto_image"
+        theme["display_name"] = "画像から生成したテーマ"
+        theme["description"] = "画像から抽出した代表色で自動生成されたテーマ"
+        return theme
 
     def _generate_contrasting_color(
         self, base_color: QColor, contrast_ratio: float
@@ -493,7 +493,11 @@ class QtThemeStudioLogger:
         context: Optional[LogContext] = None,
         **kwargs: Any,
     ) -> None:
-        """パフォーマンスログ"""
+        """パフォーマンスログ(メトリクスレジストリにも記録)"""
+        from qt_theme_studio.utilities.metrics import get_metrics_registry
+
+        get_metrics_registry().observe_duration(operation, duration)
+
         message = f"パフォーマンス: {operation} - {duration:.3f}秒"
         self.info(
             message,
@@ -508,11 +512,20 @@ class QtThemeStudioLogger:
         self, operation: str, context: Optional[LogContext] = None
     ) -> Any:
         """パフォーマンス測定用コンテキストマネージャー"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             yield
+        except Exception:
+            from qt_theme_studio.utilities.metrics import get_metrics_registry
+
+            get_metrics_registry().inc(
+                "operation_errors_total",
+                labels={"operation": operation},
+                description="操作のエラー件数",
+            )
+            raise
         finally:
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
             self.log_performance(operation, duration, context)
 
     def log_exception(
@@ -0,0 +1,46 @@
+"""
+テーマパッケージ
+
+テーマデータの正規化・コンパイル済みテーマ表現と、
+複数テーマを格納したバンドルファイル・テーマパックの遅延読み込み、
+テーマファイルのホットリロード監視、構造共有によるテーマ編集履歴、
+知覚色空間での色の索引とテーマの類似検索を提供します。
+"""
+
+from .bundle import ThemeBundle, scan_bundle
+from .color_index import ColorIndex, ThemeSimilarityIndex
+from .compiled import CompiledTheme, as_compiled_theme, resolve_roles
+from .history import PersistentMap, ThemeEditHistory
+from .pack import (
+    PACK_SUFFIX,
+    ThemePack,
+    ThemePackError,
+    json_to_pack,
+    pack_to_json,
+    read_pack,
+    write_pack,
+)
+from .watcher import ThemeChanges, ThemeFileTracker, ThemeFileWatcher, list_theme_files
+
+__all__ = [
+    "PACK_SUFFIX",
+    "ColorIndex",
+    "CompiledTheme",
+    "PersistentMap",
+    "ThemeBundle",
+    "ThemeChanges",
+    "ThemeEditHistory",
+    "ThemeFileTracker",
+    "ThemeFileWatcher",
+    "ThemePack",
+    "ThemePackError",
+    "ThemeSimilarityIndex",
+    "as_compiled_theme",
+    "json_to_pack",
+    "list_theme_files",
+    "pack_to_json",
+    "read_pack",
+    "resolve_roles",
+    "scan_bundle",
+    "write_pack",
+]
@@ -0,0 +1,448 @@
+"""
+テーマバンドル
+
+"available_themes"に複数のテーマを格納したバンドルファイルを遅延読み込みします。
+ファイル全体を解析する代わりに、mmap上をストリーミング走査して
+テーマ名 → バイト範囲の索引を作成・キャッシュし、テーマは選択時に個別に解析します。
+"""
+
+import json
+import mmap
+import os
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from qt_theme_studio.logger import get_logger
+
+BUNDLE_KEY = "available_themes"
+
+# 索引ファイルの形式バージョン(形式を変更した場合は更新する)
+INDEX_VERSION = 1
+
+# 索引ファイルを保存する最小のファイルサイズ(これ未満は一括で解析した方が速い)
+LAZY_BUNDLE_MIN_SIZE = 1024 * 1024
+
+# JSON文字列(エスケープを考慮)
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+# JSONの文字列と構造文字のみを抽出するトークン(数値・リテラル・空白は読み飛ばす)
+_TOKEN_RE = re.compile(_STRING + rb"|[{}\[\],]")
+
+# 一括で読み飛ばすオブジェクトの最大入れ子数(これより深い場合は1トークンずつ処理)
+MAX_OBJECT_NESTING = 8
+
+
+def _build_object_pattern(nesting: int, capture: bytes = b"") -> bytes:
+    """入れ子数に上限のあるJSONオブジェクト全体に一致するパターンを構築
+
+    各繰り返しの選択肢が先頭文字で一意に決まる形にしているため、
+    一致しない場合も指数的なバックトラックは発生しません。
+
+    Args:
+        nesting: 入れ子数の上限
+        capture: 直下の値を取得するキー(グループ1に値の文字列が一致する)
+    """
+    pattern = rb'\{[^{}"]*(?:' + _STRING + rb'[^{}"]*)*\}'
+    for level in range(1, nesting):
+        choices = _STRING + rb"|" + pattern
+        if capture and level == nesting - 1:
+            # 直下のキーのみを捕捉する(入れ子のオブジェクトは内側のパターンが消費する)
+            choices = capture + rb"\s*:\s*(" + _STRING + rb")|" + choices
+        pattern = rb'\{[^{}"]*(?:(?:' + choices + rb')[^{}"]*)*\}'
+    return pattern
+
+
+def _build_braced_pattern(nesting: int) -> bytes:
+    """文字列を考慮せず、括弧の対応のみで入れ子数に上限のあるオブジェクトに一致するパターン"""
+    pattern = rb"\{[^{}]*\}"
+    for _ in range(1, nesting):
+        pattern = rb"\{[^{}]*(?:" + pattern + rb"[^{}]*)*\}"
+    return pattern
+
+
+_DISPLAY_NAME_TOKEN = b'"display_name"'
+
+_OBJECT_RE = re.compile(_build_object_pattern(MAX_OBJECT_NESTING))
+# テーマ全体に一致し、直下の"display_name"の値を同じ走査で取得する(グループ1)
+_THEME_RE = re.compile(
+    _build_object_pattern(MAX_OBJECT_NESTING, capture=_DISPLAY_NAME_TOKEN)
+)
+# バンドル内の「"テーマ名": {テーマ}」の1項目(グループ: 名前・テーマ・表示名)
+_ITEM_RE = re.compile(
+    rb"\s*(" + _STRING + rb")\s*:\s*(" + _THEME_RE.pattern + rb")\s*(?:,|(?=\}))"
+)
+
+# 以下は文字列にエスケープも括弧も含まないテーマ(ほとんどのテーマ)用。
+# 括弧の対応をbytes.find()で辿り、正規表現で文字列を1つずつ照合する処理を省く
+_PLAIN_KEY_RE = re.compile(rb'\s*"([^"\\]*)"\s*:\s*(?=\{)')
+_ITEM_SEPARATOR_RE = re.compile(rb"\s*(?:,|(?=\}))")
+# 引用符と括弧以外を削除する変換(文字列内の括弧の検出用)と、一度に変換するバイト数
+_NON_STRUCTURE_BYTES = bytes(c for c in range(256) if c not in b'"{}')
+_TRANSLATE_CHUNK_SIZE = 1024 * 1024
+# 直下の"display_name"の値(グループ1、引用符を除く)。入れ子のオブジェクトは括弧の対応のみで読み飛ばす
+_PLAIN_DISPLAY_NAME_RE = re.compile(
+    rb'\{[^{}"]*(?:(?:"(?!display_name")[^"]*"|'
+    + _build_braced_pattern(MAX_OBJECT_NESTING - 1)
+    + rb')[^{}"]*)*"display_name"\s*:\s*"([^"]*)"'
+)
+
+_BUNDLE_KEY_TOKEN = json.dumps(BUNDLE_KEY).encode("utf-8")
+
+_OPEN_OBJECT = ord("{")
+_OPEN_ARRAY = ord("[")
+_CLOSE_OBJECT = ord("}")
+_CLOSE_ARRAY = ord("]")
+_COMMA = ord(",")
+_QUOTE = ord('"')
+
+
+class BundleEntry:
+    """バンドル内の1テーマの索引項目"""
+
+    __slots__ = ("display_name", "end", "name", "start")
+
+    def __init__(self, name: str, display_name: str, start: int, end: int) -> None:
+        self.name = name
+        self.display_name = display_name
+        self.start = start
+        self.end = end
+
+    def to_list(self) -> list[Any]:
+        """索引ファイル用のリスト表現"""
+        return [self.name, self.display_name, self.start, self.end]
+
+
+def _decode_string(token: bytes) -> str:
+    """JSON文字列のトークンを復号(エスケープを含まない場合はjson.loadsを省略)"""
+    if b"\\" in token:
+        return json.loads(token)
+    return token[1:-1].decode("utf-8")
+
+
+def _has_plain_strings(data: Union[bytes, mmap.mmap]) -> bool:
+    """文字列がエスケープも括弧も含まない(括弧がすべて構造文字である)かどうか
+
+    引用符と括弧のみを残し、隣り合う引用符の対を除いて引用符が残らなければ、
+    どの括弧も引用符の対の外にあります。mmapを一度に複製しないよう分割して変換します。
+    """
+    if data.find(b"\\") >= 0:
+        return False
+    structure = b"".join(
+        data[i : i + _TRANSLATE_CHUNK_SIZE].translate(None, _NON_STRUCTURE_BYTES)
+        for i in range(0, len(data), _TRANSLATE_CHUNK_SIZE)
+    )
+    return b'"' not in structure.replace(b'""', b"")
+
+
+def _find_object_end(data: Union[bytes, mmap.mmap], start: int) -> int:
+    """文字列を考慮せず、startの"{"に対応する"}"の直後の位置を取得(なければ-1)"""
+    find = data.find
+    depth = 1
+    opened = find(b"{", start + 1)
+    close = find(b"}", start + 1)
+    while close >= 0:
+        if 0 <= opened < close:
+            depth += 1
+            opened = find(b"{", opened + 1)
+            continue
+        depth -= 1
+        if not depth:
+            return close + 1
+        close = find(b"}", close + 1)
+    return -1
+
+
+def _match_plain_item(
+    data: Union[bytes, mmap.mmap], pos: int, plain_strings: bool
+) -> Optional[tuple[BundleEntry, int]]:
+    """文字列にエスケープも括弧も含まない項目を照合(索引項目と項目の直後の位置)
+
+    Args:
+        data: JSONのバイト列
+        pos: 項目の先頭の位置
+        plain_strings: data全体で_has_plain_strings()を確認済みかどうか
+            (Falseの場合はテーマごとに確認する)
+    """
+    key = _PLAIN_KEY_RE.match(data, pos)
+    if key is None:
+        return None
+    start = key.end()
+    end = _find_object_end(data, start)
+    if end < 0 or (not plain_strings and not _has_plain_strings(data[start:end])):
+        return None
+    separator = _ITEM_SEPARATOR_RE.match(data, end)
+    if separator is None:
+        return None
+    name = key.group(1).decode("utf-8")
+    display = _PLAIN_DISPLAY_NAME_RE.match(data, start, end)
+    if display is not None:
+        display_name = display.group(1).decode("utf-8")
+    elif data.find(_DISPLAY_NAME_TOKEN, start, end) < 0:
+        display_name = name
+    else:
+        return None
+    return BundleEntry(name, display_name, start, end), separator.end()
+
+
+def _scan_bundle_items(
+    data: Union[bytes, mmap.mmap], pos: int, entries: list[BundleEntry]
+) -> int:
+    """バンドル内のテーマを項目単位で走査し、照合できた位置の直後を返す
+
+    オブジェクト以外の値や入れ子の深いテーマなど照合できない項目の手前で止まり、
+    以降はscan_bundle()が1トークンずつ処理します。
+    """
+    plain_strings = _has_plain_strings(data)
+    while True:
+        plain = _match_plain_item(data, pos, plain_strings)
+        if plain is not None:
+            entry, pos = plain
+            entries.append(entry)
+            continue
+        item = _ITEM_RE.match(data, pos)
+        if item is None:
+            return pos
+        name = _decode_string(item.group(1))
+        display_token = item.group(3)
+        display_name = _decode_string(display_token) if display_token else name
+        entries.append(BundleEntry(name, display_name, item.start(2), item.end(2)))
+        pos = item.end()
+
+
+def scan_bundle(data: Union[bytes, mmap.mmap]) -> Optional[list[BundleEntry]]:
+    """JSONバイト列を走査し、"available_themes"内の各テーマのバイト範囲を取得
+
+    JSON全体は解析せず、文字列と括弧の対応のみを追跡します。
+    テーマなどのオブジェクトは括弧の対応をbytes.find()で辿るか正規表現で一括して
+    読み飛ばし、表示名も同じ走査で取得します(各テーマのバイト列を再走査しない)。
+    オブジェクト以外の値を持つテーマは索引に含めません。
+
+    Args:
+        data: JSONのバイト列(mmapも可)
+
+    Returns:
+        Optional[list[BundleEntry]]: 索引項目(バンドル形式でない場合はNone)
+    """
+    # スタックの各要素: [オブジェクトかどうか, 直近のキー, キー待ちかどうか]
+    stack: list[list[Any]] = []
+    entries: Optional[list[BundleEntry]] = None
+    theme_start = -1
+    # 1トークンずつ処理しているテーマの表示名のトークン
+    theme_display_name: Optional[bytes] = None
+    pos = 0
+
+    def add_entry(start: int, end: int, display_token: Optional[bytes]) -> None:
+        name = _decode_string(stack[1][1])
+        display_name = _decode_string(display_token) if display_token else name
+        entries.append(BundleEntry(name, display_name, start, end))
+
+    while True:
+        match = _TOKEN_RE.search(data, pos)
+        if match is None:
+            break
+        pos = match.end()
+        char = data[match.start()]
+
+        if char == _QUOTE:
+            if stack and stack[-1][0] and stack[-1][2]:
+                stack[-1][1] = match.group()
+                stack[-1][2] = False
+            elif (
+                len(stack) == 3
+                and theme_start >= 0
+                and stack[-1][1] == _DISPLAY_NAME_TOKEN
+            ):
+                theme_display_name = match.group()
+        elif char in (_OPEN_OBJECT, _OPEN_ARRAY):
+            is_object = char == _OPEN_OBJECT
+            depth = len(stack)
+            in_bundle = depth == 2 and stack[0][1] == _BUNDLE_KEY_TOKEN and stack[1][0]
+            if depth == 1 and is_object and stack[0][1] == _BUNDLE_KEY_TOKEN:
+                entries = []
+                stack.append([True, None, True])
+                pos = _scan_bundle_items(data, pos, entries)
+                continue
+            if depth >= 1 and is_object:
+                whole = (_THEME_RE if in_bundle else _OBJECT_RE).match(
+                    data, match.start()
+                )
+                if whole is not None:
+                    pos = whole.end()
+                    if in_bundle:
+                        add_entry(match.start(), pos, whole.group(1))
+                    continue
+                if in_bundle:
+                    theme_start = match.start()
+                    theme_display_name = None
+            stack.append([is_object, None, is_object])
+        elif char in (_CLOSE_OBJECT, _CLOSE_ARRAY):
+            if not stack:
+                break
+            stack.pop()
+            if len(stack) == 2 and theme_start >= 0:
+                add_entry(theme_start, pos, theme_display_name)
+                theme_start = -1
+            elif not stack:
+                break
+        elif char == _COMMA and stack and stack[-1][0]:
+            stack[-1][2] = True
+
+    return entries
+
+
+class ThemeBundle:
+    """複数テーマを格納したバンドルファイルの遅延リーダー
+
+    構築時に索引のみを用意し(索引ファイルが最新ならそれを使用)、
+    テーマ本体はload_theme()で要求されたものだけを解析します。
+    LAZY_BUNDLE_MIN_SIZE以上のバンドルのみ、索引ファイルをバンドルと同じディレクトリに
+    ".<ファイル名>.index.json"として保存し、ファイルサイズと更新時刻で有効性を判定します。
+    """
+
+    def __init__(self, path: Union[str, Path], use_index_file: bool = True) -> None:
+        """バンドルを開いて索引を用意
+
+        Args:
+            path: バンドルファイルのパス
+            use_index_file: 索引ファイルを読み書きするかどうか
+
+        Raises:
+            OSError: ファイルにアクセスできない場合
+        """
+        self.path = Path(path)
+        self.use_index_file = use_index_file
+        self.logger = get_logger()
+        self._entries: dict[str, BundleEntry] = {}
+        self._is_bundle = False
+        self._signature: tuple[int, int] = (-1, -1)
+        self._load_index()
+
+    @property
+    def index_path(self) -> Path:
+        """索引ファイルのパス"""
+        return self.path.with_name(f".{self.path.name}.index.json")
+
+    @property
+    def is_bundle(self) -> bool:
+        """バンドル形式("available_themes"を持つ)かどうか"""
+        return self._is_bundle
+
+    def names(self) -> list[str]:
+        """テーマ名の一覧(ファイル内の順序)"""
+        return list(self._entries)
+
+    def display_name(self, name: str) -> str:
+        """テーマの表示名を取得
+
+        Raises:
+            KeyError: バンドルにテーマがない場合
+        """
+        return self._entries[name].display_name
+
+    def load_theme(self, name: str) -> dict[str, Any]:
+        """テーマを1件だけ読み込んで解析
+
+        索引作成後にファイルが変更されていた場合は索引を作り直します。
+
+        Args:
+            name: テーマ名
+
+        Returns:
+            dict[str, Any]: テーマデータ
+
+        Raises:
+            KeyError: バンドルにテーマがない場合
+            json.JSONDecodeError: テーマ部分のJSONが不正な場合
+        """
+        if self._stat_signature() != self._signature:
+            self.logger.debug(f"バンドルが変更されたため索引を再作成: {self.path}")
+            self._load_index()
+
+        entry = self._entries[name]
+        with self.path.open("rb") as f:
+            f.seek(entry.start)
+            return json.loads(f.read(entry.end - entry.start))
+
+    def load_all(self) -> dict[str, dict[str, Any]]:
+        """全テーマを読み込んで解析"""
+        return {name: self.load_theme(name) for name in self._entries}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def _stat_signature(self) -> tuple[int, int]:
+        """ファイルサイズと更新時刻(ns)"""
+        stat = self.path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load_index(self) -> None:
+        """索引ファイルを読み込み、古い・存在しない場合は走査して作成"""
+        signature = self._stat_signature()
+        persist = self.use_index_file and signature[0] >= LAZY_BUNDLE_MIN_SIZE
+        index = self._read_index_file(signature) if persist else None
+
+        if index is None:
+            with self.logger.performance_timer("theme.bundle_index"):
+                entries = self._scan_file(signature[0])
+            index = (entries is not None, entries or [])
+            if persist and index[0]:
+                self._write_index_file(signature, *index)
+
+        self._signature = signature
+        self._is_bundle = index[0]
+        self._entries = {entry.name: entry for entry in index[1]}
+
+    def _scan_file(self, size: int) -> Optional[list[BundleEntry]]:
+        """mmap上でバンドルファイルを走査"""
+        if size == 0:
+            return None
+        with self.path.open("rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with mapped:
+            return scan_bundle(mapped)
+
+    def _read_index_file(
+        self, signature: tuple[int, int]
+    ) -> Optional[tuple[bool, list[BundleEntry]]]:
+        """有効な索引ファイルがあれば(バンドル形式かどうか, 索引項目)を返す"""
+        try:
+            with self.index_path.open(encoding="utf-8") as f:
+                index = json.load(f)
+            if (
+                index.get("version") != INDEX_VERSION
+                or index.get("size") != signature[0]
+                or index.get("mtime_ns") != signature[1]
+            ):
+                return None
+            entries = [BundleEntry(*item) for item in index["themes"]]
+            return bool(index["is_bundle"]), entries
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+
+    def _write_index_file(
+        self, signature: tuple[int, int], is_bundle: bool, entries: list[BundleEntry]
+    ) -> None:
+        """索引ファイルを保存(書き込めない場合はメモリ上の索引のみ使用)"""
+        index = {
+            "version": INDEX_VERSION,
+            "size": signature[0],
+            "mtime_ns": signature[1],
+            "is_bundle": is_bundle,
+            "themes": [entry.to_list() for entry in entries],
+        }
+        temp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}")
+        try:
+            with temp_path.open("w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False)
+            temp_path.replace(self.index_path)
+        except OSError as e:
+            self.logger.debug(f"バンドル索引を保存できませんでした: {e}")
+            temp_path.unlink(missing_ok=True)
@@ -0,0 +1,656 @@
+"""
+知覚色空間での色とテーマの索引
+
+テーマライブラリの色をCIE L*a*b*色空間へ一度だけ変換して連続した配列に格納し、
+格子(グリッド)索引で最近傍・半径内の色を検索します。色差はCIE76のΔEです。
+近似重複の色のまとめと、ロールの色差によるテーマの類似検索
+(テーマ数が多い場合はLSHのバケットで候補を絞り込む)を提供します。
+NumPyが必要です(pip install qt-theme-studio[optimize])。
+"""
+
+import math
+import re
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from typing import Any, Optional
+
+from qt_theme_studio.logger import get_logger
+from qt_theme_studio.utilities.color_math import (
+    DEFAULT_DELTA_E,
+    import_numpy,
+    srgb_to_lab,
+)
+from qt_theme_studio.utilities.metrics import get_metrics_registry
+
+from .compiled import collect_colors, resolve_roles
+
+# 格子索引のセルの一辺(ΔE)
+DEFAULT_CELL_SIZE = 8.0
+
+# テーマの類似度を比較するロール
+SIMILARITY_ROLES = (
+    "background",
+    "text",
+    "primary",
+    "accent",
+    "border",
+    "button_background",
+    "button_text",
+    "input_background",
+    "selection_background",
+    "disabled_text",
+)
+
+# LSHで候補を絞り込むテーマ数の下限(これより少ない場合は全件を比較する)。
+# 全件の比較は20万テーマで約25msのため、それ以下では近似を用いない
+LSH_THRESHOLD = 200_000
+
+# LSHのハッシュ表の数、1つの表のハッシュ関数の数、バケットの幅(ロールあたりのΔE)
+LSH_TABLES = 12
+LSH_HASHES = 4
+LSH_BUCKET_DELTA_E = 24.0
+
+# LSHの候補を採用するk番目の色差の上限(バケットの幅に対する割合)。
+# これより遠い候補しか見つからない場合は、より近いテーマを見落としている
+# 可能性が高いため全件を比較する
+LSH_RELIABLE_FRACTION = 0.5
+
+# 解析結果を保持する色値の数(テーマライブラリでは同じ色値が繰り返し使用される)
+PARSE_CACHE_SIZE = 1 << 16
+
+_HEX_COLOR_RE = re.compile(r"#([0-9a-f]{3}|[0-9a-f]{6}|[0-9a-f]{8})")
+_RGB_FUNCTION_RE = re.compile(
+    r"rgba?\(\s*([\d.]+%?)\s*,\s*([\d.]+%?)\s*,\s*([\d.]+%?)\s*(?:,\s*[\d.]+%?\s*)?\)",
+    re.IGNORECASE,
+)
+
+# 基本色名 → RGB(validators.theme_schemaで有効な色名。transparentは除く)
+_NAMED_RGB = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "green": (0, 128, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "gray": (128, 128, 128),
+    "grey": (128, 128, 128),
+    "darkgray": (169, 169, 169),
+    "darkgrey": (169, 169, 169),
+    "lightgray": (211, 211, 211),
+    "lightgrey": (211, 211, 211),
+}
+
+
+def parse_color(value: Any) -> Optional[tuple[int, int, int]]:
+    """色値をRGBへ変換(不透明度は無視、解釈できない場合はNone)
+
+    #RGB/#RRGGBB/#RRGGBBAA、rgb()/rgba()、基本色名を受け付けます。
+    """
+    if not isinstance(value, str):
+        return None
+    return _parse_color_text(value)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_color_text(value: str) -> Optional[tuple[int, int, int]]:
+    text = value.strip().lower()
+    match = _HEX_COLOR_RE.fullmatch(text)
+    if match is not None:
+        digits = match.group(1)
+        if len(digits) == 3:
+            digits = "".join(digit * 2 for digit in digits)
+        number = int(digits[:6], 16)
+        return (number >> 16, (number >> 8) & 0xFF, number & 0xFF)
+
+    match = _RGB_FUNCTION_RE.fullmatch(text)
+    if match is not None:
+        channels = []
+        for component in match.groups():
+            if component.endswith("%"):
+                channel = float(component[:-1]) * 2.55
+            else:
+                channel = float(component)
+            channels.append(min(255, max(0, round(channel))))
+        return (channels[0], channels[1], channels[2])
+    return _NAMED_RGB.get(text)
+
+
+def _to_lab(np: Any, rgb: Any) -> Any:
+    """RGBの配列(N, 3)をL*a*b*の連続した配列(float64)へ変換"""
+    rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+    return np.ascontiguousarray(srgb_to_lab(rgb), dtype=np.float64)
+
+
+def _iter_color_values(
+    colors: Mapping[str, Any], prefix: str = ""
+) -> Iterable[tuple[str, Any]]:
+    """色設定の(キー, 色値)を列挙(入れ子の設定は"."で連結したキーとする)"""
+    for key, value in colors.items():
+        if isinstance(value, Mapping):
+            yield from _iter_color_values(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}", value
+
+
+class ColorMatch:
+    """色の検索結果
+
+    colorは正規化した色(#rrggbb形式)、distanceは検索した色との色差(ΔE)、
+    usagesはその色を使用している(テーマ名, 色キー)の一覧です。
+    """
+
+    __slots__ = ("color", "distance", "usages")
+
+    def __init__(
+        self, color: str, distance: float, usages: list[tuple[str, str]]
+    ) -> None:
+        self.color = color
+        self.distance = distance
+        self.usages = usages
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "color": self.color,
+            "distance": round(self.distance, 3),
+            "usages": [list(usage) for usage in self.usages],
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ColorMatch({self.color!r}, distance={self.distance:.2f}, "
+            f"usages={len(self.usages)})"
+        )
+
+
+class ColorIndex:
+    """テーマライブラリの色の格子索引
+
+    同じ色は1点にまとめ、L*a*b*の座標を連続した配列に格納します。
+    点はセル番号の順に並べ、セル番号の二分探索で近傍のセルの点を取得します。
+    """
+
+    __slots__ = (
+        "_cell_ids",
+        "_cell_size",
+        "_cell_starts",
+        "_grid_origin",
+        "_grid_shape",
+        "_lab",
+        "_usages",
+        "colors",
+    )
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[str, str, Any]],
+        cell_size: float = DEFAULT_CELL_SIZE,
+    ) -> None:
+        """色の索引を構築
+
+        Args:
+            entries: (テーマ名, 色キー, 色値)の一覧(解釈できない色値は無視)
+            cell_size: 格子のセルの一辺(ΔE)
+
+        Raises:
+            ImportError: NumPyがインストールされていない場合
+            ValueError: cell_sizeが正でない場合
+        """
+        if cell_size <= 0:
+            raise ValueError("cell_sizeには正の値を指定してください")
+        np = import_numpy("optimize", "色の索引")
+        with get_metrics_registry().time("color_index.build"):
+            usages_by_rgb: dict[tuple[int, int, int], list[tuple[str, str]]] = {}
+            for theme_name, key, value in entries:
+                rgb = parse_color(value)
+                if rgb is not None:
+                    usages_by_rgb.setdefault(rgb, []).append((theme_name, key))
+
+            rgb_array = np.array(list(usages_by_rgb), dtype=np.uint8).reshape(-1, 3)
+            lab = _to_lab(np, rgb_array)
+            cells = np.floor(lab / cell_size).astype(np.int64)
+            origin = cells.min(axis=0) if len(cells) else np.zeros(3, np.int64)
+            shape = (
+                cells.max(axis=0) - origin + 1 if len(cells) else np.ones(3, np.int64)
+            )
+            cell_ids = self._encode(cells - origin, shape)
+
+            # セル番号の順に並べ、各セルの点の範囲を記録する
+            order = np.argsort(cell_ids, kind="stable")
+            sorted_ids = cell_ids[order]
+            unique_ids, starts = np.unique(sorted_ids, return_index=True)
+            names = ["#{:02x}{:02x}{:02x}".format(*rgb) for rgb in usages_by_rgb]
+            usage_lists = list(usages_by_rgb.values())
+
+            self._cell_size = float(cell_size)
+            self._grid_origin = origin
+            self._grid_shape = shape
+            self._lab = np.ascontiguousarray(lab[order])
+            self._cell_ids = unique_ids
+            self._cell_starts = np.append(starts, len(order))
+            self.colors = [names[index] for index in order.tolist()]
+            self._usages = [usage_lists[index] for index in order.tolist()]
+
+        get_logger().info(
+            f"色の索引を構築しました: {len(self.colors)}色 "
+            f"(使用箇所 {sum(len(usages) for usages in self._usages)}件, "
+            f"セル {len(unique_ids)}個)"
+        )
+
+    @classmethod
+    def from_themes(
+        cls,
+        themes: Mapping[str, Mapping[str, Any]],
+        cell_size: float = DEFAULT_CELL_SIZE,
+    ) -> "ColorIndex":
+        """テーマ名 → テーマデータから、全テーマの色設定の索引を構築
+
+        QSS・CSSから読み込んだテーマの"color_N"の色も対象とします。
+        """
+        return cls(
+            (
+                (theme_name, key, value)
+                for theme_name, theme_data in themes.items()
+                for key, value in _iter_color_values(collect_colors(theme_data))
+            ),
+            cell_size,
+        )
+
+    @staticmethod
+    def _encode(cells: Any, shape: Any) -> Any:
+        """格子の座標(原点からの相対値)をセル番号へ変換"""
+        return (cells[..., 0] * shape[1] + cells[..., 1]) * shape[2] + cells[..., 2]
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    def _query_lab(self, color: Any) -> Any:
+        """検索する色をL*a*b*の座標へ変換"""
+        rgb = parse_color(color)
+        if rgb is None:
+            raise ValueError(f"色値を解釈できません: {color}")
+        return _to_lab(import_numpy("optimize", "色の索引"), [rgb])[0]
+
+    def _points_in_box(self, lower: Any, upper: Any) -> Any:
+        """格子の座標の範囲[lower, upper]にあるセルの点の番号を取得"""
+        np = import_numpy("optimize", "色の索引")
+        lower = np.maximum(lower - self._grid_origin, 0)
+        upper = np.minimum(upper - self._grid_origin, self._grid_shape - 1)
+        if (upper < lower).any():
+            return np.zeros(0, dtype=np.intp)
+        if np.prod(upper - lower + 1) >= len(self._cell_ids):
+            # 範囲が格子のほぼ全体を覆う場合は全点を対象とする
+            return np.arange(len(self.colors))
+
+        axes = [np.arange(low, high + 1) for low, high in zip(lower, upper)]
+        grid = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+        wanted = self._encode(grid, self._grid_shape)
+        positions = np.searchsorted(self._cell_ids, wanted)
+        inside = positions < len(self._cell_ids)
+        positions = positions[inside]
+        positions = positions[self._cell_ids[positions] == wanted[inside]]
+        if len(positions) == 0:
+            return np.zeros(0, dtype=np.intp)
+        return np.concatenate(
+            [
+                np.arange(self._cell_starts[position], self._cell_starts[position + 1])
+                for position in positions
+            ]
+        )
+
+    def _matches(self, indices: Any, distances: Any) -> list[ColorMatch]:
+        order = import_numpy("optimize", "色の索引").argsort(distances, kind="stable")
+        return [
+            ColorMatch(
+                self.colors[indices[i]],
+                float(distances[i]),
+                list(self._usages[indices[i]]),
+            )
+            for i in order
+        ]
+
+    def within(self, color: Any, radius: float) -> list[ColorMatch]:
+        """色差がradius以下の色を近い順に取得
+
+        Args:
+            color: 検索する色
+            radius: 色差の上限(ΔE)
+
+        Raises:
+            ValueError: 色値を解釈できない場合
+        """
+        np = import_numpy("optimize", "色の索引")
+        query = self._query_lab(color)
+        indices = self._points_in_box(
+            np.floor((query - radius) / self._cell_size).astype(np.int64),
+            np.floor((query + radius) / self._cell_size).astype(np.int64),
+        )
+        distances = np.sqrt(((self._lab[indices] - query) ** 2).sum(axis=1))
+        inside = distances <= radius
+        return self._matches(indices[inside], distances[inside])
+
+    def nearest(self, color: Any, k: int = 1) -> list[ColorMatch]:
+        """最も近いk色を近い順に取得
+
+        検索する色のセルから周囲へ範囲を広げてk色以上の候補を集め、
+        k番目の候補の色差を半径とする検索で確定します。
+
+        Raises:
+            ValueError: 色値を解釈できない場合
+        """
+        np = import_numpy("optimize", "色の索引")
+        if k <= 0 or not self.colors:
+            return []
+        query = self._query_lab(color)
+        center = np.floor(query / self._cell_size).astype(np.int64)
+        reach = 0
+        while True:
+            indices = self._points_in_box(center - reach, center + reach)
+            if len(indices) >= min(k, len(self.colors)):
+                break
+            reach += 1
+
+        distances = np.sqrt(((self._lab[indices] - query) ** 2).sum(axis=1))
+        count = min(k, len(distances))
+        radius = float(np.partition(distances, count - 1)[count - 1])
+        if radius > reach * self._cell_size:
+            # 集めた範囲の外により近い色がある可能性がある場合は半径で検索し直す
+            return self.within(color, radius)[:k]
+        return self._matches(indices, distances)[:k]
+
+    def duplicate_groups(self, radius: float = DEFAULT_DELTA_E) -> list[list[str]]:
+        """色差がradius以下で連なる色をまとめた近似重複のグループを取得
+
+        各グループは使用箇所の多い順の色(#rrggbb形式)で、
+        先頭の色をグループの代表色として統合できます。
+        グループは色数の多い順に並べます。
+
+        Args:
+            radius: 同じ色とみなす色差の上限(ΔE、既定値は知覚できる最小の色差)
+        """
+        np = import_numpy("optimize", "色の索引")
+        parents = list(range(len(self.colors)))
+
+        def find(index: int) -> int:
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        reach = max(1, math.ceil(radius / self._cell_size))
+        with get_metrics_registry().time("color_index.duplicates"):
+            for position in range(len(self._cell_ids)):
+                start = self._cell_starts[position]
+                stop = self._cell_starts[position + 1]
+                cell = self._decode(self._cell_ids[position])
+                neighbors = self._points_in_box(
+                    cell - reach + self._grid_origin, cell + reach + self._grid_origin
+                )
+                # 各組を一度だけ比較するため、番号の大きい点のみを相手にする
+                neighbors = neighbors[neighbors >= start]
+                block = self._lab[start:stop]
+                distances = np.sqrt(
+                    ((block[:, None, :] - self._lab[neighbors][None, :, :]) ** 2).sum(
+                        axis=2
+                    )
+                )
+                rows, columns = np.nonzero(distances <= radius)
+                for row, column in zip(rows.tolist(), columns.tolist()):
+                    first, second = find(start + row), find(int(neighbors[column]))
+                    if first != second:
+                        parents[second] = first
+
+        groups: dict[int, list[int]] = {}
+        for index in range(len(self.colors)):
+            groups.setdefault(find(index), []).append(index)
+        result = [
+            [
+                self.colors[index]
+                for index in sorted(
+                    members, key=lambda index: (-len(self._usages[index]), index)
+                )
+            ]
+            for members in groups.values()
+            if len(members) > 1
+        ]
+        result.sort(key=len, reverse=True)
+        return result
+
+    def _decode(self, cell_id: int) -> Any:
+        """セル番号を格子の座標(原点からの相対値)へ変換"""
+        np = import_numpy("optimize", "色の索引")
+        plane = int(self._grid_shape[1] * self._grid_shape[2])
+        return np.array(
+            [
+                cell_id // plane,
+                cell_id % plane // int(self._grid_shape[2]),
+                cell_id % int(self._grid_shape[2]),
+            ],
+            dtype=np.int64,
+        )
+
+
+def theme_role_colors(theme_data: Mapping[str, Any]) -> list[Optional[str]]:
+    """テーマの類似度の比較に使用するロールの色を取得
+
+    ロールの色キーを持たないテーマ(QSS・CSSから抽出した"color_N"のみのテーマ)は、
+    色を明度順に並べてロールの数に標本化します。
+    これらのテーマ同士は配色の明暗の分布で比較されます。
+    """
+    colors = collect_colors(theme_data)
+    if any(role in colors for role in SIMILARITY_ROLES):
+        roles = resolve_roles(colors)
+        return [roles[role] for role in SIMILARITY_ROLES]
+
+    palette = [
+        rgb
+        for _key, value in _iter_color_values(colors)
+        if (rgb := parse_color(value)) is not None
+    ]
+    if not palette:
+        roles = resolve_roles(colors)
+        return [roles[role] for role in SIMILARITY_ROLES]
+    palette.sort(key=lambda rgb: 0.2126 * rgb[0] + 0.7152 * rgb[1] + 0.0722 * rgb[2])
+    count = len(SIMILARITY_ROLES)
+    return [
+        "#{:02x}{:02x}{:02x}".format(*palette[position * len(palette) // count])
+        for position in range(count)
+    ]
+
+
+def _role_rgb(
+    theme_data: Mapping[str, Any], defaults: Mapping[str, str]
+) -> list[tuple[int, int, int]]:
+    """ロールの色のRGB(解釈できない色はロールの既定の色)"""
+    return [
+        parse_color(color) or parse_color(defaults[role]) or (0, 0, 0)
+        for role, color in zip(SIMILARITY_ROLES, theme_role_colors(theme_data))
+    ]
+
+
+class ThemeMatch:
+    """テーマの類似検索の結果(distanceはロールあたりの色差の二乗平均平方根)"""
+
+    __slots__ = ("distance", "name")
+
+    def __init__(self, name: str, distance: float) -> None:
+        self.name = name
+        self.distance = distance
+
+    def __repr__(self) -> str:
+        return f"ThemeMatch({self.name!r}, distance={self.distance:.2f})"
+
+
+class ThemeSimilarityIndex:
+    """ロールの色差によるテーマの類似検索
+
+    各テーマのロールの色をL*a*b*で連結したベクトルを行列に格納し、
+    色差をまとめて計算します。テーマ数がlsh_threshold以上の場合は、
+    p-stable LSH(乱数の射影を幅bucket_widthで量子化したハッシュ)の
+    いずれかの表で同じバケットに入るテーマのみを候補として比較します。
+    LSHの結果は近似で、似たテーマの集まりがあるライブラリでは上位10件の
+    約95%が全件比較と一致します。k番目の候補の色差がバケットの幅の
+    LSH_RELIABLE_FRACTION倍を超える場合は全件を比較します。
+    解釈できないロールの色は、そのロールの既定の色として扱います。
+    """
+
+    __slots__ = (
+        "_bucket_keys",
+        "_bucket_orders",
+        "_mixers",
+        "_offsets",
+        "_positions",
+        "_projections",
+        "_vectors",
+        "bucket_width",
+        "lsh_threshold",
+        "names",
+    )
+
+    def __init__(
+        self,
+        themes: Mapping[str, Mapping[str, Any]],
+        lsh_threshold: int = LSH_THRESHOLD,
+        bucket_width: Optional[float] = None,
+        seed: int = 0,
+    ) -> None:
+        """テーマの類似検索の索引を構築
+
+        Args:
+            themes: テーマ名 → テーマデータ
+            lsh_threshold: LSHで候補を絞り込むテーマ数の下限
+            bucket_width: LSHのバケットの幅(省略時はロール数に応じた既定値)
+            seed: LSHの乱数のシード
+
+        Raises:
+            ImportError: NumPyがインストールされていない場合
+        """
+        np = import_numpy("optimize", "色の索引")
+        defaults = resolve_roles({})
+        with get_metrics_registry().time("theme_similarity.build"):
+            self.names = list(themes)
+            self._positions = {name: index for index, name in enumerate(self.names)}
+            rgb = np.array(
+                [_role_rgb(theme_data, defaults) for theme_data in themes.values()],
+                dtype=np.uint8,
+            ).reshape(-1, len(SIMILARITY_ROLES), 3)
+            self._vectors = np.ascontiguousarray(
+                srgb_to_lab(rgb).reshape(len(self.names), -1), dtype=np.float32
+            )
+
+            self.lsh_threshold = lsh_threshold
+            self.bucket_width = bucket_width or LSH_BUCKET_DELTA_E * math.sqrt(
+                len(SIMILARITY_ROLES)
+            )
+            rng = np.random.default_rng(seed)
+            dimensions = self._vectors.shape[1]
+            self._projections = rng.standard_normal(
+                (dimensions, LSH_TABLES * LSH_HASHES)
+            ).astype(np.float32)
+            self._offsets = rng.uniform(
+                0, self.bucket_width, LSH_TABLES * LSH_HASHES
+            ).astype(np.float32)
+            self._mixers = rng.integers(1, 2**61, LSH_HASHES, dtype=np.int64)
+            self._bucket_keys: list[Any] = []
+            self._bucket_orders: list[Any] = []
+            if len(self.names) >= lsh_threshold:
+                keys = self._hash(self._vectors)
+                for table in range(LSH_TABLES):
+                    order = np.argsort(keys[:, table], kind="stable")
+                    self._bucket_orders.append(order)
+                    self._bucket_keys.append(keys[order, table])
+
+        get_logger().info(
+            f"テーマの類似検索の索引を構築しました: {len(self.names)}テーマ "
+            f"(LSH: {'有効' if self._bucket_keys else '無効'})"
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _hash(self, vectors: Any) -> Any:
+        """ベクトル(N, 次元)から各ハッシュ表のバケットのキー(N, 表の数)を計算"""
+        np = import_numpy("optimize", "色の索引")
+        codes = np.floor(
+            (vectors @ self._projections + self._offsets) / self.bucket_width
+        ).astype(np.int64)
+        codes = codes.reshape(len(vectors), LSH_TABLES, LSH_HASHES)
+        # 整数のオーバーフローは折り返しとなり、ハッシュの混合として扱える
+        with np.errstate(over="ignore"):
+            return (codes * self._mixers).sum(axis=2)
+
+    def _candidates(self, vector: Any) -> Any:
+        """いずれかのハッシュ表で同じバケットに入るテーマの番号を取得"""
+        np = import_numpy("optimize", "色の索引")
+        keys = self._hash(vector[None, :])[0]
+        found = []
+        for table, key in enumerate(keys):
+            bucket_keys = self._bucket_keys[table]
+            start = np.searchsorted(bucket_keys, key, side="left")
+            stop = np.searchsorted(bucket_keys, key, side="right")
+            found.append(self._bucket_orders[table][start:stop])
+        return np.unique(np.concatenate(found))
+
+    def similar(self, theme_name: str, k: int = 10) -> list[ThemeMatch]:
+        """登録済みのテーマに似たテーマを似ている順に取得(自身は除く)
+
+        Raises:
+            KeyError: 未登録のテーマ名の場合
+        """
+        position = self._positions[theme_name]
+        return self._search(self._vectors[position], k, exclude=position)
+
+    def similar_to(
+        self, theme_data: Mapping[str, Any], k: int = 10
+    ) -> list[ThemeMatch]:
+        """テーマデータに似た登録済みのテーマを似ている順に取得"""
+        np = import_numpy("optimize", "色の索引")
+        rgb = np.array(_role_rgb(theme_data, resolve_roles({})), dtype=np.uint8)
+        return self._search(srgb_to_lab(rgb).reshape(-1).astype(np.float32), k)
+
+    def _distances(self, candidates: Any, vector: Any) -> Any:
+        """候補のテーマとの色差(ロールあたりの二乗平均平方根のΔE)を計算"""
+        np = import_numpy("optimize", "色の索引")
+        differences = self._vectors[candidates] - vector
+        return np.sqrt(
+            np.einsum("ij,ij->i", differences, differences) / len(SIMILARITY_ROLES)
+        )
+
+    def _search(
+        self, vector: Any, k: int, exclude: Optional[int] = None
+    ) -> list[ThemeMatch]:
+        np = import_numpy("optimize", "色の索引")
+        if k <= 0 or not self.names:
+            return []
+        with get_metrics_registry().time("theme_similarity.search"):
+            candidates = None
+            if self._bucket_keys:
+                candidates = self._candidates(vector)
+                if exclude is not None:
+                    candidates = candidates[candidates != exclude]
+                # 候補が足りない場合、またはk番目の候補が遠く見落としの可能性が
+                # 高い場合は全件を比較する
+                if len(candidates) < k:
+                    candidates = None
+                else:
+                    distances = self._distances(candidates, vector)
+                    reliable = self.bucket_width * LSH_RELIABLE_FRACTION
+                    kth = float(np.partition(distances, k - 1)[k - 1])
+                    if kth * math.sqrt(len(SIMILARITY_ROLES)) > reliable:
+                        candidates = None
+            if candidates is None:
+                candidates = np.arange(len(self.names))
+                if exclude is not None:
+                    candidates = candidates[candidates != exclude]
+                distances = self._distances(candidates, vector)
+
+            count = min(k, len(candidates))
+            if count == 0:
+                return []
+            nearest = np.argpartition(distances, count - 1)[:count]
+            nearest = nearest[np.lexsort((candidates[nearest], distances[nearest]))]
+        return [
+            ThemeMatch(self.names[candidates[index]], float(distances[index]))
+            for index in nearest
+        ]
@@ -0,0 +1,306 @@
+"""
+コンパイル済みテーマ
+
+テーマデータ(Qt-Theme-Studio形式またはqt-theme-manager形式)を一度だけ正規化し、
+全セマンティックロールの色解決・両形式への変換・内容ハッシュを事前計算した
+不変オブジェクトを提供します。
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Optional, Union
+
+# ロール名 → (参照する色キー, フォールバック)
+# フォールバックは先に定義されたロール名、または色値リテラル
+ROLE_FALLBACKS: dict[str, tuple[tuple[str, ...], str]] = {
+    "background": (("background",), "#ffffff"),
+    "text": (("text",), "#333333"),
+    "primary": (("primary",), "#007acc"),
+    "accent": (("accent",), "primary"),
+    "border": (("border",), "primary"),
+    "button_background": (("button_background",), "primary"),
+    "button_text": (("button_text",), "#ffffff"),
+    "button_hover": (("button_hover",), "accent"),
+    "button_pressed": (("button_pressed",), "primary"),
+    # ショーケースのボタンの押下色(既定はホバー色)
+    "showcase_button_pressed": (("button_pressed",), "button_hover"),
+    "button_border": (("button_border",), "primary"),
+    "disabled_background": (("disabled_background",), "#cccccc"),
+    "disabled_text": (("disabled_text",), "#666666"),
+    "disabled_border": (("disabled_border",), "#cccccc"),
+    "input_background": (("input_background",), "background"),
+    "input_text": (("input_text",), "text"),
+    "input_border": (("input_border",), "primary"),
+    "focus_border": (("focus_border", "accent"), "input_border"),
+    "selection_background": (("selection_background",), "primary"),
+    "selection_text": (("selection_text",), "#ffffff"),
+    # タブ・スクロールバー・プログレスバー・スライダーの下地(既定は淡い灰色)
+    "tab_background": (("input_background", "background"), "#f0f0f0"),
+    "scrollbar_background": (("scrollbar_background", "background"), "#f0f0f0"),
+    "scrollbar_handle": (("scrollbar_handle",), "primary"),
+    "scrollbar_handle_hover": (("scrollbar_handle_hover",), "accent"),
+    "progress_background": (("progress_background", "background"), "#f0f0f0"),
+    "progress_fill": (("progress_fill",), "primary"),
+    "slider_groove": (("slider_groove", "background"), "#f0f0f0"),
+    "slider_handle": (("slider_handle",), "primary"),
+    "slider_handle_border": (("slider_handle_border",), "primary"),
+    "zebra_even": (("zebra_even",), "#f8f9fa"),
+    "status_background": (("status_background",), "background"),
+    "status_text": (("status_text",), "text"),
+    "status_border": (("status_border",), "#dee2e6"),
+}
+
+# qt-theme-manager形式のトップレベル色キー → Qt-Theme-Studio形式の色キー
+QT_MANAGER_COLOR_KEYS = {
+    "primaryColor": "primary",
+    "accentColor": "accent",
+    "backgroundColor": "background",
+    "textColor": "text",
+}
+
+_FROZEN_MESSAGE = "CompiledThemeは変更できません"
+
+
+def _color_value(value: Any) -> Optional[str]:
+    """色値として使用できる値を文字列で取得(空・Noneの場合はNone)"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def resolve_roles(colors: Mapping[str, Any]) -> dict[str, str]:
+    """色設定から全セマンティックロールの色を解決
+
+    Args:
+        colors: Qt-Theme-Studio形式の色設定
+
+    Returns:
+        dict[str, str]: ロール名 → 色値
+    """
+    resolved: dict[str, str] = {}
+    for role, (keys, fallback) in ROLE_FALLBACKS.items():
+        for key in keys:
+            value = _color_value(colors.get(key))
+            if value is not None:
+                break
+        else:
+            value = resolved.get(fallback, fallback)
+        resolved[role] = value
+    return resolved
+
+
+def collect_colors(theme_data: Mapping[str, Any]) -> dict[str, Any]:
+    """テーマデータからQt-Theme-Studio形式の色設定を取得
+
+    qt-theme-managerの形式のトップレベル色キーも取り込み、
+    "colors"に同じ色がある場合は"colors"の値を優先します。
+    """
+    colors: dict[str, Any] = {}
+    for qt_key, studio_key in QT_MANAGER_COLOR_KEYS.items():
+        if qt_key in theme_data:
+            colors[studio_key] = theme_data[qt_key]
+    raw_colors = theme_data.get("colors")
+    if isinstance(raw_colors, Mapping):
+        colors.update(raw_colors)
+    return colors
+
+
+def _copy_nested(data: dict[str, Any]) -> dict[str, Any]:
+    """キャッシュ済み変換結果を呼び出し元が変更できるよう複製"""
+    return {
+        key: _copy_nested(value) if isinstance(value, dict) else value
+        for key, value in data.items()
+    }
+
+
+class CompiledTheme:
+    """正規化済みの不変テーマ
+
+    from_data()で一度だけ構築し、適用処理ではrolesの解決済みの色を参照します。
+    content_hashはテーマ内容(qt-theme-manager形式へ引き継ぐ項目を含む)から
+    算出される安定したハッシュで、
+    スタイルシートなど下流のキャッシュのキーとして使用できます。
+    """
+
+    __slots__ = (
+        "_qt_theme_manager",
+        "_studio",
+        "content_hash",
+        "description",
+        "display_name",
+        "name",
+        "roles",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        display_name: str,
+        description: str,
+        colors: Mapping[str, Any],
+        qt_theme_manager_extra: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        """コンパイル済みテーマを構築(通常はfrom_data()を使用)
+
+        Args:
+            name: テーマ名
+            display_name: 表示名
+            description: 説明
+            colors: Qt-Theme-Studio形式の色設定(未解決のロールを含んでよい)
+            qt_theme_manager_extra: qt-theme-manager形式へ追加で引き継ぐ項目
+        """
+        roles = resolve_roles(colors)
+        studio_colors = {
+            str(key): str(value)
+            for key, value in colors.items()
+            if _color_value(value) is not None
+        }
+        studio_colors.update(roles)
+
+        studio = {
+            "name": name,
+            "display_name": display_name,
+            "description": description,
+            "colors": studio_colors,
+        }
+        qt_theme_manager = {
+            "name": name,
+            "display_name": display_name,
+            "description": description,
+            "primaryColor": roles["primary"],
+            "accentColor": roles["accent"],
+            "backgroundColor": roles["background"],
+            "textColor": roles["text"],
+            "button": {
+                "background": roles["button_background"],
+                "text": roles["button_text"],
+            },
+            "input": {
+                "background": roles["input_background"],
+                "text": roles["input_text"],
+                "border": roles["input_border"],
+            },
+            "status": {
+                "background": roles["status_background"],
+                "text": roles["status_text"],
+                "border": roles["status_border"],
+            },
+        }
+        if qt_theme_manager_extra:
+            qt_theme_manager.update(_copy_nested(dict(qt_theme_manager_extra)))
+
+        # 引き継ぐ項目(panel等)のみが異なるテーマも区別するため、両形式から算出する
+        canonical = json.dumps(
+            [studio, qt_theme_manager],
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        content_hash = hashlib.blake2b(
+            canonical.encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+        set_attr = object.__setattr__
+        set_attr(self, "name", name)
+        set_attr(self, "display_name", display_name)
+        set_attr(self, "description", description)
+        set_attr(self, "roles", MappingProxyType(roles))
+        set_attr(self, "content_hash", content_hash)
+        set_attr(self, "_studio", studio)
+        set_attr(self, "_qt_theme_manager", qt_theme_manager)
+
+    @classmethod
+    def from_data(
+        cls, theme_data: Mapping[str, Any], fallback_name: Optional[str] = None
+    ) -> "CompiledTheme":
+        """テーマデータからコンパイル済みテーマを構築
+
+        Qt-Theme-Studio形式("colors"を持つ)とqt-theme-manager形式
+        ("primaryColor"などを持つ)の両方、およびその混在を受け付けます。
+        両方に同じ色がある場合は"colors"の値を優先します。
+
+        Args:
+            theme_data: テーマデータ
+            fallback_name: テーマ名がない場合に使用する名前
+
+        Returns:
+            CompiledTheme: コンパイル済みテーマ
+        """
+        colors = collect_colors(theme_data)
+
+        name = str(theme_data.get("name") or fallback_name or "Unknown")
+        display_name = str(theme_data.get("display_name") or fallback_name or name)
+
+        # qt-theme-manager形式の入力は、変換で表現できない項目(panel等)も引き継ぐ
+        is_qt_theme_manager = any(key in theme_data for key in QT_MANAGER_COLOR_KEYS)
+        extra = (
+            {key: value for key, value in theme_data.items() if key != "colors"}
+            if is_qt_theme_manager
+            else None
+        )
+        if extra is not None:
+            extra["name"] = name
+            extra["display_name"] = display_name
+
+        return cls(
+            name=name,
+            display_name=display_name,
+            description=str(theme_data.get("description", "")),
+            colors=colors,
+            qt_theme_manager_extra=extra,
+        )
+
+    def role(self, role_name: str) -> str:
+        """ロールの解決済みの色を取得
+
+        Raises:
+            KeyError: 未知のロール名の場合
+        """
+        return self.roles[role_name]
+
+    def to_preview_dict(self) -> dict[str, Any]:
+        """プレビュー用(Qt-Theme-Studio形式)のテーマデータを取得
+
+        "name"には表示名が入り、"colors"には全ロールの解決済みの色が含まれます。
+        """
+        preview = _copy_nested(self._studio)
+        preview["name"] = self.display_name
+        return preview
+
+    def to_studio(self) -> dict[str, Any]:
+        """Qt-Theme-Studio形式のテーマデータを取得"""
+        return _copy_nested(self._studio)
+
+    def to_qt_theme_manager(self) -> dict[str, Any]:
+        """qt-theme-manager形式のテーマデータを取得"""
+        return _copy_nested(self._qt_theme_manager)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(_FROZEN_MESSAGE)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(_FROZEN_MESSAGE)
+
+    def __hash__(self) -> int:
+        return hash(self.content_hash)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompiledTheme):
+            return NotImplemented
+        return self.content_hash == other.content_hash
+
+    def __repr__(self) -> str:
+        return f"CompiledTheme({self.name!r}, hash={self.content_hash[:12]})"
+
+
+def as_compiled_theme(
+    theme: Union[CompiledTheme, Mapping[str, Any]],
+    fallback_name: Optional[str] = None,
+) -> CompiledTheme:
+    """コンパイル済みテーマはそのまま、テーマデータはコンパイルして返す"""
+    if isinstance(theme, CompiledTheme):
+        return theme
+    return CompiledTheme.from_data(theme, fallback_name)
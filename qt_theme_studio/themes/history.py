@@ -0,0 +1,505 @@
+"""
+テーマ編集履歴
+
+テーマデータを構造共有する永続マップ(HAMT: Hash Array Mapped Trie)で保持し、
+編集ごとに変更されたパス上のノードのみを新しく作成します。
+各時点のテーマは変更されないため、スナップショットの取得と復元は参照の切り替えのみで行え、
+1回の編集で増えるメモリはテーマ全体ではなく変更箇所のO(log n)個のノードに限られます。
+"""
+
+import time
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, Callable, Optional
+
+# 1階層で使用するハッシュのビット数
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+# 既定の履歴の上限件数と、同じパスへの連続した編集をまとめる間隔(秒)
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_COALESCE_SECONDS = 0.5
+
+_MISSING = object()
+
+
+def _hash(key: Any) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+class _Node:
+    """ビットマップで子の有無を表すトライのノード
+
+    entriesの各要素は(キー, 値)のタプル、_Node、_Collisionのいずれかです。
+    """
+
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: tuple[Any, ...]) -> None:
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _Collision:
+    """ハッシュ値が完全に一致するキーの組"""
+
+    __slots__ = ("hash", "items")
+
+    def __init__(self, key_hash: int, items: tuple[tuple[Any, Any], ...]) -> None:
+        self.hash = key_hash
+        self.items = items
+
+
+_EMPTY_NODE = _Node(0, ())
+
+
+def _merge_leaves(
+    key1: Any, value1: Any, hash1: int, key2: Any, value2: Any, hash2: int, shift: int
+) -> Any:
+    """同じ位置に入る2つの要素から、区別できる深さまでノードを作成"""
+    if shift >= _HASH_BITS:
+        return _Collision(hash1, ((key1, value1), (key2, value2)))
+    index1 = (hash1 >> shift) & _MASK
+    index2 = (hash2 >> shift) & _MASK
+    if index1 == index2:
+        child = _merge_leaves(key1, value1, hash1, key2, value2, hash2, shift + _BITS)
+        return _Node(1 << index1, (child,))
+    leaf1, leaf2 = (key1, value1), (key2, value2)
+    entries = (leaf1, leaf2) if index1 < index2 else (leaf2, leaf1)
+    return _Node((1 << index1) | (1 << index2), entries)
+
+
+def _node_get(node: _Node, key: Any, key_hash: int) -> Any:
+    shift = 0
+    while True:
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return _MISSING
+        entry = node.entries[_popcount(node.bitmap & (bit - 1))]
+        if isinstance(entry, _Node):
+            node = entry
+            shift += _BITS
+            continue
+        if isinstance(entry, _Collision):
+            for item_key, item_value in entry.items:
+                if item_key == key:
+                    return item_value
+            return _MISSING
+        return entry[1] if entry[0] == key else _MISSING
+
+
+def _node_set(
+    node: _Node, key: Any, value: Any, key_hash: int, shift: int
+) -> tuple[_Node, bool]:
+    """キーを設定したノードと、キーが追加されたかを返す(変更がなければ同じノード)"""
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    index = _popcount(node.bitmap & (bit - 1))
+    entries = node.entries
+
+    if not node.bitmap & bit:
+        new_entries = (*entries[:index], (key, value), *entries[index:])
+        return _Node(node.bitmap | bit, new_entries), True
+
+    entry = entries[index]
+    added = False
+    if isinstance(entry, _Node):
+        new_entry, added = _node_set(entry, key, value, key_hash, shift + _BITS)
+        if new_entry is entry:
+            return node, False
+    elif isinstance(entry, _Collision):
+        if entry.hash == key_hash:
+            items = [item for item in entry.items if item[0] != key]
+            added = len(items) == len(entry.items)
+            new_entry = _Collision(key_hash, (*items, (key, value)))
+        else:
+            # 異なるハッシュ値のキーが入る場合は、衝突の組を1段深い階層へ移す
+            wrapper = _Node(1 << ((entry.hash >> (shift + _BITS)) & _MASK), (entry,))
+            new_entry, added = _node_set(wrapper, key, value, key_hash, shift + _BITS)
+    elif entry[0] == key:
+        if entry[1] is value:
+            return node, False
+        new_entry = (key, value)
+    else:
+        new_entry = _merge_leaves(
+            entry[0], entry[1], _hash(entry[0]), key, value, key_hash, shift + _BITS
+        )
+        added = True
+
+    new_entries = (*entries[:index], new_entry, *entries[index + 1 :])
+    return _Node(node.bitmap, new_entries), added
+
+
+def _node_delete(node: _Node, key: Any, key_hash: int, shift: int) -> Optional[_Node]:
+    """キーを削除したノードを返す(空になった場合はNone、キーがなければ同じノード)"""
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node
+    index = _popcount(node.bitmap & (bit - 1))
+    entry = node.entries[index]
+
+    if isinstance(entry, _Node):
+        new_entry: Any = _node_delete(entry, key, key_hash, shift + _BITS)
+        if new_entry is entry:
+            return node
+        if (
+            new_entry is not None
+            and len(new_entry.entries) == 1
+            and not isinstance(new_entry.entries[0], _Node)
+        ):
+            # 要素が1つだけになった子の階層は、その要素で置き換える
+            new_entry = new_entry.entries[0]
+    elif isinstance(entry, _Collision):
+        items = tuple(item for item in entry.items if item[0] != key)
+        if len(items) == len(entry.items):
+            return node
+        new_entry = items[0] if len(items) == 1 else _Collision(entry.hash, items)
+    elif entry[0] == key:
+        new_entry = None
+    else:
+        return node
+
+    if new_entry is None:
+        entries = (*node.entries[:index], *node.entries[index + 1 :])
+        if not entries:
+            return None
+        return _Node(node.bitmap & ~bit, entries)
+    entries = (*node.entries[:index], new_entry, *node.entries[index + 1 :])
+    return _Node(node.bitmap, entries)
+
+
+def freeze(value: Any) -> Any:
+    """辞書を永続マップへ、リストをタプルへ再帰的に変換"""
+    if isinstance(value, PersistentMap):
+        return value
+    if isinstance(value, Mapping):
+        return PersistentMap.from_dict(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """永続マップを辞書へ、タプルをリストへ再帰的に変換"""
+    if isinstance(value, PersistentMap):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class PersistentMap(Mapping):
+    """構造共有する不変のマップ
+
+    set・deleteは元のマップを変更せず、変更されたパス上のノードのみを
+    新しく作成したマップを返します。入れ子の辞書はPersistentMapとして保持し、
+    set_inで入れ子のパスを変更できます。
+    反復の順序は辞書と同じく追加順とし、キーの順序をタプルで保持します
+    (既存のキーの値の変更ではタプルを共有します)。
+    """
+
+    __slots__ = ("_keys", "_root")
+
+    def __init__(self, root: _Node = _EMPTY_NODE, keys: tuple[Any, ...] = ()) -> None:
+        self._root = root
+        self._keys = keys
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PersistentMap":
+        """辞書(入れ子を含む)から永続マップを作成"""
+        root = _EMPTY_NODE
+        for key, value in data.items():
+            root, _added = _node_set(root, key, freeze(value), _hash(key), 0)
+        return cls(root, tuple(data))
+
+    def __getitem__(self, key: Any) -> Any:
+        value = _node_get(self._root, key, _hash(key))
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return _node_get(self._root, key, _hash(key)) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._keys)
+
+    def items(self) -> Iterator[tuple[Any, Any]]:  # type: ignore[override]
+        """(キー, 値)を追加順に返す"""
+        root = self._root
+        return ((key, _node_get(root, key, _hash(key))) for key in self._keys)
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({self.to_dict()!r})"
+
+    def set(self, key: Any, value: Any) -> "PersistentMap":
+        """キーに値を設定したマップを返す(値が同一の場合は自身を返す)"""
+        root, added = _node_set(self._root, key, value, _hash(key), 0)
+        if root is self._root:
+            return self
+        return PersistentMap(root, (*self._keys, key) if added else self._keys)
+
+    def delete(self, key: Any) -> "PersistentMap":
+        """キーを削除したマップを返す(キーがない場合は自身を返す)"""
+        root = _node_delete(self._root, key, _hash(key), 0)
+        if root is self._root:
+            return self
+        keys = tuple(item for item in self._keys if item != key)
+        return PersistentMap(root or _EMPTY_NODE, keys)
+
+    def get_in(self, path: Sequence[Any], default: Any = None) -> Any:
+        """入れ子のパスの値を取得"""
+        value: Any = self
+        for key in path:
+            if not isinstance(value, PersistentMap) or key not in value:
+                return default
+            value = value[key]
+        return value
+
+    def set_in(self, path: Sequence[Any], value: Any) -> "PersistentMap":
+        """入れ子のパスに値を設定したマップを返す(途中のマップがなければ作成)
+
+        Raises:
+            ValueError: パスが空の場合
+        """
+        if not path:
+            raise ValueError("パスが空です")
+        key = path[0]
+        if len(path) == 1:
+            return self.set(key, freeze(value))
+        child = self.get(key)
+        if not isinstance(child, PersistentMap):
+            child = EMPTY_MAP
+        return self.set(key, child.set_in(path[1:], value))
+
+    def delete_in(self, path: Sequence[Any]) -> "PersistentMap":
+        """入れ子のパスの値を削除したマップを返す"""
+        if not path:
+            raise ValueError("パスが空です")
+        key = path[0]
+        if len(path) == 1:
+            return self.delete(key)
+        child = self.get(key)
+        if not isinstance(child, PersistentMap):
+            return self
+        return self.set(key, child.delete_in(path[1:]))
+
+    def update_from(self, data: Mapping[str, Any]) -> "PersistentMap":
+        """辞書の内容と順序に置き換えたマップを返す(内容が同じ部分木は共有)"""
+        result = self
+        for key in [key for key in self if key not in data]:
+            result = result.delete(key)
+        for key, value in data.items():
+            current = result.get(key, _MISSING)
+            if isinstance(value, Mapping) and isinstance(current, PersistentMap):
+                new_value = current.update_from(value)
+            else:
+                new_value = freeze(value)
+                if current is not _MISSING and current == new_value:
+                    continue
+            result = result.set(key, new_value)
+        return result.reorder(data)
+
+    def reorder(self, keys: Iterable[Any]) -> "PersistentMap":
+        """キーの反復順序を変更したマップを返す(順序が同じ場合は自身を返す)
+
+        Raises:
+            ValueError: keysがマップのキーの組と一致しない場合
+        """
+        keys = tuple(keys)
+        if keys == self._keys:
+            return self
+        if len(set(keys)) != len(self._keys) or any(key not in self for key in keys):
+            raise ValueError("キーの組がマップと一致しません")
+        return PersistentMap(self._root, keys)
+
+    def to_dict(self) -> dict[str, Any]:
+        """辞書(入れ子を含む)に変換"""
+        return {key: thaw(value) for key, value in self.items()}
+
+
+EMPTY_MAP = PersistentMap()
+
+
+class HistoryEntry:
+    """編集履歴の1件"""
+
+    __slots__ = ("label", "path", "state", "timestamp")
+
+    def __init__(
+        self,
+        state: PersistentMap,
+        label: str,
+        path: Optional[tuple[Any, ...]],
+        timestamp: float,
+    ) -> None:
+        self.state = state
+        self.label = label
+        self.path = path
+        self.timestamp = timestamp
+
+
+class ThemeEditHistory:
+    """元に戻す・やり直しに対応したテーマの編集履歴
+
+    各時点のテーマをPersistentMapで保持するため、1件の履歴が保持するのは
+    変更されたパス上のノードのみです。同じパスへの編集がcoalesce_seconds以内に
+    続いた場合(カラーピッカーのドラッグなど)は1件にまとめます。
+    max_entriesを超えた場合は古い履歴から破棄します(Noneの場合は無制限)。
+    """
+
+    def __init__(
+        self,
+        theme_data: Mapping[str, Any],
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+        coalesce_seconds: float = DEFAULT_COALESCE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """テーマ編集履歴を初期化します
+
+        Args:
+            theme_data: 初期状態のテーマデータ
+            max_entries: 保持する履歴の上限件数(初期状態を含む)
+            coalesce_seconds: 同じパスへの編集を1件にまとめる間隔(秒)
+            clock: 現在時刻(秒)を返す関数
+        """
+        if max_entries is not None and max_entries < 2:
+            raise ValueError("max_entriesは2以上を指定してください")
+        self.max_entries = max_entries
+        self.coalesce_seconds = coalesce_seconds
+        self.clock = clock
+        self._entries = [HistoryEntry(freeze(theme_data), "初期状態", None, clock())]
+        self._index = 0
+
+    @property
+    def current(self) -> PersistentMap:
+        """現在のテーマ"""
+        return self._entries[self._index].state
+
+    @property
+    def can_undo(self) -> bool:
+        return self._index > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._index < len(self._entries) - 1
+
+    @property
+    def undo_label(self) -> Optional[str]:
+        """元に戻す編集の説明"""
+        return self._entries[self._index].label if self.can_undo else None
+
+    @property
+    def redo_label(self) -> Optional[str]:
+        """やり直す編集の説明"""
+        return self._entries[self._index + 1].label if self.can_redo else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def to_dict(self) -> dict[str, Any]:
+        """現在のテーマを辞書で取得"""
+        return self.current.to_dict()
+
+    def edit(
+        self, path: Sequence[Any], value: Any, label: Optional[str] = None
+    ) -> PersistentMap:
+        """パスの値を変更して履歴に記録
+
+        Args:
+            path: 変更する値のパス(例: ("colors", "background"))
+            value: 新しい値
+            label: 編集の説明(省略時はパス)
+
+        Returns:
+            PersistentMap: 変更後のテーマ
+        """
+        path = tuple(path)
+        return self.edit_many({path: value}, label or ".".join(map(str, path)))
+
+    def edit_many(
+        self, changes: Mapping[tuple[Any, ...], Any], label: str
+    ) -> PersistentMap:
+        """複数のパスの値をまとめて変更し、1件の履歴として記録
+
+        同じパスの組への編集がcoalesce_seconds以内に続いた場合は1件にまとめます。
+
+        Args:
+            changes: パス → 新しい値
+            label: 編集の説明
+
+        Returns:
+            PersistentMap: 変更後のテーマ
+        """
+        state = self.current
+        for path, value in changes.items():
+            state = state.set_in(path, value)
+        if state is self.current:
+            return state
+
+        paths = tuple(tuple(path) for path in changes)
+        key = paths[0] if len(paths) == 1 else paths
+        now = self.clock()
+        last = self._entries[self._index]
+        if (
+            not self.can_redo
+            and last.path == key
+            and now - last.timestamp <= self.coalesce_seconds
+        ):
+            # 連続した編集は直前の履歴を更新してまとめる
+            last.state = state
+            last.timestamp = now
+            return state
+
+        self._push(HistoryEntry(state, label, key, now))
+        return state
+
+    def replace(self, theme_data: Mapping[str, Any], label: str) -> PersistentMap:
+        """テーマ全体を置き換えて履歴に記録(内容が同じ部分は共有)
+
+        Args:
+            theme_data: 新しいテーマデータ
+            label: 編集の説明
+
+        Returns:
+            PersistentMap: 置き換え後のテーマ
+        """
+        state = self.current.update_from(theme_data)
+        if state is not self.current:
+            self._push(HistoryEntry(state, label, None, self.clock()))
+        return state
+
+    def seal(self) -> None:
+        """直前の編集を確定し、以降の編集とまとめないようにする"""
+        self._entries[self._index].path = None
+
+    def undo(self) -> Optional[PersistentMap]:
+        """1件前の状態に戻す(戻せない場合はNone)"""
+        if not self.can_undo:
+            return None
+        self._index -= 1
+        self.seal()
+        return self.current
+
+    def redo(self) -> Optional[PersistentMap]:
+        """元に戻した編集をやり直す(やり直せない場合はNone)"""
+        if not self.can_redo:
+            return None
+        self._index += 1
+        self.seal()
+        return self.current
+
+    def _push(self, entry: HistoryEntry) -> None:
+        """履歴を追加(やり直し可能な履歴は破棄し、上限を超えた古い履歴を削除)"""
+        del self._entries[self._index + 1 :]
+        self._entries.append(entry)
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            del self._entries[: len(self._entries) - self.max_entries]
+        self._index = len(self._entries) - 1
@@ -0,0 +1,494 @@
+"""
+テーマパック
+
+多数のテーマをまとめて保存するバイナリ形式(.qtpack)の書き込み・読み込みを提供します。
+キーと文字列は重複を除いた文字列テーブルに格納し、"#rrggbb"/"#rrggbbaa"形式の色は
+RGBAのuint32として格納します。読み込み時はファイルをmmapし、要求されたテーマの
+範囲だけを解析します。
+
+ファイル構成(すべてリトルエンディアン):
+    ヘッダー: マジック"QTSP", バージョン, フラグ, テーマ数, 文字列数,
+              文字列テーブル位置, テーマテーブル位置
+    データ部: テーマごとの値(タグ付きの値を再帰的に格納)
+    文字列テーブル: (文字列数 + 1)個のuint32オフセットとUTF-8バイト列
+    テーマテーブル: テーマごとの(名前ID, 表示名ID, データ位置, データ長)
+    名前順テーブル: テーマ名のUTF-8バイト列順に並べたテーマ位置(uint32、二分探索用)
+"""
+
+import json
+import mmap
+import re
+import struct
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from qt_theme_studio.utilities.autosave import atomic_write_bytes
+
+PACK_SUFFIX = ".qtpack"
+
+MAGIC = b"QTSP"
+
+# 形式バージョン(互換性のない変更を行った場合は更新する)
+VERSION = 1
+
+# 単一テーマとして保存されたパック
+FLAG_SINGLE_THEME = 0x0001
+
+_HEADER = struct.Struct("<4sHHIIQQ")
+_THEME_ENTRY = struct.Struct("<IIQI")
+_U32 = struct.Struct("<I")
+_U32_PAIR = struct.Struct("<II")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_unpack_u32 = _U32.unpack_from
+
+# 値のタグ
+TAG_NULL = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_BIGINT = 4
+TAG_FLOAT = 5
+TAG_STRING = 6
+TAG_COLOR_RGB = 7
+TAG_COLOR_RGBA = 8
+TAG_ARRAY = 9
+TAG_OBJECT = 10
+
+# 元の文字列を復元できる小文字の色表記のみを色として格納する
+_RGB_RE = re.compile(r"#[0-9a-f]{6}")
+_RGBA_RE = re.compile(r"#[0-9a-f]{8}")
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+class ThemePackError(Exception):
+    """テーマパックの形式エラー"""
+
+
+class _PackWriter:
+    """テーマパックのデータ部と文字列テーブルを構築"""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.data = bytearray()
+
+    def string_id(self, text: str) -> int:
+        """文字列テーブルのIDを取得(未登録なら追加)"""
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings[text] = string_id
+        return string_id
+
+    def write_value(self, value: Any) -> None:
+        """値をタグ付きでデータ部へ追加"""
+        data = self.data
+        if value is None:
+            data.append(TAG_NULL)
+        elif value is True:
+            data.append(TAG_TRUE)
+        elif value is False:
+            data.append(TAG_FALSE)
+        elif isinstance(value, int):
+            if _INT64_MIN <= value <= _INT64_MAX:
+                data.append(TAG_INT)
+                data += _I64.pack(value)
+            else:
+                data.append(TAG_BIGINT)
+                data += _U32.pack(self.string_id(str(value)))
+        elif isinstance(value, float):
+            data.append(TAG_FLOAT)
+            data += _F64.pack(value)
+        elif isinstance(value, str):
+            if _RGB_RE.fullmatch(value):
+                data.append(TAG_COLOR_RGB)
+                data += _U32.pack((int(value[1:], 16) << 8) | 0xFF)
+            elif _RGBA_RE.fullmatch(value):
+                data.append(TAG_COLOR_RGBA)
+                data += _U32.pack(int(value[1:], 16))
+            else:
+                data.append(TAG_STRING)
+                data += _U32.pack(self.string_id(value))
+        elif isinstance(value, (list, tuple)):
+            data.append(TAG_ARRAY)
+            data += _U32.pack(len(value))
+            for item in value:
+                self.write_value(item)
+        elif isinstance(value, Mapping):
+            data.append(TAG_OBJECT)
+            data += _U32.pack(len(value))
+            for key, item in value.items():
+                data += _U32.pack(self.string_id(str(key)))
+                self.write_value(item)
+        else:
+            raise ThemePackError(f"パックできない値の型です: {type(value).__name__}")
+
+    def string_table(self) -> bytes:
+        """文字列テーブルのバイト列"""
+        encoded = [text.encode("utf-8") for text in self.strings]
+        offsets = [0]
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(encoded)
+
+
+def write_pack(
+    themes: Mapping[str, Any], path: Union[str, Path], single_theme: bool = False
+) -> int:
+    """テーマをパック形式で保存
+
+    Args:
+        themes: テーマ名 → テーマデータ
+        path: 保存先のパス
+        single_theme: 単一テーマファイルとして保存する場合True
+
+    Returns:
+        int: 保存したテーマ数
+
+    Raises:
+        ThemePackError: パックできない値が含まれる場合
+    """
+    writer = _PackWriter()
+    entries = []
+    for name, theme_data in themes.items():
+        display_name = name
+        if isinstance(theme_data, Mapping) and theme_data.get("display_name"):
+            display_name = str(theme_data["display_name"])
+        start = len(writer.data)
+        writer.write_value(theme_data)
+        entries.append(
+            (
+                writer.string_id(name),
+                writer.string_id(display_name),
+                start,
+                len(writer.data) - start,
+            )
+        )
+
+    data_offset = _HEADER.size
+    string_table_offset = data_offset + len(writer.data)
+    string_table = writer.string_table()
+    theme_table_offset = string_table_offset + len(string_table)
+
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        FLAG_SINGLE_THEME if single_theme else 0,
+        len(entries),
+        len(writer.strings),
+        string_table_offset,
+        theme_table_offset,
+    )
+    theme_table = b"".join(
+        _THEME_ENTRY.pack(name_id, display_id, data_offset + start, length)
+        for name_id, display_id, start, length in entries
+    )
+    encoded_names = [name.encode("utf-8") for name in themes]
+    name_order = sorted(range(len(entries)), key=encoded_names.__getitem__)
+
+    atomic_write_bytes(
+        path,
+        b"".join(
+            (
+                header,
+                writer.data,
+                string_table,
+                theme_table,
+                struct.pack(f"<{len(name_order)}I", *name_order),
+            )
+        ),
+    )
+    return len(entries)
+
+
+class ThemePack:
+    """テーマパックのmmapリーダー
+
+    開く際はヘッダーのみを検証し、テーマ名や文字列は参照時に必要な分だけ復号します。
+    名前による参照は名前順テーブルの二分探索で行うため、全テーマ名の復号は不要です。
+    ThemeBundleと同じ名前一覧・表示名・個別読み込みのインターフェースを持ちます。
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """テーマパックを開く
+
+        Args:
+            path: テーマパックのパス
+
+        Raises:
+            OSError: ファイルにアクセスできない場合
+            ThemePackError: パック形式として不正な場合
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise ThemePackError(f"空のファイルです: {self.path}") from e
+
+        try:
+            self._read_header()
+        except Exception:
+            self._data.close()
+            raise
+
+        self._strings: list[Optional[str]] = [None] * self._string_count
+
+    def _read_header(self) -> None:
+        """ヘッダーを読み込み検証"""
+        if len(self._data) < _HEADER.size:
+            raise ThemePackError(f"テーマパックのヘッダーが不正です: {self.path}")
+        (
+            magic,
+            version,
+            self.flags,
+            self._theme_count,
+            self._string_count,
+            self._string_table_offset,
+            self._theme_table_offset,
+        ) = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ThemePackError(f"テーマパックではありません: {self.path}")
+        if version != VERSION:
+            raise ThemePackError(
+                f"未対応のテーマパックのバージョンです: {version} ({self.path})"
+            )
+        self._name_order_offset = (
+            self._theme_table_offset + self._theme_count * _THEME_ENTRY.size
+        )
+        expected_size = self._name_order_offset + 4 * self._theme_count
+        if expected_size != len(self._data):
+            raise ThemePackError(f"テーマパックが破損しています: {self.path}")
+        self._string_blob_offset = self._string_table_offset + 4 * (
+            self._string_count + 1
+        )
+
+    @property
+    def is_bundle(self) -> bool:
+        """複数テーマとして扱えるかどうか(ThemeBundle互換、常にTrue)"""
+        return True
+
+    @property
+    def is_single_theme(self) -> bool:
+        """単一テーマファイルとして保存されたパックかどうか"""
+        return bool(self.flags & FLAG_SINGLE_THEME)
+
+    def names(self) -> list[str]:
+        """テーマ名の一覧(保存順)"""
+        return [self._string(self._entry(index)[0]) for index in range(len(self))]
+
+    def display_name(self, name: str) -> str:
+        """テーマの表示名を取得
+
+        Raises:
+            KeyError: パックにテーマがない場合
+        """
+        return self._string(self._entry(self._index_of(name))[1])
+
+    def load_theme(self, name: str) -> Any:
+        """テーマを1件だけ解析
+
+        Raises:
+            KeyError: パックにテーマがない場合
+        """
+        return self.load_theme_at(self._index_of(name))
+
+    def load_theme_at(self, index: int) -> Any:
+        """保存順の位置を指定してテーマを解析
+
+        Raises:
+            IndexError: 位置が範囲外の場合
+        """
+        if not 0 <= index < self._theme_count:
+            raise IndexError(index)
+        offset = self._entry(index)[2]
+        value, _ = self._read_value(offset)
+        return value
+
+    def load_all(self) -> dict[str, Any]:
+        """全テーマを解析"""
+        themes = {}
+        for index in range(self._theme_count):
+            name_id, _, offset, _ = self._entry(index)
+            themes[self._string(name_id)] = self._read_value(offset)[0]
+        return themes
+
+    def close(self) -> None:
+        """mmapを解放"""
+        self._data.close()
+
+    def __enter__(self) -> "ThemePack":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._theme_count
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        try:
+            self._index_of(name)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def _entry(self, index: int) -> tuple[int, int, int, int]:
+        """テーマテーブルの項目(名前ID, 表示名ID, データ位置, データ長)"""
+        return _THEME_ENTRY.unpack_from(
+            self._data, self._theme_table_offset + index * _THEME_ENTRY.size
+        )
+
+    def _index_of(self, name: str) -> int:
+        """名前順テーブルを二分探索してテーマの位置を取得
+
+        Raises:
+            KeyError: パックにテーマがない場合
+        """
+        target = name.encode("utf-8")
+        low, high = 0, self._theme_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_bytes(self._ordered_index(middle)) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._theme_count:
+            index = self._ordered_index(low)
+            if self._name_bytes(index) == target:
+                return index
+        raise KeyError(name)
+
+    def _ordered_index(self, position: int) -> int:
+        """名前順テーブルのposition番目のテーマ位置"""
+        return _unpack_u32(self._data, self._name_order_offset + 4 * position)[0]
+
+    def _name_bytes(self, index: int) -> bytes:
+        """テーマ名のUTF-8バイト列(復号せずに取得)"""
+        return self._string_bytes(self._entry(index)[0])
+
+    def _string_bytes(self, string_id: int) -> bytes:
+        """文字列テーブルのUTF-8バイト列"""
+        start, end = _U32_PAIR.unpack_from(
+            self._data, self._string_table_offset + 4 * string_id
+        )
+        base = self._string_blob_offset
+        return self._data[base + start : base + end]
+
+    def _string(self, string_id: int) -> str:
+        """文字列テーブルから文字列を取得(復号結果はキャッシュ)"""
+        text = self._strings[string_id]
+        if text is None:
+            text = str(self._string_bytes(string_id), "utf-8")
+            self._strings[string_id] = text
+        return text
+
+    def _read_value(self, offset: int) -> tuple[Any, int]:
+        """offsetから値を1つ解析し、(値, 次の位置)を返す"""
+        data = self._data
+        tag = data[offset]
+        offset += 1
+        if tag == TAG_STRING:
+            string_id = _unpack_u32(data, offset)[0]
+            text = self._strings[string_id]
+            if text is None:
+                text = self._string(string_id)
+            return text, offset + 4
+        if tag == TAG_COLOR_RGB:
+            return f"#{_unpack_u32(data, offset)[0] >> 8:06x}", offset + 4
+        if tag == TAG_COLOR_RGBA:
+            return f"#{_unpack_u32(data, offset)[0]:08x}", offset + 4
+        if tag == TAG_OBJECT:
+            strings = self._strings
+            read_value = self._read_value
+            count = _unpack_u32(data, offset)[0]
+            offset += 4
+            result = {}
+            for _ in range(count):
+                string_id = _unpack_u32(data, offset)[0]
+                key = strings[string_id]
+                if key is None:
+                    key = self._string(string_id)
+                result[key], offset = read_value(offset + 4)
+            return result, offset
+        if tag == TAG_ARRAY:
+            count = _unpack_u32(data, offset)[0]
+            offset += 4
+            items = []
+            for _ in range(count):
+                item, offset = self._read_value(offset)
+                items.append(item)
+            return items, offset
+        if tag == TAG_NULL:
+            return None, offset
+        if tag == TAG_TRUE:
+            return True, offset
+        if tag == TAG_FALSE:
+            return False, offset
+        if tag == TAG_INT:
+            return _I64.unpack_from(data, offset)[0], offset + 8
+        if tag == TAG_FLOAT:
+            return _F64.unpack_from(data, offset)[0], offset + 8
+        if tag == TAG_BIGINT:
+            return int(self._string(_unpack_u32(data, offset)[0])), offset + 4
+        raise ThemePackError(f"不明な値のタグです: {tag} (位置 {offset - 1})")
+
+
+def read_pack(path: Union[str, Path]) -> dict[str, Any]:
+    """テーマパックの全テーマを読み込む
+
+    Returns:
+        dict[str, Any]: テーマ名 → テーマデータ
+    """
+    with ThemePack(path) as pack:
+        return pack.load_all()
+
+
+def json_to_pack(json_path: Union[str, Path], pack_path: Union[str, Path]) -> int:
+    """JSONのテーマファイル(単一テーマまたはバンドル)をパック形式に変換
+
+    バンドルは"available_themes"内のテーマのみを変換します。
+
+    Returns:
+        int: 変換したテーマ数
+    """
+    json_path = Path(json_path)
+    with json_path.open(encoding="utf-8") as f:
+        theme_data = json.load(f)
+
+    if isinstance(theme_data, dict) and "available_themes" in theme_data:
+        return write_pack(theme_data["available_themes"], pack_path)
+    name = theme_data.get("name") or json_path.stem
+    return write_pack({str(name): theme_data}, pack_path, single_theme=True)
+
+
+def pack_to_json(pack_path: Union[str, Path], json_path: Union[str, Path]) -> int:
+    """テーマパックをJSONのテーマファイルに変換
+
+    単一テーマとして保存されたパックはテーマそのものを、
+    それ以外は"available_themes"形式のバンドルを出力します。
+
+    Returns:
+        int: 変換したテーマ数
+    """
+    with ThemePack(pack_path) as pack:
+        themes = pack.load_all()
+        single_theme = pack.is_single_theme and len(themes) == 1
+
+    output = (
+        next(iter(themes.values())) if single_theme else {"available_themes": themes}
+    )
+    json_path = Path(json_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    with json_path.open("w", encoding="utf-8") as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    return len(themes)
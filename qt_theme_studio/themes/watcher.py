@@ -0,0 +1,428 @@
+"""
+テーマファイル監視
+
+読み込み済みのテーマファイルとテーマフォルダを監視し、外部エディタでの変更を検出します。
+変更の判定はファイルサイズ・更新時刻・内容ハッシュの順に行い、
+バンドルファイルはテーマごとのバイト範囲のハッシュを比較して
+変更されたテーマだけを解析します。
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from qt_theme_studio.logger import get_logger
+
+from .bundle import scan_bundle
+from .pack import PACK_SUFFIX, ThemePack, ThemePackError
+
+# フォルダ監視の対象とするテーマファイルの拡張子
+THEME_FILE_SUFFIXES = (".json", PACK_SUFFIX)
+
+
+def _digest(data: bytes) -> str:
+    """内容ハッシュ"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ThemeChanges:
+    """1ファイル分のテーマの変更内容"""
+
+    __slots__ = ("added", "changed", "path", "removed")
+
+    def __init__(
+        self,
+        path: Path,
+        added: Optional[dict[str, Any]] = None,
+        changed: Optional[dict[str, Any]] = None,
+        removed: Optional[list[str]] = None,
+    ) -> None:
+        self.path = path
+        self.added = added or {}
+        self.changed = changed or {}
+        self.removed = removed or []
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def __repr__(self) -> str:
+        return (
+            f"ThemeChanges({self.path.name}: +{len(self.added)} "
+            f"~{len(self.changed)} -{len(self.removed)})"
+        )
+
+
+class _Snapshot:
+    """ファイルの内容ハッシュとテーマごとのハッシュ・遅延解析関数"""
+
+    __slots__ = ("digest", "loaders", "theme_hashes")
+
+    def __init__(
+        self,
+        digest: str,
+        theme_hashes: dict[str, str],
+        loaders: dict[str, Callable[[], Any]],
+    ) -> None:
+        self.digest = digest
+        self.theme_hashes = theme_hashes
+        self.loaders = loaders
+
+
+class _TrackedFile:
+    """追跡中のファイルの状態"""
+
+    __slots__ = ("digest", "fallback_name", "mtime_ns", "size", "theme_hashes")
+
+    def __init__(self, fallback_name: Optional[str]) -> None:
+        self.fallback_name = fallback_name
+        self.size = -1
+        self.mtime_ns = -1
+        self.digest = ""
+        self.theme_hashes: dict[str, str] = {}
+
+
+class ThemeFileTracker:
+    """テーマファイルの変更を検出して差分を求める(Qtに依存しない)"""
+
+    def __init__(self) -> None:
+        self.logger = get_logger()
+        self._files: dict[Path, _TrackedFile] = {}
+
+    def tracked_files(self) -> list[Path]:
+        """追跡中のファイルの一覧"""
+        return list(self._files)
+
+    def is_tracked(self, path: Union[str, Path]) -> bool:
+        """ファイルを追跡中かどうか"""
+        return Path(path).absolute() in self._files
+
+    def track(
+        self,
+        path: Union[str, Path],
+        fallback_name: Optional[str] = None,
+        load: bool = False,
+    ) -> ThemeChanges:
+        """ファイルの追跡を開始
+
+        現在の内容を基準として記録します。バンドルのテーマは解析しません。
+
+        Args:
+            path: テーマファイルのパス
+            fallback_name: 単一テーマファイルにテーマ名がない場合に使用する名前
+            load: 現在のテーマを追加として返す場合True
+
+        Returns:
+            ThemeChanges: load=Trueの場合は全テーマを追加として含む変更内容
+
+        Raises:
+            OSError: ファイルを読み込めない場合
+            ValueError: テーマファイルとして解析できない場合
+        """
+        path = Path(path).absolute()
+        tracked = _TrackedFile(fallback_name)
+        stat = path.stat()
+        snapshot = self._snapshot(path, fallback_name)
+
+        tracked.size, tracked.mtime_ns = stat.st_size, stat.st_mtime_ns
+        tracked.digest = snapshot.digest
+        tracked.theme_hashes = snapshot.theme_hashes
+        self._files[path] = tracked
+
+        if not load:
+            return ThemeChanges(path)
+        return ThemeChanges(
+            path, added={name: loader() for name, loader in snapshot.loaders.items()}
+        )
+
+    def untrack(self, path: Union[str, Path]) -> None:
+        """ファイルの追跡を終了"""
+        self._files.pop(Path(path).absolute(), None)
+
+    def check(self, path: Union[str, Path]) -> Optional[ThemeChanges]:
+        """ファイルの変更を確認し、変更されたテーマだけを解析して差分を返す
+
+        サイズと更新時刻が同じ場合は内容を読み込みません。
+        解析に失敗した場合(保存途中など)は前回の内容を維持してNoneを返します。
+
+        Returns:
+            Optional[ThemeChanges]: 変更内容(変更がない場合はNone)
+        """
+        path = Path(path).absolute()
+        tracked = self._files.get(path)
+        if tracked is None:
+            return None
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            del self._files[path]
+            return ThemeChanges(path, removed=list(tracked.theme_hashes)) or None
+
+        if (stat.st_size, stat.st_mtime_ns) == (tracked.size, tracked.mtime_ns):
+            return None
+        tracked.size, tracked.mtime_ns = stat.st_size, stat.st_mtime_ns
+
+        try:
+            snapshot = self._snapshot(path, tracked.fallback_name)
+        except (OSError, ValueError, ThemePackError) as e:
+            self.logger.warning(
+                f"変更されたテーマファイルを解析できません: {path}: {e}"
+            )
+            return None
+
+        if snapshot.digest == tracked.digest:
+            return None
+
+        old_hashes = tracked.theme_hashes
+        changes = ThemeChanges(path)
+        for name, theme_hash in snapshot.theme_hashes.items():
+            old_hash = old_hashes.get(name)
+            if old_hash is None:
+                changes.added[name] = snapshot.loaders[name]()
+            elif old_hash != theme_hash:
+                changes.changed[name] = snapshot.loaders[name]()
+        changes.removed = [
+            name for name in old_hashes if name not in snapshot.theme_hashes
+        ]
+
+        tracked.digest = snapshot.digest
+        tracked.theme_hashes = snapshot.theme_hashes
+        return changes or None
+
+    def check_all(self) -> list[ThemeChanges]:
+        """追跡中の全ファイルの変更を確認"""
+        results = []
+        for path in self.tracked_files():
+            changes = self.check(path)
+            if changes is not None:
+                results.append(changes)
+        return results
+
+    def _snapshot(self, path: Path, fallback_name: Optional[str]) -> _Snapshot:
+        """ファイルの内容ハッシュとテーマごとのハッシュを取得"""
+        if path.suffix.lower() == PACK_SUFFIX:
+            return self._pack_snapshot(path)
+
+        data = path.read_bytes()
+        digest = _digest(data)
+
+        entries = scan_bundle(data)
+        if entries is not None:
+            theme_hashes = {}
+            loaders = {}
+            for entry in entries:
+                span = data[entry.start : entry.end]
+                theme_hashes[entry.name] = _digest(span)
+                loaders[entry.name] = lambda span=span: json.loads(span)
+            return _Snapshot(digest, theme_hashes, loaders)
+
+        theme_data = json.loads(data)
+        if not isinstance(theme_data, dict):
+            raise ValueError("テーマファイルの形式が正しくありません")
+        name = str(theme_data.get("name") or fallback_name or path.stem)
+        return _Snapshot(digest, {name: digest}, {name: lambda: theme_data})
+
+    def _pack_snapshot(self, path: Path) -> _Snapshot:
+        """テーマパックの内容ハッシュとテーマごとのハッシュを取得
+
+        文字列テーブルを共有する形式のため、テーマは全て解析して比較します。
+        """
+        with ThemePack(path) as pack:
+            themes = pack.load_all()
+        digest = _digest(path.read_bytes())
+        theme_hashes = {
+            name: _digest(json.dumps(theme, sort_keys=True).encode("utf-8"))
+            for name, theme in themes.items()
+        }
+        loaders = {name: (lambda theme=theme: theme) for name, theme in themes.items()}
+        return _Snapshot(digest, theme_hashes, loaders)
+
+
+def list_theme_files(directory: Union[str, Path]) -> list[Path]:
+    """フォルダ直下のテーマファイルの一覧(隠しファイル・一時ファイルを除く)"""
+    directory = Path(directory)
+    return sorted(
+        path.absolute()
+        for path in directory.iterdir()
+        if path.suffix.lower() in THEME_FILE_SUFFIXES
+        and not path.name.startswith(".")
+        and path.is_file()
+    )
+
+
+class ThemeFileWatcher:
+    """テーマファイルとテーマフォルダのホットリロード監視
+
+    QFileSystemWatcherの通知をdebounce_msミリ秒まとめてから変更を確認します。
+    通知が届かない環境(ネットワークドライブ等)やリネームによる置換で
+    監視が外れた場合に備え、poll_interval_msごとに更新時刻とサイズも確認します。
+    変更はon_changesコールバックへThemeChangesとして通知されます。
+    """
+
+    def __init__(
+        self,
+        on_changes: Callable[[ThemeChanges], None],
+        debounce_ms: int = 50,
+        poll_interval_ms: int = 1000,
+        qt_modules: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """テーマファイル監視を初期化します
+
+        Args:
+            on_changes: 変更内容を受け取るコールバック(GUIスレッドで呼び出される)
+            debounce_ms: 変更通知をまとめる待機時間(ミリ秒)
+            poll_interval_ms: 定期確認の間隔(ミリ秒、0の場合は定期確認しない)
+            qt_modules: Qtモジュール辞書(省略時はQtAdapterで検出)
+        """
+        self.on_changes = on_changes
+        self.logger = get_logger()
+        self.tracker = ThemeFileTracker()
+
+        if qt_modules is None:
+            from qt_theme_studio.adapters.qt_adapter import QtAdapter
+
+            qt_modules = QtAdapter().get_qt_modules()
+        qt_core = qt_modules["QtCore"]
+
+        self._directories: dict[Path, set[Path]] = {}
+        self._dirty_files: set[Path] = set()
+        self._dirty_directories: set[Path] = set()
+
+        self._watcher = qt_core.QFileSystemWatcher()
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._debounce_timer = qt_core.QTimer()
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self.process_pending)
+
+        self._poll_timer = qt_core.QTimer()
+        self._poll_timer.setInterval(poll_interval_ms)
+        self._poll_timer.timeout.connect(self.poll)
+        if poll_interval_ms > 0:
+            self._poll_timer.start()
+
+    def watch_file(
+        self, path: Union[str, Path], fallback_name: Optional[str] = None
+    ) -> None:
+        """読み込み済みのテーマファイルを監視
+
+        Args:
+            path: テーマファイルのパス
+            fallback_name: 単一テーマファイルにテーマ名がない場合に使用する名前
+        """
+        path = Path(path).absolute()
+        if self.tracker.is_tracked(path):
+            return
+        try:
+            self.tracker.track(path, fallback_name)
+        except (OSError, ValueError, ThemePackError) as e:
+            self.logger.warning(f"テーマファイルを監視できません: {path}: {e}")
+            return
+        self._watcher.addPath(str(path))
+        self.logger.debug(f"テーマファイルの監視を開始: {path}")
+
+    def watch_directory(self, directory: Union[str, Path]) -> list[ThemeChanges]:
+        """テーマフォルダを監視し、フォルダ内の既存のテーマを返す
+
+        以後フォルダに追加されたテーマファイルは追加として通知されます。
+
+        Returns:
+            list[ThemeChanges]: 既存のテーマファイルごとの変更内容(全テーマが追加)
+        """
+        directory = Path(directory).absolute()
+        if directory in self._directories:
+            return []
+
+        self._directories[directory] = set()
+        self._watcher.addPath(str(directory))
+        self.logger.debug(f"テーマフォルダの監視を開始: {directory}")
+        return self._scan_directory(directory)
+
+    def stop(self) -> None:
+        """監視を停止"""
+        self._poll_timer.stop()
+        self._debounce_timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def poll(self) -> None:
+        """追跡中のファイルとフォルダを確認(定期確認から呼び出される)"""
+        self._dirty_files.update(self.tracker.tracked_files())
+        self._dirty_directories.update(self._directories)
+        self.process_pending()
+
+    def process_pending(self) -> None:
+        """通知されたファイル・フォルダの変更を確認してコールバックへ通知"""
+        start_time = time.perf_counter()
+        dirty_directories, self._dirty_directories = self._dirty_directories, set()
+
+        results: list[ThemeChanges] = []
+        for directory in dirty_directories:
+            results.extend(self._scan_directory(directory))
+
+        # フォルダの確認で見つかった削除済みファイルも同じ回で処理する
+        dirty_files, self._dirty_files = self._dirty_files, set()
+        for path in dirty_files:
+            changes = self.tracker.check(path)
+            if changes is not None:
+                results.append(changes)
+            self._rewatch(path)
+
+        for changes in results:
+            self.logger.info(f"テーマファイルの変更を検出: {changes!r}")
+            self.on_changes(changes)
+
+        if results:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            self.logger.debug(f"テーマファイルの再読み込み完了({elapsed_ms:.1f}ms)")
+
+    def _on_file_changed(self, path: str) -> None:
+        self._dirty_files.add(Path(path))
+        self._debounce_timer.start()
+
+    def _on_directory_changed(self, path: str) -> None:
+        self._dirty_directories.add(Path(path))
+        self._debounce_timer.start()
+
+    def _rewatch(self, path: Path) -> None:
+        """リネームによる置換で外れた監視を再登録"""
+        if not self.tracker.is_tracked(path):
+            return
+        if str(path) not in self._watcher.files() and path.exists():
+            self._watcher.addPath(str(path))
+
+    def _scan_directory(self, directory: Path) -> list[ThemeChanges]:
+        """フォルダ内の新しいテーマファイルを追跡し、追加として返す"""
+        known = self._directories.get(directory)
+        if known is None:
+            return []
+        try:
+            current = set(list_theme_files(directory))
+        except OSError as e:
+            self.logger.warning(f"テーマフォルダを確認できません: {directory}: {e}")
+            return []
+
+        results = []
+        for path in sorted(current - known):
+            if self.tracker.is_tracked(path):
+                continue
+            try:
+                changes = self.tracker.track(path, load=True)
+            except (OSError, ValueError, ThemePackError) as e:
+                # 作成途中のファイルは次回の確認で再試行する
+                self.logger.debug(f"テーマファイルを読み込めません: {path}: {e}")
+                current.discard(path)
+                continue
+            self._watcher.addPath(str(path))
+            if changes:
+                results.append(changes)
+
+        # 削除されたファイルは個別の確認で削除として通知する
+        self._dirty_files.update(known - current)
+        self._directories[directory] = current
+        return results
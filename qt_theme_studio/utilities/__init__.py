@@ -0,0 +1,42 @@
+"""
+ユーティリティパッケージ
+
+アプリケーション全体で共有される監視・計測・保存などの補助機能を提供します。
+"""
+
+from .autosave import (
+    WriteBehindQueue,
+    atomic_write_bytes,
+    autosave_path,
+    default_autosave_dir,
+    encode_json,
+    get_write_behind_queue,
+)
+from .color_math import DEFAULT_DELTA_E, import_numpy, lab_to_srgb, srgb_to_lab
+from .metrics import (
+    LatencyHistogram,
+    LogHistogram,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+from .ui_watchdog import StallRecord, UIThreadWatchdog, get_ui_watchdog
+
+__all__ = [
+    "DEFAULT_DELTA_E",
+    "LatencyHistogram",
+    "LogHistogram",
+    "MetricsRegistry",
+    "StallRecord",
+    "UIThreadWatchdog",
+    "WriteBehindQueue",
+    "atomic_write_bytes",
+    "autosave_path",
+    "default_autosave_dir",
+    "encode_json",
+    "get_metrics_registry",
+    "get_ui_watchdog",
+    "get_write_behind_queue",
+    "import_numpy",
+    "lab_to_srgb",
+    "srgb_to_lab",
+]
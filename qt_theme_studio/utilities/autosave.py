@@ -0,0 +1,370 @@
+"""
+書き込み遅延(write-behind)保存
+
+ファイル保存をバックグラウンドスレッドで行い、同じパスへの連続した保存要求を
+最新の内容1回にまとめます。書き込みは一時ファイルとos.replaceによる原子的な置換で行い、
+途中で異常終了しても書きかけのファイルが残らないようにします。
+"""
+
+import atexit
+import json
+import os
+import re
+import secrets
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from qt_theme_studio.logger import LogCategory, get_logger
+from qt_theme_studio.utilities.metrics import get_metrics_registry
+
+# 一時ファイル名の衝突時に作成を再試行する回数
+TEMP_FILE_ATTEMPTS = 100
+
+# 自動保存のファイル名に使用できない文字
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w.-]")
+
+
+def default_autosave_dir() -> Path:
+    """編集中のテーマを自動保存する既定の保存先"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA")
+        root = Path(base) if base else Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_DATA_HOME")
+        root = Path(base) if base else Path.home() / ".local" / "share"
+    return root / "qt_theme_studio" / "autosave"
+
+
+def autosave_path(theme_name: str, directory: Union[str, Path, None] = None) -> Path:
+    """テーマの自動保存先のパス(ファイル名に使用できない文字は"_"に置き換える)"""
+    directory = Path(directory) if directory else default_autosave_dir()
+    return directory / f"{_UNSAFE_FILENAME_RE.sub('_', theme_name)}.json"
+
+
+def _fsync_directory(directory: Path) -> None:
+    """ディレクトリのエントリ更新(リネーム)をディスクへ反映"""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _create_temp_file(path: Path) -> tuple[int, str]:
+    """保存先と同じディレクトリに一時ファイルを作成
+
+    新規の場合は通常のファイル作成と同じく0666にumaskを適用した権限で作成し、
+    既存ファイルを置き換える場合はその権限に合わせます。
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode: Optional[int] = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        mode = None
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(TEMP_FILE_ATTEMPTS):
+        temp_name = str(path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            fd = os.open(temp_name, flags, 0o666)
+        except FileExistsError:
+            continue
+        if mode is not None:
+            try:
+                Path(temp_name).chmod(mode)
+            except OSError:
+                os.close(fd)
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+        return fd, temp_name
+    raise FileExistsError(f"一時ファイルを作成できません: {path}")
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes, fsync: bool = True) -> None:
+    """一時ファイルへの書き込みとos.replaceでファイルを原子的に置き換える
+
+    Args:
+        path: 保存先のパス
+        data: 書き込む内容
+        fsync: ディスクへの反映を待つ場合True
+
+    Raises:
+        OSError: 書き込みに失敗した場合(一時ファイルは削除されます)
+    """
+    path = Path(path)
+    fd, temp_name = _create_temp_file(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        Path(temp_name).replace(path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    if fsync:
+        _fsync_directory(path.parent)
+
+
+def encode_json(data: Any) -> bytes:
+    """テーマファイルと同じ書式(インデント2、非ASCIIをそのまま出力)でJSONを符号化"""
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+class WriteBehindQueue:
+    """書き込み遅延保存キュー
+
+    submit()された内容はdelay秒待ってからバックグラウンドスレッドでまとめて書き込みます。
+    待機中に同じパスへ再度submit()された場合は最新の内容のみを書き込みます。
+    一括書き込みでは全ファイルを一時ファイルへ書いてからまとめてfsyncし、
+    os.replaceで置換した後にディレクトリごとに1回だけfsyncします。
+    """
+
+    def __init__(self, delay: float = 0.5, fsync: bool = True) -> None:
+        """書き込み遅延保存キューを初期化します
+
+        Args:
+            delay: 最初の保存要求から書き込みまでの待機時間(秒)
+            fsync: ディスクへの反映を待つ場合True
+        """
+        self.delay = delay
+        self.fsync = fsync
+        self.logger = get_logger()
+
+        self._pending: dict[Path, bytes] = {}
+        self._first_pending_at = 0.0
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._completed = 0
+        self._flush_requested = False
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+        self.errors: list[dict[str, str]] = []
+
+    @property
+    def is_running(self) -> bool:
+        """書き込みスレッドが動作中かどうかを返す"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending_count(self) -> int:
+        """書き込み待ちのファイル数"""
+        with self._condition:
+            return len(self._pending)
+
+    def submit(self, path: Union[str, Path], data: bytes) -> None:
+        """ファイルの保存を要求(すぐに戻り、書き込みはバックグラウンドで行う)
+
+        Args:
+            path: 保存先のパス
+            data: 書き込む内容
+
+        Raises:
+            RuntimeError: close()後に呼び出した場合
+        """
+        path = Path(path).absolute()
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("書き込み遅延保存キューは終了しています")
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            if path in self._pending:
+                self.stats["coalesced"] += 1
+            self._pending[path] = data
+            self._submitted += 1
+            self.stats["submitted"] += 1
+            self._ensure_thread()
+            self._condition.notify_all()
+
+    def submit_json(self, path: Union[str, Path], data: Any) -> None:
+        """JSONデータの保存を要求
+
+        データは呼び出し時点で符号化されるため、呼び出し後に元のデータを
+        変更しても保存内容には影響しません。
+        """
+        self.submit(path, encode_json(data))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """待機中の保存をすぐに書き込み、完了まで待つ
+
+        Args:
+            timeout: 最大待機時間(秒、Noneの場合は無制限)
+
+        Returns:
+            bool: 時間内に全ての保存が完了した場合True
+        """
+        with self._condition:
+            target = self._submitted
+            if self._completed >= target:
+                return True
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: self._completed >= target, timeout=timeout
+            )
+
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """待機中の保存を書き込んでから書き込みスレッドを終了
+
+        Returns:
+            bool: 時間内に全ての保存が完了した場合True
+        """
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        if not flushed:
+            self.logger.error(
+                f"終了時に保存が完了しませんでした: {self.pending_count}件",
+                LogCategory.PERFORMANCE,
+            )
+        return flushed
+
+    def _ensure_thread(self) -> None:
+        """書き込みスレッドを起動(ロック取得中に呼び出すこと)"""
+        if self.is_running:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="write-behind-saver", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """書き込みスレッドのメインループ"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closing)
+                if not self._pending:
+                    return
+
+                # 最初の要求からdelay秒待ち、その間の要求を1回の書き込みにまとめる
+                while not (self._flush_requested or self._closing):
+                    remaining = self._first_pending_at + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._pending
+                batch_sequence = self._submitted
+                self._pending = {}
+                self._flush_requested = False
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                self.logger.error(f"一括保存中に予期しないエラーが発生しました: {e}")
+            finally:
+                with self._condition:
+                    self._completed = batch_sequence
+                    self._condition.notify_all()
+
+    def _write_batch(self, batch: dict[Path, bytes]) -> None:
+        """ファイルをまとめて原子的に書き込む"""
+        start_time = time.perf_counter()
+        staged: list[tuple[Path, str]] = []
+        failed = 0
+
+        # 全ファイルを一時ファイルへ書き込んでから、まとめてfsyncする
+        opened: list[tuple[Path, str, Any]] = []
+        for path, data in batch.items():
+            try:
+                fd, temp_name = _create_temp_file(path)
+            except OSError as e:
+                failed += 1
+                self._record_error(path, e)
+                continue
+            f = os.fdopen(fd, "wb")
+            try:
+                f.write(data)
+                f.flush()
+            except OSError as e:
+                failed += 1
+                self._record_error(path, e)
+                f.close()
+                Path(temp_name).unlink(missing_ok=True)
+                continue
+            opened.append((path, temp_name, f))
+
+        for path, temp_name, f in opened:
+            try:
+                if self.fsync:
+                    os.fsync(f.fileno())
+                f.close()
+                staged.append((path, temp_name))
+            except OSError as e:
+                failed += 1
+                self._record_error(path, e)
+                f.close()
+                Path(temp_name).unlink(missing_ok=True)
+
+        directories = set()
+        written = 0
+        for path, temp_name in staged:
+            try:
+                Path(temp_name).replace(path)
+                directories.add(path.parent)
+                written += 1
+            except OSError as e:
+                failed += 1
+                self._record_error(path, e)
+                Path(temp_name).unlink(missing_ok=True)
+
+        if self.fsync:
+            for directory in directories:
+                _fsync_directory(directory)
+
+        duration = time.perf_counter() - start_time
+        self.stats["batches"] += 1
+        self.stats["written"] += written
+        self.stats["failed"] += failed
+
+        registry = get_metrics_registry()
+        registry.inc(
+            "autosave_files_written_total",
+            written,
+            description="書き込み遅延保存で書き込んだファイル数",
+        )
+        registry.observe_duration("autosave.write_batch", duration)
+        self.logger.debug(
+            f"{written}件のファイルを保存しました({duration * 1000:.1f}ms)"
+        )
+
+    def _record_error(self, path: Path, error: OSError) -> None:
+        """書き込みエラーを記録"""
+        self.errors.append({"path": str(path), "error": str(error)})
+        self.logger.error(f"ファイルの保存に失敗しました: {path}: {error}")
+
+
+# グローバル保存キューインスタンス
+_global_queue: Optional[WriteBehindQueue] = None
+
+
+def get_write_behind_queue() -> WriteBehindQueue:
+    """書き込み遅延保存キューインスタンスを取得(プロセス終了時に自動でflush)"""
+    global _global_queue
+    if _global_queue is None:
+        _global_queue = WriteBehindQueue()
+        atexit.register(_global_queue.close)
+    return _global_queue
@@ -0,0 +1,78 @@
+"""
+色の計算
+
+sRGBとCIE L*a*b*の相互変換と、知覚的な色差(CIE76のΔE)の目安を提供します。
+視覚回帰テスト・画像からのパレット抽出・色の索引で共有します。
+
+配列の計算にはNumPyが必要です(pip install qt-theme-studio[optimize])。
+"""
+
+from typing import Any
+
+# 知覚できる色差の目安(ΔE≒2.3が丁度可知差異)
+DEFAULT_DELTA_E = 2.3
+
+# sRGB(D65) → XYZの変換行列と白色点
+_RGB_TO_XYZ = (
+    (0.4124564, 0.3575761, 0.1804375),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339, 0.1191920, 0.9503041),
+)
+_WHITE_POINT = (0.95047, 1.0, 1.08883)
+
+
+def import_numpy(extra: str = "optimize", feature: str = "この機能") -> Any:
+    """NumPyをインポート(未インストールの場合は分かりやすいエラー)
+
+    Args:
+        extra: インストールを案内する追加依存関係の名前(例: "visual")
+        feature: エラーメッセージに表示する機能の名前
+
+    Raises:
+        ImportError: NumPyがインストールされていない場合
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            f"{feature}にはNumPyが必要です。"
+            "以下のコマンドでインストールしてください:\n"
+            f"pip install qt-theme-studio[{extra}]"
+        ) from e
+    return numpy
+
+
+def srgb_to_lab(rgb: Any) -> Any:
+    """sRGB(0〜255)の配列(..., 3)をCIE L*a*b*へ変換"""
+    np = import_numpy(feature="色の変換")
+    linear = rgb.astype(np.float32) / 255.0
+    linear = np.where(
+        linear <= 0.04045, linear / 12.92, ((linear + 0.055) / 1.055) ** 2.4
+    )
+    xyz = linear @ np.asarray(_RGB_TO_XYZ, dtype=np.float32).T
+    xyz /= np.asarray(_WHITE_POINT, dtype=np.float32)
+
+    epsilon = (6 / 29) ** 3
+    f = np.where(xyz > epsilon, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    lightness = 116 * f[..., 1] - 16
+    a = 500 * (f[..., 0] - f[..., 1])
+    b = 200 * (f[..., 1] - f[..., 2])
+    return np.stack((lightness, a, b), axis=-1)
+
+
+def lab_to_srgb(lab: Any) -> Any:
+    """CIE L*a*b*の配列(..., 3)をsRGB(0〜255、範囲外は切り詰め)の配列へ変換"""
+    np = import_numpy(feature="色の変換")
+    lab = np.asarray(lab, dtype=np.float32)
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack((fy + lab[..., 1] / 500, fy, fy - lab[..., 2] / 200), axis=-1)
+
+    delta = 6 / 29
+    xyz = np.where(f > delta, f**3, 3 * delta**2 * (f - 4 / 29))
+    xyz *= np.asarray(_WHITE_POINT, dtype=np.float32)
+    linear = xyz @ np.linalg.inv(np.asarray(_RGB_TO_XYZ, dtype=np.float32)).T
+    linear = np.clip(linear, 0.0, 1.0)
+    rgb = np.where(
+        linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055
+    )
+    return np.clip(np.round(rgb * 255), 0, 255).astype(np.uint8)
@@ -0,0 +1,455 @@
+"""
+プロセス内メトリクスレジストリ
+
+カウンター・ゲージ・レイテンシヒストグラムを集計し、
+Prometheusテキスト形式でファイルまたはHTTPエンドポイントへ出力します。
+"""
+
+import bisect
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# Prometheus出力用のバケット境界(秒)
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[dict[str, str]]) -> LabelKey:
+    """ラベル辞書をソート済みのキーに変換"""
+    if not labels:
+        return ()
+    return tuple(sorted((str(key), str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[tuple[str, str]] = None) -> str:
+    """Prometheus形式のラベル文字列を生成"""
+    pairs = list(key)
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        name
+        + '="'
+        + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        + '"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Prometheus形式の数値文字列を生成"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class LogHistogram:
+    """対数バケットヒストグラム(HDRヒストグラム方式)
+
+    値を相対精度 precision の対数バケットに分類して件数のみを保持します。
+    バケットは疎な辞書で保持されるため、マージやJSON化が軽量に行えます。
+    """
+
+    def __init__(self, precision: float = 0.01, min_value: float = 1e-6) -> None:
+        """
+        ヒストグラムを初期化
+
+        Args:
+            precision: バケットの相対精度(0.01 = 1%)
+            min_value: 記録する最小値(これ以下は最小バケットに集約)
+        """
+        self.precision = precision
+        self.min_value = min_value
+        self._log_base = math.log1p(precision)
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _bucket_index(self, value: float) -> int:
+        """値のバケット番号を計算"""
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_base) + 1
+
+    def _bucket_value(self, index: int) -> float:
+        """バケットの代表値(幾何中央値)を計算"""
+        if index <= 0:
+            return self.min_value
+        lower = self.min_value * math.exp((index - 1) * self._log_base)
+        return lower * math.sqrt(1.0 + self.precision)
+
+    def record(self, value: float, count: int = 1) -> None:
+        """値を記録"""
+        index = self._bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LogHistogram") -> None:
+        """別のヒストグラムを統合"""
+        if other.precision != self.precision or other.min_value != self.min_value:
+            raise ValueError("精度の異なるヒストグラムは統合できません")
+
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        """平均値"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """パーセンタイル値を取得(q: 0〜100)"""
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        cumulative = 0
+        for index in sorted(self.buckets):
+            cumulative += self.buckets[index]
+            if cumulative >= rank:
+                # 代表値は実測の最小・最大値の範囲内に収める
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """統計サマリーを取得"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """辞書形式に変換"""
+        return {
+            "precision": self.precision,
+            "min_value": self.min_value,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LogHistogram":
+        """辞書形式から復元"""
+        histogram = cls(data.get("precision", 0.01), data.get("min_value", 1e-6))
+        histogram.buckets = {
+            int(index): count for index, count in data.get("buckets", {}).items()
+        }
+        histogram.count = data.get("count", 0)
+        histogram.total = data.get("total", 0.0)
+        histogram.min = data["min"] if data.get("min") is not None else math.inf
+        histogram.max = data.get("max", 0.0)
+        return histogram
+
+
+class LatencyHistogram(LogHistogram):
+    """レイテンシヒストグラム
+
+    対数バケットに加えてPrometheus出力用の固定バケットを保持します。
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        precision: float = 0.01,
+        min_value: float = 1e-6,
+    ) -> None:
+        super().__init__(precision, min_value)
+        self.bounds = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+
+    @property
+    def sum(self) -> float:
+        """記録した値の合計"""
+        return self.total
+
+    def record(self, value: float, count: int = 1) -> None:
+        """値を記録"""
+        self.bucket_counts[bisect.bisect_left(self.bounds, value)] += count
+        super().record(value, count)
+
+    def observe(self, value: float) -> None:
+        """値を記録"""
+        self.record(value)
+
+    def snapshot(self) -> dict[str, float]:
+        """統計情報を取得"""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class MetricFamily:
+    """同名メトリクス(ラベル違い)の集合"""
+
+    def __init__(self, name: str, metric_type: str, description: str) -> None:
+        self.name = name
+        self.type = metric_type
+        self.description = description
+        self.series: dict[LabelKey, Any] = {}
+
+
+class MetricsRegistry:
+    """メトリクスレジストリクラス
+
+    スレッドセーフにカウンター・ゲージ・ヒストグラムを記録します。
+    メトリクス名には自動的にプレフィックスが付与されます。
+    """
+
+    def __init__(self, prefix: str = "qt_theme_studio") -> None:
+        self.prefix = prefix
+        self._families: dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+        self._http_server: Optional[Any] = None
+
+    def _family(self, name: str, metric_type: str, description: str) -> MetricFamily:
+        """メトリクスファミリーを取得(存在しない場合は作成)"""
+        full_name = f"{self.prefix}_{name}" if self.prefix else name
+        family = self._families.get(full_name)
+        if family is None:
+            family = MetricFamily(full_name, metric_type, description)
+            self._families[full_name] = family
+        elif family.type != metric_type:
+            raise ValueError(
+                f"メトリクス {full_name} は {family.type} として登録済みです"
+            )
+        return family
+
+    def inc(
+        self,
+        name: str,
+        amount: float = 1.0,
+        labels: Optional[dict[str, str]] = None,
+        description: str = "",
+    ) -> None:
+        """カウンターを加算"""
+        with self._lock:
+            family = self._family(name, "counter", description)
+            key = _label_key(labels)
+            family.series[key] = family.series.get(key, 0.0) + amount
+
+    def set_gauge(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[dict[str, str]] = None,
+        description: str = "",
+    ) -> None:
+        """ゲージを設定"""
+        with self._lock:
+            family = self._family(name, "gauge", description)
+            family.series[_label_key(labels)] = float(value)
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[dict[str, str]] = None,
+        description: str = "",
+    ) -> None:
+        """ヒストグラムに値を記録"""
+        with self._lock:
+            family = self._family(name, "histogram", description)
+            key = _label_key(labels)
+            histogram = family.series.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram()
+                family.series[key] = histogram
+            histogram.observe(value)
+
+    def observe_duration(self, operation: str, duration: float) -> None:
+        """操作の所要時間(秒)を記録"""
+        self.observe(
+            "operation_duration_seconds",
+            duration,
+            {"operation": operation},
+            "操作の所要時間(秒)",
+        )
+
+    @contextmanager
+    def time(self, operation: str) -> Iterator[None]:
+        """操作の所要時間をperf_counter_nsで計測して記録"""
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.observe_duration(operation, (time.perf_counter_ns() - start_ns) / 1e9)
+
+    def get_percentiles(self, operation: str) -> dict[str, float]:
+        """操作の所要時間統計(p50/p95/p99など)を取得"""
+        with self._lock:
+            family = self._families.get(f"{self.prefix}_operation_duration_seconds")
+            if family is None:
+                return LatencyHistogram().snapshot()
+            histogram = family.series.get(_label_key({"operation": operation}))
+            if histogram is None:
+                return LatencyHistogram().snapshot()
+            return histogram.snapshot()
+
+    def snapshot(self) -> dict[str, Any]:
+        """全メトリクスのスナップショットを取得"""
+        result: dict[str, Any] = {}
+        with self._lock:
+            for name, family in self._families.items():
+                series = []
+                for key, value in family.series.items():
+                    entry: dict[str, Any] = {"labels": dict(key)}
+                    if isinstance(value, LatencyHistogram):
+                        entry.update(value.snapshot())
+                    else:
+                        entry["value"] = value
+                    series.append(entry)
+                result[name] = {"type": family.type, "series": series}
+        return result
+
+    def reset(self) -> None:
+        """全メトリクスを破棄"""
+        with self._lock:
+            self._families.clear()
+
+    def to_prometheus_text(self) -> str:
+        """Prometheusテキスト形式で出力"""
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._families):
+                family = self._families[name]
+                if family.description:
+                    lines.append(f"# HELP {name} {family.description}")
+                lines.append(f"# TYPE {name} {family.type}")
+
+                for key in sorted(family.series):
+                    value = family.series[key]
+                    if isinstance(value, LatencyHistogram):
+                        lines.extend(self._format_histogram(name, key, value))
+                    else:
+                        lines.append(
+                            f"{name}{_format_labels(key)} {_format_value(value)}"
+                        )
+        return "\n".join(lines) + "\n"
+
+    def _format_histogram(
+        self, name: str, key: LabelKey, histogram: LatencyHistogram
+    ) -> list[str]:
+        """ヒストグラムをPrometheus形式の行に変換"""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(histogram.bounds, histogram.bucket_counts):
+            cumulative += count
+            labels = _format_labels(key, ("le", _format_value(bound)))
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(key, ("le", "+Inf"))
+        lines.append(f"{name}_bucket{labels} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+        lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return lines
+
+    def export_prometheus(self, output_file: Union[str, Path]) -> bool:
+        """Prometheusテキスト形式でファイルに出力
+
+        node_exporterのtextfileコレクターで読み込めるよう、一時ファイル経由で置き換えます。
+        """
+        try:
+            output_path = Path(output_file)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+            temp_path.write_text(self.to_prometheus_text(), encoding="utf-8")
+            temp_path.replace(output_path)
+            return True
+        except OSError:
+            return False
+
+    def start_http_server(self, port: int = 9464, host: str = "127.0.0.1") -> Any:
+        """/metrics エンドポイントをバックグラウンドで公開"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        if self._http_server is not None:
+            return self._http_server
+
+        registry = self
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # アクセスログは出力しない
+                pass
+
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        thread = threading.Thread(
+            target=server.serve_forever, name="metrics-http", daemon=True
+        )
+        thread.start()
+        self._http_server = server
+        return server
+
+    def stop_http_server(self) -> None:
+        """/metrics エンドポイントを停止"""
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+
+# グローバルレジストリインスタンス
+_global_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """メトリクスレジストリインスタンスを取得"""
+    global _global_registry
+    if _global_registry is None:
+        _global_registry = MetricsRegistry()
+    return _global_registry
@@ -0,0 +1,286 @@
+"""
+UIスレッド監視(イベントループ停止検出)
+
+監視スレッドからQtイベントループへハートビートイベントを送信し、
+一定時間内に処理されなかった場合にGUIスレッドのPythonスタックを取得して
+停止(ストール)として記録します。
+"""
+
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from qt_theme_studio.logger import LogCategory, get_logger
+
+
+class StallRecord:
+    """イベントループ停止の記録
+
+    started_atは応答のなかったハートビートの送信時刻で、
+    started_atからduration秒後にGUIスレッドが応答を再開しています。
+    """
+
+    def __init__(
+        self,
+        started_at: datetime,
+        duration: float,
+        stack: list[str],
+        location: str,
+    ) -> None:
+        self.started_at = started_at
+        self.duration = duration
+        self.stack = stack
+        self.location = location
+
+    def to_dict(self) -> dict[str, Any]:
+        """辞書形式で停止記録を取得"""
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration": self.duration,
+            "location": self.location,
+            "stack": self.stack,
+        }
+
+
+class UIThreadWatchdog:
+    """UIスレッド監視クラス
+
+    ハートビートはQCoreApplication.postEventでGUIスレッドのレシーバーに届けられます。
+    閾値を超えても応答がない場合はsys._current_frames()でGUIスレッドの
+    実行中スタックを取得し、PERFORMANCEカテゴリでログに記録します。
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.2,
+        interval: float = 0.1,
+        qt_modules: Optional[dict[str, Any]] = None,
+        max_records: int = 200,
+        stack_depth: int = 15,
+    ) -> None:
+        """UIスレッド監視を初期化します
+
+        Args:
+            threshold: 停止と判定するハートビート遅延(秒)
+            interval: ハートビート送信間隔(秒)
+            qt_modules: Qtモジュール辞書(省略時はQtAdapterで検出)
+            max_records: 保持する停止記録の最大数
+            stack_depth: 記録するスタックフレーム数
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.max_records = max_records
+        self.stack_depth = stack_depth
+        self.logger = get_logger()
+
+        if qt_modules is None:
+            from qt_theme_studio.adapters.qt_adapter import QtAdapter
+
+            qt_modules = QtAdapter().get_qt_modules()
+        self.QtCore = qt_modules["QtCore"]
+
+        # 停止記録と集計
+        self.records: list[StallRecord] = []
+        self._aggregates: dict[str, dict[str, Any]] = {}
+        self._total_stalls = 0
+        self._total_stall_time = 0.0
+        self._max_stall = 0.0
+        self._lock = threading.Lock()
+
+        # ハートビート状態
+        self._sequence = 0
+        self._acked_sequence = 0
+        self._ack_time = 0.0
+        self._ack_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._gui_thread_id: Optional[int] = None
+        self._receiver: Optional[Any] = None
+        self._event_type: Optional[Any] = None
+
+    @property
+    def is_running(self) -> bool:
+        """監視中かどうかを返す"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """監視を開始します(GUIスレッドから呼び出すこと)"""
+        if self.is_running:
+            return
+
+        self._gui_thread_id = threading.get_ident()
+        self._receiver, self._event_type = self._create_receiver()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="ui-thread-watchdog", daemon=True
+        )
+        self._thread.start()
+
+        self.logger.info(
+            f"UIスレッド監視を開始しました(閾値: {self.threshold * 1000:.0f}ms)",
+            LogCategory.PERFORMANCE,
+        )
+
+    def stop(self) -> None:
+        """監視を停止し、集計レポートをログに出力します"""
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._ack_event.set()
+        self._thread.join(timeout=self.threshold + self.interval + 1.0)
+        self._thread = None
+
+        report = self.get_stall_report()
+        self.logger.info(
+            f"UIスレッド監視を停止しました: 停止{report['total_stalls']}回 "
+            f"(合計 {report['total_stall_time']:.3f}秒)",
+            LogCategory.PERFORMANCE,
+            performance_data=report,
+        )
+
+    def _create_receiver(self) -> tuple[Any, Any]:
+        """ハートビートを受け取るQObjectを作成"""
+        qt_core = self.QtCore
+        event_type = qt_core.QEvent.Type(qt_core.QEvent.registerEventType())
+        watchdog = self
+
+        class _HeartbeatReceiver(qt_core.QObject):  # type: ignore[misc, name-defined]
+            """GUIスレッドでハートビートに応答するレシーバー"""
+
+            def event(self, event: Any) -> bool:
+                if event.type() == event_type:
+                    watchdog._acknowledge()
+                    return True
+                return bool(super().event(event))
+
+        return _HeartbeatReceiver(), event_type
+
+    def _acknowledge(self) -> None:
+        """GUIスレッドでハートビートを受信"""
+        self._acked_sequence = self._sequence
+        self._ack_time = time.perf_counter()
+        self._ack_event.set()
+
+    def _run(self) -> None:
+        """監視スレッドのメインループ"""
+        while not self._stop_event.is_set():
+            self._sequence += 1
+            self._ack_event.clear()
+            sent_at = time.perf_counter()
+            heartbeat_at = datetime.now()
+            self.QtCore.QCoreApplication.postEvent(
+                self._receiver, self.QtCore.QEvent(self._event_type)
+            )
+
+            if not self._ack_event.wait(self.threshold):
+                # 閾値超過: ブロック中のGUIスレッドのスタックを取得
+                stack = self._capture_gui_stack()
+                while not self._ack_event.wait(self.interval):
+                    if self._stop_event.is_set():
+                        return
+
+                if self._stop_event.is_set():
+                    return
+                self._record_stall(heartbeat_at, self._ack_time - sent_at, stack)
+
+            self._stop_event.wait(self.interval)
+
+    def _capture_gui_stack(self) -> list[str]:
+        """GUIスレッドの現在のスタックを取得"""
+        frame = sys._current_frames().get(self._gui_thread_id or 0)
+        if frame is None:
+            return []
+
+        summary = traceback.extract_stack(frame)[-self.stack_depth :]
+        return [f"{entry.filename}:{entry.lineno} in {entry.name}" for entry in summary]
+
+    def _stall_location(self, stack: list[str]) -> str:
+        """停止箇所(アプリケーション内の最も内側のフレーム)を特定"""
+        for entry in reversed(stack):
+            if "qt_theme_studio" in entry and "ui_watchdog" not in entry:
+                return entry
+        return stack[-1] if stack else "unknown"
+
+    def _record_stall(
+        self, started_at: datetime, duration: float, stack: list[str]
+    ) -> None:
+        """停止を記録してログに出力"""
+        location = self._stall_location(stack)
+        record = StallRecord(started_at, duration, stack, location)
+
+        with self._lock:
+            self.records.append(record)
+            if len(self.records) > self.max_records:
+                self.records.pop(0)
+
+            self._total_stalls += 1
+            self._total_stall_time += duration
+            self._max_stall = max(self._max_stall, duration)
+
+            aggregate = self._aggregates.setdefault(
+                location, {"count": 0, "total_time": 0.0, "max_time": 0.0}
+            )
+            aggregate["count"] += 1
+            aggregate["total_time"] += duration
+            aggregate["max_time"] = max(aggregate["max_time"], duration)
+
+        self.logger.warning(
+            f"UIスレッドが停止しました: {duration * 1000:.0f}ms - {location}",
+            LogCategory.PERFORMANCE,
+            performance_data={
+                "operation": "ui_thread_stall",
+                "duration": duration,
+                **record.to_dict(),
+            },
+        )
+
+    def get_stall_report(self) -> dict[str, Any]:
+        """停止の集計レポートを取得"""
+        with self._lock:
+            locations = [
+                {"location": location, **aggregate}
+                for location, aggregate in self._aggregates.items()
+            ]
+            report: dict[str, Any] = {
+                "threshold": self.threshold,
+                "total_stalls": self._total_stalls,
+                "total_stall_time": round(self._total_stall_time, 6),
+                "max_stall_time": round(self._max_stall, 6),
+                "locations": sorted(
+                    locations, key=lambda item: item["total_time"], reverse=True
+                ),
+                "recent_stalls": [record.to_dict() for record in self.records[-10:]],
+            }
+        return report
+
+    def export_stall_report(self, output_file: Union[str, Path]) -> bool:
+        """停止の集計レポートをJSONファイルにエクスポート"""
+        import json
+
+        try:
+            output_path = Path(output_file)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("w", encoding="utf-8") as f:
+                json.dump(self.get_stall_report(), f, ensure_ascii=False, indent=2)
+            return True
+        except Exception as e:
+            self.logger.error(f"停止レポートのエクスポートに失敗: {e}")
+            return False
+
+
+# グローバル監視インスタンス
+_global_watchdog: Optional[UIThreadWatchdog] = None
+
+
+def get_ui_watchdog(threshold: float = 0.2) -> UIThreadWatchdog:
+    """UIスレッド監視インスタンスを取得"""
+    global _global_watchdog
+    if _global_watchdog is None:
+        _global_watchdog = UIThreadWatchdog(threshold=threshold)
+    return _global_watchdog
@@ -0,0 +1,48 @@
+"""
+検証パッケージ
+
+宣言的なテーマスキーマのコンパイル・検証と、テーマファイルの一括検証、
+描画の視覚回帰テストを提供します。
+"""
+
+from .batch import (
+    map_theme_files,
+    validate_theme_file,
+    validate_theme_files,
+    write_ndjson,
+)
+from .theme_schema import (
+    CompiledSchema,
+    ValidationIssue,
+    ValidationResult,
+    compile_schema,
+    get_validator,
+    is_valid_color,
+)
+from .visual_regression import (
+    ImageDiff,
+    check_visual_regression,
+    check_visual_regressions,
+    compare_images,
+    qimage_to_array,
+    render_showcase,
+)
+
+__all__ = [
+    "CompiledSchema",
+    "ImageDiff",
+    "ValidationIssue",
+    "ValidationResult",
+    "check_visual_regression",
+    "check_visual_regressions",
+    "compare_images",
+    "compile_schema",
+    "get_validator",
+    "is_valid_color",
+    "map_theme_files",
+    "qimage_to_array",
+    "render_showcase",
+    "validate_theme_file",
+    "validate_theme_files",
+    "write_ndjson",
+]
@@ -0,0 +1,161 @@
+"""
+テーマファイル一括検証
+
+多数のテーマファイルをプロセスプールで並列に検証し、
+1ファイル1行のNDJSON形式で結果をストリーミング出力します。
+"""
+
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import IO, Any, Callable, Optional, Union
+
+from .theme_schema import ERROR, get_validator
+
+# これ未満のファイル数ではプロセス起動コストが上回るため逐次実行する
+PARALLEL_THRESHOLD = 16
+
+# ワーカーへ一度に渡すファイル数の上限
+MAX_CHUNKSIZE = 64
+
+
+def validate_theme_file(
+    path: Union[str, Path], schema: str = "theme"
+) -> dict[str, Any]:
+    """テーマファイルを1件読み込んで検証
+
+    読み込みやJSON解析に失敗した場合も例外は送出せず、
+    code="load"のエラーとして結果に含めます。
+
+    Args:
+        path: テーマファイルのパス
+        schema: 使用するスキーマ名
+
+    Returns:
+        dict[str, Any]: 検証結果
+                - 'file': str - ファイルパス
+                - 'is_valid': bool - 検証が成功したかどうか
+                - 'errors': List[dict] - エラーのリスト
+                - 'warnings': List[dict] - 警告のリスト
+                - 'elapsed_ms': float - 処理時間(ミリ秒)
+    """
+    start_time = time.perf_counter()
+    record: dict[str, Any] = {"file": str(path)}
+
+    try:
+        with Path(path).open("rb") as f:
+            theme_data = json.loads(f.read())
+    except (OSError, ValueError) as e:
+        record.update(
+            is_valid=False,
+            errors=[
+                {
+                    "path": "",
+                    "code": "load",
+                    "severity": ERROR,
+                    "message": f"テーマファイルの読み込みに失敗しました: {e}",
+                }
+            ],
+            warnings=[],
+        )
+    else:
+        result = get_validator(schema).validate(theme_data)
+        record.update(
+            is_valid=result.is_valid,
+            errors=[issue.to_dict() for issue in result.errors],
+            warnings=[issue.to_dict() for issue in result.warnings],
+        )
+
+    record["elapsed_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+    return record
+
+
+def _default_workers() -> int:
+    """CPU数に基づくデフォルトのワーカー数"""
+    return os.cpu_count() or 1
+
+
+def map_theme_files(
+    func: Callable[[str], dict[str, Any]],
+    paths: Iterable[Union[str, Path]],
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[dict[str, Any]]:
+    """ファイルごとの処理をプロセスプールで並列実行し、入力順に結果を返すイテレーター
+
+    ファイル数が少ない場合やmax_workers=1の場合は現在のプロセスで逐次実行します。
+    並列実行する場合、funcはpickle可能なモジュールレベル関数
+    (またはそのfunctools.partial)である必要があります。
+
+    Args:
+        func: ファイルパスを受け取り結果の辞書を返す関数
+        paths: テーマファイルのパス
+        max_workers: ワーカープロセス数(デフォルト: CPU数)
+        chunksize: ワーカーへ一度に渡すファイル数(デフォルト: 自動)
+
+    Yields:
+        dict[str, Any]: funcの結果
+    """
+    paths = [str(path) for path in paths]
+    workers = min(max_workers or _default_workers(), len(paths))
+    if workers <= 1 or len(paths) < PARALLEL_THRESHOLD:
+        for path in paths:
+            yield func(path)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, min(MAX_CHUNKSIZE, len(paths) // (workers * 4)))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, paths, chunksize=chunksize)
+
+
+def validate_theme_files(
+    paths: Iterable[Union[str, Path]],
+    schema: str = "theme",
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[dict[str, Any]]:
+    """複数のテーマファイルを検証し、入力順に結果を返すイテレーター
+
+    各ワーカープロセスはスキーマを一度だけコンパイルして再利用します。
+
+    Args:
+        paths: テーマファイルのパス
+        schema: 使用するスキーマ名
+        max_workers: ワーカープロセス数(デフォルト: CPU数)
+        chunksize: ワーカーへ一度に渡すファイル数(デフォルト: 自動)
+
+    Yields:
+        dict[str, Any]: validate_theme_file()の結果
+    """
+    # 未知のスキーマ名はワーカー起動前に検出する
+    get_validator(schema)
+    return map_theme_files(
+        partial(validate_theme_file, schema=schema), paths, max_workers, chunksize
+    )
+
+
+def write_ndjson(records: Iterable[dict[str, Any]], stream: IO[str]) -> dict[str, int]:
+    """検証結果をNDJSON形式で1件ずつ書き出す
+
+    Args:
+        records: 検証結果のイテラブル
+        stream: 出力先のテキストストリーム
+
+    Returns:
+        dict[str, int]: 集計('files', 'valid', 'invalid', 'errors', 'warnings')
+    """
+    summary = {"files": 0, "valid": 0, "invalid": 0, "errors": 0, "warnings": 0}
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        summary["files"] += 1
+        summary["valid" if record["is_valid"] else "invalid"] += 1
+        summary["errors"] += len(record["errors"])
+        summary["warnings"] += len(record["warnings"])
+    stream.flush()
+    return summary
@@ -0,0 +1,479 @@
+"""
+テーマスキーマ検証
+
+宣言的なテーマスキーマを検証関数にコンパイルし、構造化された検証結果を返します。
+スキーマはコンパイル時にフィールドごとのクロージャへ一度だけ変換され、
+色値の判定には事前コンパイル済みの正規表現を使用します。
+"""
+
+import re
+from functools import cache
+from typing import Any, Callable, Optional
+
+ERROR = "error"
+WARNING = "warning"
+
+# 色値判定用の事前コンパイル済み正規表現
+_HEX_COLOR_RE = re.compile(r"#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+_RGB_COLOR_RE = re.compile(
+    r"rgba?\(\s*[\d.]+%?\s*(?:,\s*[\d.]+%?\s*){2,3}\)", re.IGNORECASE
+)
+
+NAMED_COLORS = frozenset(
+    {
+        "black",
+        "white",
+        "red",
+        "green",
+        "blue",
+        "yellow",
+        "cyan",
+        "magenta",
+        "gray",
+        "grey",
+        "darkgray",
+        "darkgrey",
+        "lightgray",
+        "lightgrey",
+        "transparent",
+    }
+)
+
+# 既定のエラーメッセージ(スキーマの"messages"で上書き可能)
+DEFAULT_MESSAGES = {
+    "missing": "必須フィールドが不足しています: {path}",
+    "recommended": "推奨フィールドが設定されていません: {path}",
+    "type": "{path} の型が不正です(期待: {expected})",
+    "empty": "{path} は空にできません",
+    "color": "無効な色値が検出されました: {path} = {value}",
+    "pattern": "{path} の形式が不正です: {value}",
+    "range": "{path} が範囲外です: {value}",
+}
+
+_TYPE_CHECKS: dict[str, tuple[Any, str]] = {
+    "object": (dict, "オブジェクト"),
+    "array": (list, "配列"),
+    "string": (str, "文字列"),
+    "number": ((int, float), "数値"),
+    "integer": (int, "整数"),
+    "boolean": (bool, "真偽値"),
+}
+
+# 検証関数: (値, パス, 問題リスト) -> Falseの場合は後続の検証を打ち切る
+Checker = Callable[[Any, str, list["ValidationIssue"]], Optional[bool]]
+
+
+def is_valid_color(value: Any) -> bool:
+    """色値(#RGB/#RRGGBB/#RRGGBBAA、rgb()/rgba()、基本色名)が有効か判定"""
+    if not isinstance(value, str):
+        return False
+    value = value.strip()
+    if value.startswith("#"):
+        return _HEX_COLOR_RE.fullmatch(value) is not None
+    if value[:3].lower() == "rgb":
+        return _RGB_COLOR_RE.fullmatch(value) is not None
+    return value.lower() in NAMED_COLORS
+
+
+class ValidationIssue:
+    """検証で検出された問題"""
+
+    __slots__ = ("code", "message", "path", "severity", "value")
+
+    def __init__(
+        self, path: str, code: str, message: str, severity: str, value: Any = None
+    ) -> None:
+        self.path = path
+        self.code = code
+        self.message = message
+        self.severity = severity
+        self.value = value
+
+    def to_dict(self) -> dict[str, Any]:
+        """辞書形式で問題を取得"""
+        return {
+            "path": self.path,
+            "code": self.code,
+            "severity": self.severity,
+            "message": self.message,
+        }
+
+    def __repr__(self) -> str:
+        return f"ValidationIssue({self.severity}, {self.path!r}, {self.code!r})"
+
+
+class ValidationResult:
+    """スキーマ検証の結果"""
+
+    def __init__(self, issues: list[ValidationIssue]) -> None:
+        self.issues = issues
+        self.errors = [issue for issue in issues if issue.severity == ERROR]
+        self.warnings = [issue for issue in issues if issue.severity == WARNING]
+
+    @property
+    def is_valid(self) -> bool:
+        """エラーが1件もない場合True"""
+        return not self.errors
+
+    @property
+    def error_messages(self) -> list[str]:
+        """エラーメッセージのリスト"""
+        return [issue.message for issue in self.errors]
+
+    @property
+    def warning_messages(self) -> list[str]:
+        """警告メッセージのリスト"""
+        return [issue.message for issue in self.warnings]
+
+    def to_dict(self) -> dict[str, Any]:
+        """従来の検証結果と互換の辞書形式で結果を取得
+
+        Returns: dict[str, Any]: 検証結果
+                - 'is_valid': bool - 検証が成功したかどうか
+                - 'errors': List[str] - エラーメッセージのリスト
+                - 'warnings': List[str] - 警告メッセージのリスト
+                - 'issues': List[dict] - 構造化された問題のリスト
+        """
+        return {
+            "is_valid": self.is_valid,
+            "errors": self.error_messages,
+            "warnings": self.warning_messages,
+            "issues": [issue.to_dict() for issue in self.issues],
+        }
+
+
+class CompiledSchema:
+    """コンパイル済みスキーマ
+
+    compile_schema()で生成します。validate()はスキーマを辿らず、
+    コンパイル時に組み立てたクロージャを呼び出すだけで検証を行います。
+    """
+
+    def __init__(self, schema: dict[str, Any], checker: Checker) -> None:
+        self.schema = schema
+        self._checker = checker
+
+    def validate(self, data: Any) -> ValidationResult:
+        """データを検証
+
+        Args:
+            data: 検証するテーマデータ
+
+        Returns:
+            ValidationResult: 検証結果
+        """
+        issues: list[ValidationIssue] = []
+        self._checker(data, "", issues)
+        return ValidationResult(issues)
+
+    def is_valid(self, data: Any) -> bool:
+        """データがエラーなしで検証を通過するか判定"""
+        return self.validate(data).is_valid
+
+
+def _check_nothing(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+    """制約のないノード用の検証関数"""
+
+
+def _make_reporter(node: dict[str, Any], code: str, severity: str) -> Callable:
+    """問題を記録する関数を生成(メッセージテンプレートはコンパイル時に確定)"""
+    template = node.get("messages", {}).get(code, DEFAULT_MESSAGES[code])
+    expected = _TYPE_CHECKS.get(node.get("type", ""), (None, node.get("type")))[1]
+
+    def report(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        key = path.rsplit(".", 1)[-1]
+        message = template.format(
+            path=path or "テーマデータ", key=key, value=value, expected=expected
+        )
+        issues.append(ValidationIssue(path, code, message, severity, value))
+
+    return report
+
+
+def _compile_node(node: dict[str, Any]) -> Checker:
+    """スキーマノードを検証クロージャにコンパイル"""
+    node_type = node.get("type", "any")
+    severity = node.get("severity", ERROR)
+    steps: list[Checker] = []
+
+    if node_type == "color":
+        report_color = _make_reporter(node, "color", severity)
+
+        def check_color(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+            if not is_valid_color(value):
+                report_color(value, path, issues)
+
+        steps.append(check_color)
+    elif node_type in _TYPE_CHECKS:
+        python_type = _TYPE_CHECKS[node_type][0]
+        report_type = _make_reporter(node, "type", severity)
+        # boolはintのサブクラスのため数値型からは除外する
+        reject_bool = node_type in ("number", "integer")
+
+        def check_type(value: Any, path: str, issues: list[ValidationIssue]) -> bool:
+            if not isinstance(value, python_type) or (
+                reject_bool and isinstance(value, bool)
+            ):
+                report_type(value, path, issues)
+                return False
+            return True
+
+        steps.append(check_type)
+    elif node_type != "any":
+        raise ValueError(f"未知のスキーマ型です: {node_type}")
+
+    if node.get("non_empty"):
+        report_empty = _make_reporter(node, "empty", severity)
+
+        def check_non_empty(
+            value: Any, path: str, issues: list[ValidationIssue]
+        ) -> Optional[bool]:
+            if (isinstance(value, str) and not value.strip()) or (
+                not isinstance(value, str) and not value
+            ):
+                report_empty(value, path, issues)
+                return False
+            return True
+
+        steps.insert(0, check_non_empty)
+
+    if "pattern" in node:
+        regex = re.compile(node["pattern"])
+        report_pattern = _make_reporter(node, "pattern", severity)
+
+        def check_pattern(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+            if isinstance(value, str) and regex.fullmatch(value) is None:
+                report_pattern(value, path, issues)
+
+        steps.append(check_pattern)
+
+    if "minimum" in node or "maximum" in node:
+        minimum = node.get("minimum", float("-inf"))
+        maximum = node.get("maximum", float("inf"))
+        report_range = _make_reporter(node, "range", severity)
+
+        def check_range(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+            if isinstance(value, (int, float)) and not minimum <= value <= maximum:
+                report_range(value, path, issues)
+
+        steps.append(check_range)
+
+    if "fields" in node:
+        steps.append(_compile_fields(node["fields"]))
+
+    if "values" in node:
+        value_checker = _compile_node(node["values"])
+
+        def check_values(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+            if isinstance(value, dict):
+                prefix = f"{path}." if path else ""
+                for key, item in value.items():
+                    value_checker(item, f"{prefix}{key}", issues)
+
+        steps.append(check_values)
+
+    if "items" in node:
+        item_checker = _compile_node(node["items"])
+
+        def check_items(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    item_checker(item, f"{path}[{index}]", issues)
+
+        steps.append(check_items)
+
+    if not steps:
+        return _check_nothing
+    if len(steps) == 1:
+        return steps[0]
+
+    def check(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        # 型・空値チェックに失敗した場合は以降の検証を行わない
+        for step in steps:
+            if step(value, path, issues) is False:
+                return
+
+    return check
+
+
+def _compile_fields(fields: dict[str, dict[str, Any]]) -> Checker:
+    """オブジェクトのフィールド定義をコンパイル"""
+    compiled = []
+    for name, field in fields.items():
+        if field.get("required"):
+            report_missing = _make_reporter(field, "missing", ERROR)
+        elif field.get("recommended"):
+            report_missing = _make_reporter(field, "recommended", WARNING)
+        else:
+            report_missing = None
+        compiled.append((name, _compile_node(field), report_missing))
+
+    def check_fields(value: Any, path: str, issues: list[ValidationIssue]) -> None:
+        if not isinstance(value, dict):
+            return
+        prefix = f"{path}." if path else ""
+        for name, checker, report_missing in compiled:
+            if name in value:
+                checker(value[name], prefix + name, issues)
+            elif report_missing is not None:
+                report_missing(None, prefix + name, issues)
+
+    return check_fields
+
+
+def compile_schema(schema: dict[str, Any]) -> CompiledSchema:
+    """宣言的なスキーマを検証関数にコンパイル
+
+    スキーマノードは次のキーを持つ辞書です。
+
+    - type: "object" / "array" / "string" / "number" / "integer" /
+      "boolean" / "color" / "any"
+    - required / recommended: 欠落時にエラー / 警告を記録
+    - non_empty: 空文字列・空コンテナをエラーとする
+    - severity: 値の問題を記録する重大度("error" または "warning")
+    - fields: オブジェクトの固定フィールド定義
+    - values: オブジェクトの全値に適用するノード
+    - items: 配列の全要素に適用するノード
+    - pattern / minimum / maximum: 文字列形式・数値範囲の制約
+    - messages: 問題コードごとのメッセージテンプレート
+      ({path}, {key}, {value}, {expected} を使用可能)
+
+    Args:
+        schema: ルートのスキーマノード
+
+    Returns:
+        CompiledSchema: コンパイル済みスキーマ
+
+    Raises:
+        ValueError: スキーマに未知の型が含まれる場合
+    """
+    return CompiledSchema(schema, _compile_node(schema))
+
+
+# テーマエディター標準のテーマスキーマ
+COLOR_MAP_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "values": {
+        "type": "color",
+        "severity": WARNING,
+        "messages": {"color": "無効な色値が検出されました: {key} = {value}"},
+    },
+}
+
+THEME_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "messages": {"type": "テーマデータは辞書形式である必要があります"},
+    "fields": {
+        "name": {
+            "type": "string",
+            "required": True,
+            "non_empty": True,
+            "messages": {
+                "type": "テーマ名は空でない文字列である必要があります",
+                "empty": "テーマ名は空でない文字列である必要があります",
+            },
+        },
+        "version": {
+            "type": "any",
+            "recommended": True,
+            "messages": {"recommended": "バージョン情報が設定されていません"},
+        },
+        "metadata": {
+            "type": "any",
+            "recommended": True,
+            "messages": {"recommended": "メタデータが設定されていません"},
+        },
+        "colors": COLOR_MAP_SCHEMA,
+    },
+}
+
+# CLI品質チェック用スキーマ(色設定を必須とする)
+QUALITY_CHECK_SCHEMA: dict[str, Any] = {
+    **THEME_SCHEMA,
+    "fields": {
+        **THEME_SCHEMA["fields"],
+        "name": {
+            **THEME_SCHEMA["fields"]["name"],
+            "messages": {
+                "missing": "必須フィールドが不足: {path}",
+                "type": "テーマ名は空でない文字列である必要があります",
+                "empty": "テーマ名は空でない文字列である必要があります",
+            },
+        },
+        "colors": {
+            **COLOR_MAP_SCHEMA,
+            "required": True,
+            "messages": {"missing": "必須フィールドが不足: {path}"},
+        },
+    },
+}
+
+
+def _qt_manager_color(required: bool = False) -> dict[str, Any]:
+    """qt-theme-manager形式の色フィールド定義"""
+    field: dict[str, Any] = {
+        "type": "color",
+        "messages": {
+            "missing": "必須フィールドが不足: {path}",
+            "empty": "必須フィールドが不足: {path}",
+            "color": "無効な色形式: {path} = {value}",
+        },
+    }
+    if required:
+        field.update(required=True, non_empty=True)
+    return field
+
+
+_QT_MANAGER_WIDGET_COLORS: dict[str, Any] = {
+    "type": "object",
+    "fields": {
+        "background": _qt_manager_color(),
+        "text": _qt_manager_color(),
+        "border": _qt_manager_color(),
+    },
+}
+
+# qt-theme-managerのStylesheetGeneratorに渡すテーマのスキーマ
+QT_THEME_MANAGER_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "messages": {"type": "テーマデータは辞書形式である必要があります"},
+    "fields": {
+        "name": {
+            "type": "any",
+            "required": True,
+            "non_empty": True,
+            "messages": {
+                "missing": "必須フィールドが不足: {path}",
+                "empty": "必須フィールドが不足: {path}",
+            },
+        },
+        "primaryColor": _qt_manager_color(required=True),
+        "backgroundColor": _qt_manager_color(required=True),
+        "textColor": _qt_manager_color(required=True),
+        "accentColor": _qt_manager_color(),
+        "button": _QT_MANAGER_WIDGET_COLORS,
+        "input": _QT_MANAGER_WIDGET_COLORS,
+        "status": _QT_MANAGER_WIDGET_COLORS,
+    },
+}
+
+SCHEMAS: dict[str, dict[str, Any]] = {
+    "theme": THEME_SCHEMA,
+    "quality": QUALITY_CHECK_SCHEMA,
+    "qt_theme_manager": QT_THEME_MANAGER_SCHEMA,
+}
+
+
+@cache
+def get_validator(name: str = "theme") -> CompiledSchema:
+    """名前付きスキーマのコンパイル済み検証器を取得(プロセスごとに一度だけコンパイル)
+
+    Args:
+        name: スキーマ名("theme" / "quality" / "qt_theme_manager")
+
+    Raises:
+        KeyError: 未知のスキーマ名の場合
+    """
+    if name not in SCHEMAS:
+        raise KeyError(f"未知のスキーマです: {name}")
+    return compile_schema(SCHEMAS[name])
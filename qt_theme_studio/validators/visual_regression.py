@@ -0,0 +1,496 @@
+"""
+テーマ描画の視覚回帰テスト
+
+テーマを適用したウィジェットショーケースをオフスクリーンで描画し、保存済みの基準画像と
+ピクセル単位で比較します。差分はショーケースのグループ(領域)ごとに集計し、
+知覚的な色差(CIE76のΔE)で判定するため、人が見分けられない程度の差は失敗にしません。
+テーマファイルごとの処理はmap_theme_files()によりプロセスプールで並列に実行します。
+
+NumPyが必要です(pip install qt-theme-studio[visual])。
+基準画像はフォントやスタイルに依存するため、同じ環境(CIのイメージ)で作成・比較してください。
+"""
+
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from functools import partial
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from qt_theme_studio.utilities.color_math import (
+    DEFAULT_DELTA_E,
+    import_numpy,
+    srgb_to_lab,
+)
+
+from .batch import map_theme_files
+from .theme_schema import ERROR, WARNING
+
+# 描画するショーケースの幅(ピクセル、高さは内容に合わせる)
+RENDER_WIDTH = 640
+
+# チャンネルごとの差がこの値以下のピクセルは変化なしとみなす
+DEFAULT_TOLERANCE = 2
+
+# 描画の変化として許容する画素の割合
+DEFAULT_MAX_CHANGED_RATIO = 0.0
+
+BASELINE_SUFFIX = ".png"
+
+# ワーカープロセスごとに一度だけ作成するQtモジュールとアプリケーション
+_qt_modules: Optional[dict[str, Any]] = None
+_application: Any = None
+
+
+def _ensure_application() -> dict[str, Any]:
+    """オフスクリーン描画用のQApplicationを用意してQtモジュールを返す"""
+    global _qt_modules, _application
+    if _qt_modules is not None:
+        return _qt_modules
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from qt_theme_studio.adapters.qt_adapter import QtAdapter
+
+    qt_modules = QtAdapter().get_qt_modules()
+    qt_widgets = qt_modules["QtWidgets"]
+    _application = qt_widgets.QApplication.instance()
+    if _application is None:
+        _application = qt_widgets.QApplication([])
+        # プラットフォームによる描画の違いを減らすため、スタイルを固定する
+        _application.setStyle("Fusion")
+    _qt_modules = qt_modules
+    return qt_modules
+
+
+def qimage_to_array(image: Any) -> tuple[Any, Any]:
+    """QImageをRGBAのNumPy配列(高さ, 幅, 4)として参照
+
+    RGBA8888形式のQImageは画素データを複製せずに参照します。
+    他の形式の場合は一度だけ変換します。
+
+    Args:
+        image: QImage
+
+    Returns:
+        tuple[ndarray, QImage]: 配列と、配列が参照するQImage
+            (配列を使用する間はQImageを保持すること)
+    """
+    np = import_numpy("visual", "視覚回帰テスト")
+    rgba_format = type(image).Format.Format_RGBA8888
+    if image.format() != rgba_format:
+        image = image.convertToFormat(rgba_format)
+
+    width, height, stride = image.width(), image.height(), image.bytesPerLine()
+    buffer = image.constBits()
+    if hasattr(buffer, "setsize"):
+        # PyQtのsip.voidptrはサイズを指定してからバッファとして使用する
+        buffer.setsize(stride * height)
+    rows = np.frombuffer(buffer, dtype=np.uint8, count=stride * height)
+    array = rows.reshape(height, stride)[:, : width * 4].reshape(height, width, 4)
+    return array, image
+
+
+def array_to_qimage(array: Any, qt_modules: dict[str, Any]) -> Any:
+    """RGBAのNumPy配列からQImageを作成(画素データは複製する)"""
+    np = import_numpy("visual", "視覚回帰テスト")
+    data = np.ascontiguousarray(array, dtype=np.uint8)
+    height, width = data.shape[:2]
+    qt_gui = qt_modules["QtGui"]
+    image = qt_gui.QImage(
+        data.tobytes(), width, height, width * 4, qt_gui.QImage.Format.Format_RGBA8888
+    )
+    return image.copy()
+
+
+class ImageDiff:
+    """2つの画像の比較結果"""
+
+    __slots__ = (
+        "changed_pixels",
+        "height",
+        "mask",
+        "max_delta_e",
+        "mean_delta_e",
+        "regions",
+        "size_mismatch",
+        "visible_pixels",
+        "width",
+    )
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.size_mismatch = False
+        # 許容値を超えて変化したピクセル数と、そのうち知覚できる色差のピクセル数
+        self.changed_pixels = 0
+        self.visible_pixels = 0
+        self.max_delta_e = 0.0
+        self.mean_delta_e = 0.0
+        self.regions: list[dict[str, Any]] = []
+        # 知覚できる変化があったピクセルのマスク(高さ, 幅)
+        self.mask: Any = None
+
+    @property
+    def changed_ratio(self) -> float:
+        """知覚できる変化があったピクセルの割合"""
+        total = self.width * self.height
+        return self.visible_pixels / total if total else 0.0
+
+    @property
+    def is_identical(self) -> bool:
+        """ピクセル単位で一致(許容値以内)するかどうか"""
+        return not self.size_mismatch and self.changed_pixels == 0
+
+    def exceeds(self, max_changed_ratio: float = DEFAULT_MAX_CHANGED_RATIO) -> bool:
+        """許容できない描画の変化があるかどうか"""
+        if self.size_mismatch:
+            return True
+        return self.visible_pixels > 0 and self.changed_ratio > max_changed_ratio
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSONに出力できる辞書へ変換(マスクは含まない)"""
+        return {
+            "width": self.width,
+            "height": self.height,
+            "size_mismatch": self.size_mismatch,
+            "changed_pixels": self.changed_pixels,
+            "visible_pixels": self.visible_pixels,
+            "changed_ratio": round(self.changed_ratio, 6),
+            "max_delta_e": round(self.max_delta_e, 3),
+            "mean_delta_e": round(self.mean_delta_e, 3),
+            "regions": self.regions,
+        }
+
+
+def compare_images(
+    actual: Any,
+    baseline: Any,
+    regions: Iterable[tuple[str, int, int, int, int]] = (),
+    tolerance: int = DEFAULT_TOLERANCE,
+    delta_e_threshold: float = DEFAULT_DELTA_E,
+) -> ImageDiff:
+    """RGBA配列同士をピクセル単位で比較し、領域ごとの差分と色差を求める
+
+    色差(ΔE)は許容値を超えて変化したピクセルについてのみ計算します。
+
+    Args:
+        actual: 描画結果の配列(高さ, 幅, 4)
+        baseline: 基準画像の配列(高さ, 幅, 4)
+        regions: (名前, x, y, 幅, 高さ)の領域
+        tolerance: 変化なしとみなすチャンネルごとの差
+        delta_e_threshold: 知覚できる変化とみなす色差
+
+    Returns:
+        ImageDiff: 比較結果
+    """
+    np = import_numpy("visual", "視覚回帰テスト")
+    height, width = actual.shape[:2]
+    diff = ImageDiff(width, height)
+    if actual.shape != baseline.shape:
+        diff.size_mismatch = True
+        return diff
+
+    diff.mask = np.zeros((height, width), dtype=bool)
+    delta_map = np.zeros((height, width), dtype=np.float32)
+    if not np.array_equal(actual, baseline):
+        channel_diff = np.abs(actual.astype(np.int16) - baseline.astype(np.int16))
+        ys, xs = np.nonzero(channel_diff.max(axis=2) > tolerance)
+        diff.changed_pixels = len(ys)
+
+        if diff.changed_pixels:
+            delta_e = np.linalg.norm(
+                srgb_to_lab(actual[ys, xs, :3]) - srgb_to_lab(baseline[ys, xs, :3]),
+                axis=-1,
+            )
+            # 透明度の変化は色差に含まれないため、許容値を超えた場合は知覚できる変化とする
+            alpha_changed = channel_diff[ys, xs, 3] > tolerance
+            visible = (delta_e > delta_e_threshold) | alpha_changed
+            delta_map[ys, xs] = delta_e
+            diff.mask[ys[visible], xs[visible]] = True
+            diff.visible_pixels = int(np.count_nonzero(visible))
+            diff.max_delta_e = float(delta_e.max())
+            diff.mean_delta_e = float(delta_e.mean())
+
+    for name, x, y, region_width, region_height in regions:
+        region_mask = diff.mask[y : y + region_height, x : x + region_width]
+        region_delta = delta_map[y : y + region_height, x : x + region_width]
+        visible_pixels = int(np.count_nonzero(region_mask))
+        area = region_mask.size
+        diff.regions.append(
+            {
+                "name": name,
+                "rect": [x, y, region_width, region_height],
+                "visible_pixels": visible_pixels,
+                "changed_ratio": round(visible_pixels / area, 6) if area else 0.0,
+                "max_delta_e": round(float(region_delta.max()), 3) if area else 0.0,
+            }
+        )
+    return diff
+
+
+def render_showcase(
+    theme_data: dict[str, Any], width: int = RENDER_WIDTH
+) -> tuple[Any, list[tuple[str, int, int, int, int]]]:
+    """テーマを適用したウィジェットショーケースをオフスクリーンで描画
+
+    スクロールせずに全体が収まるよう、内容の高さに合わせて描画します。
+
+    Args:
+        theme_data: テーマデータ
+        width: 描画する幅(ピクセル)
+
+    Returns:
+        tuple[QImage, list]: 描画結果と、グループごとの(名前, x, y, 幅, 高さ)
+    """
+    qt_modules = _ensure_application()
+    qt_widgets = qt_modules["QtWidgets"]
+    from qt_theme_studio.views.preview import WidgetShowcase
+
+    showcase = WidgetShowcase(qt_modules)
+    root = showcase.create_widget()
+    showcase.apply_theme(theme_data)
+
+    scroll_area = root.findChild(qt_widgets.QScrollArea)
+    content = scroll_area.widget()
+    scroll_area.setWidgetResizable(False)
+    content.ensurePolished()
+    content.layout().activate()
+    content.resize(width, content.sizeHint().height())
+
+    regions = []
+    for group in content.findChildren(
+        qt_widgets.QGroupBox,
+        options=qt_modules["QtCore"].Qt.FindChildOption.FindDirectChildrenOnly,
+    ):
+        geometry = group.geometry()
+        regions.append(
+            (
+                group.title(),
+                geometry.x(),
+                geometry.y(),
+                geometry.width(),
+                geometry.height(),
+            )
+        )
+
+    image = content.grab().toImage()
+    # ワーカープロセスはイベントループを実行しないため、削除を予約したイベントを
+    # その場で処理してウィジェットを解放する(処理しないと描画のたびに蓄積する)
+    root.deleteLater()
+    qt_core = qt_modules["QtCore"]
+    qt_core.QCoreApplication.sendPostedEvents(None, qt_core.QEvent.Type.DeferredDelete)
+    return image, regions
+
+
+def baseline_root(theme_files: Iterable[Union[str, Path]]) -> Optional[Path]:
+    """テーマファイルの共通の親フォルダ(基準画像の名前の基準、ファイルがなければNone)"""
+    parents = [str(Path(theme_file).absolute().parent) for theme_file in theme_files]
+    return Path(os.path.commonpath(parents)) if parents else None
+
+
+def baseline_name(
+    theme_file: Union[str, Path], root: Union[str, Path, None] = None
+) -> str:
+    """基準画像の名前(rootからの相対パスから拡張子を除いたもの)
+
+    別のフォルダにある同名のテーマファイルが同じ基準画像を共有しないよう、
+    rootの配下のファイルはサブフォルダを含めた名前とします。
+    rootがNone、またはrootの配下にないファイルはファイル名のみとします。
+    """
+    path = Path(theme_file)
+    if root is not None:
+        try:
+            relative = path.absolute().relative_to(Path(root).absolute())
+        except ValueError:
+            pass
+        else:
+            return relative.with_suffix("").as_posix()
+    return path.stem
+
+
+def _issue(code: str, message: str, severity: str = ERROR) -> dict[str, Any]:
+    """結果に含める問題の辞書を生成"""
+    return {"path": "", "code": code, "severity": severity, "message": message}
+
+
+def _write_artifacts(
+    output_dir: Path, name: str, actual: Any, diff: ImageDiff, qt_modules: dict
+) -> None:
+    """失敗時の描画結果と差分画像(変化した画素を赤で強調)を出力"""
+    np = import_numpy("visual", "視覚回帰テスト")
+    (output_dir / name).parent.mkdir(parents=True, exist_ok=True)
+    array_to_qimage(actual, qt_modules).save(
+        str(output_dir / f"{name}.actual.png"), "PNG"
+    )
+    if diff.mask is None:
+        return
+
+    highlighted = actual.copy()
+    highlighted[..., :3] = (actual[..., :3] * 0.3 + 178).astype(np.uint8)
+    highlighted[diff.mask] = (255, 0, 0, 255)
+    array_to_qimage(highlighted, qt_modules).save(
+        str(output_dir / f"{name}.diff.png"), "PNG"
+    )
+
+
+def check_visual_regression(
+    theme_file: str,
+    baseline_dir: Union[str, Path],
+    output_dir: Union[str, Path, None] = None,
+    update: bool = False,
+    tolerance: int = DEFAULT_TOLERANCE,
+    delta_e_threshold: float = DEFAULT_DELTA_E,
+    max_changed_ratio: float = DEFAULT_MAX_CHANGED_RATIO,
+    root: Union[str, Path, None] = None,
+) -> dict[str, Any]:
+    """テーマファイル1件の描画を基準画像と比較(ワーカープロセスで実行)
+
+    Args:
+        theme_file: テーマファイルのパス
+        baseline_dir: 基準画像のフォルダ(baseline_name()の名前.png)
+        output_dir: 失敗時に描画結果と差分画像を出力するフォルダ
+        update: 基準画像を現在の描画結果で作成・更新する場合True
+        tolerance: 変化なしとみなすチャンネルごとの差
+        delta_e_threshold: 知覚できる変化とみなす色差
+        max_changed_ratio: 許容する変化した画素の割合
+        root: 基準画像の名前の基準となるフォルダ(Noneの場合はファイル名のみ)
+
+    Returns:
+        dict[str, Any]: 結果('file', 'is_valid', 'status', 'errors', 'warnings',
+            'diff', 'elapsed_ms')
+    """
+    start_time = time.perf_counter()
+    record: dict[str, Any] = {"file": theme_file, "command": "visual"}
+    errors: list[dict[str, Any]] = []
+    warnings: list[dict[str, Any]] = []
+    name = baseline_name(theme_file, root)
+    baseline_path = Path(baseline_dir) / f"{name}{BASELINE_SUFFIX}"
+
+    try:
+        with Path(theme_file).open(encoding="utf-8") as f:
+            theme_data = json.load(f)
+    except (OSError, ValueError) as e:
+        record.update(
+            is_valid=False,
+            status="error",
+            errors=[_issue("load", f"テーマファイルの読み込みに失敗しました: {e}")],
+            warnings=[],
+        )
+        record["elapsed_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+        return record
+
+    qt_modules = _ensure_application()
+    render_start = time.perf_counter()
+    image, regions = render_showcase(theme_data)
+    record["render_ms"] = round((time.perf_counter() - render_start) * 1000, 3)
+
+    if update:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        existed = baseline_path.exists()
+        if not image.save(str(baseline_path), "PNG"):
+            errors.append(
+                _issue("baseline", f"基準画像を保存できません: {baseline_path}")
+            )
+        status = "updated" if existed else "created"
+    elif not baseline_path.exists():
+        errors.append(
+            _issue(
+                "baseline",
+                f"基準画像がありません: {baseline_path}(--updateで作成してください)",
+            )
+        )
+        status = "missing"
+    else:
+        qt_gui = qt_modules["QtGui"]
+        baseline_image = qt_gui.QImage(str(baseline_path))
+        if baseline_image.isNull():
+            errors.append(_issue("load", f"基準画像を読み込めません: {baseline_path}"))
+            status = "error"
+        else:
+            actual, image = qimage_to_array(image)
+            baseline, baseline_image = qimage_to_array(baseline_image)
+            diff = compare_images(
+                actual, baseline, regions, tolerance, delta_e_threshold
+            )
+            record["diff"] = diff.to_dict()
+
+            if diff.size_mismatch:
+                errors.append(
+                    _issue(
+                        "visual",
+                        f"描画サイズが基準画像と異なります: {actual.shape[1]}x"
+                        f"{actual.shape[0]} (基準: {baseline.shape[1]}x"
+                        f"{baseline.shape[0]})",
+                    )
+                )
+            elif diff.exceeds(max_changed_ratio):
+                for region in diff.regions:
+                    if region["visible_pixels"]:
+                        errors.append(
+                            {
+                                **_issue(
+                                    "visual",
+                                    f"{region['name']}: {region['visible_pixels']}"
+                                    f"ピクセルが変化(最大ΔE "
+                                    f"{region['max_delta_e']:.1f})",
+                                ),
+                                "path": region["name"],
+                            }
+                        )
+                if not errors:
+                    errors.append(
+                        _issue(
+                            "visual",
+                            f"{diff.visible_pixels}ピクセルが変化(最大ΔE "
+                            f"{diff.max_delta_e:.1f})",
+                        )
+                    )
+            elif diff.changed_pixels:
+                warnings.append(
+                    _issue(
+                        "visual",
+                        f"{diff.changed_pixels}ピクセルにわずかな差があります"
+                        f"(最大ΔE {diff.max_delta_e:.1f})",
+                        WARNING,
+                    )
+                )
+
+            if errors and output_dir is not None:
+                _write_artifacts(Path(output_dir), name, actual, diff, qt_modules)
+            status = "failed" if errors else "passed"
+
+    record.update(is_valid=not errors, status=status, errors=errors, warnings=warnings)
+    record["elapsed_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+    return record
+
+
+def check_visual_regressions(
+    theme_files: Iterable[Union[str, Path]],
+    baseline_dir: Union[str, Path],
+    max_workers: Optional[int] = None,
+    **options: Any,
+) -> Iterator[dict[str, Any]]:
+    """複数のテーマファイルの描画を並列に比較し、入力順に結果を返すイテレーター
+
+    各ワーカープロセスはQApplicationを一度だけ作成して再利用します。
+    基準画像の名前は、全テーマファイルの共通の親フォルダからの相対パスとします。
+
+    Args:
+        theme_files: テーマファイルのパス
+        baseline_dir: 基準画像のフォルダ
+        max_workers: ワーカープロセス数(デフォルト: CPU数)
+        **options: check_visual_regression()のキーワード引数
+
+    Yields:
+        dict[str, Any]: check_visual_regression()の結果
+    """
+    # NumPyがない場合はワーカー起動前に検出する
+    import_numpy("visual", "視覚回帰テスト")
+    theme_files = list(theme_files)
+    options.setdefault("root", baseline_root(theme_files))
+    return map_theme_files(
+        partial(check_visual_regression, baseline_dir=baseline_dir, **options),
+        theme_files,
+        max_workers,
+    )
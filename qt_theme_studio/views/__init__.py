@@ -4,16 +4,32 @@
 UIコンポーネントとユーザーインターフェースを提供します。
 """
 
+from .apply_transaction import ThemeApplyTransaction
+from .layout_profiler import LayoutProfile, LayoutProfiler
 from .main_window import QtThemeStudioMainWindow
+from .palette import APPLY_MODES, apply_palette, build_palette, theme_palette
 from .preview import PreviewWindow
+from .theme_picker import ThemePickerDialog
+from .thumbnails import ThumbnailCache, ThumbnailRenderer, render_thumbnail
 
 # 将来実装予定のモジュール
 # from .theme_editor import ThemeEditor
 # from .zebra_editor import ZebraEditor
 
 __all__ = [
+    "APPLY_MODES",
+    "LayoutProfile",
+    "LayoutProfiler",
     "PreviewWindow",
     "QtThemeStudioMainWindow",
+    "ThemeApplyTransaction",
+    "ThemePickerDialog",
+    "ThumbnailCache",
+    "ThumbnailRenderer",
+    "apply_palette",
+    "build_palette",
+    "render_thumbnail",
+    "theme_palette",
     # "ThemeEditor",
     # "ZebraEditor",
 ]
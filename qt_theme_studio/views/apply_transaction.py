@@ -0,0 +1,212 @@
+"""
+テーマ適用トランザクション
+
+テーマの切り替え中はウィジェットツリーの更新を停止し、スタイルシートの変更を
+最上位ウィジェットの1つのスタイルシートにまとめて設定します。
+ウィジェットごとにsetStyleSheetを呼ぶとその都度サブツリーのポリッシュが走るため、
+まとめて設定することでポリッシュを1回、再描画を更新再開時の非同期の1回に抑えます。
+"""
+
+import itertools
+import re
+from typing import Any, Optional
+
+from qt_theme_studio.logger import get_logger
+from qt_theme_studio.utilities.metrics import get_metrics_registry
+
+# 最上位のスタイルシートのうち、子ウィジェット向けにまとめた部分の開始位置
+SCOPED_SECTION_MARKER = "/* qt-theme-studio: scoped style sheets */"
+
+# まとめて設定する際に子ウィジェットへ割り当てるオブジェクト名の接頭辞
+SCOPED_OBJECT_NAME_PREFIX = "qts_apply_"
+
+_RULE_PATTERN = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_TYPE_SELECTOR_PATTERN = re.compile(r"(\*|[A-Za-z_][\w-]*)?(.*)", re.DOTALL)
+_OBJECT_NAME_PATTERN = re.compile(r"[A-Za-z_][\w-]*")
+
+_object_name_counter = itertools.count(1)
+
+
+def scope_style_sheet(style_sheet: str, object_name: str) -> str:
+    """ウィジェットに設定するスタイルシートを、親に設定できる形へ変換
+
+    各セレクタを、オブジェクト名のウィジェット自身("QPushButton#name:hover")と
+    その子孫("#name QPushButton:hover")に一致する2つのセレクタへ置き換えます。
+    セレクタを持たない宣言のみのスタイルシートは、ウィジェット自身への指定として扱います。
+
+    Args:
+        style_sheet: ウィジェットに設定するスタイルシート
+        object_name: 対象ウィジェットのオブジェクト名
+
+    Returns:
+        str: 変換後のスタイルシート
+    """
+    if "{" not in style_sheet:
+        declarations = style_sheet.strip()
+        return f"#{object_name} {{ {declarations} }}" if declarations else ""
+
+    rules = []
+    for selectors, declarations in _RULE_PATTERN.findall(style_sheet):
+        scoped_selectors = []
+        for selector in selectors.split(","):
+            selector = selector.strip()
+            if not selector:
+                continue
+            # パターンは全体が省略可能なため、常に一致する
+            type_name, rest = _TYPE_SELECTOR_PATTERN.match(selector).groups()
+            if type_name in (None, "*"):
+                type_name = ""
+            scoped_selectors.append(f"{type_name}#{object_name}{rest}")
+            scoped_selectors.append(f"#{object_name} {selector}")
+        if scoped_selectors:
+            rules.append(f"{', '.join(scoped_selectors)} {{{declarations}}}")
+    return "\n".join(rules)
+
+
+class ThemeApplyTransaction:
+    """テーマ適用トランザクション
+
+    with文の間は最上位ウィジェットの更新を停止し、set_style_sheetで予約した
+    スタイルシートを終了時に1回のsetStyleSheetで設定してから更新を再開します。
+    with文の中で直接行ったパレット等の変更も、再開時の1回の再描画にまとめられます。
+    入れ子で使用した場合、更新の再開は最も外側のトランザクションが行います。
+
+    例外で終了した場合は予約した変更を破棄し、更新の再開のみを行います。
+    """
+
+    __slots__ = (
+        "_resume_updates",
+        "_root_style_sheet",
+        "_scoped_style_sheets",
+        "logger",
+        "name",
+        "polish_passes",
+        "root",
+        "update_requests",
+    )
+
+    def __init__(self, root: Any, name: str = "theme") -> None:
+        """テーマ適用トランザクションを初期化します
+
+        Args:
+            root: 適用対象のウィジェットツリーの最上位ウィジェット
+            name: メトリクスのラベルに使用する適用先の名前
+        """
+        self.root = root
+        self.name = name
+        self.logger = get_logger()
+        self.polish_passes = 0
+        self.update_requests = 0
+        self._root_style_sheet: Optional[str] = None
+        self._scoped_style_sheets: dict[int, tuple[Any, str]] = {}
+        self._resume_updates = False
+
+    def __enter__(self) -> "ThemeApplyTransaction":
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self._scoped_style_sheets.clear()
+            self._root_style_sheet = None
+            self._resume()
+
+    def begin(self) -> None:
+        """ウィジェットツリーの更新を停止"""
+        self._resume_updates = bool(self.root.updatesEnabled())
+        if self._resume_updates:
+            self.root.setUpdatesEnabled(False)
+
+    def set_style_sheet(self, widget: Any, style_sheet: str) -> None:
+        """スタイルシートの設定を予約(同じウィジェットへの再設定は後の指定が優先)
+
+        Args:
+            widget: 設定先のウィジェット(最上位ウィジェットまたはその子孫)
+            style_sheet: 設定するスタイルシート
+        """
+        if widget is self.root:
+            self._root_style_sheet = style_sheet
+        else:
+            self._scoped_style_sheets[id(widget)] = (widget, style_sheet)
+
+    def commit(self) -> None:
+        """予約したスタイルシートを設定し、更新を再開"""
+        try:
+            self._apply_style_sheets()
+        finally:
+            self._resume()
+
+        registry = get_metrics_registry()
+        labels = {"target": self.name}
+        registry.inc(
+            "theme_apply_polish_passes_total",
+            self.polish_passes,
+            labels=labels,
+            description="テーマ適用で発生したスタイルシートのポリッシュ回数",
+        )
+        registry.inc(
+            "theme_apply_update_requests_total",
+            self.update_requests,
+            labels=labels,
+            description="テーマ適用で要求した再描画の回数",
+        )
+
+    def _apply_style_sheets(self) -> None:
+        """予約したスタイルシートを最上位ウィジェットにまとめて設定"""
+        if self._root_style_sheet is None and not self._scoped_style_sheets:
+            return
+
+        current = self.root.styleSheet()
+        base, _, previous_scoped = current.partition(SCOPED_SECTION_MARKER)
+        if self._root_style_sheet is not None:
+            base = self._root_style_sheet
+
+        scoped = previous_scoped
+        if self._scoped_style_sheets:
+            blocks = []
+            for widget, style_sheet in self._scoped_style_sheets.values():
+                object_name = self._scoped_object_name(widget)
+                if object_name is None:
+                    # セレクタに使用できない名前のウィジェットには個別に設定
+                    widget.setStyleSheet(style_sheet)
+                    self.polish_passes += 1
+                    continue
+                if widget.styleSheet():
+                    widget.setStyleSheet("")
+                    self.polish_passes += 1
+                blocks.append(scope_style_sheet(style_sheet, object_name))
+            scoped = "\n" + "\n".join(block for block in blocks if block)
+
+        merged = (
+            f"{base.rstrip()}\n{SCOPED_SECTION_MARKER}{scoped}"
+            if scoped.strip()
+            else base
+        )
+        if merged != current:
+            self.root.setStyleSheet(merged)
+            self.polish_passes += 1
+        self._scoped_style_sheets.clear()
+        self._root_style_sheet = None
+
+    def _scoped_object_name(self, widget: Any) -> Optional[str]:
+        """セレクタで参照するオブジェクト名を取得(未設定の場合は割り当てる)"""
+        object_name = widget.objectName()
+        if not object_name:
+            object_name = f"{SCOPED_OBJECT_NAME_PREFIX}{next(_object_name_counter)}"
+            widget.setObjectName(object_name)
+            return object_name
+        if _OBJECT_NAME_PATTERN.fullmatch(object_name):
+            return object_name
+        self.logger.debug(
+            f"オブジェクト名をセレクタに使用できないため個別に設定します: {object_name}"
+        )
+        return None
+
+    def _resume(self) -> None:
+        """更新を再開(再開時にQtが非同期の再描画を1回予約する)"""
+        if self._resume_updates:
+            self._resume_updates = False
+            self.root.setUpdatesEnabled(True)
+            self.update_requests += 1
@@ -0,0 +1,297 @@
+"""
+レイアウト・描画プロファイラー
+
+ウィジェットツリーのサイズを連続して変更(リサイズストーム)し、
+レイアウトと描画の所要時間をperf_counter_nsで別々に計測します。
+アプリケーションのイベントフィルターでResize・LayoutRequest・Paintの配送を記録し、
+ウィジェットクラスごとのコストを集計します。
+
+描画はデバイスピクセル比を設定したQImageへのrenderで行うため、
+スケール係数(DPI)ごとの描画コストをプラットフォームによらず計測できます。
+"""
+
+import statistics
+import time
+from typing import Any, Optional
+
+from qt_theme_studio.logger import get_logger
+
+# 計測の段階
+PHASE_LAYOUT = "layout"
+PHASE_PAINT = "paint"
+PHASES = (PHASE_LAYOUT, PHASE_PAINT)
+
+# 既定のサイズ一覧とスケール係数
+DEFAULT_SIZES = ((800, 600), (1024, 768), (1280, 1024), (1920, 1080))
+DEFAULT_SCALE_FACTORS = (1.0,)
+
+
+def size_sweep(
+    start: tuple[int, int], end: tuple[int, int], steps: int
+) -> list[tuple[int, int]]:
+    """startからendまでを等間隔に変化させたサイズの一覧を作成
+
+    Args:
+        start: 開始サイズ(幅, 高さ)
+        end: 終了サイズ(幅, 高さ)
+        steps: サイズの数(2以上)
+
+    Returns:
+        list[tuple[int, int]]: サイズの一覧
+    """
+    if steps < 2:
+        return [start]
+    sizes = []
+    for index in range(steps):
+        ratio = index / (steps - 1)
+        sizes.append(
+            (
+                round(start[0] + (end[0] - start[0]) * ratio),
+                round(start[1] + (end[1] - start[1]) * ratio),
+            )
+        )
+    return sizes
+
+
+def _summarize_ns(values: list[int]) -> dict[str, float]:
+    """ナノ秒の計測値からミリ秒の統計値を計算"""
+    if not values:
+        return {"count": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(values)
+    p95_index = min(len(ordered) - 1, int(len(ordered) * 0.95))
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.mean(ordered) / 1e6,
+        "median_ms": statistics.median(ordered) / 1e6,
+        "p95_ms": ordered[p95_index] / 1e6,
+        "max_ms": ordered[-1] / 1e6,
+    }
+
+
+class LayoutProfile:
+    """レイアウト・描画プロファイルの結果
+
+    samplesはサイズとスケール係数の組ごとの計測値、class_costsはウィジェットクラスごとの
+    累計コストです。クラスごとのコストは、イベントの配送開始から次のイベントの配送開始
+    (または段階の終了)までの時間をそのイベントの受信側に割り当てた自己時間の近似です。
+    """
+
+    __slots__ = ("class_costs", "samples")
+
+    def __init__(self) -> None:
+        self.samples: list[dict[str, Any]] = []
+        self.class_costs: dict[str, dict[str, int]] = {}
+
+    def phase_durations(self, phase: str) -> list[int]:
+        """段階ごとの所要時間(ナノ秒)の一覧を取得"""
+        return [sample[f"{phase}_ns"] for sample in self.samples]
+
+    def phase_stats(self, phase: str) -> dict[str, float]:
+        """段階ごとの所要時間の統計値(ミリ秒)を取得"""
+        return _summarize_ns(self.phase_durations(phase))
+
+    def class_durations(self, class_name: str) -> list[int]:
+        """ウィジェットクラスのサンプルごとのコスト(ナノ秒)の一覧を取得"""
+        return [sample["class_ns"].get(class_name, 0) for sample in self.samples]
+
+    def top_classes(self, limit: int = 10) -> list[tuple[str, dict[str, int]]]:
+        """累計コストの大きいウィジェットクラスを取得"""
+        ranked = sorted(
+            self.class_costs.items(),
+            key=lambda item: item[1]["layout_ns"] + item[1]["paint_ns"],
+            reverse=True,
+        )
+        return ranked[:limit]
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSONに変換可能な辞書に変換"""
+        return {
+            "samples": [
+                {
+                    "size": list(sample["size"]),
+                    "scale": sample["scale"],
+                    "layout_ms": sample["layout_ns"] / 1e6,
+                    "paint_ms": sample["paint_ns"] / 1e6,
+                    "events": dict(sample["events"]),
+                }
+                for sample in self.samples
+            ],
+            "phases": {phase: self.phase_stats(phase) for phase in PHASES},
+            "classes": {
+                class_name: {
+                    "layout_ms": costs["layout_ns"] / 1e6,
+                    "paint_ms": costs["paint_ns"] / 1e6,
+                    "resize_events": costs["resize_events"],
+                    "layout_requests": costs["layout_requests"],
+                    "paint_events": costs["paint_events"],
+                }
+                for class_name, costs in self.top_classes(len(self.class_costs))
+            },
+        }
+
+
+class LayoutProfiler:
+    """リサイズストームによるレイアウト・描画プロファイラー
+
+    対象のウィジェットは表示済みである必要があります
+    (非表示のウィジェットはリサイズ時にResizeイベントが送られず、レイアウトが遅延します)。
+    """
+
+    def __init__(self, widget: Any, qt_modules: dict[str, Any]) -> None:
+        """レイアウト・描画プロファイラーを初期化します
+
+        Args:
+            widget: 計測対象のウィジェットツリーの最上位ウィジェット
+            qt_modules: Qtモジュールの辞書
+        """
+        self.widget = widget
+        self.qt_modules = qt_modules
+        self.logger = get_logger()
+
+        qt_core = qt_modules["QtCore"]
+        event_type = qt_core.QEvent.Type
+        self._event_kinds = {
+            event_type.Resize: "resize_events",
+            event_type.LayoutRequest: "layout_requests",
+            event_type.Paint: "paint_events",
+        }
+        self._profile: Optional[LayoutProfile] = None
+        self._sample: Optional[dict[str, Any]] = None
+        self._phase = PHASE_LAYOUT
+        # 配送中のイベント(受信側のクラス名, 配送開始時刻)
+        self._open_event: Optional[tuple[str, int]] = None
+
+    def profile(
+        self,
+        sizes: Optional[list[tuple[int, int]]] = None,
+        scale_factors: Optional[list[float]] = None,
+        repeats: int = 1,
+    ) -> LayoutProfile:
+        """サイズとスケール係数の全組み合わせでリサイズと描画を計測
+
+        Args:
+            sizes: 順に適用するサイズの一覧(省略時はDEFAULT_SIZES)
+            scale_factors: 描画時のデバイスピクセル比の一覧
+            repeats: サイズ一覧を繰り返す回数
+
+        Returns:
+            LayoutProfile: 計測結果
+        """
+        sizes = list(sizes or DEFAULT_SIZES)
+        scale_factors = list(scale_factors or DEFAULT_SCALE_FACTORS)
+        application = self.qt_modules["QtWidgets"].QApplication.instance()
+        event_filter = self._create_event_filter()
+        original_size = self.widget.size()
+
+        self._profile = LayoutProfile()
+        application.installEventFilter(event_filter)
+        try:
+            for scale in scale_factors:
+                for _ in range(repeats):
+                    for width, height in sizes:
+                        self._measure(width, height, scale)
+        finally:
+            application.removeEventFilter(event_filter)
+            self.widget.resize(original_size)
+            self._sample = None
+            self._open_event = None
+
+        profile = self._profile
+        self._profile = None
+        self.logger.info(
+            f"レイアウトプロファイルを計測しました: {len(profile.samples)}件 "
+            f"(レイアウト平均 {profile.phase_stats(PHASE_LAYOUT)['mean_ms']:.2f}ms, "
+            f"描画平均 {profile.phase_stats(PHASE_PAINT)['mean_ms']:.2f}ms)"
+        )
+        return profile
+
+    def _measure(self, width: int, height: int, scale: float) -> None:
+        """1つのサイズとスケール係数でレイアウトと描画を計測"""
+        qt_core = self.qt_modules["QtCore"]
+        qt_gui = self.qt_modules["QtGui"]
+        sample: dict[str, Any] = {
+            "size": (width, height),
+            "scale": scale,
+            "events": dict.fromkeys(self._event_kinds.values(), 0),
+            "class_ns": {},
+        }
+        self._sample = sample
+
+        # レイアウト: リサイズ(同期的なResize)と、予約されたLayoutRequestの処理
+        self._phase = PHASE_LAYOUT
+        started = time.perf_counter_ns()
+        self.widget.resize(width, height)
+        qt_core.QCoreApplication.sendPostedEvents(
+            None, int(qt_core.QEvent.Type.LayoutRequest.value)
+        )
+        laid_out = time.perf_counter_ns()
+        self._close_event(laid_out)
+        sample["layout_ns"] = laid_out - started
+
+        # 描画: デバイスピクセル比を設定したQImageへツリー全体を描画
+        image = qt_gui.QImage(
+            max(1, round(width * scale)),
+            max(1, round(height * scale)),
+            qt_gui.QImage.Format.Format_ARGB32_Premultiplied,
+        )
+        image.setDevicePixelRatio(scale)
+        self._phase = PHASE_PAINT
+        paint_started = time.perf_counter_ns()
+        self.widget.render(image)
+        painted = time.perf_counter_ns()
+        self._close_event(painted)
+        sample["paint_ns"] = painted - paint_started
+
+        self._profile.samples.append(sample)
+
+    def _record_event(self, watched: Any, kind: str) -> None:
+        """計測対象のイベントの配送開始を記録"""
+        now = time.perf_counter_ns()
+        self._close_event(now)
+        class_name = watched.metaObject().className()
+        self._open_event = (class_name, now)
+
+        costs = self._profile.class_costs.get(class_name)
+        if costs is None:
+            costs = {
+                "layout_ns": 0,
+                "paint_ns": 0,
+                "resize_events": 0,
+                "layout_requests": 0,
+                "paint_events": 0,
+            }
+            self._profile.class_costs[class_name] = costs
+        costs[kind] += 1
+        self._sample["events"][kind] += 1
+
+    def _close_event(self, now: int) -> None:
+        """配送中のイベントの経過時間を受信側のクラスに割り当てる"""
+        if self._open_event is None:
+            return
+        class_name, started = self._open_event
+        self._open_event = None
+        elapsed = now - started
+        self._profile.class_costs[class_name][f"{self._phase}_ns"] += elapsed
+        class_ns = self._sample["class_ns"]
+        class_ns[class_name] = class_ns.get(class_name, 0) + elapsed
+
+    def _create_event_filter(self) -> Any:
+        """計測対象のツリーへのイベントを記録するイベントフィルターを作成"""
+        qt_core = self.qt_modules["QtCore"]
+        profiler = self
+        root = self.widget
+        event_kinds = self._event_kinds
+
+        class LayoutEventFilter(qt_core.QObject):
+            def eventFilter(self, watched: Any, event: Any) -> bool:  # noqa: N802
+                kind = event_kinds.get(event.type())
+                if (
+                    kind is not None
+                    and profiler._sample is not None
+                    and watched.isWidgetType()
+                    and (watched is root or root.isAncestorOf(watched))
+                ):
+                    profiler._record_event(watched, kind)
+                return False
+
+        return LayoutEventFilter()
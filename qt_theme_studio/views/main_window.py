@@ -4,13 +4,16 @@ Qt-Theme-Studio メインウィンドウ
 クリーンなアーキテクチャによる高度なテーマ管理・生成・編集
 """
 
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor
+from PySide6.QtGui import QAction, QActionGroup, QColor
 from PySide6.QtWidgets import (
     QColorDialog,
+    QComboBox,
+    QDialog,
     QFileDialog,
     QGroupBox,
     QHBoxLayout,
@@ -27,9 +30,148 @@ from PySide6.QtWidgets import (
 
 from qt_theme_studio.adapters.qt_adapter import QtAdapter
 from qt_theme_studio.adapters.theme_adapter import ThemeAdapter
-from qt_theme_studio.generators.theme_generator import ThemeGenerator
+from qt_theme_studio.generators.color_graph import ColorDependencyGraph
+from qt_theme_studio.generators.image_palette import extract_palette
+from qt_theme_studio.generators.theme_generator import (
+    STYLE_FRAGMENT_PREFIX,
+    TUNABLE_COLORS,
+    ThemeGenerator,
+    changed_theme_paths,
+)
 from qt_theme_studio.logger import get_logger
+from qt_theme_studio.themes.bundle import BUNDLE_KEY, LAZY_BUNDLE_MIN_SIZE, ThemeBundle
+from qt_theme_studio.themes.color_index import ThemeSimilarityIndex
+from qt_theme_studio.themes.compiled import CompiledTheme
+from qt_theme_studio.themes.history import ThemeEditHistory
+from qt_theme_studio.themes.pack import PACK_SUFFIX, ThemePack
+from qt_theme_studio.themes.watcher import ThemeChanges, ThemeFileWatcher
+from qt_theme_studio.utilities.autosave import (
+    atomic_write_bytes,
+    autosave_path,
+    default_autosave_dir,
+    encode_json,
+    get_write_behind_queue,
+)
+from qt_theme_studio.utilities.metrics import get_metrics_registry
+from qt_theme_studio.views.apply_transaction import ThemeApplyTransaction
+from qt_theme_studio.views.palette import (
+    APPLY_MODE_PALETTE,
+    APPLY_MODE_STYLESHEET,
+    APPLY_MODES,
+    apply_palette,
+    reset_palette,
+    validate_apply_mode,
+)
 from qt_theme_studio.views.preview import PreviewWindow
+from qt_theme_studio.views.theme_picker import ThemePickerDialog
+from qt_theme_studio.views.thumbnails import ThumbnailCache, ThumbnailRenderer
+
+# 「似たテーマを表示」で一覧に表示するテーマ数
+SIMILAR_THEME_COUNT = 20
+
+# エクスポートに失敗したファイルをエラーメッセージに表示する件数
+EXPORT_ERROR_DISPLAY_COUNT = 5
+
+# テーマが選択されていない場合のテーマ選択ボタンの表示
+THEME_BUTTON_PLACEHOLDER = "テーマを選択"
+
+# メインウィンドウのスタイルシートの断片(断片名 → 色設定のキーで色を参照するテンプレート)
+# 生成テーマの微調整では、変更された色を参照する断片のみを再生成する
+MAIN_WINDOW_STYLE_FRAGMENTS = {
+    "QMainWindow": """\
+QMainWindow {{
+    background-color: {background};
+    color: {text};
+}}""",
+    "QWidget": """\
+QWidget {{
+    background-color: {background};
+    color: {text};
+}}""",
+    "QGroupBox": """\
+QGroupBox {{
+    background-color: {background};
+    color: {text};
+    border: 2px solid {border};
+    border-radius: 6px;
+    margin-top: 10px;
+    padding-top: 10px;
+    font-weight: bold;
+}}""",
+    "QGroupBox::title": """\
+QGroupBox::title {{
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+    background-color: {background};
+    color: {text};
+}}""",
+    "QPushButton": """\
+QPushButton {{
+    background-color: {button_background};
+    color: {button_text};
+    border: 2px solid {button_background};
+    border-radius: 6px;
+    padding: 8px 16px;
+    font-weight: bold;
+    min-height: 20px;
+}}""",
+    "QPushButton:hover": """\
+QPushButton:hover {{
+    background-color: {button_hover};
+    border-color: {button_hover};
+}}""",
+    "QPushButton:pressed": """\
+QPushButton:pressed {{
+    background-color: {button_pressed};
+}}""",
+    "QPushButton:disabled": """\
+QPushButton:disabled {{
+    background-color: {disabled_background};
+    color: {disabled_text};
+    border-color: {disabled_border};
+}}""",
+    "QComboBox": """\
+QComboBox {{
+    background-color: {input_background};
+    color: {input_text};
+    border: 2px solid {input_border};
+    border-radius: 4px;
+    padding: 4px;
+}}""",
+    "QComboBox::drop-down": """\
+QComboBox::drop-down {{
+    border: none;
+    width: 20px;
+}}""",
+    "QComboBox::down-arrow": """\
+QComboBox::down-arrow {{
+    image: none;
+    border-left: 5px solid transparent;
+    border-right: 5px solid transparent;
+    border-top: 5px solid {text};
+}}""",
+    "QComboBox QAbstractItemView": """\
+QComboBox QAbstractItemView {{
+    background-color: {input_background};
+    color: {input_text};
+    selection-background-color: {selection_background};
+    selection-color: {selection_text};
+}}""",
+    "QLabel": """\
+QLabel {{
+    background-color: transparent;
+    color: {text};
+}}""",
+    "QTextEdit": """\
+QTextEdit {{
+    background-color: {input_background};
+    color: {input_text};
+    border: 2px solid {input_border};
+    border-radius: 4px;
+    padding: 6px;
+}}""",
+}
 
 
 class QtThemeStudioMainWindow(QMainWindow):
@@ -71,7 +213,31 @@ class QtThemeStudioMainWindow(QMainWindow):
             self.logger.debug("テーマ管理初期化中...")
             # テーマ管理
             self.themes: dict[str, dict] = {}  # テーマ辞書
+            # 未解析のバンドル内テーマ(テーマ名 → バンドル、選択時にself.themesへ読み込む)
+            self._bundle_themes: dict[str, Union[ThemeBundle, ThemePack]] = {}
+            # 開いているテーマパック → 未解析のテーマ数(0になった時点でmmapを解放)
+            self._open_packs: dict[ThemePack, int] = {}
+            # コンパイル済みテーマ(テーマ名 → (元のテーマ辞書, コンパイル結果))
+            self._compiled_themes: dict[str, tuple[dict, CompiledTheme]] = {}
             self.current_theme_name: Union[str, None] = None
+            # テーマ名 → 編集履歴(初回の編集時に作成)
+            self._edit_histories: dict[str, ThemeEditHistory] = {}
+            # 編集中のテーマの自動保存先(編集のたびに書き込み遅延保存キューへ渡す)
+            self.autosave_dir = default_autosave_dir()
+            # 直前に生成したテーマの名前と派生色の依存グラフ(微調整で使用)
+            self._generated_theme_name: Optional[str] = None
+            self._generated_graph: Optional[ColorDependencyGraph] = None
+            # テーマ名 → テーマ選択メニューの項目
+            self._theme_actions: dict[str, QAction] = {}
+            # 読み込み済みファイル・テーマフォルダのホットリロード監視(初回読み込み時に作成)
+            self.theme_watcher: Optional[ThemeFileWatcher] = None
+            # テーマ一覧のサムネイル描画(初回表示時に作成)
+            self.thumbnail_renderer: Optional[ThumbnailRenderer] = None
+            # テーマの類似検索の索引と、構築に使用したテーマ辞書(テーマ名 → 辞書)
+            self._similarity_index: Optional[ThemeSimilarityIndex] = None
+            self._similarity_sources: dict[str, Any] = {}
+            # テーマの適用方式(スタイルシートまたはパレット)
+            self.apply_mode = APPLY_MODE_STYLESHEET
             self.logger.debug("テーマ管理初期化完了")
 
             self.logger.debug("UIセットアップ中...")
@@ -100,6 +266,10 @@ class QtThemeStudioMainWindow(QMainWindow):
         load_action.setShortcut("Ctrl+O")
         load_action.triggered.connect(self.load_custom_theme_file)
 
+        # テーマフォルダ監視
+        watch_action = file_menu.addAction("テーマフォルダを監視(&W)")
+        watch_action.triggered.connect(self.watch_theme_directory)
+
         # テーマ保存
         save_action = file_menu.addAction("テーマ保存(&S)")
         save_action.setShortcut("Ctrl+S")
@@ -118,6 +288,18 @@ class QtThemeStudioMainWindow(QMainWindow):
         exit_action.setShortcut("Ctrl+Q")
         exit_action.triggered.connect(self.close)
 
+        # 編集メニュー
+        edit_menu = menubar.addMenu("編集(&E)")
+
+        # 元に戻す・やり直し
+        self.undo_action = edit_menu.addAction("元に戻す(&U)")
+        self.undo_action.setShortcut("Ctrl+Z")
+        self.undo_action.triggered.connect(self.undo_theme_edit)
+        self.redo_action = edit_menu.addAction("やり直し(&R)")
+        self.redo_action.setShortcut("Ctrl+Y")
+        self.redo_action.triggered.connect(self.redo_theme_edit)
+        self._update_edit_actions()
+
         # テーマメニュー
         theme_menu = menubar.addMenu("テーマ(&T)")
 
@@ -126,6 +308,28 @@ class QtThemeStudioMainWindow(QMainWindow):
         apply_action.setShortcut("Ctrl+T")
         apply_action.triggered.connect(self.apply_current_theme)
 
+        # テーマ一覧
+        picker_action = theme_menu.addAction("テーマ一覧から選択(&P)")
+        picker_action.setShortcut("Ctrl+P")
+        picker_action.triggered.connect(self.show_theme_picker)
+
+        # 似たテーマの一覧
+        similar_action = theme_menu.addAction("似たテーマを表示(&S)")
+        similar_action.setShortcut("Ctrl+Shift+P")
+        similar_action.triggered.connect(self.show_similar_themes)
+
+        # 適用方式
+        mode_menu = theme_menu.addMenu("適用方式(&M)")
+        mode_group = QActionGroup(self)
+        for mode, label in APPLY_MODES.items():
+            mode_action = mode_menu.addAction(label)
+            mode_action.setCheckable(True)
+            mode_action.setChecked(mode == self.apply_mode)
+            mode_action.triggered.connect(
+                lambda _checked, m=mode: self.set_apply_mode(m)
+            )
+            mode_group.addAction(mode_action)
+
         # ワンクリック生成
         generate_action = theme_menu.addAction("ワンクリック生成(&G)")
         generate_action.setShortcut("Ctrl+G")
@@ -156,13 +360,18 @@ class QtThemeStudioMainWindow(QMainWindow):
 
         # テーマ選択ボタン
         self.theme_button = QToolButton()
-        self.theme_button.setText("テーマを選択")
+        self.theme_button.setText(THEME_BUTTON_PLACEHOLDER)
         self.theme_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
         self.theme_menu = QMenu()
         self.theme_button.setMenu(self.theme_menu)
         theme_layout.addWidget(QLabel("テーマ選択:"))
         theme_layout.addWidget(self.theme_button)
 
+        # テーマ一覧ボタン
+        picker_btn = QPushButton("一覧から選択")
+        picker_btn.clicked.connect(self.show_theme_picker)
+        theme_layout.addWidget(picker_btn)
+
         # テーマ適用ボタン
         apply_btn = QPushButton("テーマ適用")
         apply_btn.clicked.connect(self.apply_current_theme)
@@ -218,6 +427,16 @@ class QtThemeStudioMainWindow(QMainWindow):
         )
         quick_generate_btn.clicked.connect(self.generate_theme_from_background)
         bg_layout.addWidget(quick_generate_btn)
+
+        # コントラスト最適化ボタン
+        optimize_btn = QPushButton("🎯 コントラスト最適化")
+        optimize_btn.clicked.connect(self.generate_optimized_themes)
+        bg_layout.addWidget(optimize_btn)
+
+        # 画像からの生成ボタン
+        image_btn = QPushButton("🖼 画像から生成")
+        image_btn.clicked.connect(self.choose_image_for_theme)
+        bg_layout.addWidget(image_btn)
         bg_layout.addStretch()
         quick_layout.addLayout(bg_layout)
 
@@ -241,6 +460,20 @@ class QtThemeStudioMainWindow(QMainWindow):
             preset_layout.addWidget(preset_btn)
 
         quick_layout.addLayout(preset_layout)
+
+        # 生成したテーマの基本色の微調整
+        tune_layout = QHBoxLayout()
+        tune_layout.addWidget(QLabel("微調整:"))
+        self.tune_color_combo = QComboBox()
+        for node_name, label in TUNABLE_COLORS.items():
+            self.tune_color_combo.addItem(label, node_name)
+        tune_layout.addWidget(self.tune_color_combo)
+        tune_button = QPushButton("色を調整...")
+        tune_button.clicked.connect(self.choose_generated_color)
+        tune_layout.addWidget(tune_button)
+        tune_layout.addStretch()
+        quick_layout.addLayout(tune_layout)
+
         layout.addWidget(quick_group)
 
         # 生成されたテーマのプレビュー
@@ -303,28 +536,14 @@ class QtThemeStudioMainWindow(QMainWindow):
             bg_color = self.get_current_color("background")
             self.logger.info(f"背景色からテーマ生成開始: {bg_color.name()}")
 
-            # テーマジェネレータでテーマを生成
-            theme_data = self.theme_generator.generate_theme_from_background(bg_color)
-
-            # テーマを追加
-            theme_name = f"auto_{len(self.themes)}"
-            theme_data["name"] = theme_name
-
-            self.themes[theme_name] = theme_data
-            self.add_theme_to_menu(theme_name, theme_data["display_name"])
-
-            # 生成されたテーマを選択
-            self.current_theme_name = theme_name
-            self.theme_button.setText(theme_data["display_name"])
-
-            # テーマを適用
-            self.apply_current_theme()
-
-            # 生成されたテーマのプレビューを更新
-            self.update_generated_theme_preview()
+            # テーマジェネレータで派生色の依存グラフを構築し、テーマを生成
+            graph = self.theme_generator.build_color_graph(
+                bg_color, MAIN_WINDOW_STYLE_FRAGMENTS
+            )
+            theme_data = self._add_generated_theme(graph)
 
             self.logger.info(
-                f"ワンクリックでテーマ「{theme_name}」を生成・適用しました"
+                f"ワンクリックでテーマ「{theme_data['name']}」を生成・適用しました"
             )
 
             # 成功メッセージを表示
@@ -344,6 +563,232 @@ class QtThemeStudioMainWindow(QMainWindow):
                 self, "エラー", f"テーマの自動生成に失敗しました:\n{e!s}"
             )
 
+    def _add_generated_theme(
+        self, graph: ColorDependencyGraph, display_name: Optional[str] = None
+    ) -> dict[str, Any]:
+        """派生色の依存グラフから生成したテーマを追加して選択・適用"""
+        theme_data = self.theme_generator.theme_from_graph(graph)
+        if display_name:
+            theme_data["display_name"] = display_name
+
+        # テーマを追加
+        theme_name = f"auto_{len(self.themes)}"
+        theme_data["name"] = theme_name
+        self._generated_theme_name = theme_name
+        self._generated_graph = graph
+
+        self.themes[theme_name] = theme_data
+        self.add_theme_to_menu(theme_name, theme_data["display_name"])
+
+        # 生成されたテーマを選択
+        self.current_theme_name = theme_name
+        self.theme_button.setText(theme_data["display_name"])
+
+        # テーマを適用
+        self.apply_current_theme()
+
+        # 生成されたテーマのプレビューを更新
+        self.update_generated_theme_preview()
+        return theme_data
+
+    def choose_image_for_theme(self) -> None:
+        """画像ファイルを選択してテーマを生成"""
+        dialog = QFileDialog(self, "テーマの元にする画像を選択")
+        dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
+        dialog.setNameFilter("Image Files (*.png *.jpg *.jpeg *.bmp *.gif *.webp)")
+        dialog.setViewMode(QFileDialog.ViewMode.List)
+        if dialog.exec() == QFileDialog.DialogCode.Accepted:
+            self.generate_theme_from_image(dialog.selectedFiles()[0])
+
+    def generate_theme_from_image(self, file_path: str) -> None:
+        """画像から代表色を抽出してテーマを生成・適用
+
+        抽出した背景色を背景色ボタンに設定し、プライマリ色・アクセント色は
+        生成したテーマの依存グラフへ固定します。
+        """
+        try:
+            self.logger.info(f"画像からテーマ生成開始: {file_path}")
+            palette = extract_palette(file_path)
+        except ImportError as e:
+            QMessageBox.warning(self, "画像からテーマ生成", str(e))
+            return
+        except (OSError, ValueError) as e:
+            self.logger.error(f"画像からのパレット抽出エラー: {e}")
+            QMessageBox.critical(
+                self, "エラー", f"画像からパレットを抽出できませんでした:\n{e!s}"
+            )
+            return
+
+        roles = palette.roles()
+        self.set_color_button("background", QColor(roles["background"]))
+        graph = self.theme_generator.build_color_graph_from_palette(
+            palette, MAIN_WINDOW_STYLE_FRAGMENTS
+        )
+        theme_data = self._add_generated_theme(graph, "画像から生成したテーマ")
+        self._update_edit_actions()
+
+        self.logger.info(f"画像からテーマ「{theme_data['name']}」を生成・適用しました")
+        QMessageBox.information(
+            self,
+            "テーマ生成完了",
+            f"画像から抽出した色でテーマを生成しました!\n\n"
+            f"抽出した色: {', '.join(palette.colors)}\n"
+            f"背景色: {theme_data['backgroundColor']}\n"
+            f"プライマリ色: {theme_data['primaryColor']}\n"
+            f"アクセント色: {theme_data['accentColor']}",
+        )
+
+    def generate_optimized_themes(self) -> None:
+        """背景色からWCAGコントラストを最適化したテーマの候補を生成し、最良の候補を適用"""
+        try:
+            bg_color = self.get_current_color("background")
+            self.logger.info(f"コントラスト最適化開始: {bg_color.name()}")
+            themes = self.theme_generator.generate_optimized_themes(bg_color)
+        except ImportError as e:
+            QMessageBox.warning(self, "コントラスト最適化", str(e))
+            return
+        except Exception as e:
+            self.logger.error(f"コントラスト最適化エラー: {e}")
+            QMessageBox.critical(
+                self, "エラー", f"テーマ候補の生成に失敗しました:\n{e!s}"
+            )
+            return
+        if not themes:
+            self.logger.warning(
+                f"WCAGの基準を満たすテーマ候補がありません: {bg_color.name()}"
+            )
+            QMessageBox.information(
+                self,
+                "コントラスト最適化",
+                "WCAGの基準を満たすテーマ候補が見つかりませんでした。\n"
+                "背景色を変更して再度お試しください。",
+            )
+            return
+
+        for theme_data in themes:
+            theme_name = f"optimized_{len(self.themes)}"
+            theme_data["name"] = theme_name
+            self.themes[theme_name] = theme_data
+            self.add_theme_to_menu(theme_name, theme_data["display_name"])
+
+        # 最良の候補を選択して適用
+        best = themes[0]
+        self.current_theme_name = best["name"]
+        self.theme_button.setText(best["display_name"])
+        self._update_edit_actions()
+        self.apply_current_theme()
+        self.update_generated_theme_preview()
+
+        QMessageBox.information(
+            self,
+            "コントラスト最適化完了",
+            f"{len(themes)}件のテーマ候補をテーマメニューに追加しました。\n\n"
+            + "\n".join(
+                f"{theme['display_name']}: {theme['description']}" for theme in themes
+            ),
+        )
+
+    def choose_generated_color(self) -> None:
+        """生成したテーマの基本色を色選択ダイアログで微調整
+
+        ダイアログで選択中の色は、その色に依存する値のみを再計算して即座に反映します。
+        キャンセルした場合は元の色に戻します。
+        """
+        if (
+            self._generated_graph is None
+            or self.current_theme_name != self._generated_theme_name
+        ):
+            QMessageBox.information(
+                self, "微調整", "ワンクリック生成したテーマを選択してください"
+            )
+            return
+
+        node_name = self.tune_color_combo.currentData()
+        original = QColor(self._generated_graph.value(node_name))
+        color_dialog = QColorDialog(original, self)
+        color_dialog.currentColorChanged.connect(
+            lambda color: self.tune_generated_color(node_name, color)
+        )
+        if color_dialog.exec() != QColorDialog.DialogCode.Accepted:
+            self.tune_generated_color(node_name, original)
+
+        history = self._edit_histories.get(self._generated_theme_name)
+        if history is not None:
+            # 次の微調整を別の履歴にする
+            history.seal()
+
+    def tune_generated_color(self, node_name: str, color: QColor) -> list[str]:
+        """生成したテーマの基本色を変更し、依存する値のみを再計算して反映
+
+        変更された項目のみを編集履歴に記録し、メインウィンドウのスタイルシートは
+        変更された色を参照する断片のみを再生成します(パレット方式ではパレットを再設定)。
+
+        Args:
+            node_name: 基本色のノード名(TUNABLE_COLORSのキー)
+            color: 新しい色
+
+        Returns:
+            list[str]: 値が変わった依存グラフのノード名
+        """
+        graph = self._generated_graph
+        theme_name = self._generated_theme_name
+        if graph is None or theme_name != self.current_theme_name:
+            return []
+        if theme_name not in self.themes:
+            return []
+
+        changed = graph.pin(node_name, QColor(color))
+        if not changed:
+            return []
+
+        paths = changed_theme_paths(changed)
+        history = self._get_edit_history(theme_name)
+        state = history.edit_many(
+            {path: graph.value(changed_node).name() for path, changed_node in paths},
+            f"{TUNABLE_COLORS.get(node_name, node_name)}の調整",
+        )
+        self.themes[theme_name] = state.to_dict()
+        self._autosave_theme(theme_name)
+
+        changed_fragments = [
+            name for name in changed if name.startswith(STYLE_FRAGMENT_PREFIX)
+        ]
+        if self.apply_mode == APPLY_MODE_PALETTE:
+            # パレットは断片に分けられないため、変更後のテーマで設定し直す
+            with ThemeApplyTransaction(self, "main_window"):
+                apply_palette(
+                    self,
+                    self.get_compiled_theme(theme_name),
+                    self.qt_adapter.get_qt_modules(),
+                )
+        elif changed_fragments:
+            # 未変更の断片はグラフに保持した生成済みの文字列を再利用
+            stylesheet = "\n".join(
+                graph.value(f"{STYLE_FRAGMENT_PREFIX}{fragment_name}")
+                for fragment_name in MAIN_WINDOW_STYLE_FRAGMENTS
+            )
+            with ThemeApplyTransaction(self, "main_window") as transaction:
+                transaction.set_style_sheet(self, stylesheet)
+
+        self.preview_window.update_preview(state)
+        self.update_generated_theme_preview()
+        self._update_edit_actions()
+        self.logger.debug(
+            f"派生色を再計算しました: {node_name} -> {len(changed)}ノード "
+            f"(再計算 {graph.last_recomputed}件, 断片 {len(changed_fragments)}件)"
+        )
+        return changed
+
+    def _sync_generated_graph(
+        self, graph: ColorDependencyGraph, theme: Mapping[str, Any]
+    ) -> None:
+        """元に戻す・やり直し後のテーマの基本色を派生色の依存グラフへ反映"""
+        colors = theme.get("colors", {})
+        for node_name in TUNABLE_COLORS:
+            value = colors.get(node_name)
+            if value and graph.value(node_name).name() != value:
+                graph.pin(node_name, QColor(value))
+
     def update_generated_theme_preview(self) -> None:
         """生成テーマのプレビューを更新"""
         if self.current_theme_name and self.current_theme_name in self.themes:
@@ -359,7 +804,7 @@ class QtThemeStudioMainWindow(QMainWindow):
             # ファイルダイアログを設定
             dialog = QFileDialog(self, "テーマファイルを選択")
             dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
-            dialog.setNameFilter("JSON Files (*.json)")
+            dialog.setNameFilter(f"Theme Files (*.json *{PACK_SUFFIX})")
             dialog.setViewMode(QFileDialog.ViewMode.List)
 
             # ファイルダイアログを表示
@@ -376,30 +821,63 @@ class QtThemeStudioMainWindow(QMainWindow):
     def _load_theme_from_file(self, file_path: str) -> None:
         """ファイルからテーマを読み込み"""
         try:
-            with Path(file_path).open(encoding="utf-8") as f:
-                import json
-
-                theme_data = json.load(f)
-
-            # 単一テーマか複数テーマかを判定
-            if "available_themes" in theme_data:
-                # 複数テーマファイル
-                available_themes = theme_data.get("available_themes", {})
-                for theme_name, theme_config in available_themes.items():
-                    if theme_name not in self.themes:
-                        self.themes[theme_name] = theme_config
-                        self.add_theme_to_menu(
-                            theme_name, theme_config.get("display_name", theme_name)
-                        )
-            else:
-                # 単一テーマファイル
-                theme_name = theme_data.get("name", f"custom_{len(self.themes)}")
-                if theme_name not in self.themes:
-                    self.themes[theme_name] = theme_data
-                    self.add_theme_to_menu(
-                        theme_name, theme_data.get("display_name", theme_name)
-                    )
+            import json
 
+            with self.logger.performance_timer("theme.load"):
+                # 大きな複数テーマファイルは索引のみ作成し、テーマは選択時に解析する
+                path = Path(file_path)
+                bundle: Optional[Union[ThemeBundle, ThemePack]] = None
+                if path.suffix.lower() == PACK_SUFFIX:
+                    bundle = ThemePack(file_path)
+                elif path.stat().st_size >= LAZY_BUNDLE_MIN_SIZE:
+                    bundle = ThemeBundle(file_path)
+
+                if bundle is not None and bundle.is_bundle:
+                    added = 0
+                    for theme_name in bundle.names():
+                        if not self._has_theme(theme_name):
+                            self._bundle_themes[theme_name] = bundle
+                            self.add_theme_to_menu(
+                                theme_name, bundle.display_name(theme_name)
+                            )
+                            added += 1
+                    if isinstance(bundle, ThemePack):
+                        if added:
+                            self._open_packs[bundle] = added
+                        else:
+                            bundle.close()
+                    self._watch_theme_file(file_path)
+                else:
+                    with path.open(encoding="utf-8") as f:
+                        theme_data = json.load(f)
+
+                    if BUNDLE_KEY in theme_data:
+                        # 複数テーマファイル
+                        for theme_name, theme_config in theme_data[BUNDLE_KEY].items():
+                            if not self._has_theme(theme_name):
+                                self.themes[theme_name] = theme_config
+                                self.add_theme_to_menu(
+                                    theme_name,
+                                    theme_config.get("display_name", theme_name),
+                                )
+                        self._watch_theme_file(file_path)
+                    else:
+                        # 単一テーマファイル
+                        theme_name = theme_data.get(
+                            "name", f"custom_{len(self.themes)}"
+                        )
+                        if not self._has_theme(theme_name):
+                            self.themes[theme_name] = theme_data
+                            self.add_theme_to_menu(
+                                theme_name, theme_data.get("display_name", theme_name)
+                            )
+                        self._watch_theme_file(file_path, theme_name)
+
+            get_metrics_registry().set_gauge(
+                "themes_loaded",
+                len(self.themes) + len(self._bundle_themes),
+                description="読み込み済みテーマ数",
+            )
             self.logger.info(f"カスタムテーマを読み込みました: {file_path}")
 
             # 成功メッセージを表示
@@ -420,21 +898,259 @@ class QtThemeStudioMainWindow(QMainWindow):
                 self, "読み込みエラー", f"ファイルの読み込みに失敗しました:\n{e!s}"
             )
 
+    def _get_theme_watcher(self) -> ThemeFileWatcher:
+        """ホットリロード監視を取得(未作成なら作成)"""
+        if self.theme_watcher is None:
+            self.theme_watcher = ThemeFileWatcher(
+                self._on_theme_files_changed,
+                qt_modules=self.qt_adapter.get_qt_modules(),
+            )
+        return self.theme_watcher
+
+    def _watch_theme_file(
+        self, file_path: str, fallback_name: Optional[str] = None
+    ) -> None:
+        """読み込んだテーマファイルをホットリロードの対象にする"""
+        try:
+            self._get_theme_watcher().watch_file(file_path, fallback_name)
+        except Exception as e:
+            self.logger.warning(f"テーマファイルの監視を開始できません: {e}")
+
+    def watch_theme_directory(self) -> None:
+        """テーマフォルダを監視し、フォルダ内のテーマを読み込む"""
+        try:
+            dialog = QFileDialog(self, "監視するテーマフォルダを選択")
+            dialog.setFileMode(QFileDialog.FileMode.Directory)
+            dialog.setOptions(QFileDialog.Option.ShowDirsOnly)
+            if dialog.exec() != QFileDialog.DialogCode.Accepted:
+                return
+
+            folder_path = dialog.selectedFiles()[0]
+            with self.logger.performance_timer("theme.watch_directory"):
+                for changes in self._get_theme_watcher().watch_directory(folder_path):
+                    self._on_theme_files_changed(changes)
+            self.logger.info(f"テーマフォルダの監視を開始しました: {folder_path}")
+
+        except Exception as e:
+            self.logger.error(f"テーマフォルダ監視エラー: {e}")
+            QMessageBox.critical(
+                self, "エラー", f"テーマフォルダの監視に失敗しました:\n{e!s}"
+            )
+
+    def _on_theme_files_changed(self, changes: ThemeChanges) -> None:
+        """外部で変更されたテーマを登録済みテーマへ反映
+
+        変更されたテーマのみを置き換え、選択中のテーマが変更された場合だけ再適用します。
+        選択中のテーマが削除された場合は、残っている最初のテーマを選択します。
+        """
+        for theme_name, theme_data in changes.added.items():
+            if self._has_theme(theme_name):
+                # 別のファイルから同名のテーマが読み込み済みの場合は変更として扱う
+                changes.changed.setdefault(theme_name, theme_data)
+                continue
+            self.themes[theme_name] = theme_data
+            self.add_theme_to_menu(
+                theme_name, theme_data.get("display_name", theme_name)
+            )
+
+        for theme_name, theme_data in changes.changed.items():
+            self._forget_bundle_theme(theme_name)
+            self.themes[theme_name] = theme_data
+            history = self._edit_histories.get(theme_name)
+            if history is not None:
+                # 外部での変更も元に戻せるよう履歴に記録
+                history.replace(theme_data, "外部での変更")
+            action = self._theme_actions.get(theme_name)
+            if action is not None:
+                action.setText(theme_data.get("display_name", theme_name))
+                if theme_name == self.current_theme_name:
+                    self.theme_button.setText(action.text())
+
+        for theme_name in changes.removed:
+            self.themes.pop(theme_name, None)
+            self._forget_bundle_theme(theme_name)
+            self._compiled_themes.pop(theme_name, None)
+            self._edit_histories.pop(theme_name, None)
+            action = self._theme_actions.pop(theme_name, None)
+            if action is not None:
+                self.theme_menu.removeAction(action)
+
+        get_metrics_registry().set_gauge(
+            "themes_loaded",
+            len(self.themes) + len(self._bundle_themes),
+            description="読み込み済みテーマ数",
+        )
+
+        removed_current = self.current_theme_name in changes.removed
+        if removed_current:
+            self.logger.info(
+                f"選択中のテーマが削除されました: {self.current_theme_name}"
+            )
+            self.current_theme_name = None
+            self.theme_button.setText(THEME_BUTTON_PLACEHOLDER)
+
+        self._update_edit_actions()
+        if removed_current and self._theme_actions:
+            theme_name, action = next(iter(self._theme_actions.items()))
+            self.on_theme_selected(theme_name, action.text())
+        elif self.current_theme_name in changes.changed:
+            self.logger.info(f"選択中のテーマが変更されたため再適用: {changes.path}")
+            self.apply_current_theme()
+
+    def _has_theme(self, theme_name: str) -> bool:
+        """テーマが登録済みかどうか(未解析のバンドル内テーマを含む)"""
+        return theme_name in self.themes or theme_name in self._bundle_themes
+
+    def _ensure_theme_loaded(self, theme_name: str) -> None:
+        """未解析のバンドル内テーマを解析してself.themesへ登録"""
+        bundle = self._bundle_themes.get(theme_name)
+        if bundle is None:
+            return
+        with self.logger.performance_timer("theme.load_from_bundle"):
+            self.themes[theme_name] = bundle.load_theme(theme_name)
+        self._forget_bundle_theme(theme_name)
+
+    def _forget_bundle_theme(self, theme_name: str) -> None:
+        """未解析のバンドル内テーマの登録を解除
+
+        テーマパックの未解析のテーマがなくなった場合はmmapを解放します。
+        """
+        bundle = self._bundle_themes.pop(theme_name, None)
+        if not isinstance(bundle, ThemePack):
+            return
+        remaining = self._open_packs.get(bundle, 0) - 1
+        if remaining > 0:
+            self._open_packs[bundle] = remaining
+        else:
+            self._open_packs.pop(bundle, None)
+            bundle.close()
+
+    def closeEvent(self, event: Any) -> None:  # noqa: N802
+        """ウィンドウを閉じる際に開いているテーマパックを解放"""
+        for pack in self._open_packs:
+            pack.close()
+        self._open_packs.clear()
+        super().closeEvent(event)
+
     def add_theme_to_menu(self, theme_name: str, display_name: str) -> None:
         """テーマをメニューに追加"""
         action = self.theme_menu.addAction(display_name)
+        self._theme_actions[theme_name] = action
+        # 表示名はホットリロードで変わるため、選択時の項目名を使用する
         action.triggered.connect(
-            lambda: self.on_theme_selected(theme_name, display_name)
+            lambda: self.on_theme_selected(theme_name, action.text())
         )
 
     def on_theme_selected(self, theme_name: str, display_name: str) -> None:
         """テーマが選択された時の処理"""
+        try:
+            self._ensure_theme_loaded(theme_name)
+        except Exception as e:
+            self.logger.error(f"テーマ読み込みエラー: {theme_name}: {e}")
+            QMessageBox.critical(
+                self, "読み込みエラー", f"テーマの読み込みに失敗しました:\n{e!s}"
+            )
+            return
+
         self.current_theme_name = theme_name
         self.theme_button.setText(display_name)
+        self._update_edit_actions()
 
         self.logger.info(f"テーマ選択: {display_name} -> {theme_name}")
         self.apply_current_theme()
 
+    def show_theme_picker(self) -> None:
+        """サムネイル付きのテーマ一覧を表示し、選択されたテーマを適用"""
+        if not self._theme_actions:
+            QMessageBox.information(
+                self, "テーマ一覧", "テーマファイルを読み込んでください"
+            )
+            return
+
+        themes = [
+            (theme_name, action.text())
+            for theme_name, action in self._theme_actions.items()
+        ]
+        self._pick_theme(themes)
+
+    def show_similar_themes(self) -> None:
+        """現在のテーマに似たテーマを似ている順に一覧表示し、選択されたテーマを適用"""
+        if self.current_theme_name not in self._theme_actions:
+            QMessageBox.information(
+                self, "似たテーマ", "比較するテーマを選択してください"
+            )
+            return
+        try:
+            index = self._get_similarity_index()
+        except ImportError as e:
+            QMessageBox.warning(self, "似たテーマ", str(e))
+            return
+
+        matches = index.similar(self.current_theme_name, SIMILAR_THEME_COUNT)
+        themes = [
+            (
+                match.name,
+                f"{self._theme_actions[match.name].text()} (ΔE {match.distance:.1f})",
+            )
+            for match in matches
+        ]
+        self._pick_theme(themes)
+
+    def _get_similarity_index(self) -> ThemeSimilarityIndex:
+        """テーマの類似検索の索引を取得(テーマが追加・変更された場合は再構築)
+
+        読み込みに失敗したバンドル内のテーマは検索の対象から除きます。
+        """
+        for theme_name in list(self._bundle_themes):
+            try:
+                self._ensure_theme_loaded(theme_name)
+            except Exception as e:
+                self.logger.error(f"テーマ読み込みエラー: {theme_name}: {e}")
+        sources = {
+            name: self.themes[name]
+            for name in self._theme_actions
+            if name in self.themes
+        }
+        if (
+            self._similarity_index is None
+            or sources.keys() != self._similarity_sources.keys()
+            or any(
+                theme is not self._similarity_sources[name]
+                for name, theme in sources.items()
+            )
+        ):
+            with self.logger.performance_timer("theme.similarity_index"):
+                self._similarity_index = ThemeSimilarityIndex(sources)
+            self._similarity_sources = sources
+        return self._similarity_index
+
+    def _pick_theme(self, themes: list[tuple[str, str]]) -> None:
+        """テーマ選択ダイアログを表示し、選択されたテーマを適用"""
+        if self.thumbnail_renderer is None:
+            self.thumbnail_renderer = ThumbnailRenderer(
+                self.qt_adapter.get_qt_modules(), ThumbnailCache()
+            )
+
+        dialog = ThemePickerDialog(
+            themes,
+            self._compile_theme_for_thumbnail,
+            self.thumbnail_renderer,
+            current_theme_name=self.current_theme_name,
+            parent=self,
+        )
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+
+        selected = dialog.selected_theme()
+        if selected is not None:
+            theme_name = selected[0]
+            self.on_theme_selected(theme_name, self._theme_actions[theme_name].text())
+
+    def _compile_theme_for_thumbnail(self, theme_name: str) -> CompiledTheme:
+        """サムネイル描画用にテーマをコンパイル(未解析のバンドル内テーマは解析する)"""
+        self._ensure_theme_loaded(theme_name)
+        return self.get_compiled_theme(theme_name)
+
     def apply_current_theme(self) -> None:
         """現在選択されているテーマを適用"""
         if self.current_theme_name and self.current_theme_name in self.themes:
@@ -445,143 +1161,196 @@ class QtThemeStudioMainWindow(QMainWindow):
             )
             self.logger.info(f"テーマ設定: {theme_config}")
 
-            # qt-theme-manager形式のテーマをプレビュー用形式に変換
-            converted_theme = self.convert_theme_for_preview(theme_config)
-            self.logger.info(f"変換後のテーマ: {converted_theme}")
+            # メインウィンドウとプレビューの変更をまとめ、再描画を最後の1回にする
+            transaction = ThemeApplyTransaction(self, "main_window")
+            with self.logger.performance_timer("theme.apply"), transaction:
+                # テーマごとに一度だけコンパイルし、ロール解決済みの結果を共有
+                compiled_theme = self.get_compiled_theme(self.current_theme_name)
+                self.logger.info(f"コンパイル済みテーマ: {compiled_theme!r}")
 
-            # メインウィンドウにもテーマを適用
-            self._apply_theme_to_main_window(converted_theme)
+                # メインウィンドウにもテーマを適用
+                self._apply_theme_to_main_window(compiled_theme, transaction)
 
-            # プレビューウィンドウにテーマを適用
-            self.preview_window.apply_theme(converted_theme)
+                # プレビューウィンドウにテーマを適用
+                self.preview_window.apply_theme(compiled_theme)
 
             self.logger.info(
                 f"テーマ「{theme_config.get('display_name', self.current_theme_name)}」を適用完了"
             )
 
-    def _apply_theme_to_main_window(self, theme_data: dict[str, Any]) -> None:
-        """メインウィンドウにテーマを適用"""
+    def _get_edit_history(self, theme_name: str) -> ThemeEditHistory:
+        """テーマの編集履歴を取得(未作成の場合は現在の内容から作成)"""
+        history = self._edit_histories.get(theme_name)
+        if history is None:
+            history = ThemeEditHistory(self.themes[theme_name])
+            self._edit_histories[theme_name] = history
+        return history
+
+    def edit_current_theme(
+        self, path: tuple[str, ...], value: Any, label: Optional[str] = None
+    ) -> bool:
+        """選択中のテーマの値を変更して編集履歴に記録し、プレビューを更新
+
+        カラーピッカーのドラッグなど、同じ値への連続した変更は1件の履歴にまとめます。
+
+        Args:
+            path: 変更する値のパス(例: ("colors", "background"))
+            value: 新しい値
+            label: 元に戻す際に表示する編集の説明
+
+        Returns:
+            bool: 変更した場合はTrue(テーマが選択されていない場合はFalse)
+        """
+        if not self.current_theme_name or self.current_theme_name not in self.themes:
+            return False
+
+        history = self._get_edit_history(self.current_theme_name)
+        state = history.edit(path, value, label)
+        self.themes[self.current_theme_name] = state.to_dict()
+        self._autosave_theme(self.current_theme_name)
+        # 永続マップは複製せずにプレビューのデバウンスへ渡せる
+        self.preview_window.update_preview(state)
+        self._update_edit_actions()
+        return True
+
+    def undo_theme_edit(self) -> None:
+        """選択中のテーマの直前の編集を元に戻す"""
+        history = self._edit_histories.get(self.current_theme_name or "")
+        if history is None or history.undo() is None:
+            return
+        self._restore_edit_state(history)
+
+    def redo_theme_edit(self) -> None:
+        """元に戻した編集をやり直す"""
+        history = self._edit_histories.get(self.current_theme_name or "")
+        if history is None or history.redo() is None:
+            return
+        self._restore_edit_state(history)
+
+    def _restore_edit_state(self, history: ThemeEditHistory) -> None:
+        """編集履歴の現在の状態をテーマに反映して再適用"""
+        self.themes[self.current_theme_name] = history.to_dict()
+        self._autosave_theme(self.current_theme_name)
+        if (
+            self._generated_graph is not None
+            and self.current_theme_name == self._generated_theme_name
+        ):
+            self._sync_generated_graph(
+                self._generated_graph, self.themes[self.current_theme_name]
+            )
+        self._update_edit_actions()
+        self.apply_current_theme()
+
+    def _autosave_theme(self, theme_name: str) -> None:
+        """編集したテーマを自動保存先へ書き込み遅延で保存(UIスレッドを待たせない)
+
+        同じテーマへの連続した編集は、書き込み遅延保存キューで最新の内容1回にまとめます。
+        """
+        try:
+            get_write_behind_queue().submit_json(
+                autosave_path(theme_name, self.autosave_dir), self.themes[theme_name]
+            )
+        except RuntimeError as e:
+            # 終了処理でキューが閉じた後の編集は保存しない
+            self.logger.warning(
+                f"テーマの自動保存をスキップしました: {theme_name}: {e}"
+            )
+
+    def _update_edit_actions(self) -> None:
+        """元に戻す・やり直しメニューの有効状態と表示を更新"""
+        history = self._edit_histories.get(self.current_theme_name or "")
+        undo_label = history.undo_label if history is not None else None
+        redo_label = history.redo_label if history is not None else None
+        self.undo_action.setEnabled(undo_label is not None)
+        self.undo_action.setText(
+            f"元に戻す: {undo_label}(&U)" if undo_label else "元に戻す(&U)"
+        )
+        self.redo_action.setEnabled(redo_label is not None)
+        self.redo_action.setText(
+            f"やり直し: {redo_label}(&R)" if redo_label else "やり直し(&R)"
+        )
+
+    def set_apply_mode(self, mode: str) -> None:
+        """テーマの適用方式を切り替え、選択中のテーマを再適用
+
+        Args:
+            mode: "stylesheet"(スタイルシート)または"palette"(パレット)
+
+        Raises:
+            ValueError: 未知の適用方式の場合
+        """
+        validate_apply_mode(mode)
+        if mode == self.apply_mode:
+            return
+
+        if mode == APPLY_MODE_STYLESHEET:
+            qt_modules = self.qt_adapter.get_qt_modules()
+            reset_palette(self, qt_modules)
+        else:
+            central_widget = self.centralWidget()
+            if central_widget and central_widget.styleSheet():
+                central_widget.setStyleSheet("")
+        self.preview_window.set_apply_mode(mode)
+        self.apply_mode = mode
+
+        self.logger.info(f"テーマの適用方式を変更しました: {APPLY_MODES[mode]}")
+        self.apply_current_theme()
+
+    def get_compiled_theme(self, theme_name: str) -> CompiledTheme:
+        """テーマのコンパイル結果を取得(テーマ辞書が差し替えられた場合は再コンパイル)
+
+        Raises:
+            KeyError: 未登録のテーマ名の場合
+        """
+        theme_config = self.themes[theme_name]
+        cached = self._compiled_themes.get(theme_name)
+        if cached is not None and cached[0] is theme_config:
+            return cached[1]
+
+        compiled_theme = CompiledTheme.from_data(theme_config, theme_name)
+        self._compiled_themes[theme_name] = (theme_config, compiled_theme)
+        return compiled_theme
+
+    def _apply_theme_to_main_window(
+        self, theme: CompiledTheme, transaction: ThemeApplyTransaction
+    ) -> None:
+        """メインウィンドウにテーマを適用
+
+        スタイルシートはtransactionの終了時にまとめて設定されます。
+        """
         try:
-            colors = theme_data.get("colors", {})
-            if not colors:
+            if self.apply_mode == APPLY_MODE_PALETTE:
+                # 最上位に一度だけ設定し、子ウィジェットへはQtのパレット伝播に任せる
+                with get_metrics_registry().time("main_window.apply_palette"):
+                    apply_palette(self, theme, self.qt_adapter.get_qt_modules())
+                self.logger.info("メインウィンドウにパレットでテーマを適用しました")
                 return
 
             # メインウィンドウ用のスタイルシートを生成
-            main_window_stylesheet = self._generate_main_window_stylesheet(colors)
+            main_window_stylesheet = self._generate_main_window_stylesheet(theme.roles)
 
             # メインウィンドウ全体にスタイルシートを適用
-            self.setStyleSheet(main_window_stylesheet)
-
-            # 中央ウィジェットにもスタイルシートを適用
-            central_widget = self.centralWidget()
-            if central_widget:
-                central_widget.setStyleSheet(main_window_stylesheet)
+            # (中央ウィジェット以下へはカスケードで反映されるため、個別には設定しない)
+            transaction.set_style_sheet(self, main_window_stylesheet)
 
             self.logger.info("メインウィンドウにテーマを適用しました")
 
         except Exception as e:
             self.logger.error(f"メインウィンドウへのテーマ適用エラー: {e}")
 
-    def _generate_main_window_stylesheet(self, colors: dict[str, str]) -> str:
+    def _generate_main_window_stylesheet(self, roles: Mapping[str, str]) -> str:
         """メインウィンドウ用のスタイルシートを生成"""
-        return f"""
-        QMainWindow {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
-        }}
-        QWidget {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
-        }}
-        QGroupBox {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
-            border: 2px solid {colors.get("border", colors.get("primary", "#007acc"))};
-            border-radius: 6px;
-            margin-top: 10px;
-            padding-top: 10px;
-            font-weight: bold;
-        }}
-        QGroupBox::title {{
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px 0 5px;
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
-        }}
-        QPushButton {{
-            background-color: {colors.get("button_background", colors.get("primary", "#007acc"))};
-            color: {colors.get("button_text", "#ffffff")};
-            border: 2px solid {colors.get("button_background", colors.get("primary", "#007acc"))};
-            border-radius: 6px;
-            padding: 8px 16px;
-            font-weight: bold;
-            min-height: 20px;
-        }}
-        QPushButton:hover {{
-            background-color: {colors.get("button_hover", colors.get("accent", colors.get("primary", "#007acc")))};
-            border-color: {colors.get("button_hover", colors.get("accent", colors.get("primary", "#007acc")))};
-        }}
-        QPushButton:pressed {{
-            background-color: {colors.get("button_pressed", colors.get("primary", "#007acc"))};
-        }}
-        QPushButton:disabled {{
-            background-color: {colors.get("disabled_background", "#cccccc")};
-            color: {colors.get("disabled_text", "#666666")};
-            border-color: {colors.get("disabled_border", "#cccccc")};
-        }}
-        QComboBox {{
-            background-color: {colors.get("input_background", colors.get("background", "#ffffff"))};
-            color: {colors.get("input_text", colors.get("text", "#333333"))};
-            border: 2px solid {colors.get("input_border", colors.get("primary", "#007acc"))};
-            border-radius: 4px;
-            padding: 4px;
-        }}
-        QComboBox::drop-down {{
-            border: none;
-            width: 20px;
-        }}
-        QComboBox::down-arrow {{
-            image: none;
-            border-left: 5px solid transparent;
-            border-right: 5px solid transparent;
-            border-top: 5px solid {colors.get("text", "#333333")};
-        }}
-        QComboBox QAbstractItemView {{
-            background-color: {colors.get("input_background", colors.get("background", "#ffffff"))};
-            color: {colors.get("input_text", colors.get("text", "#333333"))};
-            selection-background-color: {colors.get("selection_background", colors.get("primary", "#007acc"))};
-            selection-color: {colors.get("selection_text", "#ffffff")};
-        }}
-        QLabel {{
-            background-color: transparent;
-            color: {colors.get("text", "#333333")};
-        }}
-        QTextEdit {{
-            background-color: {colors.get("input_background", colors.get("background", "#ffffff"))};
-            color: {colors.get("input_text", colors.get("text", "#333333"))};
-            border: 2px solid {colors.get("input_border", colors.get("primary", "#007acc"))};
-            border-radius: 4px;
-            padding: 6px;
-        }}
-        """
+        return "\n".join(
+            template.format_map(roles)
+            for template in MAIN_WINDOW_STYLE_FRAGMENTS.values()
+        )
 
     def convert_theme_for_preview(self, theme_config: dict[str, Any]) -> dict[str, Any]:
         """qt-theme-manager形式のテーマをプレビュー用形式に変換"""
         try:
-            # プレビュー機能が期待する形式に変換
-
-            return {
-                "name": theme_config.get("display_name", self.current_theme_name),
-                "colors": {
-                    "background": theme_config.get("backgroundColor", "#ffffff"),
-                    "text": theme_config.get("textColor", "#333333"),
-                    "primary": theme_config.get("primaryColor", "#007acc"),
-                    "accent": theme_config.get(
-                        "accentColor", theme_config.get("primaryColor", "#007acc")
-                    ),
-                },
-            }
+            return CompiledTheme.from_data(
+                theme_config, self.current_theme_name
+            ).to_preview_dict()
 
         except Exception as e:
             self.logger.error(f"テーマ変換エラー: {e}")
@@ -612,11 +1381,11 @@ class QtThemeStudioMainWindow(QMainWindow):
                 if file_path:
                     theme_data = self.themes[self.current_theme_name]
 
-                    # テーマデータを保存
-                    with Path(file_path).open("w", encoding="utf-8") as f:
-                        import json
-
-                        json.dump(theme_data, f, indent=2, ensure_ascii=False)
+                    # 自動保存の書き込みを待ってから、テーマデータを原子的に保存
+                    # (完了を確認してから結果を表示する)
+                    with self.logger.performance_timer("theme.save"):
+                        get_write_behind_queue().flush()
+                        atomic_write_bytes(file_path, encode_json(theme_data))
 
                     self.logger.info(
                         f"テーマ「{self.current_theme_name}」を保存しました: {file_path}"
@@ -639,7 +1408,7 @@ class QtThemeStudioMainWindow(QMainWindow):
 
     def export_all_themes(self) -> None:
         """全テーマをエクスポート"""
-        if not self.themes:
+        if not self.themes and not self._bundle_themes:
             self.logger.warning("エクスポートするテーマがありません")
             QMessageBox.warning(self, "警告", "エクスポートするテーマがありません")
             return
@@ -660,17 +1429,37 @@ class QtThemeStudioMainWindow(QMainWindow):
 
             if folder_path:
                 exported_count = 0
-
-                for theme_name, theme_data in self.themes.items():
-                    # 各テーマを個別ファイルとして保存
-                    file_path = Path(folder_path) / f"{theme_name}.json"
-
-                    with Path(file_path).open("w", encoding="utf-8") as f:
-                        import json
-
-                        json.dump(theme_data, f, indent=2, ensure_ascii=False)
-
-                    exported_count += 1
+                failures: list[str] = []
+
+                with self.logger.performance_timer("theme.export_all"):
+                    # 自動保存の書き込みを待ってからエクスポートする
+                    get_write_behind_queue().flush()
+                    for theme_name in list(self._bundle_themes):
+                        self._ensure_theme_loaded(theme_name)
+
+                    for theme_name, theme_data in self.themes.items():
+                        # 各テーマを個別ファイルとして原子的に保存
+                        file_path = Path(folder_path) / f"{theme_name}.json"
+                        try:
+                            atomic_write_bytes(file_path, encode_json(theme_data))
+                        except OSError as e:
+                            self.logger.error(
+                                f"テーマのエクスポートに失敗しました: {file_path}: {e}"
+                            )
+                            failures.append(f"{file_path.name}: {e}")
+                            continue
+
+                        exported_count += 1
+
+                if failures:
+                    QMessageBox.critical(
+                        self,
+                        "エクスポートエラー",
+                        f"{len(failures)}個のテーマをエクスポートできませんでした"
+                        f"({exported_count}個は保存済み):\n"
+                        + "\n".join(failures[:EXPORT_ERROR_DISPLAY_COUNT]),
+                    )
+                    return
 
                 self.logger.info(
                     f"{exported_count}個のテーマをエクスポートしました: {folder_path}"
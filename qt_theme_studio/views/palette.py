@@ -0,0 +1,156 @@
+"""
+パレットによるテーマ適用
+
+コンパイル済みテーマの全ロールからQPaletteを一度だけ構築してキャッシュし、
+ウィジェットツリーの最上位に設定します。子ウィジェットへの反映はQtのパレット伝播に任せるため、
+スタイルシートの再ポリッシュに比べて大規模なフォームでも高速にテーマを切り替えられます。
+
+パレットの反映度合いはスタイルに依存します(Fusionスタイルは全ロールを使用します)。
+枠線の太さや角丸など、パレットで表現できない装飾はスタイルシート適用でのみ反映されます。
+"""
+
+from collections import OrderedDict
+from typing import Any
+
+from qt_theme_studio.themes.compiled import CompiledTheme
+
+# テーマの適用方式
+APPLY_MODE_STYLESHEET = "stylesheet"
+APPLY_MODE_PALETTE = "palette"
+
+# 適用方式 → 表示名
+APPLY_MODES = {
+    APPLY_MODE_STYLESHEET: "スタイルシート(QSS)",
+    APPLY_MODE_PALETTE: "パレット(高速)",
+}
+
+# 有効・非アクティブ時のQPalette.ColorRole名 → テーマのロール名
+PALETTE_ROLES = {
+    "Window": "background",
+    "WindowText": "text",
+    "Base": "input_background",
+    "AlternateBase": "zebra_even",
+    "Text": "input_text",
+    "Button": "button_background",
+    "ButtonText": "button_text",
+    "BrightText": "selection_text",
+    "Highlight": "selection_background",
+    "HighlightedText": "selection_text",
+    "Link": "primary",
+    "LinkVisited": "accent",
+    "ToolTipBase": "status_background",
+    "ToolTipText": "status_text",
+    "PlaceholderText": "disabled_text",
+    "Accent": "accent",
+}
+
+# 無効時に上書きするロール
+DISABLED_PALETTE_ROLES = {
+    "WindowText": "disabled_text",
+    "Text": "disabled_text",
+    "ButtonText": "disabled_text",
+    "Button": "disabled_background",
+    "Base": "disabled_background",
+    "Highlight": "disabled_border",
+    "HighlightedText": "disabled_text",
+}
+
+# キャッシュするパレット数の上限
+MAX_CACHED_PALETTES = 64
+
+# (フレームワーク名, 内容ハッシュ) → QPalette
+_palette_cache: OrderedDict[tuple[str, str], Any] = OrderedDict()
+
+
+def validate_apply_mode(mode: str) -> str:
+    """適用方式の名前を検証
+
+    Raises:
+        ValueError: 未知の適用方式の場合
+    """
+    if mode not in APPLY_MODES:
+        raise ValueError(
+            f"未知のテーマ適用方式です: {mode}({', '.join(APPLY_MODES)}のいずれか)"
+        )
+    return mode
+
+
+def to_qcolor(value: str, qt_gui: Any) -> Any:
+    """色値をQColorへ変換(#rrggbbaaはCSSと同じくアルファ値が末尾)
+
+    解釈できない色値の場合は灰色を返します。
+    """
+    text = value.strip()
+    if text.startswith("#") and len(text) == 9:
+        text = f"#{text[7:9]}{text[1:7]}"
+    color = qt_gui.QColor(text)
+    if not color.isValid():
+        color = qt_gui.QColor("#808080")
+    return color
+
+
+def build_palette(theme: CompiledTheme, qt_modules: dict[str, Any]) -> Any:
+    """テーマの全ロールからQPaletteを構築
+
+    立体表現用の色(Light/Midlight/Mid/Dark/Shadow)はボタン色からQtが導出し、
+    全カラーグループに同じ色を設定した後、無効グループをdisabled_*のロールで上書きします。
+    """
+    qt_gui = qt_modules["QtGui"]
+    palette_class = qt_gui.QPalette
+    roles = theme.roles
+    colors = {role: to_qcolor(value, qt_gui) for role, value in roles.items()}
+
+    palette = palette_class(colors["button_background"], colors["background"])
+    for role_name, theme_role in PALETTE_ROLES.items():
+        role = getattr(palette_class.ColorRole, role_name, None)
+        if role is not None:
+            # Accent(Qt 6.6以降)など、古いQtにないロールは設定しない
+            palette.setColor(role, colors[theme_role])
+
+    disabled = palette_class.ColorGroup.Disabled
+    for role_name, theme_role in DISABLED_PALETTE_ROLES.items():
+        palette.setColor(
+            disabled, getattr(palette_class.ColorRole, role_name), colors[theme_role]
+        )
+    return palette
+
+
+def theme_palette(theme: CompiledTheme, qt_modules: dict[str, Any]) -> Any:
+    """コンパイル済みテーマのQPaletteを取得(内容ハッシュごとにキャッシュ)
+
+    返されるQPaletteはキャッシュと共有されるため、変更しないでください。
+    """
+    key = (str(qt_modules.get("framework", "")), theme.content_hash)
+    palette = _palette_cache.get(key)
+    if palette is not None:
+        _palette_cache.move_to_end(key)
+        return palette
+
+    palette = build_palette(theme, qt_modules)
+    _palette_cache[key] = palette
+    while len(_palette_cache) > MAX_CACHED_PALETTES:
+        _palette_cache.popitem(last=False)
+    return palette
+
+
+def clear_palette_cache() -> None:
+    """パレットのキャッシュを破棄"""
+    _palette_cache.clear()
+
+
+def apply_palette(
+    widget: Any, theme: CompiledTheme, qt_modules: dict[str, Any]
+) -> None:
+    """ウィジェットツリーの最上位にテーマのパレットを設定
+
+    子ウィジェットへはQtが伝播して再描画を予約するため、子の走査や同期的な再描画は行いません。
+    最上位のスタイルシートはパレットより優先されるため解除します。
+    """
+    if widget.styleSheet():
+        widget.setStyleSheet("")
+    widget.setPalette(theme_palette(theme, qt_modules))
+
+
+def reset_palette(widget: Any, qt_modules: dict[str, Any]) -> None:
+    """明示的に設定したパレットを解除し、親(アプリケーション)のパレットへ戻す"""
+    widget.setPalette(qt_modules["QtGui"].QPalette())
@@ -4,11 +4,39 @@
 このモジュールは、Qt-Theme-Studioアプリケーションのプレビュー機能を提供します。
 """
 
-from typing import Any, Callable, Optional
+from collections.abc import Mapping
+from typing import Any, Callable, Optional, Union
 
 from qt_theme_studio.adapters.qt_adapter import QtAdapter
 from qt_theme_studio.adapters.theme_adapter import ThemeAdapter
 from qt_theme_studio.logger import LogCategory, get_logger
+from qt_theme_studio.themes.compiled import CompiledTheme, as_compiled_theme
+from qt_theme_studio.themes.history import PersistentMap
+from qt_theme_studio.utilities.metrics import get_metrics_registry
+from qt_theme_studio.validators.theme_schema import get_validator
+from qt_theme_studio.views.apply_transaction import ThemeApplyTransaction
+from qt_theme_studio.views.layout_profiler import LayoutProfile, LayoutProfiler
+from qt_theme_studio.views.palette import (
+    APPLY_MODE_PALETTE,
+    APPLY_MODE_STYLESHEET,
+    apply_palette,
+    reset_palette,
+    validate_apply_mode,
+)
+
+# 適用処理が受け付けるテーマ(テーマデータ、編集履歴の永続マップまたはコンパイル済みテーマ)
+ThemeInput = Union[dict[str, Any], PersistentMap, CompiledTheme]
+
+
+def _compile_for_apply(theme_data: ThemeInput) -> Optional[CompiledTheme]:
+    """適用対象のテーマをコンパイル(色設定のないテーマデータの場合はNone)"""
+    if isinstance(theme_data, CompiledTheme):
+        return theme_data
+    if not theme_data.get("colors"):
+        return None
+    if isinstance(theme_data, PersistentMap):
+        theme_data = theme_data.to_dict()
+    return CompiledTheme.from_data(theme_data)
 
 
 class WidgetShowcase:
@@ -35,6 +63,9 @@ class WidgetShowcase:
         self.widget: Optional[Any] = None
         self.widgets: dict[str, Any] = {}
 
+        # テーマの適用方式(スタイルシートまたはパレット)
+        self.apply_mode = APPLY_MODE_STYLESHEET
+
     def create_widget(self) -> Any:
         """ウィジェットショーケースを作成します
 
@@ -295,14 +326,15 @@ class WidgetShowcase:
         """
         return self.widgets.copy()
 
-    def apply_theme(self, theme_data: dict[str, Any]) -> None:
+    def apply_theme(self, theme_data: ThemeInput) -> None:
         """テーマを適用します
 
         Args:
-            theme_data: 適用するテーマデータ
+            theme_data: 適用するテーマデータまたはコンパイル済みテーマ
         """
         try:
-            self.apply_theme_to_widgets(theme_data)
+            with self.logger.performance_timer("showcase.apply_theme"):
+                self.apply_theme_to_widgets(theme_data)
             self.logger.info(
                 "ウィジェットショーケースにテーマを適用しました", LogCategory.UI
             )
@@ -311,24 +343,46 @@ class WidgetShowcase:
                 f"ウィジェットショーケースへのテーマ適用エラー: {e}", LogCategory.UI
             )
 
-    def apply_theme_to_widgets(self, theme_data: dict[str, Any]) -> None:
+    def set_apply_mode(self, mode: str) -> None:
+        """テーマの適用方式を設定します(次回の適用から反映)
+
+        Args:
+            mode: "stylesheet"または"palette"
+
+        Raises:
+            ValueError: 未知の適用方式の場合
+        """
+        validate_apply_mode(mode)
+        if mode == self.apply_mode:
+            return
+        if self.widget and mode == APPLY_MODE_STYLESHEET:
+            # パレット適用で設定した色がスタイルシートの未指定箇所に残らないよう解除
+            reset_palette(self.widget, self.qt_modules)
+        self.apply_mode = mode
+
+    def apply_theme_to_widgets(self, theme_data: ThemeInput) -> None:
         """ウィジェットにテーマを適用します
 
         Args:
-            theme_data: テーマデータ
+            theme_data: テーマデータまたはコンパイル済みテーマ
         """
         if not self.widget or not theme_data:
             return
 
+        if self.apply_mode == APPLY_MODE_PALETTE:
+            self._apply_theme_via_palette(theme_data)
+            return
+
         try:
-            colors = theme_data.get("colors", {})
-            if not colors:
+            theme = _compile_for_apply(theme_data)
+            if theme is None:
                 return
+            roles = theme.roles
 
             # シンプルなスタイルシート生成
-            bg = colors.get("background", "#ffffff")
-            text = colors.get("text", "#333333")
-            primary = colors.get("primary", "#007acc")
+            bg = roles["background"]
+            text = roles["text"]
+            primary = roles["primary"]
 
             stylesheet = f"""
             QWidget {{
@@ -358,85 +412,85 @@ class WidgetShowcase:
             }}
             """
 
-            # ウィジェット全体にスタイルシートを適用
-            self.widget.setStyleSheet(stylesheet)
-
-            # 強制的に再描画
-            self.widget.update()
-            self.widget.repaint()
+            # ウィジェット全体にスタイルシートを適用(再描画は更新再開時の1回のみ)
+            with ThemeApplyTransaction(self.widget, "showcase") as transaction:
+                transaction.set_style_sheet(self.widget, stylesheet)
 
             self.logger.debug("ウィジェットにテーマを適用しました", LogCategory.UI)
 
         except Exception as e:
             self.logger.error(f"テーマ適用エラー: {e}", LogCategory.UI)
 
-    def _apply_theme_to_individual_widgets(self, theme_data: dict[str, Any]) -> None:
+    def _apply_theme_to_individual_widgets(self, theme_data: ThemeInput) -> None:
         """個別のウィジェットにテーマを適用"""
         if not self.widget or not theme_data:
             return
 
         try:
-            colors = theme_data.get("colors", {})
-            if not colors:
+            theme = _compile_for_apply(theme_data)
+            if theme is None:
                 return
+            roles = theme.roles
 
             # 各ウィジェットタイプ別のスタイルシートを生成
-            button_stylesheet = self._generate_button_stylesheet(colors)
-            input_stylesheet = self._generate_input_stylesheet(colors)
-            selection_stylesheet = self._generate_selection_stylesheet(colors)
-            display_stylesheet = self._generate_display_stylesheet(colors)
-            container_stylesheet = self._generate_container_stylesheet(colors)
-            progress_stylesheet = self._generate_progress_stylesheet(colors)
-
-            # 各ウィジェットに個別のスタイルシートを適用
-            for widget_name, widget in self.widgets.items():
-                try:
-                    if "button" in widget_name.lower():
-                        widget.setStyleSheet(button_stylesheet)
-                    elif any(
-                        keyword in widget_name.lower()
-                        for keyword in ["input", "edit", "line"]
-                    ):
-                        widget.setStyleSheet(input_stylesheet)
-                    elif any(
-                        keyword in widget_name.lower()
-                        for keyword in ["combo", "list", "table"]
-                    ):
-                        widget.setStyleSheet(selection_stylesheet)
-                    elif any(
-                        keyword in widget_name.lower()
-                        for keyword in ["label", "text", "group"]
-                    ):
-                        widget.setStyleSheet(display_stylesheet)
-                    elif any(
-                        keyword in widget_name.lower()
-                        for keyword in ["frame", "widget", "area"]
-                    ):
-                        widget.setStyleSheet(container_stylesheet)
-                    elif any(
-                        keyword in widget_name.lower()
-                        for keyword in ["progress", "bar", "slider"]
-                    ):
-                        widget.setStyleSheet(progress_stylesheet)
-                    else:
-                        # デフォルトスタイル
-                        widget.setStyleSheet(self._generate_default_stylesheet(colors))
-                except Exception as e:
-                    self.logger.debug(
-                        f"ウィジェット {widget_name} へのスタイル適用エラー: {e}"
-                    )
+            button_stylesheet = self._generate_button_stylesheet(roles)
+            input_stylesheet = self._generate_input_stylesheet(roles)
+            selection_stylesheet = self._generate_selection_stylesheet(roles)
+            display_stylesheet = self._generate_display_stylesheet(roles)
+            container_stylesheet = self._generate_container_stylesheet(roles)
+            progress_stylesheet = self._generate_progress_stylesheet(roles)
+
+            # 各ウィジェット向けのスタイルシートを最上位にまとめ、ポリッシュを1回にする
+            with ThemeApplyTransaction(self.widget, "showcase") as transaction:
+                for widget_name, widget in self.widgets.items():
+                    try:
+                        if "button" in widget_name.lower():
+                            transaction.set_style_sheet(widget, button_stylesheet)
+                        elif any(
+                            keyword in widget_name.lower()
+                            for keyword in ["input", "edit", "line"]
+                        ):
+                            transaction.set_style_sheet(widget, input_stylesheet)
+                        elif any(
+                            keyword in widget_name.lower()
+                            for keyword in ["combo", "list", "table"]
+                        ):
+                            transaction.set_style_sheet(widget, selection_stylesheet)
+                        elif any(
+                            keyword in widget_name.lower()
+                            for keyword in ["label", "text", "group"]
+                        ):
+                            transaction.set_style_sheet(widget, display_stylesheet)
+                        elif any(
+                            keyword in widget_name.lower()
+                            for keyword in ["frame", "widget", "area"]
+                        ):
+                            transaction.set_style_sheet(widget, container_stylesheet)
+                        elif any(
+                            keyword in widget_name.lower()
+                            for keyword in ["progress", "bar", "slider"]
+                        ):
+                            transaction.set_style_sheet(widget, progress_stylesheet)
+                        else:
+                            # デフォルトスタイル
+                            transaction.set_style_sheet(
+                                widget, self._generate_default_stylesheet(roles)
+                            )
+                    except Exception as e:
+                        self.logger.debug(
+                            f"ウィジェット {widget_name} へのスタイル適用エラー: {e}"
+                        )
 
             self.logger.info("個別ウィジェットにテーマを適用しました")
 
         except Exception as e:
             self.logger.error(f"個別ウィジェットへのテーマ適用エラー: {e}")
 
-    def _generate_button_stylesheet(self, colors: dict[str, str]) -> str:
+    def _generate_button_stylesheet(self, roles: Mapping[str, str]) -> str:
         """ボタン用のスタイルシートを生成"""
-        primary = colors.get("primary", "#007acc")
-        button_bg = colors.get("button_background", primary)
-        button_text = colors.get("button_text", "#ffffff")
-        button_hover = colors.get("button_hover", colors.get("accent", primary))
+        button_bg = roles["button_background"]
+        button_text = roles["button_text"]
+        button_hover = roles["button_hover"]
 
         return f"""
         QPushButton {{
@@ -453,20 +507,20 @@ class WidgetShowcase:
             border-color: {button_hover};
         }}
         QPushButton:pressed {{
-            background-color: {colors.get("button_pressed", button_hover)};
+            background-color: {roles["showcase_button_pressed"]};
         }}
         QPushButton:disabled {{
-            background-color: {colors.get("disabled_background", "#cccccc")};
-            color: {colors.get("disabled_text", "#666666")};
-            border-color: {colors.get("disabled_border", "#cccccc")};
+            background-color: {roles["disabled_background"]};
+            color: {roles["disabled_text"]};
+            border-color: {roles["disabled_border"]};
         }}
         """
 
-    def _generate_input_stylesheet(self, colors: dict[str, str]) -> str:
+    def _generate_input_stylesheet(self, roles: Mapping[str, str]) -> str:
         """入力ウィジェット用のスタイルシートを生成"""
-        input_bg = colors.get("input_background", colors.get("background", "#ffffff"))
-        input_text = colors.get("input_text", colors.get("text", "#333333"))
-        input_border = colors.get("input_border", colors.get("primary", "#007acc"))
+        input_bg = roles["input_background"]
+        input_text = roles["input_text"]
+        input_border = roles["input_border"]
 
         return f"""
         QLineEdit, QTextEdit, QPlainTextEdit {{
@@ -475,26 +529,24 @@ class WidgetShowcase:
             border: 2px solid {input_border};
             border-radius: 4px;
             padding: 6px;
-            selection-background-color: {colors.get("selection_background", colors.get("primary", "#007acc"))};
+            selection-background-color: {roles["selection_background"]};
         }}
         QLineEdit:focus, QTextEdit:focus, QPlainTextEdit:focus {{
-            border-color: {colors.get("focus_border", colors.get("accent", input_border))};
+            border-color: {roles["focus_border"]};
             border-width: 3px;
         }}
         """
 
-    def _generate_selection_stylesheet(self, colors: dict[str, str]) -> str:
+    def _generate_selection_stylesheet(self, roles: Mapping[str, str]) -> str:
         """選択ウィジェット用のスタイルシートを生成"""
-        selection_bg = colors.get(
-            "selection_background", colors.get("primary", "#007acc")
-        )
-        selection_text = colors.get("selection_text", "#ffffff")
+        selection_bg = roles["selection_background"]
+        selection_text = roles["selection_text"]
 
         return f"""
         QComboBox, QListWidget, QTableWidget {{
-            background-color: {colors.get("input_background", colors.get("background", "#ffffff"))};
-            color: {colors.get("input_text", colors.get("text", "#333333"))};
-            border: 2px solid {colors.get("input_border", colors.get("primary", "#007acc"))};
+            background-color: {roles["input_background"]};
+            color: {roles["input_text"]};
+            border: 2px solid {roles["input_border"]};
             border-radius: 4px;
             padding: 4px;
         }}
@@ -506,26 +558,26 @@ class WidgetShowcase:
             image: none;
             border-left: 5px solid transparent;
             border-right: 5px solid transparent;
-            border-top: 5px solid {colors.get("text", "#333333")};
+            border-top: 5px solid {roles["text"]};
         }}
         QComboBox QAbstractItemView {{
-            background-color: {colors.get("input_background", colors.get("background", "#ffffff"))};
-            color: {colors.get("input_text", colors.get("text", "#333333"))};
+            background-color: {roles["input_background"]};
+            color: {roles["input_text"]};
             selection-background-color: {selection_bg};
             selection-color: {selection_text};
         }}
         """
 
-    def _generate_display_stylesheet(self, colors: dict[str, str]) -> str:
+    def _generate_display_stylesheet(self, roles: Mapping[str, str]) -> str:
         """表示ウィジェット用のスタイルシートを生成"""
         return f"""
         QLabel, QGroupBox {{
-            color: {colors.get("text", "#333333")};
+            color: {roles["text"]};
             background-color: transparent;
         }}
         QGroupBox {{
             font-weight: bold;
-            border: 2px solid {colors.get("border", colors.get("primary", "#007acc"))};
+            border: 2px solid {roles["border"]};
             border-radius: 6px;
             margin-top: 10px;
             padding-top: 10px;
@@ -534,31 +586,31 @@ class WidgetShowcase:
             subcontrol-origin: margin;
             left: 10px;
             padding: 0 5px 0 5px;
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
+            background-color: {roles["background"]};
+            color: {roles["text"]};
         }}
         """
 
-    def _generate_container_stylesheet(self, colors: dict[str, str]) -> str:
+    def _generate_container_stylesheet(self, roles: Mapping[str, str]) -> str:
         """コンテナウィジェット用のスタイルシートを生成"""
         return f"""
         QFrame, QWidget {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
+            background-color: {roles["background"]};
+            color: {roles["text"]};
         }}
         QScrollArea {{
-            background-color: {colors.get("background", "#ffffff")};
-            border: 1px solid {colors.get("border", colors.get("primary", "#007acc"))};
+            background-color: {roles["background"]};
+            border: 1px solid {roles["border"]};
             border-radius: 4px;
         }}
         QTabWidget::pane {{
-            border: 1px solid {colors.get("border", colors.get("primary", "#007acc"))};
-            background-color: {colors.get("background", "#ffffff")};
+            border: 1px solid {roles["border"]};
+            background-color: {roles["background"]};
         }}
         QTabBar::tab {{
-            background-color: {colors.get("input_background", colors.get("background", "#f0f0f0"))};
-            color: {colors.get("text", "#333333")};
-            border: 1px solid {colors.get("border", colors.get("primary", "#007acc"))};
+            background-color: {roles["tab_background"]};
+            color: {roles["text"]};
+            border: 1px solid {roles["border"]};
             border-bottom: none;
             border-top-left-radius: 4px;
             border-top-right-radius: 4px;
@@ -566,190 +618,144 @@ class WidgetShowcase:
             margin-right: 2px;
         }}
         QTabBar::tab:selected {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
-            border-bottom: 1px solid {colors.get("background", "#ffffff")};
+            background-color: {roles["background"]};
+            color: {roles["text"]};
+            border-bottom: 1px solid {roles["background"]};
         }}
         QTabBar::tab:hover {{
-            background-color: {colors.get("input_background", colors.get("background", "#f0f0f0"))};
+            background-color: {roles["tab_background"]};
         }}
         QScrollBar:vertical {{
-            background-color: {colors.get("scrollbar_background", colors.get("background", "#f0f0f0"))};
+            background-color: {roles["scrollbar_background"]};
             width: 12px;
             border-radius: 6px;
         }}
         QScrollBar::handle:vertical {{
-            background-color: {colors.get("scrollbar_handle", colors.get("primary", "#007acc"))};
+            background-color: {roles["scrollbar_handle"]};
             border-radius: 6px;
             min-height: 20px;
         }}
         QScrollBar::handle:vertical:hover {{
-            background-color: {colors.get("scrollbar_handle_hover", colors.get("accent", colors.get("primary", "#007acc")))};
+            background-color: {roles["scrollbar_handle_hover"]};
         }}
         """
 
-    def _generate_progress_stylesheet(self, colors: dict[str, str]) -> str:
+    def _generate_progress_stylesheet(self, roles: Mapping[str, str]) -> str:
         """プログレスウィジェット用のスタイルシートを生成"""
         return f"""
         QProgressBar, QSlider {{
-            background-color: {colors.get("progress_background", colors.get("background", "#f0f0f0"))};
-            border: 1px solid {colors.get("border", colors.get("primary", "#007acc"))};
+            background-color: {roles["progress_background"]};
+            border: 1px solid {roles["border"]};
             border-radius: 4px;
         }}
         QProgressBar::chunk {{
-            background-color: {colors.get("progress_fill", colors.get("primary", "#007acc"))};
+            background-color: {roles["progress_fill"]};
             border-radius: 3px;
         }}
         QSlider::groove:horizontal {{
-            background-color: {colors.get("slider_groove", colors.get("background", "#f0f0f0"))};
-            border: 1px solid {colors.get("border", colors.get("primary", "#007acc"))};
+            background-color: {roles["slider_groove"]};
+            border: 1px solid {roles["border"]};
             border-radius: 2px;
             height: 8px;
         }}
         QSlider::handle:horizontal {{
-            background-color: {colors.get("slider_handle", colors.get("primary", "#007acc"))};
-            border: 2px solid {colors.get("slider_handle_border", colors.get("primary", "#007acc"))};
+            background-color: {roles["slider_handle"]};
+            border: 2px solid {roles["slider_handle_border"]};
             border-radius: 8px;
             width: 16px;
             margin: -4px 0;
         }}
         """
 
-    def _generate_default_stylesheet(self, colors: dict[str, str]) -> str:
+    def _generate_default_stylesheet(self, roles: Mapping[str, str]) -> str:
         """デフォルトのスタイルシートを生成"""
         return f"""
         QWidget {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
+            background-color: {roles["background"]};
+            color: {roles["text"]};
         }}
         QMainWindow {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
+            background-color: {roles["background"]};
+            color: {roles["text"]};
         }}
         QMenuBar {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
-            border-bottom: 1px solid {colors.get("border", colors.get("primary", "#007acc"))};
+            background-color: {roles["background"]};
+            color: {roles["text"]};
+            border-bottom: 1px solid {roles["border"]};
         }}
         QMenuBar::item {{
             background-color: transparent;
-            color: {colors.get("text", "#333333")};
+            color: {roles["text"]};
             padding: 4px 8px;
         }}
         QMenuBar::item:selected {{
-            background-color: {colors.get("selection_background", colors.get("primary", "#007acc"))};
-            color: {colors.get("selection_text", "#ffffff")};
+            background-color: {roles["selection_background"]};
+            color: {roles["selection_text"]};
         }}
         QMenu {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
-            border: 1px solid {colors.get("border", colors.get("primary", "#007acc"))};
+            background-color: {roles["background"]};
+            color: {roles["text"]};
+            border: 1px solid {roles["border"]};
             border-radius: 4px;
         }}
         QMenu::item {{
             background-color: transparent;
-            color: {colors.get("text", "#333333")};
+            color: {roles["text"]};
             padding: 6px 20px;
         }}
         QMenu::item:selected {{
-            background-color: {colors.get("selection_background", colors.get("primary", "#007acc"))};
-            color: {colors.get("selection_text", "#ffffff")};
+            background-color: {roles["selection_background"]};
+            color: {roles["selection_text"]};
         }}
         QToolBar {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
-            border: 1px solid {colors.get("border", colors.get("primary", "#007acc"))};
+            background-color: {roles["background"]};
+            color: {roles["text"]};
+            border: 1px solid {roles["border"]};
             border-radius: 4px;
             spacing: 2px;
         }}
         QToolButton {{
-            background-color: {colors.get("button_background", colors.get("primary", "#007acc"))};
-            color: {colors.get("button_text", "#ffffff")};
-            border: 1px solid {colors.get("button_border", colors.get("primary", "#007acc"))};
+            background-color: {roles["button_background"]};
+            color: {roles["button_text"]};
+            border: 1px solid {roles["button_border"]};
             border-radius: 4px;
             padding: 4px 8px;
             margin: 1px;
         }}
         QToolButton:hover {{
-            background-color: {colors.get("button_hover", colors.get("accent", colors.get("primary", "#007acc")))};
-            border-color: {colors.get("button_hover", colors.get("accent", colors.get("primary", "#007acc")))};
+            background-color: {roles["button_hover"]};
+            border-color: {roles["button_hover"]};
         }}
         QToolButton:pressed {{
-            background-color: {colors.get("button_pressed", colors.get("primary", "#007acc"))};
+            background-color: {roles["button_pressed"]};
         }}
         QStatusBar {{
-            background-color: {colors.get("background", "#ffffff")};
-            color: {colors.get("text", "#333333")};
-            border-top: 1px solid {colors.get("border", colors.get("primary", "#007acc"))};
+            background-color: {roles["background"]};
+            color: {roles["text"]};
+            border-top: 1px solid {roles["border"]};
         }}
         """
 
-    def _apply_theme_via_palette(self, theme_data: dict[str, Any]) -> None:
-        """パレットを直接操作してテーマを適用(スタイルシートの代替手段)"""
+    def _apply_theme_via_palette(self, theme_data: ThemeInput) -> None:
+        """パレットを直接操作してテーマを適用(スタイルシートの代替手段)
+
+        テーマごとにキャッシュしたQPaletteを最上位のウィジェットに一度だけ設定し、
+        子ウィジェットへの反映と再描画はQtのパレット伝播に任せます。
+        """
         if not self.widget or not theme_data:
             return
 
         try:
-            colors = theme_data.get("colors", {})
-            if not colors:
+            theme = _compile_for_apply(theme_data)
+            if theme is None:
                 return
-
-            # 新しいパレットを作成
-            palette = self.widget.palette()
-
-            # 背景色を設定
-            if "background" in colors:
-                bg_color = self.QtGui.QColor(colors["background"])
-                palette.setColor(palette.ColorRole.Window, bg_color)
-                palette.setColor(palette.ColorRole.Base, bg_color)
-                palette.setColor(palette.ColorRole.Button, bg_color)
-                palette.setColor(palette.ColorRole.Light, bg_color)
-                palette.setColor(palette.ColorRole.Mid, bg_color)
-                palette.setColor(palette.ColorRole.Dark, bg_color)
-
-            # テキスト色を設定
-            if "text" in colors:
-                text_color = self.QtGui.QColor(colors["text"])
-                palette.setColor(palette.ColorRole.WindowText, text_color)
-                palette.setColor(palette.ColorRole.Text, text_color)
-                palette.setColor(palette.ColorRole.ButtonText, text_color)
-
-            # プライマリ色を設定
-            if "primary" in colors:
-                primary_color = self.QtGui.QColor(colors["primary"])
-                palette.setColor(palette.ColorRole.Highlight, primary_color)
-                palette.setColor(palette.ColorRole.Link, primary_color)
-
-            # パレットをウィジェットに適用
-            self.widget.setPalette(palette)
-
-            # 子ウィジェットにもパレットを適用
-            for child in self.widget.findChildren(self.QtWidgets.QWidget):
-                try:
-                    child.setPalette(palette)
-                except (RuntimeError, AttributeError):
-                    # ウィジェットが削除済みまたは無効な場合はスキップ
-                    continue
-
-            # 強制的に再描画を実行
-            self.widget.update()
-            self.widget.repaint()
-
-            # 子ウィジェットも再描画
-            for child in self.widget.findChildren(self.QtWidgets.QWidget):
-                try:
-                    child.update()
-                    child.repaint()
-                except (RuntimeError, AttributeError):
-                    # ウィジェットが削除済みまたは無効な場合はスキップ
-                    continue
-
-            self.logger.info(
-                "パレットを直接操作してテーマを適用し、強制再描画を実行しました"
-            )
+            timer = get_metrics_registry().time("showcase.apply_palette")
+            with timer, ThemeApplyTransaction(self.widget, "showcase"):
+                apply_palette(self.widget, theme, self.qt_modules)
+            self.logger.debug("パレットでテーマを適用しました", LogCategory.UI)
 
         except Exception as e:
-            self.logger.info(f"パレット操作でエラー: {e}")
+            self.logger.error(f"パレット適用エラー: {e}", LogCategory.UI)
 
     def _debug_widget_colors(self) -> None:
         """ウィジェットの実際の色をデバッグ出力"""
@@ -881,24 +887,27 @@ class WidgetShowcase:
         except Exception as e:
             self.logger.info(f"色のデバッグ中にエラー: {e}")
 
-    def _generate_stylesheet_from_theme(self, theme_data: dict[str, Any]) -> str:
+    def _generate_stylesheet_from_theme(self, theme_data: ThemeInput) -> str:
         """テーマデータからスタイルシートを生成します
 
         Args:
-            theme_data: テーマデータ
+            theme_data: テーマデータまたはコンパイル済みテーマ
 
         Returns:
             str: 生成されたスタイルシート
         """
+        # 変換・フォールバック生成で共有するため一度だけコンパイル
+        theme = as_compiled_theme(theme_data)
+
         # まずフォールバックスタイルシートを生成
-        fallback_stylesheet = self._generate_fallback_stylesheet(theme_data)
+        fallback_stylesheet = self._generate_fallback_stylesheet(theme)
 
         try:
             # qt-theme-managerのStylesheetGeneratorを使用
             import qt_theme_manager
 
             # テーマデータの検証
-            converted_theme = self._convert_to_qt_theme_manager_format(theme_data)
+            converted_theme = self._convert_to_qt_theme_manager_format(theme)
             validation_result = self._validate_theme_for_qt_manager(converted_theme)
 
             if not validation_result["is_valid"]:
@@ -931,68 +940,17 @@ class WidgetShowcase:
                     "is_valid": False,
                     "errors": [str(e)],
                     "theme_data": theme_data,
-                    "converted_theme": self._convert_to_qt_theme_manager_format(
-                        theme_data
-                    ),
+                    "converted_theme": self._convert_to_qt_theme_manager_format(theme),
                 }
             )
             return fallback_stylesheet
 
     def _convert_to_qt_theme_manager_format(
-        self, theme_data: dict[str, Any]
+        self, theme_data: ThemeInput
     ) -> dict[str, Any]:
         """Qt-Theme-Studio形式をqt-theme-manager形式に変換"""
         try:
-            colors_raw = theme_data.get("colors", {})
-            colors = colors_raw if isinstance(colors_raw, dict) else {}
-
-            return {
-                "name": str(theme_data.get("name", "Unknown")),
-                "display_name": str(
-                    theme_data.get("display_name", theme_data.get("name", "Unknown"))
-                ),
-                "description": str(theme_data.get("description", "")),
-                "primaryColor": str(colors.get("primary", "#007acc")),
-                "accentColor": str(
-                    colors.get("accent", colors.get("primary", "#007acc"))
-                ),
-                "backgroundColor": str(colors.get("background", "#ffffff")),
-                "textColor": str(colors.get("text", "#333333")),
-                "button": {
-                    "background": str(
-                        colors.get(
-                            "button_background", colors.get("primary", "#007acc")
-                        )
-                    ),
-                    "text": str(
-                        colors.get("button_text", colors.get("text", "#ffffff"))
-                    ),
-                },
-                "input": {
-                    "background": str(
-                        colors.get(
-                            "input_background", colors.get("background", "#ffffff")
-                        )
-                    ),
-                    "text": str(
-                        colors.get("input_text", colors.get("text", "#333333"))
-                    ),
-                    "border": str(
-                        colors.get("input_border", colors.get("primary", "#007acc"))
-                    ),
-                },
-                "status": {
-                    "background": str(
-                        colors.get(
-                            "status_background", colors.get("background", "#ffffff")
-                        )
-                    ),
-                    "text": str(
-                        colors.get("status_text", colors.get("text", "#333333"))
-                    ),
-                    "border": str(colors.get("status_border", "#dee2e6")),
-                },
-            }
+            return as_compiled_theme(theme_data).to_qt_theme_manager()
 
         except Exception as e:
             self.logger.error(f"テーマ形式変換に失敗: {e}", LogCategory.UI)
@@ -1006,15 +964,15 @@ class WidgetShowcase:
                 "textColor": "#333333",
             }
 
-    def _generate_fallback_stylesheet(self, theme_data: dict[str, Any]) -> str:
+    def _generate_fallback_stylesheet(self, theme_data: ThemeInput) -> str:
         """フォールバックスタイルシートを生成"""
-        colors = theme_data.get("colors", {})
+        roles = as_compiled_theme(theme_data).roles
 
         # 基本色の取得
-        bg_color = colors.get("background", "#ffffff")
-        text_color = colors.get("text", "#333333")
-        primary_color = colors.get("primary", "#007acc")
-        accent_color = colors.get("accent", primary_color)
+        bg_color = roles["background"]
+        text_color = roles["text"]
+        primary_color = roles["primary"]
+        accent_color = roles["accent"]
 
         return f"""
 /* フォールバックスタイルシート */
@@ -1068,74 +1026,9 @@ QGroupBox::title {{
         self, theme_data: dict[str, Any]
     ) -> dict[str, Any]:
         """テーマデータがqt-theme-managerで使用可能か検証"""
-        errors = []
-        warnings = []
-
-        # 必須フィールドのチェック
-        required_fields = ["name", "primaryColor", "backgroundColor", "textColor"]
-        for field in required_fields:
-            if field not in theme_data or not theme_data[field]:
-                errors.append(f"必須フィールドが不足: {field}")
-
-        # 色値のフォーマットチェック
-        color_fields = ["primaryColor", "backgroundColor", "textColor", "accentColor"]
-        for field in color_fields:
-            if field in theme_data:
-                color_value = theme_data[field]
-                if not self._is_valid_color_format(color_value):
-                    errors.append(f"無効な色形式: {field} = {color_value}")
-
-        # ネストされたオブジェクトのチェック
-        nested_objects = ["button", "input", "status"]
-        for obj_name in nested_objects:
-            if obj_name in theme_data and isinstance(theme_data[obj_name], dict):
-                obj_data = theme_data[obj_name]
-                for key, value in obj_data.items():
-                    if key in [
-                        "background",
-                        "text",
-                        "border",
-                    ] and not self._is_valid_color_format(value):
-                        errors.append(f"無効な色形式: {obj_name}.{key} = {value}")
-
-        return {
-            "is_valid": len(errors) == 0,
-            "errors": errors,
-            "warnings": warnings,
-            "theme_data": theme_data,
-        }
-
-    def _is_valid_color_format(self, color_value: str) -> bool:
-        """色値のフォーマットが有効かチェック"""
-        if not isinstance(color_value, str):
-            return False
-
-        color_value = color_value.strip()
-
-        # 16進数カラーコードのチェック
-        if color_value.startswith("#"):
-            hex_part = color_value[1:]
-            if len(hex_part) in [3, 6, 8]:  # #RGB, #RRGGBB, #RRGGBBAA
-                return all(c in "0123456789abcdefABCDEF" for c in hex_part)
-
-        # RGB/RGBA形式のチェック
-        if color_value.startswith(("rgb(", "rgba(")):
-            return True
-
-        # 名前付き色のチェック
-        named_colors = {
-            "black",
-            "white",
-            "red",
-            "green",
-            "blue",
-            "yellow",
-            "cyan",
-            "magenta",
-            "gray",
-            "transparent",
-        }
-        return color_value.lower() in named_colors
+        result = get_validator("qt_theme_manager").validate(theme_data).to_dict()
+        result["theme_data"] = theme_data
+        return result
 
     def _show_theme_error_dialog(self, validation_result: dict[str, Any]) -> None:
         """テーマエラーダイアログを表示"""
@@ -1241,34 +1134,67 @@ class PreviewWindow:
 
         # 更新管理
         self.update_timer: Optional[Any] = None
-        self.pending_theme_data: Optional[dict[str, Any]] = None
+        self.pending_theme_data: Optional[ThemeInput] = None
+
+        # テーマの適用方式(スタイルシートまたはパレット)
+        self.apply_mode = APPLY_MODE_STYLESHEET
 
         # コールバック
-        self.theme_applied_callback: Optional[Callable[[dict[str, Any]], None]] = None
+        self.theme_applied_callback: Optional[Callable[[ThemeInput], None]] = None
 
         self.logger.info("プレビューウィンドウを初期化しました", LogCategory.UI)
 
-    def apply_theme(self, theme_data: dict[str, Any]) -> None:
+    def set_apply_mode(self, mode: str) -> None:
+        """テーマの適用方式を設定します(次回の適用から反映)
+
+        Args:
+            mode: "stylesheet"または"palette"
+
+        Raises:
+            ValueError: 未知の適用方式の場合
+        """
+        validate_apply_mode(mode)
+        if mode == self.apply_mode:
+            return
+        if self.widget and mode == APPLY_MODE_STYLESHEET:
+            reset_palette(self.widget, self.qt_modules)
+        if self.widget_showcase:
+            self.widget_showcase.set_apply_mode(mode)
+        self.apply_mode = mode
+
+    def apply_theme(self, theme_data: ThemeInput) -> None:
         """テーマを適用します
 
         Args:
-            theme_data: 適用するテーマデータ
+            theme_data: 適用するテーマデータまたはコンパイル済みテーマ
         """
         try:
             if self.widget_showcase and self.widget:
-                # シンプルなスタイルシート生成
-                colors = theme_data.get("colors", {})
-                stylesheet = self._generate_simple_stylesheet(colors)
+                with self.logger.performance_timer("preview.apply_theme"):
+                    theme = as_compiled_theme(theme_data)
+                    if self.apply_mode == APPLY_MODE_PALETTE:
+                        # キャッシュ済みのパレットを最上位に設定し、子へはQtが伝播する
+                        timer = get_metrics_registry().time("preview.apply_palette")
+                        with timer, ThemeApplyTransaction(self.widget, "preview"):
+                            apply_palette(self.widget, theme, self.qt_modules)
+                        self.logger.info(
+                            f"プレビューウィンドウにテーマを適用しました(パレット): "
+                            f"{theme.display_name}",
+                            LogCategory.UI,
+                        )
+                        return
 
-                # プレビューウィジェット全体にスタイルシートを適用
-                self.widget.setStyleSheet(stylesheet)
+                    # シンプルなスタイルシート生成
+                    with get_metrics_registry().time("preview.generate_stylesheet"):
+                        stylesheet = self._generate_simple_stylesheet(theme.roles)
 
-                # 強制的に再描画
-                self.widget.update()
-                self.widget.repaint()
+                    # プレビューウィジェット全体にスタイルシートを適用
+                    # (再描画は更新再開時の非同期の1回のみ)
+                    with ThemeApplyTransaction(self.widget, "preview") as transaction:
+                        transaction.set_style_sheet(self.widget, stylesheet)
 
                 self.logger.info(
-                    f"プレビューウィンドウにテーマを適用しました: {theme_data.get('name', 'Unknown')}",
+                    f"プレビューウィンドウにテーマを適用しました: {theme.display_name}",
                     LogCategory.UI,
                 )
             else:
@@ -1280,12 +1206,12 @@ class PreviewWindow:
                 f"プレビューウィンドウへのテーマ適用エラー: {e}", LogCategory.UI
             )
 
-    def _generate_simple_stylesheet(self, colors: dict[str, str]) -> str:
+    def _generate_simple_stylesheet(self, roles: Mapping[str, str]) -> str:
         """シンプルなスタイルシートを生成"""
-        bg = colors.get("background", "#ffffff")
-        text = colors.get("text", "#333333")
-        primary = colors.get("primary", "#007acc")
-        accent = colors.get("accent", primary)
+        bg = roles["background"]
+        text = roles["text"]
+        primary = roles["primary"]
+        accent = roles["accent"]
 
         return f"""
         QWidget {{
@@ -1349,10 +1275,10 @@ class PreviewWindow:
             color: {text};
             border: 2px solid {primary};
             border-radius: 4px;
-            alternate-background-color: {colors.get("zebra_even", "#f8f9fa")};
+            alternate-background-color: {roles["zebra_even"]};
         }}
         QListWidget::item:alternate, QTreeWidget::item:alternate {{
-            background-color: {colors.get("zebra_even", "#f8f9fa")};
+            background-color: {roles["zebra_even"]};
         }}
         QListWidget::item:selected, QTreeWidget::item:selected {{
             background-color: {primary};
@@ -1425,6 +1351,7 @@ class PreviewWindow:
 
         # ウィジェットショーケースを作成
         self.widget_showcase = WidgetShowcase(self.qt_modules, self.widget)
+        self.widget_showcase.apply_mode = self.apply_mode
         showcase_widget = self.widget_showcase.create_widget()
         layout.addWidget(showcase_widget)
 
@@ -1444,17 +1371,22 @@ class PreviewWindow:
 
         self.logger.debug("更新タイマーを設定しました", LogCategory.UI)
 
-    def update_preview(self, theme_data: dict[str, Any]) -> None:
+    def update_preview(self, theme_data: ThemeInput) -> None:
         """プレビューを更新します(500ms以内の更新保証とデバウンス処理)
 
         Args:
-            theme_data: 適用するテーマデータ
+            theme_data: 適用するテーマデータまたはコンパイル済みテーマ
         """
         if not self.widget or not theme_data:
             return
 
         # 保留中のテーマデータを更新
-        self.pending_theme_data = theme_data.copy()
+        # コンパイル済みテーマと編集履歴の永続マップは不変のため複製不要
+        self.pending_theme_data = (
+            theme_data
+            if isinstance(theme_data, (CompiledTheme, PersistentMap))
+            else theme_data.copy()
+        )
 
         # タイマーを再開(デバウンス処理)
         if self.update_timer:
@@ -1572,7 +1504,7 @@ class PreviewWindow:
         return self.widget_showcase
 
     def set_theme_applied_callback(
-        self, callback: Callable[[dict[str, Any]], None]
+        self, callback: Callable[[ThemeInput], None]
     ) -> None:
         """テーマ適用コールバックを設定します
 
@@ -1589,61 +1521,83 @@ class PreviewWindow:
         """
         return self.widget
 
+    def profile_layout(
+        self,
+        sizes: Optional[list[tuple[int, int]]] = None,
+        scale_factors: Optional[list[float]] = None,
+        repeats: int = 1,
+    ) -> Optional[LayoutProfile]:
+        """サイズとスケール係数を変えながらレイアウトと描画のコストを計測します
+
+        Args:
+            sizes: 順に適用するウィンドウサイズのリスト [(width, height), ...]
+            scale_factors: 描画時のデバイスピクセル比のリスト
+            repeats: サイズのリストを繰り返す回数
+
+        Returns:
+            Optional[LayoutProfile]: 計測結果(プレビューが未作成の場合はNone)
+        """
+        if not self.widget:
+            return None
+        profiler = LayoutProfiler(self.widget, self.qt_modules)
+        return profiler.profile(sizes, scale_factors, repeats)
+
     def test_responsive_layout(
-        self, sizes: Optional[list[tuple]] = None
+        self,
+        sizes: Optional[list[tuple[int, int]]] = None,
+        scale_factors: Optional[list[float]] = None,
+        threshold_ms: float = 100.0,
     ) -> dict[str, Any]:
         """レスポンシブレイアウトテストを実行します
 
         Args:
             sizes: テストするウィンドウサイズのリスト [(width, height), ...]
+            scale_factors: 描画時のデバイスピクセル比のリスト
+            threshold_ms: レイアウトと描画の合計がこれを超えたサイズを問題として記録
 
         Returns: dict[str, Any]: テスト結果
         """
         if not self.widget:
             return {"error": "プレビューウィンドウが作成されていません"}
 
-        if sizes is None:
-            sizes = [(800, 600), (1024, 768), (1280, 1024), (1920, 1080)]
-
         results: dict[str, Any] = {
             "tested_sizes": [],
             "layout_issues": [],
             "performance_data": [],
         }
 
-        original_size = self.widget.size()
-
         try:
-            for width, height in sizes:
-                start_time = self.QtCore.QTime.currentTime()
-
-                # ウィンドウサイズを変更
-                self.widget.resize(width, height)
-
-                # レイアウトの更新を強制
-                self.widget.updateGeometry()
-                self.widget.repaint()
-
-                # 処理時間を計算
-                end_time = self.QtCore.QTime.currentTime()
-                elapsed_ms = start_time.msecsTo(end_time)
-
-                results["tested_sizes"].append((width, height))
+            profile = self.profile_layout(sizes, scale_factors)
+            for sample in profile.samples:
+                layout_ms = sample["layout_ns"] / 1e6
+                paint_ms = sample["paint_ns"] / 1e6
+                update_time_ms = layout_ms + paint_ms
+                if sample["size"] not in results["tested_sizes"]:
+                    results["tested_sizes"].append(sample["size"])
                 results["performance_data"].append(
-                    {"size": (width, height), "update_time_ms": elapsed_ms}
+                    {
+                        "size": sample["size"],
+                        "scale": sample["scale"],
+                        "layout_time_ms": layout_ms,
+                        "paint_time_ms": paint_ms,
+                        "update_time_ms": update_time_ms,
+                    }
                 )
 
                 # レイアウトの問題をチェック(基本的な検証)
-                if elapsed_ms > 100:  # 100ms以上かかった場合は問題として記録
+                if update_time_ms > threshold_ms:
                     results["layout_issues"].append(
                         {
-                            "size": (width, height),
-                            "issue": "レイアウト更新が遅い: {elapsed_ms}ms",
+                            "size": sample["size"],
+                            "scale": sample["scale"],
+                            "issue": f"レイアウト更新が遅い: {update_time_ms:.1f}ms",
                         }
                     )
+            results["profile"] = profile.to_dict()
 
             self.logger.info(
-                "レスポンシブレイアウトテストを完了しました: {len(sizes)}サイズ",
+                f"レスポンシブレイアウトテストを完了しました: "
+                f"{len(results['tested_sizes'])}サイズ",
                 LogCategory.UI,
             )
 
@@ -1653,8 +1607,5 @@ class PreviewWindow:
                 f"レスポンシブレイアウトテストでエラーが発生しました: {e}",
                 LogCategory.UI,
             )
-        finally:
-            # 元のサイズに戻す
-            self.widget.resize(original_size)
 
         return results
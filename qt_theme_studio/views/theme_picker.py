@@ -0,0 +1,159 @@
+"""
+テーマ選択ダイアログ
+
+登録済みのテーマをサムネイル付きの一覧で表示し、適用せずに見比べて選択できます。
+サムネイルはThumbnailRendererによりバックグラウンドで描画されます。
+"""
+
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QSize, Qt, QTimer
+from PySide6.QtGui import QColor, QIcon, QPixmap
+from PySide6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QLineEdit,
+    QListView,
+    QListWidget,
+    QListWidgetItem,
+    QVBoxLayout,
+)
+
+from qt_theme_studio.logger import get_logger
+from qt_theme_studio.themes.compiled import CompiledTheme
+from qt_theme_studio.views.thumbnails import ThumbnailRenderer
+
+# テーマ名を保持するアイテムデータのロール
+THEME_NAME_ROLE = Qt.ItemDataRole.UserRole
+
+
+class ThemePickerDialog(QDialog):
+    """サムネイル付きのテーマ選択ダイアログ
+
+    多数のテーマがあってもダイアログの表示を妨げないよう、
+    サムネイルの要求はタイマーでbatch_size件ずつ行います。
+    """
+
+    def __init__(
+        self,
+        themes: list[tuple[str, str]],
+        compile_theme: Callable[[str], CompiledTheme],
+        renderer: ThumbnailRenderer,
+        current_theme_name: Optional[str] = None,
+        parent: Any = None,
+        batch_size: int = 32,
+    ) -> None:
+        """テーマ選択ダイアログを初期化します
+
+        Args:
+            themes: (テーマ名, 表示名)の一覧
+            compile_theme: テーマ名からコンパイル済みテーマを取得する関数
+            renderer: サムネイル描画
+            current_theme_name: 選択状態で表示するテーマ名
+            parent: 親ウィジェット
+            batch_size: 1回に要求するサムネイル数
+        """
+        super().__init__(parent)
+        self.logger = get_logger()
+        self.compile_theme = compile_theme
+        self.renderer = renderer
+        self.batch_size = batch_size
+        self._closed = False
+
+        self.setWindowTitle("テーマ一覧")
+        self.resize(900, 640)
+
+        layout = QVBoxLayout(self)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("テーマ名で絞り込み")
+        self.filter_edit.textChanged.connect(self._apply_filter)
+        layout.addWidget(self.filter_edit)
+
+        width, height = renderer.size
+        self.list_widget = QListWidget()
+        self.list_widget.setViewMode(QListView.ViewMode.IconMode)
+        self.list_widget.setResizeMode(QListView.ResizeMode.Adjust)
+        self.list_widget.setMovement(QListView.Movement.Static)
+        self.list_widget.setUniformItemSizes(True)
+        self.list_widget.setIconSize(QSize(width, height))
+        self.list_widget.setGridSize(QSize(width + 24, height + 40))
+        self.list_widget.itemDoubleClicked.connect(lambda _item: self.accept())
+        layout.addWidget(self.list_widget)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        placeholder = QPixmap(width, height)
+        placeholder.fill(QColor("#d0d0d0"))
+        placeholder_icon = QIcon(placeholder)
+
+        self._pending_items: list[QListWidgetItem] = []
+        for theme_name, display_name in themes:
+            item = QListWidgetItem(placeholder_icon, display_name)
+            item.setData(THEME_NAME_ROLE, theme_name)
+            item.setToolTip(theme_name)
+            self.list_widget.addItem(item)
+            self._pending_items.append(item)
+            if theme_name == current_theme_name:
+                self.list_widget.setCurrentItem(item)
+
+        self._request_timer = QTimer(self)
+        self._request_timer.setInterval(0)
+        self._request_timer.timeout.connect(self._request_next_batch)
+        if self._pending_items:
+            self._request_timer.start()
+
+    def selected_theme(self) -> Optional[tuple[str, str]]:
+        """選択されたテーマの(テーマ名, 表示名)を取得"""
+        item = self.list_widget.currentItem()
+        if item is None:
+            return None
+        return item.data(THEME_NAME_ROLE), item.text()
+
+    def done(self, result: int) -> None:
+        """ダイアログを閉じる際にサムネイルの要求を止める"""
+        self._closed = True
+        self._request_timer.stop()
+        super().done(result)
+
+    def _request_next_batch(self) -> None:
+        """サムネイルをbatch_size件要求"""
+        batch = self._pending_items[: self.batch_size]
+        del self._pending_items[: self.batch_size]
+        if not self._pending_items:
+            self._request_timer.stop()
+
+        for item in batch:
+            theme_name = item.data(THEME_NAME_ROLE)
+            try:
+                compiled_theme = self.compile_theme(theme_name)
+            except Exception as e:
+                self.logger.warning(
+                    f"サムネイル用にテーマを読み込めません: {theme_name}: {e}"
+                )
+                continue
+            image = self.renderer.request(
+                compiled_theme,
+                lambda image, item=item: self._set_thumbnail(item, image),
+            )
+            if image is not None:
+                self._set_thumbnail(item, image)
+
+    def _set_thumbnail(self, item: QListWidgetItem, image: Any) -> None:
+        """完成したサムネイルをアイテムに設定(描画に失敗した場合は何もしない)"""
+        if self._closed or image is None:
+            return
+        item.setIcon(QIcon(QPixmap.fromImage(image)))
+
+    def _apply_filter(self, text: str) -> None:
+        """表示名・テーマ名に文字列を含むテーマのみを表示"""
+        needle = text.strip().lower()
+        for row in range(self.list_widget.count()):
+            item = self.list_widget.item(row)
+            haystack = f"{item.text()} {item.data(THEME_NAME_ROLE)}".lower()
+            item.setHidden(bool(needle) and needle not in haystack)
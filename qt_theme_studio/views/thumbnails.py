@@ -0,0 +1,510 @@
+"""
+テーマのサムネイル
+
+テーマ選択用に、ウィジェットショーケースを縮小した見本画像をワーカースレッドで描画し、
+テーマの内容ハッシュをキーとする容量上限付きのディスクキャッシュに保存します。
+"""
+
+import contextlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from qt_theme_studio.logger import LogCategory, get_logger
+from qt_theme_studio.themes.compiled import CompiledTheme
+from qt_theme_studio.utilities.autosave import atomic_write_bytes
+from qt_theme_studio.utilities.metrics import get_metrics_registry
+from qt_theme_studio.views.palette import to_qcolor
+
+# 描画内容を変更した場合は値を上げ、古いキャッシュを使わないようにする
+RENDER_VERSION = 1
+
+DEFAULT_THUMBNAIL_SIZE = (160, 100)
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+THUMBNAIL_SUFFIX = ".png"
+
+
+def default_thumbnail_cache_dir() -> Path:
+    """サムネイルキャッシュの既定の保存先"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA")
+        root = Path(base) if base else Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME")
+        root = Path(base) if base else Path.home() / ".cache"
+    return root / "qt_theme_studio" / "thumbnails"
+
+
+def thumbnail_key(content_hash: str, width: int, height: int) -> str:
+    """サムネイルのキャッシュキー(内容ハッシュ・サイズ・描画バージョン)"""
+    return f"{content_hash}-{width}x{height}-v{RENDER_VERSION}"
+
+
+class ThumbnailCache:
+    """容量上限付きのサムネイルのディスクキャッシュ(Qtに依存しない)
+
+    PNGデータをキーごとのファイルとして保存し、合計サイズがmax_bytesを超えた場合は
+    最後に使用された時刻(ファイルの更新時刻)が古いものから削除します。
+    複数スレッドから同時に使用できます。
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+    ) -> None:
+        """サムネイルキャッシュを初期化します
+
+        Args:
+            directory: 保存先(省略時はdefault_thumbnail_cache_dir())
+            max_bytes: キャッシュの合計サイズの上限(バイト)
+        """
+        self.directory = Path(directory) if directory else default_thumbnail_cache_dir()
+        self.max_bytes = max_bytes
+        self.logger = get_logger()
+
+        self._lock = threading.Lock()
+        # キー → (サイズ, 最終使用時刻)、初回使用時にフォルダから読み込む
+        self._entries: Optional[dict[str, tuple[int, float]]] = None
+        self._total_bytes = 0
+
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+    @property
+    def total_bytes(self) -> int:
+        """キャッシュの合計サイズ(バイト)"""
+        with self._lock:
+            self._load_entries()
+            return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_entries())
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._load_entries()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """キャッシュされたPNGデータを取得(ない場合はNone)"""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self._forget(key)
+                self.stats["misses"] += 1
+            return None
+
+        now = time.time()
+        with contextlib.suppress(OSError):
+            os.utime(path, (now, now))
+        with self._lock:
+            entries = self._load_entries()
+            if key not in entries:
+                self._total_bytes += len(data)
+            else:
+                self._total_bytes += len(data) - entries[key][0]
+            entries[key] = (len(data), now)
+            self.stats["hits"] += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """PNGデータを保存し、上限を超えた分を古いものから削除
+
+        書き込みに失敗した場合は警告を記録するのみで例外は送出しません。
+        """
+        try:
+            atomic_write_bytes(self._path(key), data, fsync=False)
+        except OSError as e:
+            self.logger.warning(f"サムネイルをキャッシュに保存できません: {key}: {e}")
+            return
+
+        with self._lock:
+            entries = self._load_entries()
+            self._forget(key)
+            entries[key] = (len(data), time.time())
+            self._total_bytes += len(data)
+            self._evict()
+
+    def clear(self) -> None:
+        """キャッシュを全て削除"""
+        with self._lock:
+            for key in list(self._load_entries()):
+                self._path(key).unlink(missing_ok=True)
+                self._forget(key)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{THUMBNAIL_SUFFIX}"
+
+    def _load_entries(self) -> dict[str, tuple[int, float]]:
+        """フォルダ内のキャッシュファイルを読み込む(ロック取得中に呼び出すこと)"""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        self._total_bytes = 0
+        try:
+            scanned = list(os.scandir(self.directory))
+        except OSError:
+            scanned = []
+        for entry in scanned:
+            if not entry.name.endswith(THUMBNAIL_SUFFIX) or entry.name.startswith("."):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            key = entry.name[: -len(THUMBNAIL_SUFFIX)]
+            self._entries[key] = (stat.st_size, stat.st_mtime)
+            self._total_bytes += stat.st_size
+        return self._entries
+
+    def _forget(self, key: str) -> None:
+        """キーを管理情報から除外(ロック取得中に呼び出すこと)"""
+        if self._entries is None:
+            return
+        removed = self._entries.pop(key, None)
+        if removed is not None:
+            self._total_bytes -= removed[0]
+
+    def _evict(self) -> None:
+        """上限を超えた分を最終使用時刻の古い順に削除(ロック取得中に呼び出すこと)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        entries = self._load_entries()
+        for key, _ in sorted(entries.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._path(key).unlink(missing_ok=True)
+            self._forget(key)
+            self.stats["evicted"] += 1
+
+
+def render_thumbnail(
+    roles: Mapping[str, str], width: int, height: int, qt_modules: dict[str, Any]
+) -> Any:
+    """解決済みのロールの色でウィジェットショーケースの縮小見本を描画
+
+    QImageとQPainterのみを使用するため、ワーカースレッドから呼び出せます。
+    文字はフォントに依存しないよう、文字色の線で表します。
+
+    Args:
+        roles: ロール名 → 色値(CompiledTheme.roles)
+        width: 画像の幅(ピクセル)
+        height: 画像の高さ(ピクセル)
+        qt_modules: Qtモジュール辞書
+
+    Returns:
+        QImage: 描画した画像
+    """
+    qt_core = qt_modules["QtCore"]
+    qt_gui = qt_modules["QtGui"]
+    colors = {role: to_qcolor(value, qt_gui) for role, value in roles.items()}
+
+    image = qt_gui.QImage(
+        width, height, qt_gui.QImage.Format.Format_ARGB32_Premultiplied
+    )
+    image.fill(colors["background"])
+
+    painter = qt_gui.QPainter(image)
+    try:
+        painter.setRenderHint(qt_gui.QPainter.RenderHint.Antialiasing)
+        no_pen = qt_core.Qt.PenStyle.NoPen
+
+        def rect(
+            x: float, y: float, w: float, h: float, fill: str, border: Optional[str]
+        ) -> None:
+            painter.setPen(qt_gui.QPen(colors[border], 1) if border else no_pen)
+            painter.setBrush(colors[fill])
+            painter.drawRoundedRect(
+                qt_core.QRectF(x * width, y * height, w * width, h * height), 2, 2
+            )
+
+        def text_line(x: float, y: float, w: float, color: str) -> None:
+            painter.setPen(no_pen)
+            painter.setBrush(colors[color])
+            painter.drawRect(
+                qt_core.QRectF(
+                    x * width, y * height, w * width, max(1.0, height * 0.03)
+                )
+            )
+
+        # タイトル(プライマリ色)
+        rect(0.0, 0.0, 1.0, 0.14, "primary", None)
+        text_line(0.05, 0.055, 0.3, "button_text")
+
+        # ボタン(通常・ホバー・押下・無効)
+        for index, (fill, border, text) in enumerate(
+            (
+                ("button_background", "button_border", "button_text"),
+                ("button_hover", "button_border", "button_text"),
+                ("button_pressed", "button_border", "button_text"),
+                ("disabled_background", "disabled_border", "disabled_text"),
+            )
+        ):
+            y = 0.2 + index * 0.14
+            rect(0.05, y, 0.38, 0.11, fill, border)
+            text_line(0.12, y + 0.04, 0.24, text)
+
+        # 入力欄(通常・フォーカス)
+        rect(0.5, 0.2, 0.42, 0.11, "input_background", "input_border")
+        text_line(0.53, 0.24, 0.2, "input_text")
+        painter.setPen(qt_gui.QPen(colors["focus_border"], 2))
+        painter.setBrush(colors["input_background"])
+        painter.drawRoundedRect(
+            qt_core.QRectF(0.5 * width, 0.34 * height, 0.42 * width, 0.11 * height),
+            2,
+            2,
+        )
+
+        # リスト(ゼブラ・選択行)
+        for index in range(3):
+            fill = "zebra_even" if index % 2 == 0 else "background"
+            if index == 1:
+                fill = "selection_background"
+            y = 0.48 + index * 0.07
+            rect(0.5, y, 0.42, 0.07, fill, None)
+            text_line(
+                0.53,
+                y + 0.025,
+                0.25,
+                "selection_text" if index == 1 else "text",
+            )
+        painter.setPen(qt_gui.QPen(colors["border"], 1))
+        painter.setBrush(qt_core.Qt.BrushStyle.NoBrush)
+        painter.drawRect(
+            qt_core.QRectF(0.5 * width, 0.48 * height, 0.42 * width, 0.21 * height)
+        )
+
+        # スクロールバー
+        rect(0.94, 0.2, 0.04, 0.49, "scrollbar_background", None)
+        rect(0.945, 0.25, 0.03, 0.16, "scrollbar_handle", None)
+
+        # プログレスバー
+        rect(0.05, 0.77, 0.38, 0.05, "progress_background", "border")
+        rect(0.05, 0.77, 0.23, 0.05, "progress_fill", None)
+
+        # スライダー
+        text_line(0.5, 0.79, 0.42, "slider_groove")
+        painter.setPen(qt_gui.QPen(colors["slider_handle_border"], 1))
+        painter.setBrush(colors["slider_handle"])
+        radius = max(2.0, height * 0.045)
+        painter.drawEllipse(
+            qt_core.QPointF(0.66 * width, 0.795 * height), radius, radius
+        )
+
+        # ステータスバー
+        rect(0.0, 0.88, 1.0, 0.12, "status_background", None)
+        painter.setPen(qt_gui.QPen(colors["status_border"], 1))
+        painter.drawLine(
+            qt_core.QPointF(0, 0.88 * height), qt_core.QPointF(width, 0.88 * height)
+        )
+        text_line(0.04, 0.93, 0.35, "status_text")
+    finally:
+        painter.end()
+    return image
+
+
+def encode_png(image: Any, qt_modules: dict[str, Any]) -> bytes:
+    """QImageをPNGデータに変換"""
+    qt_core = qt_modules["QtCore"]
+    byte_array = qt_core.QByteArray()
+    buffer = qt_core.QBuffer(byte_array)
+    buffer.open(qt_core.QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(byte_array.data())
+
+
+class ThumbnailRenderer:
+    """テーマのサムネイルをワーカースレッドで描画・キャッシュする
+
+    request()はすぐに戻り、描画(またはディスクキャッシュからの読み込み)は
+    QThreadPoolで行います。完成したQImageはGUIスレッドへイベントで送られ、
+    要求時に渡したコールバックがGUIスレッドで呼び出されます。
+    同じ内容のテーマへの要求は1回の描画にまとめます。
+    """
+
+    def __init__(
+        self,
+        qt_modules: dict[str, Any],
+        cache: Optional[ThumbnailCache] = None,
+        size: tuple[int, int] = DEFAULT_THUMBNAIL_SIZE,
+        max_threads: Optional[int] = None,
+        memory_items: int = 512,
+    ) -> None:
+        """サムネイル描画を初期化します
+
+        Args:
+            qt_modules: Qtモジュール辞書
+            cache: ディスクキャッシュ(Noneの場合はディスクに保存しない)
+            size: サムネイルのサイズ(幅, 高さ)
+            max_threads: ワーカースレッド数の上限(省略時はQtの既定値)
+            memory_items: メモリに保持するサムネイル数の上限
+        """
+        self.qt_modules = qt_modules
+        self.QtCore = qt_modules["QtCore"]
+        self.cache = cache
+        self.size = size
+        self.memory_items = memory_items
+        self.logger = get_logger()
+
+        self._pool = self.QtCore.QThreadPool()
+        if max_threads is not None:
+            self._pool.setMaxThreadCount(max_threads)
+
+        self._lock = threading.Lock()
+        self._images: OrderedDict[str, Any] = OrderedDict()
+        self._waiters: dict[str, list[Callable[[Any], None]]] = {}
+        self._results: list[tuple[str, Any]] = []
+        self._runnables: dict[str, Any] = {}
+        self._receiver, self._event_type = self._create_receiver()
+
+        self.stats = {"rendered": 0, "disk_hits": 0, "memory_hits": 0, "failed": 0}
+
+    @property
+    def pending_count(self) -> int:
+        """描画待ち・描画中のサムネイル数"""
+        return len(self._waiters)
+
+    def request(
+        self, theme: CompiledTheme, callback: Callable[[Any], None]
+    ) -> Optional[Any]:
+        """サムネイルを要求(GUIスレッドから呼び出すこと)
+
+        Args:
+            theme: コンパイル済みテーマ
+            callback: 完成したQImage(描画に失敗した場合はNone)を受け取るコールバック
+
+        Returns:
+            Optional[QImage]: メモリにある場合はそのQImage(コールバックは呼ばれない)
+        """
+        width, height = self.size
+        key = thumbnail_key(theme.content_hash, width, height)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return image
+
+        waiters = self._waiters.get(key)
+        if waiters is not None:
+            waiters.append(callback)
+            return None
+
+        self._waiters[key] = [callback]
+        roles = dict(theme.roles)
+        runnable = self._create_runnable(lambda: self._produce(key, roles))
+        self._runnables[key] = runnable
+        self._pool.start(runnable)
+        return None
+
+    def wait_for_done(self, timeout_ms: int = -1) -> bool:
+        """ワーカースレッドの処理完了を待ち、結果をコールバックへ渡す(テスト・終了処理用)"""
+        finished = bool(self._pool.waitForDone(timeout_ms))
+        self.process_results()
+        return finished
+
+    def process_results(self) -> None:
+        """完成したサムネイルをコールバックへ渡す(GUIスレッドで呼び出される)
+
+        描画に失敗した場合は、コールバックへNoneを渡します。
+        """
+        with self._lock:
+            results, self._results = self._results, []
+
+        for key, image in results:
+            self._runnables.pop(key, None)
+            callbacks = self._waiters.pop(key, [])
+            if image is None:
+                # 失敗はキャッシュせず、次の要求で描画をやり直す
+                self.logger.warning(
+                    f"サムネイルを作成できなかったため、"
+                    f"{len(callbacks)}件のコールバックへNoneを渡します: {key}",
+                    LogCategory.PERFORMANCE,
+                )
+            else:
+                self._images[key] = image
+                self._images.move_to_end(key)
+                while len(self._images) > self.memory_items:
+                    self._images.popitem(last=False)
+            for callback in callbacks:
+                try:
+                    callback(image)
+                except Exception as e:
+                    self.logger.error(f"サムネイルのコールバックでエラー: {e}")
+
+    def _produce(self, key: str, roles: dict[str, str]) -> None:
+        """ディスクキャッシュから読み込むか描画する(ワーカースレッド)"""
+        qt_gui = self.qt_modules["QtGui"]
+        image = None
+        outcome = "disk_hits"
+        try:
+            data = self.cache.get(key) if self.cache is not None else None
+            if data is not None:
+                image = qt_gui.QImage.fromData(data, "PNG")
+                if image.isNull():
+                    image = None
+
+            if image is None:
+                outcome = "rendered"
+                start_time = time.perf_counter()
+                width, height = self.size
+                image = render_thumbnail(roles, width, height, self.qt_modules)
+                get_metrics_registry().observe_duration(
+                    "thumbnail.render", time.perf_counter() - start_time
+                )
+                if self.cache is not None:
+                    self.cache.put(key, encode_png(image, self.qt_modules))
+        except Exception as e:
+            outcome = "failed"
+            self.logger.error(
+                f"サムネイルの描画に失敗しました: {key}: {e}", LogCategory.PERFORMANCE
+            )
+            image = None
+
+        with self._lock:
+            self.stats[outcome] += 1
+            self._results.append((key, image))
+        self.QtCore.QCoreApplication.postEvent(
+            self._receiver, self.QtCore.QEvent(self._event_type)
+        )
+
+    def _create_runnable(self, task: Callable[[], None]) -> Any:
+        """タスクを実行するQRunnableを作成"""
+        qt_core = self.QtCore
+
+        class _ThumbnailTask(qt_core.QRunnable):  # type: ignore[misc, name-defined]
+            """サムネイル1件分のワーカータスク"""
+
+            def __init__(self) -> None:
+                super().__init__()
+                # Python側で参照を保持して削除するため、Qtによる自動削除を無効にする
+                self.setAutoDelete(False)
+
+            def run(self) -> None:
+                task()
+
+        return _ThumbnailTask()
+
+    def _create_receiver(self) -> tuple[Any, Any]:
+        """完成通知を受け取るQObjectを作成"""
+        qt_core = self.QtCore
+        event_type = qt_core.QEvent.Type(qt_core.QEvent.registerEventType())
+        renderer = self
+
+        class _ThumbnailReceiver(qt_core.QObject):  # type: ignore[misc, name-defined]
+            """GUIスレッドで完成したサムネイルを受け取るレシーバー"""
+
+            def event(self, event: Any) -> bool:
+                if event.type() == event_type:
+                    renderer.process_results()
+                    return True
+                return bool(super().event(event))
+
+        return _ThumbnailReceiver(), event_type
@@ -0,0 +1,647 @@
+#!/usr/bin/env python3
+"""
+共有AST解析キャッシュ
+
+scripts/ 配下の各チェッカー（print文検出、日本語ログ検証、互換性チェック、
+ドキュメント生成・更新チェック）が共通で利用する解析レイヤーです。
+各ファイルを一度だけ解析し、登録済みの抽出器を1回の走査でまとめて実行します。
+抽出結果はファイル内容のハッシュをキーとしてディスクにキャッシュされるため、
+内容が変わらない限り再解析は行われません。
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+# プロジェクトルートディレクトリ
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# デフォルトのキャッシュディレクトリ
+DEFAULT_CACHE_DIR = PROJECT_ROOT / ".kiro" / "cache" / "ast"
+
+# キャッシュ形式のバージョン（形式を変更した場合に更新）
+CACHE_FORMAT_VERSION = 1
+
+# 走査対象から除外するディレクトリ名
+DEFAULT_EXCLUDE_DIRS = {
+    "venv",
+    ".venv",
+    ".git",
+    ".tox",
+    ".nox",
+    ".pytest_cache",
+    ".mypy_cache",
+    ".ruff_cache",
+    "__pycache__",
+    "node_modules",
+    "build",
+    "dist",
+}
+
+LOGGER_METHODS = {
+    "debug",
+    "info",
+    "warning",
+    "warn",
+    "error",
+    "critical",
+    "exception",
+    "log",
+}
+
+
+class FactExtractor:
+    """ファクト抽出器の基底クラス
+
+    node_types に列挙したノードだけが visit() に渡されます。
+    抽出結果はJSONに変換可能な値を finish() で返してください。
+    抽出内容を変更した場合は version を更新するとキャッシュが無効化されます。
+    """
+
+    name = ""
+    version = 1
+    node_types: Tuple[Type[ast.AST], ...] = ()
+
+    def visit(self, node: ast.AST) -> None:
+        """対象ノードを訪問"""
+
+    def finish(self, tree: ast.Module) -> Any:
+        """走査完了後に抽出結果を返す"""
+        return None
+
+
+_EXTRACTORS: Dict[str, Type[FactExtractor]] = {}
+
+
+def register_extractor(extractor_class: Type[FactExtractor]) -> Type[FactExtractor]:
+    """ファクト抽出器を登録（クラスデコレーターとして使用可能）"""
+    _EXTRACTORS[extractor_class.name] = extractor_class
+    return extractor_class
+
+
+def get_extractor_versions() -> Dict[str, int]:
+    """登録済み抽出器の名前とバージョンを取得"""
+    return {name: cls.version for name, cls in sorted(_EXTRACTORS.items())}
+
+
+@register_extractor
+class PrintCallExtractor(FactExtractor):
+    """print()呼び出しと引数の種類を抽出"""
+
+    name = "print_calls"
+    node_types = (ast.Call,)
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    def visit(self, node: ast.Call) -> None:
+        if not (isinstance(node.func, ast.Name) and node.func.id == "print"):
+            return
+
+        args = []
+        for arg in node.args:
+            if isinstance(arg, ast.Constant):
+                args.append(
+                    {
+                        "kind": "constant",
+                        "text": repr(arg.value),
+                        "string": arg.value if isinstance(arg.value, str) else None,
+                    }
+                )
+            elif isinstance(arg, ast.JoinedStr):
+                args.append({"kind": "fstring", "text": "f-string"})
+            elif isinstance(arg, ast.Name):
+                args.append({"kind": "name", "text": arg.id})
+            else:
+                args.append({"kind": "other", "text": ""})
+
+        self.calls.append(
+            {"line": node.lineno, "column": node.col_offset, "args": args}
+        )
+
+    def finish(self, tree: ast.Module) -> List[Dict[str, Any]]:
+        return sorted(self.calls, key=lambda call: (call["line"], call["column"]))
+
+
+@register_extractor
+class LoggerUsageExtractor(FactExtractor):
+    """loggerのインポートとインスタンス生成を抽出"""
+
+    name = "logger_usage"
+    node_types = (ast.Import, ast.ImportFrom, ast.Assign)
+
+    def __init__(self):
+        self.has_logger_import = False
+        self.instances: List[Tuple[int, Optional[str]]] = []
+
+    def visit(self, node: ast.AST) -> None:
+        if isinstance(node, ast.Import):
+            if any("logger" in alias.name.lower() for alias in node.names):
+                self.has_logger_import = True
+        elif isinstance(node, ast.ImportFrom):
+            if node.module and "logger" in node.module:
+                self.has_logger_import = True
+        elif (
+            isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Name)
+            and node.value.func.id == "get_logger"
+        ):
+            target = node.targets[0] if node.targets else None
+            name = target.id if isinstance(target, ast.Name) else None
+            self.instances.append((node.lineno, name))
+
+    def finish(self, tree: ast.Module) -> Dict[str, Any]:
+        # ソース上で最後に代入された変数名を採用
+        names = [name for _, name in sorted(self.instances) if name]
+        return {
+            "has_logger_import": self.has_logger_import,
+            "has_logger_instance": bool(self.instances),
+            "logger_variable_name": names[-1] if names else None,
+        }
+
+
+@register_extractor
+class LogCallExtractor(FactExtractor):
+    """logger.<method>() 呼び出しのメッセージを抽出"""
+
+    name = "log_calls"
+    node_types = (ast.Call,)
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    def visit(self, node: ast.Call) -> None:
+        if not (
+            isinstance(node.func, ast.Attribute) and node.func.attr in LOGGER_METHODS
+        ):
+            return
+        if not node.args:
+            return
+
+        message = self._extract_string_value(node.args[0])
+        if message:
+            self.calls.append(
+                {
+                    "line": node.lineno,
+                    "column": node.col_offset,
+                    "method": node.func.attr,
+                    "message": message,
+                }
+            )
+
+    def _extract_string_value(self, node: ast.AST) -> str:
+        """ASTノードから文字列値を抽出（f-stringは定数部分のみ）"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.JoinedStr):
+            return "".join(
+                str(value.value)
+                for value in node.values
+                if isinstance(value, ast.Constant)
+            )
+        return ""
+
+    def finish(self, tree: ast.Module) -> List[Dict[str, Any]]:
+        return sorted(self.calls, key=lambda call: (call["line"], call["column"]))
+
+
+@register_extractor
+class DefinitionExtractor(FactExtractor):
+    """関数・クラス定義とdocstringを抽出"""
+
+    name = "definitions"
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+    def __init__(self):
+        self.items: List[Dict[str, Any]] = []
+
+    def visit(self, node: ast.AST) -> None:
+        item = {
+            "name": node.name,
+            "type": type(node).__name__,
+            "line": node.lineno,
+            "is_public": not node.name.startswith("_"),
+            "docstring": ast.get_docstring(node),
+            "decorators": [
+                decorator.id
+                if isinstance(decorator, ast.Name)
+                else ast.unparse(decorator)
+                for decorator in node.decorator_list
+            ],
+        }
+        if isinstance(node, ast.ClassDef):
+            item["methods"] = [
+                child.name for child in node.body if isinstance(child, ast.FunctionDef)
+            ]
+        self.items.append(item)
+
+    def finish(self, tree: ast.Module) -> Dict[str, Any]:
+        # ast.walk の順序（幅優先）をそのまま保持
+        return {"module_docstring": ast.get_docstring(tree), "items": self.items}
+
+
+@register_extractor
+class ImportExtractor(FactExtractor):
+    """import文を抽出（依存関係グラフの構築用）"""
+
+    name = "imports"
+    node_types = (ast.Import, ast.ImportFrom)
+
+    def __init__(self):
+        self.imports: List[Dict[str, Any]] = []
+
+    def visit(self, node: ast.AST) -> None:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                self.imports.append({"module": alias.name, "names": [], "level": 0})
+        else:
+            self.imports.append(
+                {
+                    "module": node.module or "",
+                    "names": [alias.name for alias in node.names],
+                    "level": node.level,
+                }
+            )
+
+    def finish(self, tree: ast.Module) -> List[Dict[str, Any]]:
+        return self.imports
+
+
+def module_name_for_path(file_path: Path, project_root: Path) -> str:
+    """ファイルパスからモジュール名を算出（例: qt_theme_studio/views/preview.py）"""
+    relative = Path(file_path).resolve().relative_to(project_root.resolve())
+    parts = list(relative.with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _resolve_imported_modules(
+    module_name: str, is_package: bool, imports: List[Dict[str, Any]]
+) -> List[str]:
+    """import情報から参照されるモジュール名の候補を列挙"""
+    modules = []
+    for entry in imports:
+        base = entry["module"]
+        if entry["level"]:
+            # 相対インポートを絶対名に変換
+            package_parts = module_name.split(".")
+            if not is_package:
+                package_parts = package_parts[:-1]
+            if entry["level"] > 1:
+                package_parts = package_parts[: -(entry["level"] - 1)]
+            base = ".".join(package_parts + ([base] if base else []))
+
+        candidates = [base] + [f"{base}.{name}" for name in entry["names"]]
+        for candidate in candidates:
+            parts = candidate.split(".")
+            # 親パッケージの__init__も実行されるため依存先に含める
+            modules.extend(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+    return modules
+
+
+class FileAnalysis:
+    """1ファイル分の解析結果"""
+
+    def __init__(
+        self,
+        path: Path,
+        digest: str,
+        facts: Dict[str, Any],
+        syntax_error: Optional[Dict[str, Any]] = None,
+        from_cache: bool = False,
+    ):
+        self.path = path
+        self.digest = digest
+        self.facts = facts
+        self.syntax_error = syntax_error
+        self.from_cache = from_cache
+
+    @property
+    def ok(self) -> bool:
+        """構文エラーなく解析できたかどうか"""
+        return self.syntax_error is None
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """抽出結果を名前で取得"""
+        return self.facts.get(name, default)
+
+    def syntax_error_message(self) -> str:
+        """SyntaxErrorと同じ形式のエラーメッセージを取得"""
+        if self.syntax_error is None:
+            return ""
+        return (
+            f"{self.syntax_error['message']} "
+            f"({self.path}, line {self.syntax_error['line']})"
+        )
+
+
+class ProjectAnalysisCache:
+    """プロジェクト共有のAST解析キャッシュ
+
+    ファイル内容のSHA-256ハッシュをキーに、全抽出器の結果をJSONとして保存します。
+    解析済みのASTはプロセス内でのみ保持します（ディスクには抽出結果のみ保存）。
+    """
+
+    def __init__(
+        self,
+        project_root: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        use_disk_cache: bool = True,
+    ):
+        """
+        解析キャッシュを初期化
+
+        Args:
+            project_root: プロジェクトルート（デフォルト: リポジトリルート）
+            cache_dir: キャッシュディレクトリ（デフォルト: .kiro/cache/ast）
+            use_disk_cache: ディスクキャッシュを使用するかどうか
+        """
+        self.project_root = project_root or PROJECT_ROOT
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.use_disk_cache = use_disk_cache
+        self._analyses: Dict[Path, FileAnalysis] = {}
+        self._trees: Dict[str, ast.Module] = {}
+        self._file_lists: Dict[Tuple[Path, Tuple[str, ...]], List[Path]] = {}
+        self.stats = {"parsed": 0, "disk_hits": 0, "memory_hits": 0}
+
+    def _cache_key(self) -> Dict[str, Any]:
+        """キャッシュエントリの有効性判定に使うヘッダー"""
+        return {
+            "format": CACHE_FORMAT_VERSION,
+            "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+            "extractors": get_extractor_versions(),
+        }
+
+    def _cache_file(self, digest: str) -> Path:
+        """ハッシュに対応するキャッシュファイルパス"""
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+
+    def _load_entry(self, digest: str) -> Optional[Dict[str, Any]]:
+        """キャッシュエントリを読み込み（無効な場合はNone）"""
+        cache_file = self._cache_file(digest)
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("key") != self._cache_key():
+            return None
+        return entry
+
+    def _save_entry(self, digest: str, entry: Dict[str, Any]) -> None:
+        """キャッシュエントリを一時ファイル経由で保存"""
+        cache_file = self._cache_file(digest)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            logger.debug(f"解析キャッシュの保存に失敗しました: {cache_file}: {e}")
+
+    def _parse(self, path: Path, source: bytes, digest: str) -> Dict[str, Any]:
+        """ファイルを解析し、全抽出器を1回の走査で実行"""
+        self.stats["parsed"] += 1
+        try:
+            tree = ast.parse(source, filename=str(path))
+        except SyntaxError as e:
+            return {
+                "facts": {},
+                "syntax_error": {
+                    "message": e.msg,
+                    "line": e.lineno,
+                    "offset": e.offset,
+                },
+            }
+
+        self._trees[digest] = tree
+
+        extractors = [cls() for _, cls in sorted(_EXTRACTORS.items())]
+        dispatch: Dict[Type[ast.AST], List[FactExtractor]] = {}
+        for extractor in extractors:
+            for node_type in extractor.node_types:
+                dispatch.setdefault(node_type, []).append(extractor)
+
+        for node in ast.walk(tree):
+            for extractor in dispatch.get(type(node), ()):
+                extractor.visit(node)
+
+        facts = {extractor.name: extractor.finish(tree) for extractor in extractors}
+        return {"facts": facts, "syntax_error": None}
+
+    def analyze_file(self, file_path: Path) -> FileAnalysis:
+        """ファイルを解析（キャッシュがあれば再利用）
+
+        Raises:
+            OSError: ファイルを読み込めない場合
+        """
+        path = Path(file_path)
+        with open(path, "rb") as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+
+        cached = self._analyses.get(path)
+        if cached is not None and cached.digest == digest:
+            self.stats["memory_hits"] += 1
+            return cached
+
+        entry = self._load_entry(digest) if self.use_disk_cache else None
+        from_cache = entry is not None
+        if entry is None:
+            entry = self._parse(path, source, digest)
+            if self.use_disk_cache:
+                self._save_entry(digest, {"key": self._cache_key(), **entry})
+        else:
+            self.stats["disk_hits"] += 1
+
+        analysis = FileAnalysis(
+            path, digest, entry["facts"], entry["syntax_error"], from_cache
+        )
+        self._analyses[path] = analysis
+        return analysis
+
+    def get_tree(self, file_path: Path) -> ast.Module:
+        """ファイルのASTを取得（同一プロセス内では再解析しない）
+
+        Raises:
+            OSError: ファイルを読み込めない場合
+            SyntaxError: 構文エラーがある場合
+        """
+        path = Path(file_path)
+        with open(path, "rb") as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+
+        tree = self._trees.get(digest)
+        if tree is None:
+            self.stats["parsed"] += 1
+            tree = ast.parse(source, filename=str(path))
+            self._trees[digest] = tree
+        return tree
+
+    def iter_python_files(
+        self,
+        root: Optional[Path] = None,
+        exclude_patterns: Iterable[str] = (),
+    ) -> List[Path]:
+        """Pythonファイルの一覧を取得（同一プロセス内で共有）
+
+        Args:
+            root: 検索ルート（デフォルト: プロジェクトルート）
+            exclude_patterns: パス文字列に含まれていれば除外するパターン
+        """
+        root = Path(root or self.project_root)
+        patterns = tuple(exclude_patterns)
+        key = (root, patterns)
+        if key not in self._file_lists:
+            files = []
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = sorted(
+                    d for d in dirnames if d not in DEFAULT_EXCLUDE_DIRS
+                )
+                for filename in sorted(filenames):
+                    if not filename.endswith(".py"):
+                        continue
+                    path = Path(dirpath) / filename
+                    if any(pattern in str(path) for pattern in patterns):
+                        continue
+                    files.append(path)
+            self._file_lists[key] = files
+        return list(self._file_lists[key])
+
+    def build_import_graph(self, files: Iterable[Path]) -> Dict[Path, List[Path]]:
+        """プロジェクト内の逆依存グラフ（被インポート側 → インポート側）を構築
+
+        構文エラーや読み込みエラーのファイルは依存関係なしとして扱います。
+        """
+        files = [Path(f) for f in files]
+        modules: Dict[str, Path] = {}
+        for file_path in files:
+            try:
+                modules[module_name_for_path(file_path, self.project_root)] = file_path
+            except ValueError:
+                continue
+
+        dependents: Dict[Path, List[Path]] = {file_path: [] for file_path in files}
+        for module_name, file_path in modules.items():
+            try:
+                imports = self.analyze_file(file_path).get("imports", [])
+            except OSError:
+                continue
+
+            is_package = file_path.name == "__init__.py"
+            targets = set(_resolve_imported_modules(module_name, is_package, imports))
+            for target in targets:
+                target_path = modules.get(target)
+                if target_path is not None and target_path != file_path:
+                    dependents[target_path].append(file_path)
+        return dependents
+
+    def find_dependents(
+        self, changed_files: Iterable[Path], files: Iterable[Path]
+    ) -> List[Path]:
+        """変更ファイルを直接・間接にインポートしているファイルを取得
+
+        Args:
+            changed_files: 変更されたファイル
+            files: 依存関係の探索対象となるファイル一覧
+
+        Returns:
+            依存ファイルのリスト（変更ファイル自身は含まない）
+        """
+        graph = self.build_import_graph(files)
+        changed = {Path(f) for f in changed_files}
+        found: List[Path] = []
+        visited = set(changed)
+        queue = list(changed)
+        while queue:
+            current = queue.pop()
+            for dependent in graph.get(current, []):
+                if dependent not in visited:
+                    visited.add(dependent)
+                    found.append(dependent)
+                    queue.append(dependent)
+        return sorted(found)
+
+    def prune(self, max_age_days: int = 30) -> int:
+        """一定期間更新されていないキャッシュエントリを削除
+
+        Returns:
+            削除したエントリ数
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        threshold = time.time() - max_age_days * 86400
+        removed = 0
+        for cache_file in self.cache_dir.glob("*/*.json"):
+            try:
+                if cache_file.stat().st_mtime < threshold:
+                    cache_file.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+# グローバルキャッシュインスタンス
+_global_cache: Optional[ProjectAnalysisCache] = None
+
+
+def get_analysis_cache() -> ProjectAnalysisCache:
+    """共有解析キャッシュインスタンスを取得"""
+    global _global_cache
+    if _global_cache is None:
+        _global_cache = ProjectAnalysisCache()
+    return _global_cache
+
+
+def main():
+    """メイン処理（キャッシュの事前構築・整理）"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="共有AST解析キャッシュ")
+    parser.add_argument("paths", nargs="*", help="解析するファイル（省略時は全体）")
+    parser.add_argument(
+        "--prune-days", type=int, help="指定日数より古いキャッシュを削除"
+    )
+    args = parser.parse_args()
+
+    cache = get_analysis_cache()
+
+    if args.prune_days is not None:
+        removed = cache.prune(args.prune_days)
+        print(f"🧹 {removed}件のキャッシュエントリを削除しました")
+        return
+
+    files = [Path(p) for p in args.paths] or cache.iter_python_files()
+    start = time.perf_counter()
+    errors = 0
+    for file_path in files:
+        try:
+            if not cache.analyze_file(file_path).ok:
+                errors += 1
+        except OSError as e:
+            print(f"ファイル読み込みエラー: {file_path}: {e}", file=sys.stderr)
+            errors += 1
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"✅ {len(files)}ファイルを解析しました（解析: {cache.stats['parsed']}、"
+        f"キャッシュ: {cache.stats['disk_hits']}、エラー: {errors}、{elapsed:.2f}秒）"
+    )
+
+
+if __name__ == "__main__":
+    main()
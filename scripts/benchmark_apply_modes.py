@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+テーマ適用方式のベンチマーク
+
+QT_QPA_PLATFORM=offscreen で WidgetShowcase を複数並べた大きなフォームを作成し、
+スタイルシート(QSS)適用とパレット適用のそれぞれで、テーマ切り替えから
+ポリッシュ・レイアウト・描画の完了までにかかる時間を測定します。
+"""
+
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Qtのインポート前にオフスクリーンプラットフォームを指定
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qt_theme_studio.adapters.qt_adapter import QtAdapter  # noqa: E402
+from qt_theme_studio.themes.bundle import ThemeBundle  # noqa: E402
+from qt_theme_studio.themes.compiled import CompiledTheme  # noqa: E402
+from qt_theme_studio.views.palette import (  # noqa: E402
+    APPLY_MODE_PALETTE,
+    APPLY_MODE_STYLESHEET,
+    APPLY_MODES,
+    clear_palette_cache,
+)
+from qt_theme_studio.views.preview import WidgetShowcase  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THEME_FILE = project_root / "themes" / "import" / "theme_settings.json"
+
+# 計測範囲 → 表示名
+PHASE_LABELS = {"apply": "適用のみ", "total": "描画まで"}
+
+
+class ApplyModeBenchmark:
+    """適用方式ごとのテーマ切り替え時間の測定"""
+
+    def __init__(self, showcase_count: int, themes: List[CompiledTheme]):
+        self.showcase_count = showcase_count
+        self.themes = themes
+        self.qt_adapter = QtAdapter()
+        self.qt_modules = self.qt_adapter.get_qt_modules()
+        self.application = self.qt_adapter.create_application("ApplyModeBenchmark")
+        self.container: Any = None
+        self.showcases: List[WidgetShowcase] = []
+
+    def build_form(self) -> None:
+        """WidgetShowcaseをshowcase_count個並べたフォームを作成"""
+        qt_widgets = self.qt_modules["QtWidgets"]
+        self.container = qt_widgets.QWidget()
+        layout = qt_widgets.QGridLayout(self.container)
+        columns = max(1, int(self.showcase_count**0.5))
+        for index in range(self.showcase_count):
+            showcase = WidgetShowcase(self.qt_modules)
+            layout.addWidget(
+                showcase.create_widget(), index // columns, index % columns
+            )
+            self.showcases.append(showcase)
+        self.container.resize(1280 * columns, 900 * columns)
+        self.container.show()
+        self._flush()
+
+    def run_mode(self, mode: str, repeats: int) -> Dict[str, List[float]]:
+        """指定した適用方式でテーマを順に切り替え、所要時間（秒）を計測
+
+        Returns:
+            Dict[str, List[float]]: "apply"（適用呼び出しのみ）と
+            "total"（ポリッシュ・描画の完了まで）の所要時間
+        """
+        for showcase in self.showcases:
+            showcase.set_apply_mode(mode)
+        clear_palette_cache()
+
+        # 初回のキャッシュ構築・フォント読み込みを除くためのウォームアップ
+        self._apply(self.themes[0])
+        self._flush()
+
+        durations: Dict[str, List[float]] = {"apply": [], "total": []}
+        for _ in range(repeats):
+            for theme in self.themes:
+                started = time.perf_counter()
+                self._apply(theme)
+                applied = time.perf_counter()
+                self._flush()
+                durations["apply"].append(applied - started)
+                durations["total"].append(time.perf_counter() - started)
+        return durations
+
+    def _apply(self, theme: CompiledTheme) -> None:
+        """全ショーケースにテーマを適用"""
+        for showcase in self.showcases:
+            showcase.apply_theme_to_widgets(theme)
+
+    def _flush(self) -> None:
+        """保留中のポリッシュ・レイアウトを処理し、フォーム全体を描画"""
+        self.application.processEvents()
+        self.container.grab()
+
+
+def load_themes(theme_file: Path, max_themes: int) -> List[CompiledTheme]:
+    """テーマファイルからコンパイル済みテーマを読み込む"""
+    bundle = ThemeBundle(theme_file)
+    themes = []
+    for name in bundle.names()[:max_themes]:
+        themes.append(CompiledTheme.from_data(bundle.load_theme(name), name))
+    return themes
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    """所要時間の統計値（ミリ秒）を計算"""
+    ordered = sorted(durations)
+    p95_index = min(len(ordered) - 1, int(len(ordered) * 0.95))
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[p95_index] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def main() -> int:
+    """メイン実行関数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="テーマ適用方式のベンチマーク")
+    parser.add_argument(
+        "--theme-file", default=str(DEFAULT_THEME_FILE), help="読み込むテーマファイル"
+    )
+    parser.add_argument(
+        "--max-themes", type=int, default=4, help="切り替えるテーマの最大数"
+    )
+    parser.add_argument(
+        "--showcases", type=int, default=4, help="フォームに並べるショーケースの数"
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="切り替えの繰り返し回数")
+    parser.add_argument("--output", help="結果を保存するJSONファイル")
+    parser.add_argument("--verbose", action="store_true", help="詳細ログを出力")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    themes = load_themes(Path(args.theme_file), args.max_themes)
+    if not themes:
+        logger.error(f"テーマが見つかりません: {args.theme_file}")
+        return 1
+
+    benchmark = ApplyModeBenchmark(args.showcases, themes)
+    benchmark.build_form()
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for mode in APPLY_MODES:
+        durations = benchmark.run_mode(mode, args.repeats)
+        results[mode] = {
+            phase: summarize(values) for phase, values in durations.items()
+        }
+
+    print("\n📊 テーマ適用方式のベンチマーク結果:")
+    print(f"ショーケース数: {args.showcases}、テーマ数: {len(themes)}")
+    print(
+        f"{'適用方式':<16}{'計測範囲':<10}"
+        f"{'平均':>10}{'中央値':>10}{'p95':>10}{'最大':>10}"
+    )
+    for mode, phases in results.items():
+        for phase, summary in phases.items():
+            print(
+                f"{APPLY_MODES[mode]:<16}{PHASE_LABELS[phase]:<10}"
+                f"{summary['mean_ms']:>9.2f}ms"
+                f"{summary['median_ms']:>9.2f}ms"
+                f"{summary['p95_ms']:>9.2f}ms"
+                f"{summary['max_ms']:>9.2f}ms"
+            )
+
+    baseline: Optional[Dict[str, Dict[str, float]]] = results.get(APPLY_MODE_STYLESHEET)
+    palette = results.get(APPLY_MODE_PALETTE)
+    if baseline and palette:
+        for phase in PHASE_LABELS:
+            if palette[phase]["mean_ms"] > 0:
+                ratio = baseline[phase]["mean_ms"] / palette[phase]["mean_ms"]
+                print(f"速度比（QSS / パレット、{PHASE_LABELS[phase]}）: {ratio:.1f}倍")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(
+            json.dumps(
+                {
+                    "showcases": args.showcases,
+                    "themes": [theme.name for theme in themes],
+                    "repeats": args.repeats,
+                    "results": results,
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        print(f"結果を保存しました: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+バンドル索引作成のベンチマーク
+
+同梱のテーマを複製して大きなバンドルファイルを作成し、
+索引ファイルを使わない(コールドな)ThemeBundleの索引作成と、
+json.loadによるファイル全体の解析のそれぞれにかかる時間を測定します。
+"""
+
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qt_theme_studio.themes.bundle import BUNDLE_KEY, ThemeBundle  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THEME_FILE = project_root / "themes" / "import" / "theme_settings.json"
+
+
+def write_bundle(
+    theme_file: Path, theme_count: int, output: Path, indent: Any = None
+) -> int:
+    """テーマファイルのテーマを複製し、theme_count件のバンドルを書き出す
+
+    Returns:
+        int: 書き出したテーマ数
+    """
+    with theme_file.open(encoding="utf-8") as f:
+        source = json.load(f)[BUNDLE_KEY]
+    names = list(source)
+    themes = {}
+    for index in range(theme_count):
+        name = names[index % len(names)]
+        themes[f"{name}_{index}"] = source[name]
+    with output.open("w", encoding="utf-8") as f:
+        json.dump({BUNDLE_KEY: themes}, f, ensure_ascii=False, indent=indent)
+    return len(themes)
+
+
+def measure(function: Callable[[], Any], repeats: int) -> List[float]:
+    """関数をrepeats回実行し、それぞれの所要時間（秒）を計測"""
+    durations = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def main() -> int:
+    """メイン実行関数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="バンドル索引作成のベンチマーク")
+    parser.add_argument(
+        "--theme-file", default=str(DEFAULT_THEME_FILE), help="複製するテーマファイル"
+    )
+    parser.add_argument(
+        "--themes", type=int, default=50000, help="バンドルに格納するテーマ数"
+    )
+    parser.add_argument("--indent", type=int, help="JSONのインデント（省略時は1行）")
+    parser.add_argument("--repeats", type=int, default=5, help="計測の繰り返し回数")
+    parser.add_argument("--output", help="結果を保存するJSONファイル")
+    parser.add_argument("--verbose", action="store_true", help="詳細ログを出力")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        bundle_path = Path(directory) / "bundle.json"
+        count = write_bundle(
+            Path(args.theme_file), args.themes, bundle_path, args.indent
+        )
+        size = bundle_path.stat().st_size
+
+        def load_json() -> None:
+            with bundle_path.open(encoding="utf-8") as f:
+                json.load(f)
+
+        def scan_index() -> None:
+            bundle = ThemeBundle(bundle_path, use_index_file=False)
+            if len(bundle.names()) != count:
+                raise RuntimeError("索引のテーマ数が一致しません")
+
+        results: Dict[str, List[float]] = {
+            "json_load": measure(load_json, args.repeats),
+            "bundle_index": measure(scan_index, args.repeats),
+        }
+
+    best = {name: min(durations) for name, durations in results.items()}
+
+    print("\n📊 バンドル索引作成のベンチマーク結果:")
+    print(f"テーマ数: {count}、ファイルサイズ: {size / 1024 / 1024:.1f}MB")
+    print(f"json.load（全体を解析）: {best['json_load'] * 1000:.1f}ms")
+    print(f"ThemeBundle（コールドな索引作成）: {best['bundle_index'] * 1000:.1f}ms")
+    if best["json_load"] > 0:
+        ratio = best["bundle_index"] / best["json_load"]
+        print(f"所要時間の比（索引作成 / json.load）: {ratio:.2f}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(
+            json.dumps(
+                {
+                    "themes": count,
+                    "size": size,
+                    "repeats": args.repeats,
+                    "results": results,
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        print(f"結果を保存しました: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
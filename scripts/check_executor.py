@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+並行チェック実行システム
+
+互いに独立した品質チェック・リリース前チェックをスレッドプールで並行実行します。
+各チェックにはタイムアウトを設定でき、サブプロセスの出力は上限付きバッファに
+取り込まれます。結果は実行完了順ではなく定義順で返されます。
+"""
+
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 1ストリームあたりの出力保持上限（バイト）
+DEFAULT_OUTPUT_LIMIT = 1024 * 1024
+
+# タイムアウト後にチェックの終了を待つ猶予（秒）
+TIMEOUT_GRACE = 5.0
+
+
+def default_max_workers() -> int:
+    """CPU数に基づくデフォルトの同時実行数
+
+    チェックの大半はサブプロセスの完了待ちのため、CPU数より多めに確保します。
+    """
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class BoundedOutputBuffer:
+    """先頭と末尾のみを保持する上限付き出力バッファ
+
+    上限を超えた場合は中間部分を破棄し、省略したバイト数を記録します。
+    pytestのサマリーなど末尾の情報が失われないよう、末尾側を優先して保持します。
+    """
+
+    def __init__(self, limit: int = DEFAULT_OUTPUT_LIMIT):
+        self.head_limit = limit // 4
+        self.tail_limit = limit - self.head_limit
+        self.head = bytearray()
+        self.tail: deque = deque()
+        self.tail_size = 0
+        self.dropped = 0
+
+    def write(self, data: bytes) -> None:
+        """データを追加"""
+        if len(self.head) < self.head_limit:
+            take = self.head_limit - len(self.head)
+            self.head.extend(data[:take])
+            data = data[take:]
+        if not data:
+            return
+
+        self.tail.append(data)
+        self.tail_size += len(data)
+        while self.tail_size > self.tail_limit:
+            excess = self.tail_size - self.tail_limit
+            chunk = self.tail[0]
+            if len(chunk) <= excess:
+                self.tail.popleft()
+                self.tail_size -= len(chunk)
+                self.dropped += len(chunk)
+            else:
+                self.tail[0] = chunk[excess:]
+                self.tail_size -= excess
+                self.dropped += excess
+
+    def getvalue(self) -> str:
+        """保持している内容を文字列として取得"""
+        head = self.head.decode("utf-8", errors="replace")
+        tail = b"".join(self.tail).decode("utf-8", errors="replace")
+        if self.dropped:
+            return f"{head}\n... ({self.dropped}バイト省略) ...\n{tail}"
+        return head + tail
+
+
+class CheckTask:
+    """並行実行するチェックの定義"""
+
+    def __init__(
+        self,
+        check_id: str,
+        name: str,
+        func: Callable[[], Any],
+        timeout: Optional[float] = None,
+    ):
+        """
+        チェックを定義
+
+        Args:
+            check_id: 結果のキー
+            name: 表示名
+            func: チェック関数
+            timeout: タイムアウト（秒、Noneの場合は無制限）
+        """
+        self.check_id = check_id
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+
+
+class CheckOutcome:
+    """チェックの実行結果"""
+
+    def __init__(self, task: CheckTask):
+        self.check_id = task.check_id
+        self.name = task.name
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.timed_out = False
+        self.elapsed = 0.0
+        self.started_at: Optional[float] = None
+
+
+class ConcurrentCheckExecutor:
+    """独立したチェックを並行実行するエグゼキューター
+
+    チェック関数内のサブプロセスは run_command() で実行してください。
+    チェックのタイムアウトに合わせてサブプロセスのタイムアウトが短縮され、
+    期限を過ぎたチェックのプロセスはプロセスグループごと終了されます。
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        output_limit: int = DEFAULT_OUTPUT_LIMIT,
+    ):
+        """
+        エグゼキューターを初期化
+
+        Args:
+            max_workers: 同時実行数（デフォルト: CPU数に基づく値）
+            output_limit: サブプロセス出力の1ストリームあたりの保持上限（バイト）
+        """
+        self.max_workers = max_workers or default_max_workers()
+        self.output_limit = output_limit
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._processes: Dict[str, Set[subprocess.Popen]] = {}
+
+    def _current_check(self) -> Optional[str]:
+        """実行中スレッドのチェックID"""
+        return getattr(self._local, "check_id", None)
+
+    def remaining_time(self) -> Optional[float]:
+        """実行中チェックのタイムアウトまでの残り時間（秒）"""
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    def _effective_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        """コマンドのタイムアウトをチェックの残り時間で制限"""
+        remaining = self.remaining_time()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def _kill_process(self, process: subprocess.Popen) -> None:
+        """子プロセスをプロセスグループごと終了"""
+        if process.poll() is not None:
+            return
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    def run_command(
+        self,
+        command: List[str],
+        timeout: Optional[float] = None,
+        cwd: Optional[Any] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> subprocess.CompletedProcess:
+        """コマンドを実行し、出力を上限付きバッファに取り込む
+
+        Raises:
+            subprocess.TimeoutExpired: タイムアウトした場合
+            FileNotFoundError: コマンドが見つからない場合
+        """
+        effective_timeout = self._effective_timeout(timeout)
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+            start_new_session=hasattr(os, "killpg"),
+        )
+
+        check_id = self._current_check()
+        if check_id is not None:
+            with self._lock:
+                self._processes.setdefault(check_id, set()).add(process)
+
+        buffers = [
+            BoundedOutputBuffer(self.output_limit),
+            BoundedOutputBuffer(self.output_limit),
+        ]
+        readers = [
+            threading.Thread(target=self._pump, args=(stream, buffer), daemon=True)
+            for stream, buffer in zip((process.stdout, process.stderr), buffers)
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            process.wait(timeout=effective_timeout)
+        except subprocess.TimeoutExpired:
+            self._kill_process(process)
+            process.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join(timeout=5)
+            if check_id is not None:
+                with self._lock:
+                    self._processes.get(check_id, set()).discard(process)
+
+        return subprocess.CompletedProcess(
+            command, process.returncode, buffers[0].getvalue(), buffers[1].getvalue()
+        )
+
+    def _pump(self, stream: Any, buffer: BoundedOutputBuffer) -> None:
+        """ストリームを読み切ってバッファに書き込む"""
+        try:
+            for chunk in iter(lambda: stream.read(65536), b""):
+                buffer.write(chunk)
+        finally:
+            stream.close()
+
+    def _run_task(self, task: CheckTask, outcome: CheckOutcome) -> None:
+        """ワーカースレッドでチェックを実行"""
+        start_time = time.monotonic()
+        outcome.started_at = start_time
+        self._local.check_id = task.check_id
+        self._local.deadline = (
+            start_time + task.timeout if task.timeout is not None else None
+        )
+
+        result = None
+        error = None
+        timed_out = False
+        try:
+            result = task.func()
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            error = f"{task.name}がタイムアウトしました"
+        except Exception as e:
+            error = str(e)
+        finally:
+            self._local.check_id = None
+            self._local.deadline = None
+
+        with self._lock:
+            # 打ち切り済みのチェックの結果は反映しない
+            if outcome.timed_out:
+                return
+            outcome.result = result
+            outcome.error = error
+            outcome.timed_out = timed_out
+            outcome.elapsed = time.monotonic() - start_time
+
+    def run(self, tasks: List[CheckTask]) -> List[CheckOutcome]:
+        """チェックを並行実行し、定義順に結果を返す"""
+        outcomes = [CheckOutcome(task) for task in tasks]
+        if not tasks:
+            return outcomes
+
+        workers = min(self.max_workers, len(tasks))
+        logger.info(f"⚡ {len(tasks)}件のチェックを最大{workers}並列で実行します")
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="check")
+        futures: Dict[Future, int] = {
+            executor.submit(self._run_task, task, outcome): index
+            for index, (task, outcome) in enumerate(zip(tasks, outcomes))
+        }
+
+        pending = set(futures)
+        try:
+            while pending:
+                _, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future in list(pending):
+                    task = tasks[futures[future]]
+                    outcome = outcomes[futures[future]]
+                    if task.timeout is None or outcome.started_at is None:
+                        continue
+                    if now - outcome.started_at > task.timeout + TIMEOUT_GRACE:
+                        # サブプロセス以外で停止しているチェックは待たずに打ち切る
+                        self._abandon(task, outcome)
+                        pending.discard(future)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return outcomes
+
+    def _abandon(self, task: CheckTask, outcome: CheckOutcome) -> None:
+        """タイムアウトしたチェックのプロセスを終了して結果を確定"""
+        with self._lock:
+            processes = list(self._processes.get(task.check_id, set()))
+            outcome.timed_out = True
+            outcome.error = f"{task.name}がタイムアウトしました"
+            outcome.elapsed = float(task.timeout)
+        for process in processes:
+            self._kill_process(process)
+        logger.error(f"❌ {task.name}がタイムアウトしました（{task.timeout}秒）")
@@ -6,57 +6,40 @@ print文検出スクリプト
 loggerの使用を推奨するメッセージを表示します。
 """
 
-import ast
 import sys
 from pathlib import Path
 from typing import List, Tuple
 
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
 
-class PrintStatementVisitor(ast.NodeVisitor):
-    """print文を検出するASTビジター"""
-
-    def __init__(self):
-        self.print_statements: List[Tuple[int, int, str]] = []
-
-    def visit_Call(self, node: ast.Call) -> None:
-        """関数呼び出しノードを訪問"""
-        if isinstance(node.func, ast.Name) and node.func.id == "print":
-            # print文の位置と内容を記録
-            line_no = node.lineno
-            col_offset = node.col_offset
-
-            # print文の引数を取得
-            args = []
-            for arg in node.args:
-                if isinstance(arg, ast.Constant):
-                    args.append(repr(arg.value))
-                elif isinstance(arg, ast.Name):
-                    args.append(arg.id)
-                else:
-                    args.append("...")
-
-            print_content = f"print({', '.join(args)})"
-            self.print_statements.append((line_no, col_offset, print_content))
-
-        self.generic_visit(node)
+from scripts.ast_analysis import get_analysis_cache  # noqa: E402
 
 
 def check_file_for_prints(file_path: Path) -> List[Tuple[int, int, str]]:
     """ファイル内のprint文をチェック"""
     try:
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
-
-        # ASTを解析
-        tree = ast.parse(content, filename=str(file_path))
-        visitor = PrintStatementVisitor()
-        visitor.visit(tree)
+        # 共有解析キャッシュから抽出結果を取得
+        analysis = get_analysis_cache().analyze_file(file_path)
+        if not analysis.ok:
+            print(
+                f"構文エラー: {file_path}: {analysis.syntax_error_message()}",
+                file=sys.stderr,
+            )
+            return []
+
+        print_statements = []
+        for call in analysis.get("print_calls", []):
+            args = [
+                arg["text"] if arg["kind"] in ("constant", "name") else "..."
+                for arg in call["args"]
+            ]
+            print_content = f"print({', '.join(args)})"
+            print_statements.append((call["line"], call["column"], print_content))
 
-        return visitor.print_statements
+        return print_statements
 
-    except SyntaxError as e:
-        print(f"構文エラー: {file_path}: {e}", file=sys.stderr)
-        return []
     except Exception as e:
         print(f"ファイル読み込みエラー: {file_path}: {e}", file=sys.stderr)
         return []
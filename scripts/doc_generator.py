@@ -6,14 +6,18 @@ docstringからAPIドキュメントを自動生成し、品質チェック機
 日本語docstringの適切な処理とSphinx/mkdocsでのドキュメント生成を自動化します。
 """
 
-import ast
 import re
 import subprocess
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from qt_theme_studio.logger import LogCategory, LogContext, get_logger
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qt_theme_studio.logger import LogCategory, LogContext, get_logger  # noqa: E402
+from scripts.ast_analysis import get_analysis_cache  # noqa: E402
 
 
 class DocstringQualityChecker:
@@ -138,30 +142,28 @@ class PythonDocstringExtractor:
             抽出されたdocstring情報のリスト
         """
         try:
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
+            # 共有解析キャッシュから抽出結果を取得
+            analysis = get_analysis_cache().analyze_file(file_path)
+            if not analysis.ok:
+                raise SyntaxError(analysis.syntax_error_message())
 
-            tree = ast.parse(content)
+            definitions = analysis.get("definitions", {})
             docstrings = []
 
-            for node in ast.walk(tree):
-                if isinstance(
-                    node, (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)
-                ):
-                    docstring = ast.get_docstring(node)
-                    if docstring:
-                        docstrings.append(
-                            {
-                                "name": node.name,
-                                "type": type(node).__name__,
-                                "docstring": docstring,
-                                "line_number": node.lineno,
-                                "file_path": str(file_path),
-                            }
-                        )
+            for item in definitions.get("items", []):
+                if item["docstring"]:
+                    docstrings.append(
+                        {
+                            "name": item["name"],
+                            "type": item["type"],
+                            "docstring": item["docstring"],
+                            "line_number": item["line"],
+                            "file_path": str(file_path),
+                        }
+                    )
 
             # モジュールレベルのdocstring
-            module_docstring = ast.get_docstring(tree)
+            module_docstring = definitions.get("module_docstring")
             if module_docstring:
                 docstrings.append(
                     {
@@ -748,7 +750,7 @@ class DocumentationGenerator:
             LogContext(project_root=str(self.project_root)),
         )
 
-        python_files = list(self.project_root.rglob("*.py"))
+        python_files = get_analysis_cache().iter_python_files(self.project_root)
         all_docstrings = []
         quality_results = []
 
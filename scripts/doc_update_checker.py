@@ -6,13 +6,18 @@
 不足ドキュメントの自動検出と案内を提供します。
 """
 
-import ast
 import subprocess
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from qt_theme_studio.logger import LogCategory, LogContext, get_logger
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qt_theme_studio.logger import LogCategory, LogContext, get_logger  # noqa: E402
+from scripts.ast_analysis import get_analysis_cache  # noqa: E402
 
 
 class CodeAnalyzer:
@@ -32,41 +37,34 @@ class CodeAnalyzer:
             分析結果
         """
         try:
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
-
-            tree = ast.parse(content)
+            # 共有解析キャッシュから抽出結果を取得
+            analysis = get_analysis_cache().analyze_file(file_path)
+            if not analysis.ok:
+                raise SyntaxError(analysis.syntax_error_message())
 
             # 関数とクラスを抽出
             functions = []
             classes = []
 
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
+            for item in analysis.get("definitions", {}).get("items", []):
+                if item["type"] == "FunctionDef":
                     functions.append(
                         {
-                            "name": node.name,
-                            "line": node.lineno,
-                            "is_public": not node.name.startswith("_"),
-                            "has_docstring": ast.get_docstring(node) is not None,
-                            "decorators": [
-                                d.id if hasattr(d, "id") else str(d)
-                                for d in node.decorator_list
-                            ],
+                            "name": item["name"],
+                            "line": item["line"],
+                            "is_public": item["is_public"],
+                            "has_docstring": item["docstring"] is not None,
+                            "decorators": item["decorators"],
                         }
                     )
-                elif isinstance(node, ast.ClassDef):
+                elif item["type"] == "ClassDef":
                     classes.append(
                         {
-                            "name": node.name,
-                            "line": node.lineno,
-                            "is_public": not node.name.startswith("_"),
-                            "has_docstring": ast.get_docstring(node) is not None,
-                            "methods": [
-                                n.name
-                                for n in node.body
-                                if isinstance(n, ast.FunctionDef)
-                            ],
+                            "name": item["name"],
+                            "line": item["line"],
+                            "is_public": item["is_public"],
+                            "has_docstring": item["docstring"] is not None,
+                            "methods": item["methods"],
                         }
                     )
 
@@ -324,7 +322,7 @@ class DocumentationGapAnalyzer:
         gaps = []
 
         # Pythonファイルを検索
-        python_files = list(self.project_root.rglob("*.py"))
+        python_files = get_analysis_cache().iter_python_files(self.project_root)
 
         # 除外パターン
         exclude_patterns = [
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+ヘッドレスGUI応答性テストハーネス
+
+QT_QPA_PLATFORM=offscreen で QtThemeStudioMainWindow を起動し、
+テーマ選択・プリセット生成・ファイル読み込み・プレビューリサイズといった
+実際の操作を InteractionSimulator 経由で実行してCI上で応答性を測定します。
+測定結果は ResponsivenessMonitor の既存メトリクスファイルに追記されます。
+"""
+
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Qtのインポート前にオフスクリーンプラットフォームを指定
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.gui_responsiveness_monitor import (  # noqa: E402
+    QT_AVAILABLE,
+    ResponsivenessMetrics,
+    ResponsivenessMonitor,
+)
+
+if QT_AVAILABLE:
+    from scripts.gui_responsiveness_monitor import (
+        QApplication,
+        QTimer,
+    )
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THEME_FILE = project_root / "themes" / "import" / "theme_settings.json"
+DEFAULT_PREVIEW_SIZES = [(1280, 900), (800, 600), (1600, 1000)]
+
+
+class ModalDialogDismisser:
+    """モーダルダイアログ自動クローズタイマー
+
+    メインウィンドウは操作完了時に QMessageBox を表示するため、
+    ヘッドレス実行では exec() のネストしたイベントループ内でダイアログを閉じる必要があります。
+    ファイル選択ダイアログは、pending_files に登録したファイルを選択して確定します。
+    """
+
+    def __init__(self, interval_ms: int = 20):
+        self.interval_ms = interval_ms
+        self.dismissed_count = 0
+        self.pending_files: List[str] = []
+        # メインウィンドウが使用する QtWidgets モジュール（起動後に QtAdapter から設定）
+        self.qt_widgets: Any = None
+        self._timer = None
+
+    def start(self) -> None:
+        """監視を開始"""
+        self._timer = QTimer()
+        self._timer.setInterval(self.interval_ms)
+        self._timer.timeout.connect(self._dismiss_active_modal)
+        self._timer.start()
+
+    def stop(self) -> None:
+        """監視を停止"""
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    def _dismiss_active_modal(self) -> None:
+        """表示中のモーダルダイアログを閉じる"""
+        modal = QApplication.activeModalWidget()
+        if modal is None:
+            return
+
+        if (
+            self.pending_files
+            and self.qt_widgets is not None
+            and isinstance(modal, self.qt_widgets.QFileDialog)
+        ):
+            # ファイル名欄への入力で選択する（ファイル一覧の読み込みを待たずに確定できる）
+            file_path = self.pending_files.pop(0)
+            logger.debug(f"ファイル選択ダイアログで選択します: {file_path}")
+            file_name_edit = modal.findChild(self.qt_widgets.QLineEdit, "fileNameEdit")
+            if file_name_edit is not None:
+                file_name_edit.setText(file_path)
+            else:
+                modal.selectFile(file_path)
+            modal.accept()
+            self.dismissed_count += 1
+            return
+
+        logger.debug(f"モーダルダイアログを閉じます: {modal.windowTitle()}")
+        if hasattr(modal, "done"):
+            modal.done(0)
+        else:
+            modal.close()
+        self.dismissed_count += 1
+
+
+class HeadlessResponsivenessHarness:
+    """QtThemeStudioMainWindow を対象としたヘッドレス応答性テストハーネス"""
+
+    def __init__(
+        self,
+        data_dir: str = "logs/performance/gui",
+        theme_file: Optional[Path] = None,
+        preview_sizes: Optional[List[tuple]] = None,
+        max_theme_selections: int = 5,
+        settle_time: float = 0.05,
+    ):
+        """
+        ハーネスを初期化
+
+        Args:
+            data_dir: メトリクス保存ディレクトリ
+            theme_file: 読み込むテーマファイル
+            preview_sizes: プレビューリサイズのサイズ一覧
+            max_theme_selections: 選択するテーマの最大数
+            settle_time: 各操作後にイベントループを回す時間（秒）
+        """
+        self.monitor = ResponsivenessMonitor(data_dir)
+        self.theme_file = Path(theme_file) if theme_file else DEFAULT_THEME_FILE
+        self.preview_sizes = preview_sizes or DEFAULT_PREVIEW_SIZES
+        self.max_theme_selections = max_theme_selections
+        self.settle_time = settle_time
+
+        self.app = None
+        self.main_window = None
+        self.dismisser = ModalDialogDismisser()
+
+    def boot(self) -> Any:
+        """オフスクリーンでメインウィンドウを起動"""
+        from qt_theme_studio.views.main_window import QtThemeStudioMainWindow
+
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        self.main_window = QtThemeStudioMainWindow()
+        self.main_window.show()
+        self.dismisser.qt_widgets = self._qt_widgets()
+        self.monitor.watchdog.settle(self.settle_time)
+
+        logger.info(
+            f"メインウィンドウを起動しました (platform: {self.app.platformName()})"
+        )
+        return self.main_window
+
+    def _qt_widgets(self) -> Any:
+        """メインウィンドウが使用している QtWidgets モジュールを取得"""
+        return self.main_window.qt_adapter.get_qt_modules()["QtWidgets"]
+
+    def _load_theme_file(self) -> None:
+        """ファイル読み込みスロットを実行し、ファイル選択ダイアログでテーマファイルを選択"""
+        self.dismisser.pending_files.append(str(self.theme_file))
+        self.main_window.load_custom_theme_file()
+
+    def shutdown(self) -> None:
+        """メインウィンドウを閉じる"""
+        self.dismisser.stop()
+        if self.main_window is not None:
+            self.main_window.close()
+            self.main_window.deleteLater()
+            self.main_window = None
+
+    def build_file_load_scenarios(self) -> List[Dict[str, Any]]:
+        """テーマファイル読み込みシナリオを作成"""
+        if not self.theme_file.exists():
+            logger.warning(f"テーマファイルが見つかりません: {self.theme_file}")
+            return []
+
+        return [
+            {
+                "name": "テーマファイル読み込み",
+                "type": "action",
+                "action_name": "file_load",
+                "target": self.main_window,
+                "action": self._load_theme_file,
+                "parameters": {"file": str(self.theme_file)},
+                "wait_after": self.settle_time,
+            }
+        ]
+
+    def build_theme_selection_scenarios(self) -> List[Dict[str, Any]]:
+        """テーマメニューからのテーマ選択シナリオを作成
+
+        メニュー項目はファイル読み込みシナリオの実行後に追加されるため、
+        選択対象のアクションは実行時に解決します。
+        """
+        return [
+            {
+                "name": f"テーマ選択 #{index + 1}",
+                "type": "action",
+                "action_name": "theme_selection",
+                "target": self.main_window.theme_button,
+                "action": lambda index=index: self._trigger_theme_action(index),
+                "parameters": {"menu_index": index},
+                "wait_after": self.settle_time,
+            }
+            for index in range(self.max_theme_selections)
+        ]
+
+    def _trigger_theme_action(self, index: int) -> None:
+        """テーマメニューのindex番目の項目を選択"""
+        actions = self.main_window.theme_menu.actions()
+        if index >= len(actions):
+            raise IndexError(
+                f"テーマメニューの項目が不足しています: {index + 1}/{len(actions)}"
+            )
+        actions[index].trigger()
+
+    def build_preset_generation_scenarios(self) -> List[Dict[str, Any]]:
+        """プリセットボタンによるテーマ生成シナリオを作成"""
+        push_button_class = self._qt_widgets().QPushButton
+        preset_names = {
+            preset["name"]
+            for preset in self.main_window.theme_generator.get_preset_themes().values()
+        }
+        buttons = [
+            button
+            for button in self.main_window.findChildren(push_button_class)
+            if button.text() in preset_names
+        ]
+
+        return [
+            {
+                "name": f"プリセット生成: {button.text()}",
+                "type": "click",
+                "button": "left",
+                "target": button,
+                "wait_after": self.settle_time,
+            }
+            for button in buttons
+        ]
+
+    def build_preview_resize_scenarios(self) -> List[Dict[str, Any]]:
+        """プレビューリサイズシナリオを作成"""
+        return [
+            {
+                "name": f"プレビューリサイズ ({width}x{height})",
+                "type": "window_resize",
+                "target": self.main_window.preview_widget,
+                "width": width,
+                "height": height,
+                "wait_after": self.settle_time,
+            }
+            for width, height in self.preview_sizes
+        ]
+
+    def run(self) -> ResponsivenessMetrics:
+        """全シナリオを実行してメトリクスを保存"""
+        if self.main_window is None:
+            self.boot()
+
+        scenarios = (
+            self.build_file_load_scenarios()
+            + self.build_theme_selection_scenarios()
+            + self.build_preset_generation_scenarios()
+            + self.build_preview_resize_scenarios()
+        )
+
+        self.dismisser.start()
+        try:
+            return self.monitor.run_responsiveness_test(self.main_window, scenarios)
+        finally:
+            self.dismisser.stop()
+
+
+def main() -> int:
+    """メイン実行関数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ヘッドレスGUI応答性テストハーネス")
+    parser.add_argument(
+        "--data-dir", default="logs/performance/gui", help="データ保存ディレクトリ"
+    )
+    parser.add_argument(
+        "--theme-file", default=str(DEFAULT_THEME_FILE), help="読み込むテーマファイル"
+    )
+    parser.add_argument(
+        "--max-themes", type=int, default=5, help="選択するテーマの最大数"
+    )
+    parser.add_argument(
+        "--settle", type=float, default=0.05, help="操作後の待機時間（秒）"
+    )
+    parser.add_argument(
+        "--max-p95",
+        type=float,
+        metavar="SECONDS",
+        help="95パーセンタイル応答時間の上限（超過時は終了コード1）",
+    )
+    parser.add_argument("--verbose", action="store_true", help="詳細ログを出力")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    if not QT_AVAILABLE:
+        logger.error("Qtが利用できません")
+        return 1
+
+    harness = HeadlessResponsivenessHarness(
+        data_dir=args.data_dir,
+        theme_file=Path(args.theme_file),
+        max_theme_selections=args.max_themes,
+        settle_time=args.settle,
+    )
+
+    try:
+        harness.boot()
+        metrics = harness.run()
+    finally:
+        harness.shutdown()
+
+    latency = metrics.event_loop_latency or {}
+    print("\n📊 ヘッドレスGUI応答性テスト結果:")
+    print(f"総インタラクション数: {metrics.total_interactions}")
+    print(f"成功: {metrics.successful_interactions}")
+    print(f"失敗: {metrics.failed_interactions}")
+    print(f"平均応答時間: {metrics.average_response_time:.4f}秒")
+    print(f"95パーセンタイル: {metrics.p95_response_time:.4f}秒")
+    print(f"イベントループ最大遅延: {latency.get('max', 0.0):.4f}秒")
+    print(f"自動クローズしたダイアログ: {harness.dismisser.dismissed_count}個")
+
+    if metrics.failed_interactions > 0:
+        return 1
+    if args.max_p95 is not None and metrics.p95_response_time > args.max_p95:
+        print(f"❌ 95パーセンタイルが上限を超えました: {args.max_p95:.4f}秒")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
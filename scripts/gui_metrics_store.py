@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+GUI応答性メトリクスストア
+
+測定結果とセッションメトリクスを日別パーティションのJSON Lines形式で追記保存し、
+日別・インタラクションタイプ別のロールアップ（集計値とヒストグラム）を維持します。
+レポート生成はロールアップのみを参照するため、データ量に依存せず高速に実行できます。
+"""
+
+import json
+import logging
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qt_theme_studio.utilities.metrics import LogHistogram  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class DailyRollup:
+    """日別ロールアップ
+
+    セッション数・インタラクション数と、全体およびインタラクションタイプ別の
+    応答時間ヒストグラムを保持します。
+    """
+
+    def __init__(self, day: str):
+        self.day = day
+        self.sessions = 0
+        self.total_interactions = 0
+        self.successful_interactions = 0
+        self.failed_interactions = 0
+        self.session_avg_total = 0.0
+        self.response_times = LogHistogram()
+        self.by_type: Dict[str, Dict[str, Any]] = {}
+
+    def add_session(
+        self, metrics: Dict[str, Any], measurements: List[Dict[str, Any]]
+    ) -> None:
+        """セッションと測定結果を集計に加える"""
+        self.sessions += 1
+        self.total_interactions += metrics.get("total_interactions", 0)
+        self.successful_interactions += metrics.get("successful_interactions", 0)
+        self.failed_interactions += metrics.get("failed_interactions", 0)
+        self.session_avg_total += metrics.get("average_response_time", 0.0)
+
+        for measurement in measurements:
+            event_type = measurement.get("event", {}).get("event_type", "unknown")
+            type_stats = self.by_type.setdefault(
+                event_type, {"count": 0, "failed": 0, "histogram": LogHistogram()}
+            )
+            type_stats["count"] += 1
+
+            if not measurement.get("success", False):
+                type_stats["failed"] += 1
+                continue
+
+            response_time = measurement.get("response_time", 0.0)
+            self.response_times.record(response_time)
+            type_stats["histogram"].record(response_time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書形式に変換"""
+        return {
+            "day": self.day,
+            "sessions": self.sessions,
+            "total_interactions": self.total_interactions,
+            "successful_interactions": self.successful_interactions,
+            "failed_interactions": self.failed_interactions,
+            "session_avg_total": self.session_avg_total,
+            "response_times": self.response_times.to_dict(),
+            "by_type": {
+                event_type: {
+                    "count": stats["count"],
+                    "failed": stats["failed"],
+                    "histogram": stats["histogram"].to_dict(),
+                }
+                for event_type, stats in self.by_type.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailyRollup":
+        """辞書形式から復元"""
+        rollup = cls(data["day"])
+        rollup.sessions = data.get("sessions", 0)
+        rollup.total_interactions = data.get("total_interactions", 0)
+        rollup.successful_interactions = data.get("successful_interactions", 0)
+        rollup.failed_interactions = data.get("failed_interactions", 0)
+        rollup.session_avg_total = data.get("session_avg_total", 0.0)
+        rollup.response_times = LogHistogram.from_dict(data.get("response_times", {}))
+        rollup.by_type = {
+            event_type: {
+                "count": stats.get("count", 0),
+                "failed": stats.get("failed", 0),
+                "histogram": LogHistogram.from_dict(stats.get("histogram", {})),
+            }
+            for event_type, stats in data.get("by_type", {}).items()
+        }
+        return rollup
+
+
+class ResponsivenessMetricsStore:
+    """GUI応答性メトリクスの追記型ストア
+
+    ディレクトリ構成:
+        measurements/YYYY-MM-DD.jsonl  測定結果（1行1測定）
+        sessions/YYYY-MM-DD.jsonl      セッションメトリクス（1行1セッション）
+        rollups.json                   日別ロールアップ
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        raw_retention_days: int = 30,
+        rollup_retention_days: int = 365,
+    ):
+        """
+        メトリクスストアを初期化
+
+        Args:
+            data_dir: データ保存ディレクトリ
+            raw_retention_days: 測定結果・セッションの保持日数
+            rollup_retention_days: ロールアップの保持日数
+        """
+        self.data_dir = Path(data_dir)
+        self.measurements_dir = self.data_dir / "measurements"
+        self.sessions_dir = self.data_dir / "sessions"
+        self.rollups_file = self.data_dir / "rollups.json"
+        self.raw_retention_days = raw_retention_days
+        self.rollup_retention_days = rollup_retention_days
+
+        self.measurements_dir.mkdir(parents=True, exist_ok=True)
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+
+        self._rollups: Optional[Dict[str, DailyRollup]] = None
+
+    # ------------------------------------------------------------------
+    # 書き込み
+    # ------------------------------------------------------------------
+
+    def append_session(
+        self, metrics: Dict[str, Any], measurements: List[Dict[str, Any]]
+    ) -> None:
+        """
+        セッションの測定結果とメトリクスを追記し、ロールアップを更新
+
+        Args:
+            metrics: シリアライズ済みのセッションメトリクス
+            measurements: シリアライズ済みの測定結果
+        """
+        day = self._day_of(metrics.get("timestamp"))
+
+        self._append_lines(self.measurements_dir / f"{day}.jsonl", measurements)
+        self._append_lines(self.sessions_dir / f"{day}.jsonl", [metrics])
+
+        rollups = self._load_rollups()
+        rollup = rollups.get(day) or DailyRollup(day)
+        rollup.add_session(metrics, measurements)
+        rollups[day] = rollup
+
+        self.prune()
+        self._write_rollups()
+
+    def _append_lines(self, path: Path, records: List[Dict[str, Any]]) -> None:
+        """JSON Linesファイルに追記"""
+        if not records:
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _write_rollups(self) -> None:
+        """ロールアップをアトミックに書き込み"""
+        rollups = self._load_rollups()
+        temp_file = self.rollups_file.with_suffix(".json.tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "rollups": [rollups[day].to_dict() for day in sorted(rollups)],
+                    "last_updated": datetime.now().isoformat(),
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(temp_file, self.rollups_file)
+
+    def prune(self) -> None:
+        """保持期間を過ぎたパーティションとロールアップを削除
+
+        日付はファイル名から判定するため、レコード単位の解析は行いません。
+        """
+        raw_cutoff = (
+            date.today() - timedelta(days=self.raw_retention_days)
+        ).isoformat()
+        for directory in (self.measurements_dir, self.sessions_dir):
+            for partition in directory.glob("*.jsonl"):
+                if partition.stem < raw_cutoff:
+                    partition.unlink()
+                    logger.debug(f"古いパーティションを削除: {partition}")
+
+        rollup_cutoff = (
+            date.today() - timedelta(days=self.rollup_retention_days)
+        ).isoformat()
+        rollups = self._load_rollups()
+        for day in [day for day in rollups if day < rollup_cutoff]:
+            del rollups[day]
+
+    # ------------------------------------------------------------------
+    # 読み込み
+    # ------------------------------------------------------------------
+
+    def _load_rollups(self) -> Dict[str, DailyRollup]:
+        """ロールアップを読み込み（キャッシュ付き）"""
+        if self._rollups is not None:
+            return self._rollups
+
+        self._rollups = {}
+        if self.rollups_file.exists():
+            try:
+                with open(self.rollups_file, encoding="utf-8") as f:
+                    data = json.load(f)
+                for item in data.get("rollups", []):
+                    rollup = DailyRollup.from_dict(item)
+                    self._rollups[rollup.day] = rollup
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"ロールアップ読み込みエラー: {e}")
+        return self._rollups
+
+    def load_rollups(self, days: int) -> List[DailyRollup]:
+        """指定日数分の日別ロールアップを日付順に取得"""
+        cutoff = self._cutoff_day(days)
+        rollups = self._load_rollups()
+        return [rollups[day] for day in sorted(rollups) if day >= cutoff]
+
+    def load_sessions(self, days: int) -> List[Dict[str, Any]]:
+        """指定日数分のセッションメトリクスを取得（対象日のパーティションのみ読み込み）"""
+        return list(self._iter_partitions(self.sessions_dir, days))
+
+    def load_measurements(self, days: int) -> List[Dict[str, Any]]:
+        """指定日数分の測定結果を取得（対象日のパーティションのみ読み込み）"""
+        return list(self._iter_partitions(self.measurements_dir, days))
+
+    def _iter_partitions(self, directory: Path, days: int) -> Iterator[Dict[str, Any]]:
+        """期間内のパーティションのレコードを順に返す"""
+        cutoff = self._cutoff_day(days)
+        for partition in sorted(directory.glob("*.jsonl")):
+            if partition.stem < cutoff:
+                continue
+            with open(partition, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # 書き込み途中で中断された行はスキップ
+                        continue
+
+    # ------------------------------------------------------------------
+    # 旧形式からの移行
+    # ------------------------------------------------------------------
+
+    def migrate_legacy_files(self, measurements_file: Path, metrics_file: Path) -> None:
+        """旧形式（単一JSONファイル）のデータをストアに取り込む
+
+        取り込み後の旧ファイルは .migrated 拡張子で保存されます。
+        """
+        if not metrics_file.exists():
+            return
+
+        try:
+            with open(metrics_file, encoding="utf-8") as f:
+                legacy_metrics = json.load(f).get("metrics", [])
+
+            legacy_measurements: List[Dict[str, Any]] = []
+            if measurements_file.exists():
+                with open(measurements_file, encoding="utf-8") as f:
+                    legacy_measurements = json.load(f).get("measurements", [])
+        except (OSError, ValueError) as e:
+            logger.error(f"旧形式データの読み込みエラー: {e}")
+            return
+
+        # 測定結果は日付単位でセッションに割り当てる
+        measurements_by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for measurement in legacy_measurements:
+            day = self._day_of(measurement.get("start_time"))
+            measurements_by_day.setdefault(day, []).append(measurement)
+
+        for metrics in sorted(legacy_metrics, key=lambda m: m.get("timestamp", "")):
+            day = self._day_of(metrics.get("timestamp"))
+            self.append_session(metrics, measurements_by_day.pop(day, []))
+
+        for legacy_file in (measurements_file, metrics_file):
+            if legacy_file.exists():
+                legacy_file.rename(legacy_file.with_suffix(".json.migrated"))
+
+        logger.info(
+            f"旧形式のメトリクスを移行しました: {len(legacy_metrics)}セッション"
+        )
+
+    # ------------------------------------------------------------------
+    # ユーティリティ
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _day_of(timestamp: Optional[str]) -> str:
+        """ISO形式のタイムスタンプから日付文字列を取得"""
+        if timestamp:
+            return timestamp[:10]
+        return date.today().isoformat()
+
+    @staticmethod
+    def _cutoff_day(days: int) -> str:
+        """期間の開始日を取得"""
+        return (date.today() - timedelta(days=days)).isoformat()
+
+
+def merge_rollups(rollups: List[DailyRollup]) -> DailyRollup:
+    """複数の日別ロールアップを1つに統合"""
+    merged = DailyRollup("merged")
+    for rollup in rollups:
+        merged.sessions += rollup.sessions
+        merged.total_interactions += rollup.total_interactions
+        merged.successful_interactions += rollup.successful_interactions
+        merged.failed_interactions += rollup.failed_interactions
+        merged.session_avg_total += rollup.session_avg_total
+        merged.response_times.merge(rollup.response_times)
+
+        for event_type, stats in rollup.by_type.items():
+            merged_stats = merged.by_type.setdefault(
+                event_type, {"count": 0, "failed": 0, "histogram": LogHistogram()}
+            )
+            merged_stats["count"] += stats["count"]
+            merged_stats["failed"] += stats["failed"]
+            merged_stats["histogram"].merge(stats["histogram"])
+    return merged
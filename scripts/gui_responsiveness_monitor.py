@@ -6,15 +6,24 @@ GUI応答性測定システム
 ユーザーインタラクションのシミュレーション、応答性メトリクスの可視化を提供します。
 """
 
-import json
 import logging
 import statistics
 import sys
 import time
 from dataclasses import asdict, dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.gui_metrics_store import (  # noqa: E402
+    DailyRollup,
+    ResponsivenessMetricsStore,
+    merge_rollups,
+)
 
 # Qt関連のインポート（動的インポート）
 try:
@@ -22,9 +31,7 @@ try:
         QCoreApplication,
         QEventLoop,
         Qt,
-        QThread,
         QTimer,
-        pyqtSignal,
     )
     from PySide6.QtTest import QTest
     from PySide6.QtWidgets import QApplication, QWidget
@@ -36,9 +43,7 @@ except ImportError:
             QCoreApplication,
             QEventLoop,
             Qt,
-            QThread,
             QTimer,
-            pyqtSignal,
         )
         from PyQt6.QtTest import QTest
         from PyQt6.QtWidgets import QApplication, QWidget
@@ -50,9 +55,7 @@ except ImportError:
                 QCoreApplication,
                 QEventLoop,
                 Qt,
-                QThread,
                 QTimer,
-                pyqtSignal,
             )
             from PyQt5.QtTest import QTest
             from PyQt5.QtWidgets import QApplication, QWidget
@@ -88,6 +91,7 @@ class ResponseMeasurement:
     error_message: Optional[str] = None
     ui_state_before: Optional[Dict[str, Any]] = None
     ui_state_after: Optional[Dict[str, Any]] = None
+    event_loop_latency: Optional[Dict[str, float]] = None  # イベントループ遅延統計
 
 
 @dataclass
@@ -107,6 +111,93 @@ class ResponsivenessMetrics:
     fastest_interaction: Optional[ResponseMeasurement]
     interactions_by_type: Dict[str, int]
     response_times_by_type: Dict[str, List[float]]
+    event_loop_latency: Optional[Dict[str, float]] = None  # セッション全体の遅延統計
+
+
+class EventLoopWatchdog:
+    """イベントループ遅延監視タイマー
+
+    一定間隔のQTimerを回し、各tickが予定時刻からどれだけ遅れて
+    配送されたかを記録します。GUIスレッドがブロックされている間は
+    tickが配送されないため、遅延がそのままブロック時間になります。
+    """
+
+    def __init__(self, interval_ms: int = 10):
+        self.interval_ms = interval_ms
+        self.samples: List[float] = []
+        self._timer = None
+        self._expected = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        """監視中かどうか"""
+        return self._timer is not None
+
+    def start(self) -> None:
+        """監視を開始"""
+        if not QT_AVAILABLE or self._timer is not None:
+            return
+
+        self._timer = QTimer()
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(self.interval_ms)
+        self._timer.timeout.connect(self._on_tick)
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._timer.start()
+
+    def stop(self) -> None:
+        """監視を停止"""
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    def reset(self) -> None:
+        """記録済みのサンプルを破棄"""
+        self.samples = []
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+
+    def _on_tick(self) -> None:
+        """tick受信時に予定時刻からの遅延を記録"""
+        now = time.perf_counter()
+        self.samples.append(max(0.0, now - self._expected))
+        self._expected = now + self.interval_ms / 1000
+
+    def settle(self, duration: float) -> None:
+        """指定時間イベントループを回す（time.sleepの代替）
+
+        time.sleepと異なり待機中もイベントが処理されるため、
+        操作後に遅れて配送されるペイント・タイマーイベントも測定対象になります。
+        """
+        if duration <= 0:
+            return
+
+        if not QT_AVAILABLE or QCoreApplication.instance() is None:
+            time.sleep(duration)
+            return
+
+        loop = QEventLoop()
+        QTimer.singleShot(int(duration * 1000), loop.quit)
+        loop.exec()
+
+    def summary(self) -> Dict[str, float]:
+        """遅延サンプルの統計を取得（秒単位）"""
+        return summarize_latency_samples(self.samples)
+
+
+def summarize_latency_samples(samples: List[float]) -> Dict[str, float]:
+    """遅延サンプルの統計を計算"""
+    if not samples:
+        return {"samples": 0, "mean": 0.0, "p95": 0.0, "max": 0.0}
+
+    sorted_samples = sorted(samples)
+    p95_index = min(int(len(sorted_samples) * 0.95), len(sorted_samples) - 1)
+
+    return {
+        "samples": len(sorted_samples),
+        "mean": statistics.mean(sorted_samples),
+        "p95": sorted_samples[p95_index],
+        "max": sorted_samples[-1],
+    }
 
 
 class UIStateCapture:
@@ -406,6 +497,61 @@ class InteractionSimulator:
                 f"ウィンドウリサイズシミュレーションエラー: {e}", event
             )
 
+    def simulate_action(
+        self,
+        widget,
+        action_name: str,
+        action: Callable[[], Any],
+        parameters: Optional[Dict[str, Any]] = None,
+    ) -> ResponseMeasurement:
+        """任意のUI操作（メニュー選択・ファイル読み込み等）をシミュレート"""
+        if not QT_AVAILABLE or not widget:
+            return self._create_failed_measurement("Qt not available or widget is None")
+
+        event = InteractionEvent(
+            event_type=action_name,
+            target_widget=widget.objectName() or widget.__class__.__name__,
+            timestamp=datetime.now(),
+            parameters=parameters or {},
+        )
+
+        try:
+            # UI状態をキャプチャ（前）
+            ui_state_before = self.state_capture.capture_widget_state(widget)
+
+            # 応答時間測定開始
+            start_time = datetime.now()
+            start_perf = time.perf_counter()
+
+            # 操作を実行
+            action()
+
+            # イベント処理を待機
+            QCoreApplication.processEvents()
+
+            # 応答時間測定終了
+            end_perf = time.perf_counter()
+            end_time = datetime.now()
+            response_time = end_perf - start_perf
+
+            # UI状態をキャプチャ（後）
+            ui_state_after = self.state_capture.capture_widget_state(widget)
+
+            return ResponseMeasurement(
+                event=event,
+                start_time=start_time,
+                end_time=end_time,
+                response_time=response_time,
+                success=True,
+                ui_state_before=ui_state_before,
+                ui_state_after=ui_state_after,
+            )
+
+        except Exception as e:
+            return self._create_failed_measurement(
+                f"操作シミュレーションエラー ({action_name}): {e}", event
+            )
+
     def _create_failed_measurement(
         self, error_message: str, event: Optional[InteractionEvent] = None
     ) -> ResponseMeasurement:
@@ -441,11 +587,16 @@ class ResponsivenessMonitor:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
+        # 旧形式（単一JSONファイル）のパス。存在する場合は初回にストアへ移行する
         self.measurements_file = self.data_dir / "responsiveness_measurements.json"
         self.metrics_file = self.data_dir / "responsiveness_metrics.json"
 
+        self.store = ResponsivenessMetricsStore(self.data_dir)
+        self.store.migrate_legacy_files(self.measurements_file, self.metrics_file)
+
         self.simulator = InteractionSimulator()
         self.state_capture = UIStateCapture()
+        self.watchdog = EventLoopWatchdog()
 
         # 応答性閾値設定
         self.thresholds = {
@@ -480,6 +631,8 @@ class ResponsivenessMonitor:
         self.logger.info(f"応答性テストを開始: {session_id}")
 
         measurements = []
+        all_latency_samples: List[float] = []
+        self.watchdog.start()
 
         for i, scenario in enumerate(test_scenarios):
             self.logger.info(
@@ -487,13 +640,16 @@ class ResponsivenessMonitor:
             )
 
             try:
+                self.watchdog.reset()
                 measurement = self._execute_scenario(widget, scenario)
-                measurements.append(measurement)
 
-                # シナリオ間の待機時間
+                # シナリオ間の待機時間（イベントループを回しながら遅延を測定）
                 wait_time = scenario.get("wait_after", 0.1)
-                if wait_time > 0:
-                    time.sleep(wait_time)
+                self.watchdog.settle(wait_time)
+
+                measurement.event_loop_latency = self.watchdog.summary()
+                all_latency_samples.extend(self.watchdog.samples)
+                measurements.append(measurement)
 
             except Exception as e:
                 self.logger.error(f"シナリオ実行エラー: {e}")
@@ -503,7 +659,11 @@ class ResponsivenessMonitor:
                         event_type=scenario.get("type", "unknown"),
                         target_widget=widget.objectName() if widget else "unknown",
                         timestamp=datetime.now(),
-                        parameters=scenario,
+                        parameters={
+                            key: value
+                            for key, value in scenario.items()
+                            if key not in ("action", "target")
+                        },
                     ),
                     start_time=datetime.now(),
                     end_time=datetime.now(),
@@ -513,12 +673,14 @@ class ResponsivenessMonitor:
                 )
                 measurements.append(error_measurement)
 
+        self.watchdog.stop()
+
         # メトリクスを計算
         metrics = self._calculate_metrics(session_id, measurements)
+        metrics.event_loop_latency = summarize_latency_samples(all_latency_samples)
 
         # 結果を保存
-        self._save_measurements(measurements)
-        self._save_metrics(metrics)
+        self._save_session(metrics, measurements)
 
         self.logger.info(f"応答性テスト完了: {len(measurements)}個の測定を実行")
         return metrics
@@ -528,6 +690,16 @@ class ResponsivenessMonitor:
     ) -> ResponseMeasurement:
         """個別のテストシナリオを実行"""
         scenario_type = scenario.get("type", "click")
+        # シナリオ毎に操作対象のウィジェットを差し替え可能
+        widget = scenario.get("target", widget)
+
+        if scenario_type == "action":
+            return self.simulator.simulate_action(
+                widget,
+                scenario.get("action_name", scenario.get("name", "action")),
+                scenario["action"],
+                scenario.get("parameters"),
+            )
 
         if scenario_type == "click":
             button = scenario.get("button", "left")
@@ -648,124 +820,45 @@ class ResponsivenessMonitor:
             response_times_by_type={},
         )
 
-    def _save_measurements(self, measurements: List[ResponseMeasurement]) -> None:
-        """測定結果を保存"""
-        try:
-            # 既存の測定結果を読み込み
-            existing_measurements = []
-            if self.measurements_file.exists():
-                with open(self.measurements_file, encoding="utf-8") as f:
-                    data = json.load(f)
-                    existing_measurements = data.get("measurements", [])
-
-            # 新しい測定結果を追加
-            for measurement in measurements:
-                measurement_dict = asdict(measurement)
-                # datetimeオブジェクトをISO形式の文字列に変換
-                measurement_dict["start_time"] = measurement.start_time.isoformat()
-                measurement_dict["end_time"] = measurement.end_time.isoformat()
-                measurement_dict["event"]["timestamp"] = (
-                    measurement.event.timestamp.isoformat()
-                )
-                existing_measurements.append(measurement_dict)
-
-            # 古い測定結果を削除（30日以上前）
-            cutoff_date = datetime.now() - timedelta(days=30)
-            filtered_measurements = []
-            for m in existing_measurements:
-                try:
-                    measurement_time = datetime.fromisoformat(m["start_time"])
-                    if measurement_time >= cutoff_date:
-                        filtered_measurements.append(m)
-                except (ValueError, KeyError):
-                    # 無効なデータはスキップ
-                    continue
-
-            # ファイルに保存
-            with open(self.measurements_file, "w", encoding="utf-8") as f:
-                json.dump(
-                    {
-                        "measurements": filtered_measurements,
-                        "last_updated": datetime.now().isoformat(),
-                    },
-                    f,
-                    indent=2,
-                    ensure_ascii=False,
-                )
-
-            self.logger.info(f"測定結果を保存しました: {len(measurements)}件")
-
-        except Exception as e:
-            self.logger.error(f"測定結果保存エラー: {e}")
+    def _serialize_measurement(
+        self, measurement: ResponseMeasurement
+    ) -> Dict[str, Any]:
+        """測定結果をJSON化可能な辞書に変換"""
+        measurement_dict = asdict(measurement)
+        # datetimeオブジェクトをISO形式の文字列に変換
+        measurement_dict["start_time"] = measurement.start_time.isoformat()
+        measurement_dict["end_time"] = measurement.end_time.isoformat()
+        measurement_dict["event"]["timestamp"] = measurement.event.timestamp.isoformat()
+        return measurement_dict
+
+    def _serialize_metrics(self, metrics: ResponsivenessMetrics) -> Dict[str, Any]:
+        """メトリクスをJSON化可能な辞書に変換"""
+        metrics_dict = asdict(metrics)
+        metrics_dict["timestamp"] = metrics.timestamp.isoformat()
+
+        # slowest_interaction と fastest_interaction の処理
+        if metrics.slowest_interaction:
+            metrics_dict["slowest_interaction"] = self._serialize_measurement(
+                metrics.slowest_interaction
+            )
+        if metrics.fastest_interaction:
+            metrics_dict["fastest_interaction"] = self._serialize_measurement(
+                metrics.fastest_interaction
+            )
+        return metrics_dict
 
-    def _save_metrics(self, metrics: ResponsivenessMetrics) -> None:
-        """メトリクスを保存"""
+    def _save_session(
+        self, metrics: ResponsivenessMetrics, measurements: List[ResponseMeasurement]
+    ) -> None:
+        """セッションのメトリクスと測定結果をストアに追記"""
         try:
-            # 既存のメトリクスを読み込み
-            existing_metrics = []
-            if self.metrics_file.exists():
-                with open(self.metrics_file, encoding="utf-8") as f:
-                    data = json.load(f)
-                    existing_metrics = data.get("metrics", [])
-
-            # 新しいメトリクスを追加
-            metrics_dict = asdict(metrics)
-            metrics_dict["timestamp"] = metrics.timestamp.isoformat()
-
-            # slowest_interaction と fastest_interaction の処理
-            if metrics.slowest_interaction:
-                slowest_dict = asdict(metrics.slowest_interaction)
-                slowest_dict["start_time"] = (
-                    metrics.slowest_interaction.start_time.isoformat()
-                )
-                slowest_dict["end_time"] = (
-                    metrics.slowest_interaction.end_time.isoformat()
-                )
-                slowest_dict["event"]["timestamp"] = (
-                    metrics.slowest_interaction.event.timestamp.isoformat()
-                )
-                metrics_dict["slowest_interaction"] = slowest_dict
-
-            if metrics.fastest_interaction:
-                fastest_dict = asdict(metrics.fastest_interaction)
-                fastest_dict["start_time"] = (
-                    metrics.fastest_interaction.start_time.isoformat()
-                )
-                fastest_dict["end_time"] = (
-                    metrics.fastest_interaction.end_time.isoformat()
-                )
-                fastest_dict["event"]["timestamp"] = (
-                    metrics.fastest_interaction.event.timestamp.isoformat()
-                )
-                metrics_dict["fastest_interaction"] = fastest_dict
-
-            existing_metrics.append(metrics_dict)
-
-            # 古いメトリクスを削除（30日以上前）
-            cutoff_date = datetime.now() - timedelta(days=30)
-            filtered_metrics = []
-            for m in existing_metrics:
-                try:
-                    metrics_time = datetime.fromisoformat(m["timestamp"])
-                    if metrics_time >= cutoff_date:
-                        filtered_metrics.append(m)
-                except (ValueError, KeyError):
-                    # 無効なデータはスキップ
-                    continue
-
-            # ファイルに保存
-            with open(self.metrics_file, "w", encoding="utf-8") as f:
-                json.dump(
-                    {
-                        "metrics": filtered_metrics,
-                        "last_updated": datetime.now().isoformat(),
-                    },
-                    f,
-                    indent=2,
-                    ensure_ascii=False,
-                )
-
-            self.logger.info("応答性メトリクスを保存しました")
+            self.store.append_session(
+                self._serialize_metrics(metrics),
+                [self._serialize_measurement(m) for m in measurements],
+            )
+            self.logger.info(
+                f"測定結果とメトリクスを保存しました: {len(measurements)}件"
+            )
 
         except Exception as e:
             self.logger.error(f"メトリクス保存エラー: {e}")
@@ -783,31 +876,13 @@ class ResponsivenessMonitor:
         self.logger.info(f"過去{days}日間の応答性レポートを生成中")
 
         try:
-            # メトリクスデータを読み込み
-            if not self.metrics_file.exists():
-                return self._create_empty_report(days)
-
-            with open(self.metrics_file, encoding="utf-8") as f:
-                data = json.load(f)
-                all_metrics = data.get("metrics", [])
-
-            # 期間内のメトリクスをフィルタリング
-            cutoff_date = datetime.now() - timedelta(days=days)
-            recent_metrics = []
-
-            for metrics_data in all_metrics:
-                try:
-                    metrics_time = datetime.fromisoformat(metrics_data["timestamp"])
-                    if metrics_time >= cutoff_date:
-                        recent_metrics.append(metrics_data)
-                except (ValueError, KeyError):
-                    continue
-
-            if not recent_metrics:
+            # 日別ロールアップのみを参照する（生データは読み込まない）
+            rollups = self.store.load_rollups(days)
+            if not rollups:
                 return self._create_empty_report(days)
 
             # レポートを生成
-            report = self._analyze_metrics_data(recent_metrics, days)
+            report = self._analyze_rollups(rollups, days)
 
             self.logger.info("応答性レポートを生成しました")
             return report
@@ -816,74 +891,64 @@ class ResponsivenessMonitor:
             self.logger.error(f"応答性レポート生成エラー: {e}")
             return self._create_empty_report(days)
 
-    def _analyze_metrics_data(
-        self, metrics_data: List[Dict[str, Any]], days: int
-    ) -> Dict[str, Any]:
-        """メトリクスデータを分析してレポートを生成"""
-        total_sessions = len(metrics_data)
-        total_interactions = sum(m.get("total_interactions", 0) for m in metrics_data)
-        total_successful = sum(
-            m.get("successful_interactions", 0) for m in metrics_data
-        )
-        total_failed = sum(m.get("failed_interactions", 0) for m in metrics_data)
+    def _analyze_rollups(self, rollups: List[DailyRollup], days: int) -> Dict[str, Any]:
+        """日別ロールアップを分析してレポートを生成"""
+        merged = merge_rollups(rollups)
+        response_summary = merged.response_times.summary()
 
-        # 応答時間の統計
-        all_avg_times = [
-            m.get("average_response_time", 0)
-            for m in metrics_data
-            if m.get("average_response_time", 0) > 0
-        ]
-        all_p95_times = [
-            m.get("p95_response_time", 0)
-            for m in metrics_data
-            if m.get("p95_response_time", 0) > 0
-        ]
-
-        overall_avg_response_time = (
-            statistics.mean(all_avg_times) if all_avg_times else 0
-        )
-        overall_p95_response_time = (
-            statistics.mean(all_p95_times) if all_p95_times else 0
-        )
+        overall_avg_response_time = response_summary["mean"]
 
         # 成功率
         success_rate = (
-            (total_successful / total_interactions * 100)
-            if total_interactions > 0
+            (merged.successful_interactions / merged.total_interactions * 100)
+            if merged.total_interactions > 0
             else 0
         )
 
         # インタラクションタイプ別の統計
-        interaction_types = {}
-        for metrics in metrics_data:
-            for interaction_type, count in metrics.get(
-                "interactions_by_type", {}
-            ).items():
-                interaction_types[interaction_type] = (
-                    interaction_types.get(interaction_type, 0) + count
-                )
+        interaction_types = {
+            event_type: stats["count"] for event_type, stats in merged.by_type.items()
+        }
+        response_times_by_type = {
+            event_type: {
+                key: round(value, 4)
+                for key, value in stats["histogram"].summary().items()
+            }
+            for event_type, stats in merged.by_type.items()
+        }
 
         # 応答性評価
         responsiveness_grade = self._calculate_responsiveness_grade(
             overall_avg_response_time
         )
 
-        # トレンド分析
-        trend_analysis = self._analyze_trends(metrics_data)
+        # トレンド分析（日別のセッション平均応答時間）
+        daily_points = [
+            {
+                "timestamp": rollup.day,
+                "average_response_time": rollup.session_avg_total / rollup.sessions,
+            }
+            for rollup in rollups
+            if rollup.sessions > 0
+        ]
+        trend_analysis = self._analyze_trends(daily_points)
 
         return {
             "period": f"{days}日間",
             "summary": {
-                "total_sessions": total_sessions,
-                "total_interactions": total_interactions,
-                "successful_interactions": total_successful,
-                "failed_interactions": total_failed,
+                "total_sessions": merged.sessions,
+                "total_interactions": merged.total_interactions,
+                "successful_interactions": merged.successful_interactions,
+                "failed_interactions": merged.failed_interactions,
                 "success_rate": round(success_rate, 2),
                 "overall_avg_response_time": round(overall_avg_response_time, 4),
-                "overall_p95_response_time": round(overall_p95_response_time, 4),
+                "overall_p50_response_time": round(response_summary["p50"], 4),
+                "overall_p95_response_time": round(response_summary["p95"], 4),
+                "overall_p99_response_time": round(response_summary["p99"], 4),
                 "responsiveness_grade": responsiveness_grade,
             },
             "interaction_types": interaction_types,
+            "response_times_by_type": response_times_by_type,
             "trend_analysis": trend_analysis,
             "recommendations": self._generate_recommendations(
                 overall_avg_response_time, success_rate, interaction_types
@@ -1008,10 +1073,13 @@ class ResponsivenessMonitor:
                 "failed_interactions": 0,
                 "success_rate": 0,
                 "overall_avg_response_time": 0,
+                "overall_p50_response_time": 0,
                 "overall_p95_response_time": 0,
+                "overall_p99_response_time": 0,
                 "responsiveness_grade": "不明",
             },
             "interaction_types": {},
+            "response_times_by_type": {},
             "trend_analysis": {"trend": "不明", "change_rate": 0},
             "recommendations": [
                 "データが不足しています。応答性テストを実行してください。"
@@ -1161,6 +1229,11 @@ def main():
             print(f"総インタラクション数: {summary['total_interactions']}")
             print(f"成功率: {summary['success_rate']}%")
             print(f"平均応答時間: {summary['overall_avg_response_time']:.4f}秒")
+            print(
+                f"パーセンタイル: p50 {summary['overall_p50_response_time']:.4f}秒 / "
+                f"p95 {summary['overall_p95_response_time']:.4f}秒 / "
+                f"p99 {summary['overall_p99_response_time']:.4f}秒"
+            )
             print(f"応答性評価: {summary['responsiveness_grade']}")
 
             trend = report["trend_analysis"]
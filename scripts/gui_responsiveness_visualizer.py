@@ -5,10 +5,9 @@ GUI応答性メトリクス可視化システム
 このモジュールは、GUI応答性測定結果の可視化機能を提供します。
 """
 
-import json
 import logging
 import statistics
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -678,33 +677,12 @@ class ResponsivenessVisualizer:
             ax.axis("off")
 
     def _load_metrics_data(self, days: int) -> List[Dict[str, Any]]:
-        """メトリクスデータを読み込み"""
+        """メトリクスデータを読み込み（期間内の日別パーティションのみ）"""
         if not self.monitor:
             return []
 
-        metrics_file = self.monitor.metrics_file
-        if not metrics_file.exists():
-            return []
-
         try:
-            with open(metrics_file, encoding="utf-8") as f:
-                data = json.load(f)
-
-            all_metrics = data.get("metrics", [])
-
-            # 期間内のデータをフィルタリング
-            cutoff_date = datetime.now() - timedelta(days=days)
-            filtered_metrics = []
-
-            for metrics_data in all_metrics:
-                try:
-                    metrics_time = datetime.fromisoformat(metrics_data["timestamp"])
-                    if metrics_time >= cutoff_date:
-                        filtered_metrics.append(metrics_data)
-                except (ValueError, KeyError):
-                    continue
-
-            return filtered_metrics
+            return self.monitor.store.load_sessions(days)
 
         except Exception as e:
             logger.error(f"メトリクスデータ読み込みエラー: {e}")
@@ -14,7 +14,7 @@ import sys
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # ログ設定
 logger = logging.getLogger(__name__)
@@ -237,6 +237,91 @@ class PerformanceMonitor:
             logger.error(f"GUI応答性テスト実行中にエラーが発生: {e}")
             return {"success": False, "error": str(e), "metrics": None}
 
+    def run_layout_profiling(
+        self,
+        sizes: Optional[List[Tuple[int, int]]] = None,
+        scale_factors: Optional[List[float]] = None,
+        repeats: int = 1,
+        class_limit: int = 10,
+    ) -> List[BenchmarkResult]:
+        """
+        プレビューのレイアウト・描画プロファイルを計測し、ベンチマーク履歴に記録
+
+        レイアウトと描画の段階ごとの所要時間に加えて、コストの大きい
+        ウィジェットクラスの1サンプルあたりのコストを個別のベンチマークとして記録します。
+
+        Args:
+            sizes: 順に適用するプレビューのサイズ
+            scale_factors: 描画時のデバイスピクセル比
+            repeats: サイズの一覧を繰り返す回数
+            class_limit: 記録するウィジェットクラスの数
+
+        Returns:
+            ベンチマーク結果のリスト
+        """
+        logger.info("レイアウト・描画プロファイルを計測中")
+
+        try:
+            import os
+
+            # Qtのインポート前にオフスクリーンプラットフォームを指定
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            sys.path.insert(0, str(Path(__file__).parent.parent))
+            from qt_theme_studio.adapters.qt_adapter import QtAdapter
+            from qt_theme_studio.adapters.theme_adapter import ThemeAdapter
+            from qt_theme_studio.views.layout_profiler import PHASES
+            from qt_theme_studio.views.preview import PreviewWindow
+
+            qt_adapter = QtAdapter()
+            application = qt_adapter.create_application("LayoutProfiler")
+            preview = PreviewWindow(qt_adapter, ThemeAdapter())
+            widget = preview.create_widget()
+            widget.show()
+            application.processEvents()
+
+            profile = preview.profile_layout(sizes, scale_factors, repeats)
+            widget.close()
+        except ImportError as e:
+            logger.error(f"レイアウトプロファイラーが利用できません: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"レイアウトプロファイル計測中にエラーが発生: {e}")
+            return []
+
+        commit_hash = self._get_current_commit_hash()
+        branch = self._get_current_branch()
+        measurements = {
+            f"layout_profile.{phase}": profile.phase_durations(phase)
+            for phase in PHASES
+        }
+        for class_name, _costs in profile.top_classes(class_limit):
+            measurements[f"layout_profile.class.{class_name}"] = (
+                profile.class_durations(class_name)
+            )
+
+        results = []
+        for name, durations_ns in measurements.items():
+            if not durations_ns:
+                continue
+            durations = [duration / 1e9 for duration in durations_ns]
+            results.append(
+                BenchmarkResult(
+                    name=name,
+                    timestamp=datetime.now(),
+                    mean_time=statistics.mean(durations),
+                    std_dev=statistics.stdev(durations) if len(durations) > 1 else 0,
+                    min_time=min(durations),
+                    max_time=max(durations),
+                    iterations=len(durations),
+                    commit_hash=commit_hash,
+                    branch=branch,
+                )
+            )
+
+        self._save_results(results)
+        logger.info(f"{len(results)}個のレイアウトプロファイル結果を記録しました")
+        return results
+
     def run_memory_profiling_test(self, duration_minutes: int = 5) -> Dict[str, Any]:
         """
         メモリプロファイリングテストを実行
@@ -726,6 +811,24 @@ def main():
         metavar="MINUTES",
         help="指定分数間メモリプロファイリングを実行",
     )
+    parser.add_argument(
+        "--layout-profile",
+        action="store_true",
+        help="プレビューのレイアウト・描画プロファイルを計測して履歴に記録",
+    )
+    parser.add_argument(
+        "--layout-sizes",
+        default="800x600,1920x1080",
+        help="リサイズの開始・終了サイズ（例: 800x600,1920x1080）",
+    )
+    parser.add_argument(
+        "--layout-steps", type=int, default=20, help="開始から終了までのサイズ数"
+    )
+    parser.add_argument(
+        "--scale-factors",
+        default="1.0,2.0",
+        help="描画時のデバイスピクセル比（カンマ区切り）",
+    )
     parser.add_argument("--verbose", action="store_true", help="詳細ログを出力")
 
     args = parser.parse_args()
@@ -788,6 +891,39 @@ def main():
             else:
                 print("❌ 過去のベンチマーク結果が見つかりません")
 
+        elif args.layout_profile:
+            # レイアウト・描画プロファイルの計測と回帰検出
+            sys.path.insert(0, str(Path(__file__).parent.parent))
+            from qt_theme_studio.views.layout_profiler import size_sweep
+
+            start, end = (
+                tuple(int(value) for value in size.split("x"))
+                for size in args.layout_sizes.split(",")
+            )
+            sizes = size_sweep(start, end, args.layout_steps)
+            scale_factors = [float(value) for value in args.scale_factors.split(",")]
+            results = monitor.run_layout_profiling(sizes, scale_factors)
+            if results:
+                print("\n📐 レイアウト・描画プロファイル:")
+                for result in results:
+                    print(
+                        f"  {result.name}: 平均 {result.mean_time * 1000:.2f}ms "
+                        f"(最大 {result.max_time * 1000:.2f}ms, {result.iterations}回)"
+                    )
+
+                alerts = monitor.detect_regressions(results)
+                if alerts:
+                    print(f"\n⚠️  {len(alerts)}個のパフォーマンス回帰を検出しました:")
+                    for alert in alerts:
+                        print(
+                            f"  - {alert.benchmark_name}: {alert.regression_percentage:.1f}% 低下 ({alert.severity})"
+                        )
+                else:
+                    print("✅ パフォーマンス回帰は検出されませんでした")
+            else:
+                print("❌ レイアウトプロファイルを計測できませんでした")
+                sys.exit(1)
+
         elif args.memory_profile:
             # メモリプロファイリング実行
             memory_result = monitor.run_memory_profiling_test(
@@ -30,13 +30,17 @@ from typing import Dict, List, Optional
 # プロジェクトルートディレクトリ
 PROJECT_ROOT = Path(__file__).parent.parent
 os.chdir(PROJECT_ROOT)
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.check_executor import CheckTask, ConcurrentCheckExecutor  # noqa: E402
 
 
 class PreReleaseChecker:
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, max_workers: Optional[int] = None):
         """初期化"""
         self.verbose = verbose
         self.logger = self._setup_logger()
+        self.executor = ConcurrentCheckExecutor(max_workers=max_workers)
         self.results = {
             "timestamp": datetime.now().isoformat(),
             "checks": {},
@@ -90,14 +94,17 @@ class PreReleaseChecker:
         env["PYTHONPATH"] = str(PROJECT_ROOT)
 
         try:
-            result = subprocess.run(
-                command,
-                check=check,
-                capture_output=capture_output,
-                text=True,
-                env=env,
-                timeout=timeout,
-            )
+            if capture_output:
+                # 並行実行中のチェックのタイムアウトに合わせて出力を上限付きで取り込む
+                result = self.executor.run_command(command, timeout=timeout, env=env)
+                if check and result.returncode != 0:
+                    raise subprocess.CalledProcessError(
+                        result.returncode, command, result.stdout, result.stderr
+                    )
+            else:
+                result = subprocess.run(
+                    command, check=check, text=True, env=env, timeout=timeout
+                )
 
             if self.verbose and result.stdout:
                 self.logger.debug(f"標準出力: {result.stdout[:500]}...")
@@ -889,43 +896,84 @@ class PreReleaseChecker:
         self.logger.info("🚀 Qt-Theme-Studio リリース前チェックを開始します")
         self.logger.info(f"📅 実行日時: {self.results['timestamp']}")
 
+        # (表示名, 結果キー, 関数, 実行するか, タイムアウト秒)
         checks = [
-            ("テストスイート", self.check_test_suite, not skip_tests),
-            ("コード品質", self.check_code_quality, True),
-            ("セキュリティ", self.check_security, True),
-            ("バージョン整合性", self.check_version_consistency, True),
-            ("ドキュメント", self.check_documentation, True),
-            ("変更履歴整合性", self.check_changelog_consistency, True),
-            ("依存関係健全性", self.check_dependency_health, True),
-            ("ビルドテスト", self.check_build_test, not skip_build),
-            ("最終統合検証", self.check_final_integration, True),
+            (
+                "テストスイート",
+                "test_suite",
+                self.check_test_suite,
+                not skip_tests,
+                1800,
+            ),
+            ("コード品質", "code_quality", self.check_code_quality, True, 600),
+            ("セキュリティ", "security", self.check_security, True, 600),
+            (
+                "バージョン整合性",
+                "version_consistency",
+                self.check_version_consistency,
+                True,
+                60,
+            ),
+            ("ドキュメント", "documentation", self.check_documentation, True, 60),
+            (
+                "変更履歴整合性",
+                "changelog_consistency",
+                self.check_changelog_consistency,
+                True,
+                60,
+            ),
+            (
+                "依存関係健全性",
+                "dependency_health",
+                self.check_dependency_health,
+                True,
+                300,
+            ),
+            ("ビルドテスト", "build_test", self.check_build_test, not skip_build, 600),
+            (
+                "最終統合検証",
+                "final_integration",
+                self.check_final_integration,
+                True,
+                120,
+            ),
         ]
 
-        for check_name, check_func, should_run in checks:
+        tasks = []
+        for check_name, check_key, check_func, should_run, timeout in checks:
             if not should_run:
                 self.logger.info(f"⏭️ {check_name}チェックをスキップします")
-                self.results["checks"][check_name.lower().replace(" ", "_")] = {
+                self.results["checks"][check_key] = {
                     "status": "SKIP",
                     "message": f"{check_name}チェックがスキップされました",
                 }
                 continue
+            tasks.append(CheckTask(check_key, check_name, check_func, timeout))
 
-            try:
-                self.logger.info(f"🔍 {check_name}チェックを開始...")
-                start_time = time.time()
-
-                check_func()
-
-                elapsed = time.time() - start_time
-                self.logger.info(f"✅ {check_name}チェック完了 ({elapsed:.2f}秒)")
-
-            except Exception as e:
-                self.logger.error(f"💥 {check_name}チェックでエラー: {e}")
-                self.results["checks"][check_name.lower().replace(" ", "_")] = {
+        # テスト・ビルド・セキュリティなど独立したチェックを並行実行
+        for outcome in self.executor.run(tasks):
+            if outcome.error is not None:
+                self.logger.error(f"💥 {outcome.name}チェックでエラー: {outcome.error}")
+                self.results["checks"][outcome.check_id] = {
                     "status": "ERROR",
-                    "message": f"チェック実行エラー: {e}",
-                    "details": str(e),
+                    "message": f"チェック実行エラー: {outcome.error}",
+                    "details": outcome.error,
                 }
+            else:
+                self.logger.info(
+                    f"✅ {outcome.name}チェック完了 ({outcome.elapsed:.2f}秒)"
+                )
+
+        # 完了順に依存しないよう、結果をチェック定義順に並べ替え
+        order = [check[1] for check in checks]
+        self.results["checks"] = dict(
+            sorted(
+                self.results["checks"].items(),
+                key=lambda item: (
+                    order.index(item[0]) if item[0] in order else len(order)
+                ),
+            )
+        )
 
         return self.generate_report()
 
@@ -963,10 +1011,16 @@ def main():
     parser.add_argument(
         "--skip-build", action="store_true", help="ビルドテストをスキップ"
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="チェックの同時実行数（デフォルト: CPU数に基づく値、1で逐次実行）",
+    )
 
     args = parser.parse_args()
 
-    checker = PreReleaseChecker(verbose=args.verbose)
+    checker = PreReleaseChecker(verbose=args.verbose, max_workers=args.jobs)
 
     try:
         success = checker.run_all_checks(
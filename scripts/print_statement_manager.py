@@ -6,89 +6,67 @@ print文検出・置換統合システム
 pre-commitフックとの統合とlogger使用の自動提案機能を提供します。
 """
 
-import ast
 import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
-from qt_theme_studio.logger import LogCategory, LogContext, get_logger
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qt_theme_studio.logger import LogCategory, LogContext, get_logger  # noqa: E402
+from scripts.ast_analysis import FileAnalysis, get_analysis_cache  # noqa: E402
 
 logger = get_logger(__name__)
 
 
-class PrintStatementAnalyzer(ast.NodeVisitor):
-    """print文を詳細に分析するASTビジター"""
+class PrintStatementAnalyzer:
+    """共有解析キャッシュの抽出結果からprint文を詳細に分析"""
 
-    def __init__(self):
+    def __init__(self, analysis: Optional[FileAnalysis] = None):
         self.print_statements: List[Dict[str, Union[int, str]]] = []
         self.has_logger_import = False
         self.has_logger_instance = False
         self.logger_variable_name = None
 
-    def visit_Import(self, node: ast.Import) -> None:
-        """import文を検査してlogger関連のインポートを検出"""
-        for alias in node.names:
-            if "logger" in alias.name.lower():
-                self.has_logger_import = True
-        self.generic_visit(node)
-
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-        """from import文を検査してlogger関連のインポートを検出"""
-        if node.module and "logger" in node.module:
-            self.has_logger_import = True
-            for alias in node.names:
-                if alias.name in ["get_logger", "logger", "Logger"]:
-                    self.has_logger_import = True
-        self.generic_visit(node)
-
-    def visit_Assign(self, node: ast.Assign) -> None:
-        """代入文を検査してloggerインスタンスを検出"""
-        if isinstance(node.value, ast.Call):
-            if (
-                isinstance(node.value.func, ast.Name)
-                and node.value.func.id == "get_logger"
-            ):
-                self.has_logger_instance = True
-                if node.targets and isinstance(node.targets[0], ast.Name):
-                    self.logger_variable_name = node.targets[0].id
-        self.generic_visit(node)
-
-    def visit_Call(self, node: ast.Call) -> None:
-        """関数呼び出しノードを訪問してprint文を検出"""
-        if isinstance(node.func, ast.Name) and node.func.id == "print":
-            # print文の詳細情報を収集
-            print_info = {
-                "line": node.lineno,
-                "column": node.col_offset,
-                "args": [],
-                "suggested_level": "info",
-                "suggested_replacement": "",
-            }
-
-            # 引数を解析
-            for arg in node.args:
-                if isinstance(arg, ast.Constant):
-                    arg_value = arg.value
-                    print_info["args"].append(repr(arg_value))
+        if analysis is not None:
+            self._load_facts(analysis)
+
+    def _load_facts(self, analysis: FileAnalysis) -> None:
+        """抽出結果からlogger使用状況とprint文情報を構築"""
+        logger_usage = analysis.get("logger_usage", {})
+        self.has_logger_import = logger_usage.get("has_logger_import", False)
+        self.has_logger_instance = logger_usage.get("has_logger_instance", False)
+        self.logger_variable_name = logger_usage.get("logger_variable_name")
+
+        for call in analysis.get("print_calls", []):
+            self.print_statements.append(self._build_print_info(call))
+
+    def _build_print_info(self, call: Dict[str, Any]) -> Dict[str, Union[int, str]]:
+        """print呼び出しの抽出結果から詳細情報を生成"""
+        print_info = {
+            "line": call["line"],
+            "column": call["column"],
+            "args": [],
+            "suggested_level": "info",
+            "suggested_replacement": "",
+        }
 
-                    # メッセージ内容からログレベルを推測
-                    if isinstance(arg_value, str):
-                        print_info["suggested_level"] = self._suggest_log_level(
-                            arg_value
-                        )
-                elif isinstance(arg, ast.JoinedStr):  # f-string
-                    print_info["args"].append("f-string")
-                elif isinstance(arg, ast.Name):
-                    print_info["args"].append(arg.id)
-                else:
-                    print_info["args"].append("複雑な式")
+        # 引数を解析
+        for arg in call["args"]:
+            if arg["kind"] == "other":
+                print_info["args"].append("複雑な式")
+            else:
+                print_info["args"].append(arg["text"])
 
-            # 置換提案を生成
-            print_info["suggested_replacement"] = self._generate_replacement(print_info)
-            self.print_statements.append(print_info)
+            # メッセージ内容からログレベルを推測
+            if arg.get("string") is not None:
+                print_info["suggested_level"] = self._suggest_log_level(arg["string"])
 
-        self.generic_visit(node)
+        # 置換提案を生成
+        print_info["suggested_replacement"] = self._generate_replacement(print_info)
+        return print_info
 
     def _suggest_log_level(self, message: str) -> str:
         """メッセージ内容からログレベルを推測"""
@@ -135,20 +113,17 @@ class PrintStatementManager:
     def analyze_file(self, file_path: Path) -> Optional[PrintStatementAnalyzer]:
         """ファイルを分析してprint文を検出"""
         try:
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
-
-            tree = ast.parse(content, filename=str(file_path))
-            analyzer = PrintStatementAnalyzer()
-            analyzer.visit(tree)
+            analysis = get_analysis_cache().analyze_file(file_path)
+            if not analysis.ok:
+                self.logger.error(
+                    f"構文エラー: {file_path}: {analysis.syntax_error_message()}",
+                    LogCategory.ERROR,
+                    self.context,
+                )
+                return None
 
-            return analyzer
+            return PrintStatementAnalyzer(analysis)
 
-        except SyntaxError as e:
-            self.logger.error(
-                f"構文エラー: {file_path}: {e}", LogCategory.ERROR, self.context
-            )
-            return None
         except Exception as e:
             self.logger.error(
                 f"ファイル分析エラー: {file_path}: {e}", LogCategory.ERROR, self.context
@@ -300,12 +275,9 @@ class PrintStatementManager:
                 "test_*",  # テストファイルは除外
             ]
 
-        python_files = []
-        for py_file in project_root.rglob("*.py"):
-            # 除外パターンをチェック
-            if any(pattern in str(py_file) for pattern in exclude_patterns):
-                continue
-            python_files.append(py_file)
+        python_files = get_analysis_cache().iter_python_files(
+            project_root, exclude_patterns
+        )
 
         results = {
             "total_files": len(python_files),
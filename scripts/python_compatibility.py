@@ -9,7 +9,6 @@ Qt-Theme-Studio Python バージョン互換性検証
 4. tox設定ファイルとの統合
 """
 
-import ast
 import json
 import logging
 import subprocess
@@ -20,6 +19,9 @@ from typing import Dict, List, Optional, Tuple
 
 # プロジェクトルートディレクトリ
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.ast_analysis import get_analysis_cache  # noqa: E402
 
 
 class PythonCompatibilityChecker:
@@ -117,21 +119,13 @@ class PythonCompatibilityChecker:
             Pythonファイルのパスリスト
         """
         python_files = []
+        cache = get_analysis_cache()
 
-        # メインパッケージ
-        qt_theme_studio_dir = self.project_root / "qt_theme_studio"
-        if qt_theme_studio_dir.exists():
-            python_files.extend(qt_theme_studio_dir.rglob("*.py"))
-
-        # スクリプト
-        scripts_dir = self.project_root / "scripts"
-        if scripts_dir.exists():
-            python_files.extend(scripts_dir.rglob("*.py"))
-
-        # テスト
-        tests_dir = self.project_root / "tests"
-        if tests_dir.exists():
-            python_files.extend(tests_dir.rglob("*.py"))
+        # メインパッケージ・スクリプト・テスト
+        for dir_name in ["qt_theme_studio", "scripts", "tests"]:
+            target_dir = self.project_root / dir_name
+            if target_dir.exists():
+                python_files.extend(cache.iter_python_files(target_dir))
 
         # ルートディレクトリのPythonファイル
         python_files.extend(self.project_root.glob("*.py"))
@@ -153,28 +147,24 @@ class PythonCompatibilityChecker:
 
             for file_path in python_files:
                 try:
-                    with open(file_path, encoding="utf-8") as f:
-                        source_code = f.read()
+                    # 共有解析キャッシュで一度だけ構文解析
+                    analysis = get_analysis_cache().analyze_file(file_path)
 
                     # 各サポートバージョンでの構文チェック
-                    for version in self.supported_versions:
-                        major, minor = map(int, version.split("."))
-
-                        try:
-                            # ASTを使用して構文チェック
-                            ast.parse(source_code, filename=str(file_path))
-
-                        except SyntaxError as e:
+                    # （ast.parseは実行中のインタープリターの文法で解析されるため、
+                    #  解析結果は全バージョンで共通）
+                    if not analysis.ok:
+                        for version in self.supported_versions:
                             issue = {
                                 "file": str(file_path.relative_to(self.project_root)),
                                 "python_version": version,
-                                "error": str(e),
-                                "line": e.lineno,
+                                "error": analysis.syntax_error_message(),
+                                "line": analysis.syntax_error["line"],
                                 "severity": "error",
                             }
                             issues.append(issue)
                             self.logger.warning(
-                                f"⚠️ 構文エラー ({version}): {file_path.name}:{e.lineno}"
+                                f"⚠️ 構文エラー ({version}): {file_path.name}:{analysis.syntax_error['line']}"
                             )
 
                 except Exception as e:
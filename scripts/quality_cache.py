@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+品質チェック結果キャッシュ
+
+ファイル内容のハッシュマニフェストとチェック別・ファイル別の結果を保存し、
+インクリメンタル品質チェックで変更ファイルの特定と結果の再利用を行います。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# キャッシュ形式のバージョン（形式を変更した場合に更新）
+CACHE_FORMAT_VERSION = 1
+
+# 変更時に全チェック結果を無効化する設定ファイル
+GLOBAL_INPUTS = ["pyproject.toml", "tox.ini", ".flake8"]
+
+# 全ファイルのハッシュを保持するマニフェストのキー
+MANIFEST_KEY = "__manifest__"
+
+
+class IncrementalCheckCache:
+    """インクリメンタル品質チェック用の結果キャッシュ
+
+    チェックごとに「ファイルパス → {hash, 結果}」を保持します。
+    保存時のハッシュと現在のハッシュが一致するファイルは未変更とみなし、
+    キャッシュされた結果を再利用します。
+    """
+
+    def __init__(self, project_root: Path, cache_file: Optional[Path] = None):
+        """
+        結果キャッシュを初期化
+
+        Args:
+            project_root: プロジェクトルートディレクトリ
+            cache_file: キャッシュファイル（デフォルト: .kiro/cache/quality/incremental.json）
+        """
+        self.project_root = Path(project_root)
+        self.cache_file = cache_file or (
+            self.project_root / ".kiro" / "cache" / "quality" / "incremental.json"
+        )
+        self._hashes: Dict[str, Optional[str]] = {}
+        self.data: Dict[str, Any] = self._load()
+
+        # 設定ファイルが変更された場合は全結果を破棄
+        global_hashes = {name: self.file_hash(name) for name in GLOBAL_INPUTS}
+        if self.data.get("global_inputs") != global_hashes:
+            if self.data.get("checks"):
+                logger.info(
+                    "設定ファイルの変更を検出したため結果キャッシュを破棄します"
+                )
+            self.data = self._empty()
+            self.data["global_inputs"] = global_hashes
+
+    def _empty(self) -> Dict[str, Any]:
+        """空のキャッシュデータ"""
+        return {"version": CACHE_FORMAT_VERSION, "global_inputs": {}, "checks": {}}
+
+    def _load(self) -> Dict[str, Any]:
+        """キャッシュファイルを読み込み"""
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_FORMAT_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return self._empty()
+
+    def save(self) -> None:
+        """キャッシュファイルを一時ファイル経由で保存"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file.with_suffix(".tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False)
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"結果キャッシュの保存に失敗しました: {e}")
+
+    def file_hash(self, relative_path: str) -> Optional[str]:
+        """ファイル内容のSHA-256ハッシュ（存在しない場合はNone）"""
+        if relative_path not in self._hashes:
+            try:
+                with open(self.project_root / relative_path, "rb") as f:
+                    self._hashes[relative_path] = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                self._hashes[relative_path] = None
+        return self._hashes[relative_path]
+
+    def list_python_files(self) -> List[str]:
+        """プロジェクト内のPythonファイル一覧（プロジェクトルートからの相対パス）
+
+        gitの管理対象および未追跡（.gitignore対象外）のファイルを列挙します。
+        gitが利用できない場合はディレクトリを走査します。
+        """
+        try:
+            result = subprocess.run(
+                [
+                    "git",
+                    "ls-files",
+                    "-z",
+                    "--cached",
+                    "--others",
+                    "--exclude-standard",
+                    "--",
+                    "*.py",
+                ],
+                capture_output=True,
+                text=True,
+                timeout=30,
+                cwd=self.project_root,
+            )
+            if result.returncode == 0:
+                return sorted(
+                    path
+                    for path in set(result.stdout.split("\0"))
+                    if path and (self.project_root / path).exists()
+                )
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+        from scripts.ast_analysis import get_analysis_cache
+
+        return [
+            path.relative_to(self.project_root).as_posix()
+            for path in get_analysis_cache().iter_python_files(self.project_root)
+        ]
+
+    def changed_files(self, check_key: str, files: Iterable[str]) -> List[str]:
+        """前回の結果から内容が変わった（または結果のない）ファイルを取得"""
+        entries = self.data["checks"].get(check_key, {})
+        changed = []
+        for path in files:
+            entry = entries.get(path)
+            if entry is None or entry.get("hash") != self.file_hash(path):
+                changed.append(path)
+        return changed
+
+    def get_entries(self, check_key: str, files: Iterable[str]) -> Dict[str, Any]:
+        """指定ファイルのキャッシュ済み結果を取得"""
+        entries = self.data["checks"].get(check_key, {})
+        return {path: entries[path] for path in files if path in entries}
+
+    def update(self, check_key: str, relative_path: str, result: Dict[str, Any]):
+        """ファイルの結果を現在のハッシュとともに記録"""
+        entries = self.data["checks"].setdefault(check_key, {})
+        entries[relative_path] = {"hash": self.file_hash(relative_path), **result}
+
+    def invalidate(self, check_key: str, files: Iterable[str]) -> None:
+        """指定ファイルの結果を破棄（次回必ず再実行させる）"""
+        entries = self.data["checks"].get(check_key, {})
+        for path in files:
+            entries.pop(path, None)
+
+    def retain(self, files: Iterable[str]) -> None:
+        """削除されたファイルの結果を全チェックから除去"""
+        keep = set(files)
+        for entries in self.data["checks"].values():
+            for path in [path for path in entries if path not in keep]:
+                del entries[path]
+
+    def update_manifest(self, files: Iterable[str]) -> None:
+        """全ファイルのハッシュマニフェストを更新"""
+        for path in files:
+            self.update(MANIFEST_KEY, path, {})
@@ -6,64 +6,16 @@
 適切に日本語で記述されているかを検証します。
 """
 
-import ast
 import re
 import sys
 from pathlib import Path
 from typing import List, Tuple
 
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
 
-class LogMessageVisitor(ast.NodeVisitor):
-    """ログメッセージを検出するASTビジター"""
-
-    def __init__(self):
-        self.log_calls: List[Tuple[int, str, str]] = []
-        self.logger_methods = {
-            "debug",
-            "info",
-            "warning",
-            "warn",
-            "error",
-            "critical",
-            "exception",
-            "log",
-        }
-
-    def visit_Call(self, node: ast.Call) -> None:
-        """関数呼び出しノードを訪問"""
-        # logger.method() の形式をチェック
-        if (
-            isinstance(node.func, ast.Attribute)
-            and node.func.attr in self.logger_methods
-        ):
-            line_no = node.lineno
-            method_name = node.func.attr
-
-            # 最初の引数（メッセージ）を取得
-            if node.args:
-                first_arg = node.args[0]
-                message = self._extract_string_value(first_arg)
-                if message:
-                    self.log_calls.append((line_no, method_name, message))
-
-        self.generic_visit(node)
-
-    def _extract_string_value(self, node: ast.AST) -> str:
-        """ASTノードから文字列値を抽出"""
-        if isinstance(node, ast.Constant) and isinstance(node.value, str):
-            return node.value
-        if isinstance(node, ast.Str):  # Python 3.7以前の互換性
-            return node.s
-        if isinstance(node, ast.JoinedStr):  # f-string
-            # f-stringの場合は部分的にチェック
-            parts = []
-            for value in node.values:
-                if isinstance(value, ast.Constant):
-                    parts.append(str(value.value))
-                elif isinstance(value, ast.Str):
-                    parts.append(value.s)
-            return "".join(parts)
-        return ""
+from scripts.ast_analysis import get_analysis_cache  # noqa: E402
 
 
 def has_japanese_characters(text: str) -> bool:
@@ -97,28 +49,27 @@ def is_technical_message(text: str) -> bool:
 def check_file_for_japanese_logs(file_path: Path) -> List[Tuple[int, str, str, bool]]:
     """ファイル内のログメッセージをチェック"""
     try:
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
-
-        # ASTを解析
-        tree = ast.parse(content, filename=str(file_path))
-        visitor = LogMessageVisitor()
-        visitor.visit(tree)
+        # 共有解析キャッシュから抽出結果を取得
+        analysis = get_analysis_cache().analyze_file(file_path)
+        if not analysis.ok:
+            print(
+                f"構文エラー: {file_path}: {analysis.syntax_error_message()}",
+                file=sys.stderr,
+            )
+            return []
 
         results = []
-        for line_no, method, message in visitor.log_calls:
+        for call in analysis.get("log_calls", []):
+            message = call["message"]
             # 空のメッセージや技術的なメッセージはスキップ
             if not message.strip() or is_technical_message(message):
                 continue
 
             has_japanese = has_japanese_characters(message)
-            results.append((line_no, method, message, has_japanese))
+            results.append((call["line"], call["method"], message, has_japanese))
 
         return results
 
-    except SyntaxError as e:
-        print(f"構文エラー: {file_path}: {e}", file=sys.stderr)
-        return []
     except Exception as e:
         print(f"ファイル読み込みエラー: {file_path}: {e}", file=sys.stderr)
         return []
@@ -8,13 +8,15 @@ YAML設定ファイルによる柔軟な設定管理とエラーハンドリン
 
 import asyncio
 import os
+import signal
 import sys
+import time
 import traceback
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 
@@ -34,6 +36,7 @@ class WorkflowStatus(Enum):
     FAILURE = "failure"
     WARNING = "warning"
     CANCELLED = "cancelled"
+    SKIPPED = "skipped"
 
 
 class StepStatus(Enum):
@@ -58,6 +61,7 @@ class StepResult:
     output: str = ""
     error: Optional[str] = None
     artifacts: List[str] = field(default_factory=list)
+    attempts: int = 0
 
     @property
     def execution_time(self) -> float:
@@ -312,26 +316,21 @@ class WorkflowEngine:
 
             result.status = WorkflowStatus.RUNNING
 
-            # ステップを順次実行
-            steps = pipeline_config.get("steps", [])
-            for step_config in steps:
-                step_result = await self._execute_step(step_config, **kwargs)
-                result.steps.append(step_result)
-
-                # 必須ステップが失敗した場合は中断
-                if step_result.status == StepStatus.FAILURE and step_config.get(
-                    "required", True
-                ):
-                    self.logger.error(
-                        f"必須ステップ '{step_result.name}' が失敗しました。パイプラインを中断します"
-                    )
-                    result.status = WorkflowStatus.FAILURE
-                    break
+            # 依存関係に従ってステップを実行
+            step_results, aborted = await self._execute_step_graph(
+                pipeline_name, pipeline_config, result, **kwargs
+            )
+            result.steps.extend(step_results)
 
             # 最終ステータスを決定
-            if result.status == WorkflowStatus.RUNNING:
+            if aborted:
+                result.status = WorkflowStatus.FAILURE
+            else:
                 failed_steps = [
-                    s for s in result.steps if s.status == StepStatus.FAILURE
+                    s
+                    for s in result.steps
+                    if s.status == StepStatus.FAILURE
+                    or (s.status == StepStatus.SKIPPED and s.error)
                 ]
                 if failed_steps:
                     result.status = WorkflowStatus.WARNING
@@ -362,6 +361,264 @@ class WorkflowEngine:
         finally:
             self.current_workflow = None
 
+    def _build_step_graph(self, steps: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """ステップの依存関係グラフを構築して検証
+
+        Args:
+            steps: ステップ設定のリスト
+
+        Returns:
+            ステップ名から依存ステップ名リストへの辞書
+
+        Raises:
+            ConfigurationError: 重複・未定義の依存・循環依存がある場合
+        """
+        graph: Dict[str, List[str]] = {}
+        for step_config in steps:
+            step_name = step_config.get("name", "unknown")
+            if step_name in graph:
+                raise ConfigurationError(f"ステップ名が重複しています: {step_name}")
+            graph[step_name] = list(step_config.get("depends_on", []) or [])
+
+        for step_name, dependencies in graph.items():
+            for dependency in dependencies:
+                if dependency not in graph:
+                    raise ConfigurationError(
+                        f"ステップ '{step_name}' の依存先 '{dependency}' が定義されていません"
+                    )
+
+        # 循環依存の検出（深さ優先探索）
+        visiting: Set[str] = set()
+        visited: Set[str] = set()
+
+        def visit(step_name: str) -> None:
+            if step_name in visited:
+                return
+            if step_name in visiting:
+                raise ConfigurationError(f"循環依存が検出されました: {step_name}")
+            visiting.add(step_name)
+            for dependency in graph[step_name]:
+                visit(dependency)
+            visiting.discard(step_name)
+            visited.add(step_name)
+
+        for step_name in graph:
+            visit(step_name)
+
+        return graph
+
+    def _get_max_workers(self, pipeline_config: Dict[str, Any]) -> int:
+        """同時実行ステップ数の上限を取得
+
+        parallel が有効でないパイプラインは1ステップずつ定義順に実行します。
+        max_workers 未指定時はサブプロセス待ちが主体のため、
+        concurrent.futures と同じ min(32, CPU数 + 4) を上限とします。
+        """
+        if not pipeline_config.get("parallel", False):
+            return 1
+        max_workers = pipeline_config.get("max_workers") or min(
+            32, (os.cpu_count() or 1) + 4
+        )
+        return max(1, int(max_workers))
+
+    async def _execute_step_graph(
+        self,
+        pipeline_name: str,
+        pipeline_config: Dict[str, Any],
+        workflow_result: WorkflowResult,
+        **kwargs,
+    ) -> Tuple[List[StepResult], bool]:
+        """依存関係グラフに従ってステップを実行
+
+        依存ステップがすべて完了したステップから順に、上限数までを並列に実行します。
+        必須ステップが失敗した場合は新しいステップを開始せず、残りをスキップします。
+
+        Args:
+            pipeline_name: パイプライン名
+            pipeline_config: パイプライン設定
+            workflow_result: エラー情報を記録するワークフロー結果
+            **kwargs: 実行パラメータ
+
+        Returns:
+            (定義順のステップ結果リスト, 中断したかどうか)
+        """
+        steps = pipeline_config.get("steps", [])
+        graph = self._build_step_graph(steps)
+        step_configs = {step.get("name", "unknown"): step for step in steps}
+        max_workers = self._get_max_workers(pipeline_config)
+
+        workflow_timeout = pipeline_config.get("timeout")
+        deadline = time.monotonic() + workflow_timeout if workflow_timeout else None
+
+        self.logger.info(
+            f"パイプライン '{pipeline_name}': {len(steps)}ステップを最大{max_workers}並列で実行します"
+        )
+
+        results: Dict[str, StepResult] = {}
+        pending: List[str] = list(step_configs)
+        running: Dict[asyncio.Task, str] = {}
+        aborted = False
+
+        while pending or running:
+            if aborted:
+                for step_name in pending:
+                    results[step_name] = self._create_skipped_result(
+                        step_name, "パイプラインが中断されたためスキップしました"
+                    )
+                pending = []
+            else:
+                for step_name in list(pending):
+                    dependencies = [results.get(dep) for dep in graph[step_name]]
+                    blocked = [
+                        dep
+                        for dep, dep_result in zip(graph[step_name], dependencies)
+                        if dep_result is not None
+                        and not self._is_dependency_satisfied(dep_result)
+                    ]
+                    if blocked:
+                        pending.remove(step_name)
+                        results[step_name] = self._create_skipped_result(
+                            step_name,
+                            f"依存ステップが完了していません: {', '.join(blocked)}",
+                        )
+                        continue
+
+                    if len(running) >= max_workers or None in dependencies:
+                        continue
+
+                    pending.remove(step_name)
+                    task = asyncio.create_task(
+                        self._execute_step_with_retry(step_configs[step_name], **kwargs)
+                    )
+                    running[task] = step_name
+
+            if not running:
+                continue
+
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+
+            done, _ = await asyncio.wait(
+                running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                # ワークフロー全体のタイムアウト
+                workflow_result.error = (
+                    f"パイプラインがタイムアウトしました（{workflow_timeout}秒）"
+                )
+                self.logger.error(workflow_result.error)
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                for step_name in running.values():
+                    timed_out = self._create_skipped_result(
+                        step_name, "パイプラインのタイムアウトにより中断されました"
+                    )
+                    timed_out.status = StepStatus.FAILURE
+                    results[step_name] = timed_out
+                running = {}
+                aborted = True
+                continue
+
+            for task in done:
+                step_name = running.pop(task)
+                step_result = task.result()
+                results[step_name] = step_result
+
+                # 必須ステップが失敗した場合は中断
+                if step_result.status == StepStatus.FAILURE and step_configs[
+                    step_name
+                ].get("required", True):
+                    self.logger.error(
+                        f"必須ステップ '{step_name}' が失敗しました。パイプラインを中断します"
+                    )
+                    aborted = True
+
+        return [results[step_name] for step_name in step_configs], aborted
+
+    def _is_dependency_satisfied(self, dependency_result: StepResult) -> bool:
+        """依存ステップの結果が後続ステップの実行条件を満たすか判定"""
+        if dependency_result.status == StepStatus.SUCCESS:
+            return True
+        # コマンド未指定によるスキップは成功扱い
+        return (
+            dependency_result.status == StepStatus.SKIPPED
+            and dependency_result.error is None
+        )
+
+    def _create_skipped_result(self, step_name: str, reason: str) -> StepResult:
+        """スキップされたステップの結果を作成"""
+        self.logger.warning(f"ステップ '{step_name}' をスキップしました: {reason}")
+        now = datetime.now()
+        return StepResult(
+            name=step_name,
+            status=StepStatus.SKIPPED,
+            start_time=now,
+            end_time=now,
+            error=reason,
+        )
+
+    async def _execute_step_with_retry(
+        self, step_config: Dict[str, Any], **kwargs
+    ) -> StepResult:
+        """タイムアウトとリトライ（指数バックオフ）付きでステップを実行
+
+        Args:
+            step_config: ステップ設定（timeout, retry_count, retry_delay）
+            **kwargs: 実行パラメータ
+
+        Returns:
+            最後の試行のステップ実行結果（開始時刻は最初の試行）
+        """
+        step_name = step_config.get("name", "unknown")
+        step_timeout = step_config.get("timeout")
+        retry_count = int(step_config.get("retry_count", 0))
+        retry_delay = float(
+            step_config.get(
+                "retry_delay",
+                self.config.get("error_handling", {})
+                .get("auto_recovery", {})
+                .get("retry_delay", 1.0),
+            )
+        )
+
+        first_start = datetime.now()
+        perf_start = time.perf_counter()
+        result = StepResult(name=step_name, status=StepStatus.PENDING)
+
+        for attempt in range(retry_count + 1):
+            if attempt > 0:
+                delay = retry_delay * (2 ** (attempt - 1))
+                self.logger.warning(
+                    f"ステップ '{step_name}' を{delay:.1f}秒後に再試行します"
+                    f"（{attempt}/{retry_count}）"
+                )
+                await asyncio.sleep(delay)
+
+            try:
+                result = await asyncio.wait_for(
+                    self._execute_step(step_config, **kwargs), timeout=step_timeout
+                )
+            except asyncio.TimeoutError:
+                result = StepResult(
+                    name=step_name,
+                    status=StepStatus.FAILURE,
+                    end_time=datetime.now(),
+                    error=f"ステップがタイムアウトしました（{step_timeout}秒）",
+                )
+                self.logger.error(f"ステップ '{step_name}': {result.error}")
+
+            result.attempts = attempt + 1
+            if result.status != StepStatus.FAILURE:
+                break
+
+        result.start_time = first_start
+        result.end_time = datetime.now()
+        result.duration = time.perf_counter() - perf_start
+        return result
+
     async def _execute_step(self, step_config: Dict[str, Any], **kwargs) -> StepResult:
         """個別ステップを実行
 
@@ -393,9 +650,17 @@ class WorkflowEngine:
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.STDOUT,
                     cwd=self.project_root,
+                    # タイムアウト時にシェルの子プロセスごと終了できるよう新しいセッションで起動
+                    start_new_session=hasattr(os, "killpg"),
                 )
 
-                stdout, _ = await process.communicate()
+                try:
+                    stdout, _ = await process.communicate()
+                except asyncio.CancelledError:
+                    # タイムアウト等で中断された場合は子プロセスを終了
+                    self._kill_process(process)
+                    await process.wait()
+                    raise
                 result.output = stdout.decode("utf-8", errors="ignore")
 
                 if process.returncode == 0:
@@ -438,6 +703,18 @@ class WorkflowEngine:
 
         return result
 
+    def _kill_process(self, process: Any) -> None:
+        """子プロセスをプロセスグループごと終了"""
+        if process.returncode is not None:
+            return
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
     def get_available_workflows(self) -> List[str]:
         """利用可能なワークフロー一覧を取得
 
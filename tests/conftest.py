@@ -59,6 +59,15 @@ def mock_qt_app() -> Generator[MagicMock, None, None]:
         yield mock_app
 
 
+@pytest.fixture(scope="session")
+def qt_application() -> Any:
+    """実Qtアプリケーション(セッション共有)"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
 @pytest.fixture
 def mock_theme_manager() -> Generator[MagicMock, None, None]:
     """qt-theme-managerのモック"""
@@ -0,0 +1,175 @@
+"""
+テーマ適用トランザクションの単体テスト
+
+スタイルシートのまとめ設定と、ポリッシュ・再描画の回数のテストを行います
+"""
+
+import pytest
+
+from qt_theme_studio.views.apply_transaction import (
+    SCOPED_SECTION_MARKER,
+    ThemeApplyTransaction,
+    scope_style_sheet,
+)
+
+BUTTON_STYLE = "QPushButton { background-color: #ff0000; }"
+LABEL_STYLE = "QLabel { background-color: #0000ff; }"
+ROOT_STYLE = "QWidget { color: #00ff00; }"
+
+
+@pytest.fixture
+def qt_widgets():
+    qt_widgets = pytest.importorskip("PySide6.QtWidgets")
+    if qt_widgets.QApplication.instance() is None:
+        qt_widgets.QApplication([])
+    return qt_widgets
+
+
+@pytest.fixture
+def form(qt_widgets):
+    """ボタンとラベルを持つ表示済みのフォーム"""
+    root = qt_widgets.QWidget()
+    layout = qt_widgets.QVBoxLayout(root)
+    button = qt_widgets.QPushButton("button")
+    label = qt_widgets.QLabel("label")
+    layout.addWidget(button)
+    layout.addWidget(label)
+    root.resize(200, 100)
+    root.show()
+    qt_widgets.QApplication.processEvents()
+    return root, button, label
+
+
+def install_event_counter(widgets):
+    """ウィジェットごとのStyleChange・Paintイベントの回数を数えるフィルターを設置"""
+    from PySide6.QtCore import QEvent, QObject
+
+    counted = {QEvent.Type.StyleChange: "style", QEvent.Type.Paint: "paint"}
+
+    class EventCounter(QObject):
+        def __init__(self):
+            super().__init__()
+            self.counts = {}
+
+        def eventFilter(self, watched, event):  # noqa: N802
+            kind = counted.get(event.type())
+            if kind is not None:
+                key = (id(watched), kind)
+                self.counts[key] = self.counts.get(key, 0) + 1
+            return False
+
+        def count(self, widget, kind):
+            return self.counts.get((id(widget), kind), 0)
+
+    counter = EventCounter()
+    for widget in widgets:
+        widget.installEventFilter(counter)
+    return counter
+
+
+class TestScopeStyleSheet:
+    """scope_style_sheet関数のテスト"""
+
+    def test_scopes_each_selector(self):
+        """各セレクタをウィジェット自身と子孫に一致する形へ変換する"""
+        scoped = scope_style_sheet(
+            "QPushButton, QLineEdit:focus { color: red; }", "target"
+        )
+
+        assert scoped == (
+            "QPushButton#target, #target QPushButton, "
+            "QLineEdit#target:focus, #target QLineEdit:focus { color: red; }"
+        )
+
+    def test_declarations_only(self):
+        """セレクタのない宣言のみの場合はウィジェット自身への指定とする"""
+        assert scope_style_sheet("color: red;", "target") == "#target { color: red; }"
+        assert scope_style_sheet("  ", "target") == ""
+
+
+class TestThemeApplyTransaction:
+    """ThemeApplyTransactionクラスのテスト"""
+
+    def test_merges_style_sheets_into_root(self, form):
+        """子ウィジェットのスタイルシートを最上位にまとめ、ポリッシュは1回にする"""
+        root, button, label = form
+        counter = install_event_counter((root, button, label))
+
+        with ThemeApplyTransaction(root, "test") as transaction:
+            transaction.set_style_sheet(root, ROOT_STYLE)
+            transaction.set_style_sheet(button, BUTTON_STYLE)
+            transaction.set_style_sheet(label, LABEL_STYLE)
+
+        assert transaction.polish_passes == 1
+        assert transaction.update_requests == 1
+        assert button.styleSheet() == ""
+        assert root.styleSheet().startswith(ROOT_STYLE)
+        assert SCOPED_SECTION_MARKER in root.styleSheet()
+        for widget in (root, button, label):
+            assert counter.count(widget, "style") == 1
+            # 再描画は同期的に行わず、更新の再開で予約する
+            assert counter.count(widget, "paint") == 0
+        assert root.updatesEnabled()
+
+    def test_applies_scoped_styles(self, form, qt_widgets):
+        """まとめて設定したスタイルが対象のウィジェットにのみ反映される"""
+        root, button, label = form
+
+        with ThemeApplyTransaction(root) as transaction:
+            transaction.set_style_sheet(label, LABEL_STYLE)
+        qt_widgets.QApplication.processEvents()
+
+        image = root.grab().toImage()
+        label_pixel = image.pixelColor(label.geometry().topLeft())
+        button_pixel = image.pixelColor(button.geometry().topLeft())
+        assert label_pixel.name() == "#0000ff"
+        assert button_pixel.name() != "#0000ff"
+
+    def test_keeps_scoped_section_when_only_root_changes(self, form):
+        """最上位のみを変更した場合は、以前にまとめた子ウィジェットの指定を残す"""
+        root, button, _label = form
+        with ThemeApplyTransaction(root) as transaction:
+            transaction.set_style_sheet(button, BUTTON_STYLE)
+        scoped_section = root.styleSheet().partition(SCOPED_SECTION_MARKER)[2]
+
+        with ThemeApplyTransaction(root) as transaction:
+            transaction.set_style_sheet(root, ROOT_STYLE)
+
+        assert root.styleSheet().startswith(ROOT_STYLE)
+        assert root.styleSheet().endswith(scoped_section)
+
+    def test_nested_transaction_defers_resume(self, form):
+        """入れ子のトランザクションは更新を再開せず、外側が1回だけ再開する"""
+        root, button, _label = form
+
+        with ThemeApplyTransaction(root) as outer:
+            with ThemeApplyTransaction(button) as inner:
+                inner.set_style_sheet(button, BUTTON_STYLE)
+            assert not root.updatesEnabled()
+
+        assert inner.update_requests == 0
+        assert outer.update_requests == 1
+        assert root.updatesEnabled()
+        assert button.updatesEnabled()
+
+    def test_exception_discards_changes(self, form):
+        """例外で終了した場合は予約した変更を破棄し、更新のみ再開する"""
+        root, _button, _label = form
+
+        with pytest.raises(RuntimeError), ThemeApplyTransaction(root) as transaction:
+            transaction.set_style_sheet(root, ROOT_STYLE)
+            raise RuntimeError("apply failed")
+
+        assert root.styleSheet() == ""
+        assert root.updatesEnabled()
+
+    def test_unchanged_style_sheet_skips_polish(self, form):
+        """同じスタイルシートの再設定ではポリッシュしない"""
+        root, _button, _label = form
+        with ThemeApplyTransaction(root) as transaction:
+            transaction.set_style_sheet(root, ROOT_STYLE)
+
+        with ThemeApplyTransaction(root) as transaction:
+            transaction.set_style_sheet(root, ROOT_STYLE)
+
+        assert transaction.polish_passes == 0
@@ -0,0 +1,155 @@
+"""
+書き込み遅延保存の単体テスト
+
+原子的な書き込みと書き込み遅延保存キューのテストを行います
+"""
+
+import json
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from qt_theme_studio.utilities.autosave import (
+    WriteBehindQueue,
+    atomic_write_bytes,
+    autosave_path,
+)
+
+
+def _leftover_temp_files(directory):
+    return [path.name for path in directory.iterdir() if path.suffix == ".tmp"]
+
+
+class TestAtomicWrite:
+    """atomic_write_bytes関数のテスト"""
+
+    def test_replaces_file(self, tmp_path):
+        """既存ファイルを置き換え、一時ファイルを残さない"""
+        path = tmp_path / "sub" / "theme.json"
+
+        atomic_write_bytes(path, b"first")
+        atomic_write_bytes(path, b"second")
+
+        assert path.read_bytes() == b"second"
+        assert _leftover_temp_files(path.parent) == []
+
+    def test_failure_keeps_original(self, tmp_path, monkeypatch):
+        """置換に失敗しても元のファイルは壊れない"""
+        path = tmp_path / "theme.json"
+        path.write_bytes(b"original")
+
+        def fail_replace(_self, _target):
+            raise OSError("置換失敗")
+
+        monkeypatch.setattr(Path, "replace", fail_replace)
+        with pytest.raises(OSError):
+            atomic_write_bytes(path, b"broken")
+
+        assert path.read_bytes() == b"original"
+        assert _leftover_temp_files(tmp_path) == []
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIXの権限のみ対象")
+    def test_keeps_file_mode(self, tmp_path):
+        """既存ファイルの権限を引き継ぎ、新規ファイルはumaskを適用した権限とする"""
+        existing = tmp_path / "existing.json"
+        existing.write_bytes(b"original")
+        existing.chmod(0o640)
+        created = tmp_path / "created.json"
+
+        atomic_write_bytes(existing, b"updated")
+        umask = os.umask(0)
+        os.umask(umask)
+        atomic_write_bytes(created, b"new")
+
+        assert stat.S_IMODE(existing.stat().st_mode) == 0o640
+        assert stat.S_IMODE(created.stat().st_mode) == 0o666 & ~umask
+
+    def test_autosave_path(self, tmp_path):
+        """テーマ名のファイル名に使用できない文字は置き換える"""
+        assert autosave_path("dark", tmp_path) == tmp_path / "dark.json"
+        assert autosave_path("a/b:c", tmp_path) == tmp_path / "a_b_c.json"
+
+
+class TestWriteBehindQueue:
+    """WriteBehindQueueクラスのテスト"""
+
+    def test_coalesces_repeated_saves(self, tmp_path):
+        """同じパスへの連続した保存は最新の内容1回にまとめる"""
+        queue = WriteBehindQueue(delay=60.0)
+        path = tmp_path / "theme.json"
+
+        for index in range(3):
+            queue.submit(path, f"version {index}".encode())
+
+        assert queue.pending_count == 1
+        assert not path.exists()
+        assert queue.flush(timeout=5.0)
+        assert path.read_bytes() == b"version 2"
+        assert queue.stats["coalesced"] == 2
+        assert queue.stats["written"] == 1
+        assert queue.stats["batches"] == 1
+        queue.close()
+
+    def test_batch_of_files(self, tmp_path):
+        """複数ファイルを1回の一括書き込みで保存"""
+        queue = WriteBehindQueue(delay=60.0, fsync=False)
+        paths = [tmp_path / f"theme_{index}.json" for index in range(5)]
+
+        for path in paths:
+            queue.submit_json(path, {"name": path.stem})
+
+        assert queue.close(timeout=5.0)
+        for path in paths:
+            assert json.loads(path.read_text(encoding="utf-8")) == {"name": path.stem}
+        assert queue.stats["batches"] == 1
+        assert _leftover_temp_files(tmp_path) == []
+
+    def test_writes_after_delay(self, tmp_path):
+        """flushしなくても待機時間後に書き込まれる"""
+        queue = WriteBehindQueue(delay=0.01)
+        path = tmp_path / "theme.json"
+
+        queue.submit(path, b"data")
+
+        assert queue.flush(timeout=5.0)
+        assert path.read_bytes() == b"data"
+        queue.close()
+
+    def test_submit_json_snapshots_data(self, tmp_path):
+        """submit_json呼び出し後の変更は保存内容に影響しない"""
+        queue = WriteBehindQueue(delay=60.0)
+        path = tmp_path / "theme.json"
+        theme = {"name": "before"}
+
+        queue.submit_json(path, theme)
+        theme["name"] = "after"
+        queue.close()
+
+        assert json.loads(path.read_text(encoding="utf-8")) == {"name": "before"}
+
+    def test_write_error_is_recorded(self, tmp_path):
+        """書き込めないパスはエラーとして記録し、他のファイルは保存する"""
+        queue = WriteBehindQueue(delay=60.0)
+        blocked = tmp_path / "directory"
+        blocked.mkdir()
+        (blocked / "child").write_text("x", encoding="utf-8")
+        path = tmp_path / "theme.json"
+
+        queue.submit(blocked, b"data")
+        queue.submit(path, b"data")
+
+        assert queue.flush(timeout=5.0)
+        assert path.read_bytes() == b"data"
+        assert queue.stats["failed"] == 1
+        assert queue.errors[0]["path"] == str(blocked)
+        queue.close()
+
+    def test_submit_after_close(self, tmp_path):
+        """close()後の保存要求はエラー"""
+        queue = WriteBehindQueue()
+        assert queue.close()
+
+        with pytest.raises(RuntimeError):
+            queue.submit(tmp_path / "theme.json", b"data")
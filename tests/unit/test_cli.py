@@ -5,11 +5,19 @@ Qt-Theme-StudioのCLI機能のテストを行います
 """
 
 import json
+import xml.etree.ElementTree as ET
 from unittest.mock import Mock, patch
 
 import pytest
 
-from qt_theme_studio.cli import ci_report, main, quality_check, test_theme
+from qt_theme_studio.cli import (
+    ci_report,
+    expand_theme_inputs,
+    main,
+    quality_check,
+    run_batch,
+    test_theme,
+)
 
 
 class TestQualityCheck:
@@ -222,6 +230,19 @@ class TestMain:
                 main()
             assert exc_info.value.code == 1
 
+    def test_main_visual_without_numpy(self, tmp_path, capsys):
+        """NumPyがない場合はインストール方法を表示して終了コード1とする"""
+        theme_file = tmp_path / "theme.json"
+        theme_file.write_text(json.dumps({"name": "test"}), encoding="utf-8")
+
+        argv = ["cli.py", "visual", str(theme_file), "--baseline-dir", str(tmp_path)]
+        with patch("sys.argv", argv), patch.dict("sys.modules", {"numpy": None}):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 1
+        assert "pip install qt-theme-studio[visual]" in capsys.readouterr().err
+
     def test_main_insufficient_args(self):
         """引数不足のテスト"""
         with patch("sys.argv", ["cli.py", "quality-check"]):
@@ -271,3 +292,80 @@ class TestIntegration:
         report_data = json.loads(report_file.read_text())
         assert report_data["ci_summary"]["overall_status"] == "PASS"
         assert report_data["ci_summary"]["quality_score"] == 100.0
+
+
+class TestBatchMode:
+    """ディレクトリ・globによるバッチモードのテスト"""
+
+    @pytest.fixture
+    def theme_dir(self, tmp_path):
+        """有効なテーマ2件と不正なテーマ1件を含むディレクトリ"""
+        nested = tmp_path / "themes" / "nested"
+        nested.mkdir(parents=True)
+        valid = {"name": "Valid", "colors": {"primary": "#007acc"}}
+        (tmp_path / "themes" / "a.json").write_text(json.dumps(valid))
+        (nested / "b.json").write_text(json.dumps(valid))
+        (nested / "c.json").write_text(json.dumps({"description": "x"}))
+        (nested / "notes.txt").write_text("not a theme")
+        return tmp_path / "themes"
+
+    def test_expand_directory_recursively(self, theme_dir):
+        """ディレクトリは再帰的に探索される"""
+        files = expand_theme_inputs([str(theme_dir)])
+
+        assert [f.rsplit("/", 1)[-1] for f in files] == ["a.json", "b.json", "c.json"]
+
+    def test_expand_glob_and_dedupe(self, theme_dir):
+        """globパターンを展開し重複を除く"""
+        files = expand_theme_inputs(
+            [str(theme_dir / "**" / "b.json"), str(theme_dir / "nested" / "b.json")]
+        )
+
+        assert files == [str(theme_dir / "nested" / "b.json")]
+
+    def test_ndjson_output_and_exit_code(self, theme_dir, capsys):
+        """NDJSONを1行1ファイルで出力し、不合格があれば終了コード1"""
+        exit_code = run_batch(
+            "quality-check", [str(theme_dir)], jobs=1, output_format="ndjson"
+        )
+
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert exit_code == 1
+        assert [record["is_valid"] for record in records] == [True, True, False]
+        assert records[2]["errors"][0]["code"] == "missing"
+
+    def test_junit_xml_output(self, theme_dir, tmp_path):
+        """JUnit XMLに各ファイルがtestcaseとして記録される"""
+        junit_file = tmp_path / "junit.xml"
+
+        run_batch("quality-check", [str(theme_dir)], jobs=1, junit_xml=str(junit_file))
+
+        suite = ET.parse(junit_file).getroot().find("testsuite")
+        assert suite.get("tests") == "3"
+        assert suite.get("failures") == "1"
+        assert len(suite.findall("testcase/failure")) == 1
+
+    def test_batch_ci_report(self, theme_dir, tmp_path):
+        """ci-reportのバッチ結果は1つのレポートに集約される"""
+        output_file = tmp_path / "report.json"
+
+        exit_code = run_batch(
+            "ci-report", [str(theme_dir)], jobs=1, report_output=str(output_file)
+        )
+
+        report = json.loads(output_file.read_text())
+        assert exit_code == 0
+        assert report["ci_summary"]["themes"] == 3
+        assert len(report["reports"]) == 3
+
+    def test_main_directory_input(self, theme_dir):
+        """mainにディレクトリを渡すとバッチモードで実行される"""
+        with patch("sys.argv", ["cli.py", "test", str(theme_dir), "--jobs", "1"]):
+            with patch("qt_theme_studio.cli.qt_theme_manager"):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+        assert exc_info.value.code == 0
+
+    def test_no_matching_files(self, tmp_path):
+        """一致するファイルがない場合は終了コード1"""
+        assert run_batch("quality-check", [str(tmp_path / "*.json")]) == 1
@@ -0,0 +1,135 @@
+"""
+派生色の依存グラフの単体テスト
+
+依存するノードのみの再計算と、生成テーマのグラフからのテーマデータ作成のテストを行います
+"""
+
+import pytest
+from PySide6.QtGui import QColor
+
+from qt_theme_studio.generators.color_graph import ColorDependencyGraph
+from qt_theme_studio.generators.theme_generator import (
+    STYLE_FRAGMENT_PREFIX,
+    ThemeGenerator,
+    changed_theme_paths,
+)
+
+
+class CountingGraph:
+    """ノードごとの計算回数を数える依存グラフ"""
+
+    def __init__(self):
+        self.calls = {}
+        self.graph = ColorDependencyGraph("test")
+        self.graph.add_input("base", 10)
+        self.graph.add_input("other", 1)
+        self.add("double", ("base",), lambda base: base * 2)
+        self.add("sign", ("base",), lambda base: base > 0)
+        self.add("label", ("sign",), lambda sign: "plus" if sign else "minus")
+        self.add("sum", ("double", "other"), lambda double, other: double + other)
+
+    def add(self, name, dependencies, compute):
+        def counted(*values):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            return compute(*values)
+
+        self.graph.add_derived(name, dependencies, counted)
+
+
+class TestColorDependencyGraph:
+    """ColorDependencyGraphクラスのテスト"""
+
+    def test_recomputes_only_dependents(self):
+        """変更した入力に依存するノードのみを依存順に再計算する"""
+        counting = CountingGraph()
+        counting.calls.clear()
+
+        changed = counting.graph.set_input("other", 5)
+
+        assert changed == ["other", "sum"]
+        assert counting.calls == {"sum": 1}
+        assert counting.graph.value("sum") == 25
+
+    def test_stops_when_value_unchanged(self):
+        """再計算した値が変わらないノードからは先へ伝播しない"""
+        counting = CountingGraph()
+        counting.calls.clear()
+
+        changed = counting.graph.set_input("base", 20)
+
+        assert changed == ["base", "double", "sum"]
+        assert "label" not in counting.calls
+        assert counting.graph.last_recomputed == 3
+        assert counting.graph.set_input("base", 20) == []
+
+    def test_pin_and_unpin(self):
+        """固定した派生ノードは依存先が変わっても再計算せず、解除で再計算する"""
+        graph = CountingGraph().graph
+        graph.pin("double", 100)
+        graph.set_input("base", 1)
+
+        assert graph.value("sum") == 101
+        assert graph.unpin("double") == ["double", "sum"]
+        assert graph.value("sum") == 3
+
+    def test_invalid_nodes(self):
+        """重複・未追加の依存先・派生ノードへのset_inputはValueErrorとする"""
+        graph = CountingGraph().graph
+        with pytest.raises(ValueError, match="重複"):
+            graph.add_input("base", 0)
+        with pytest.raises(ValueError, match="依存先"):
+            graph.add_derived("broken", ("missing",), lambda value: value)
+        with pytest.raises(ValueError, match="pin"):
+            graph.set_input("double", 0)
+
+    def test_dependents(self):
+        """間接的に依存するノードを依存順に取得する"""
+        graph = CountingGraph().graph
+
+        assert graph.dependents("base") == ["double", "sign", "label", "sum"]
+
+
+class TestGeneratedThemeGraph:
+    """生成テーマの派生色の依存グラフのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前処理"""
+        self.generator = ThemeGenerator()
+
+    def test_graph_matches_generated_theme(self):
+        """背景色を変更したグラフのテーマが、直接生成したテーマと一致する"""
+        graph = self.generator.build_color_graph(QColor("#1a1a1a"))
+
+        graph.set_input("background", QColor("#ffffff"))
+
+        expected = self.generator.generate_theme_from_background(QColor("#ffffff"))
+        assert self.generator.theme_from_graph(graph) == expected
+
+    def test_tuning_touches_few_values(self):
+        """基本色の微調整では、その色に依存する値と断片のみを再計算する"""
+        fragments = {
+            "button": "QPushButton {{ background: {button_hover}; }}",
+            "label": "QLabel {{ color: {text}; }}",
+        }
+        graph = self.generator.build_color_graph(QColor("#1e3a5f"), fragments)
+
+        changed = graph.pin("primary", QColor("#ff0000"))
+
+        assert "text" not in changed
+        assert f"{STYLE_FRAGMENT_PREFIX}button" in changed
+        assert f"{STYLE_FRAGMENT_PREFIX}label" not in changed
+        assert graph.last_recomputed < len(graph) // 2
+        paths = [path for path, _node in changed_theme_paths(changed)]
+        assert ("colors", "button_hover") in paths
+        assert ("colors", "background") not in paths
+        hover = graph.value("button_hover").name()
+        assert graph.value(f"{STYLE_FRAGMENT_PREFIX}button") == (
+            f"QPushButton {{ background: {hover}; }}"
+        )
+
+    def test_unknown_fragment_key(self):
+        """生成テーマにない色を参照する断片はKeyErrorとする"""
+        with pytest.raises(KeyError):
+            self.generator.build_color_graph(
+                QColor("#1a1a1a"), {"broken": "QWidget {{ color: {unknown}; }}"}
+            )
@@ -0,0 +1,269 @@
+"""
+色の索引の単体テスト
+
+色値の解釈、格子索引による最近傍・半径内の検索と近似重複のまとめ、
+ロールの色差によるテーマの類似検索のテストを行います
+"""
+
+import pytest
+
+from qt_theme_studio.themes.color_index import (
+    SIMILARITY_ROLES,
+    ColorIndex,
+    ThemeSimilarityIndex,
+    parse_color,
+    theme_role_colors,
+)
+from qt_theme_studio.utilities.color_math import srgb_to_lab
+
+np = pytest.importorskip("numpy")
+
+
+def random_entries(count, seed=0):
+    """ランダムな色の(テーマ名, 色キー, 色値)の一覧を作成"""
+    rng = np.random.default_rng(seed)
+    return [
+        (f"theme_{index % 50}", f"color_{index}", "#{:02x}{:02x}{:02x}".format(*rgb))
+        for index, rgb in enumerate(rng.integers(0, 256, (count, 3)).tolist())
+    ]
+
+
+def to_lab(colors):
+    """色値の一覧をL*a*b*の配列へ変換"""
+    return srgb_to_lab(np.array([parse_color(color) for color in colors])).astype(
+        np.float64
+    )
+
+
+def make_theme(colors):
+    """ロールの色からテーマデータを作成"""
+    return {"colors": dict(zip(SIMILARITY_ROLES, colors))}
+
+
+def record_compared(monkeypatch):
+    """色差を計算したテーマ数を検索ごとに記録(LSHと全件比較の判別に使用)"""
+    compared = []
+    distances = vars(ThemeSimilarityIndex)["_distances"]
+
+    def recording(self, candidates, vector):
+        compared.append(len(candidates))
+        return distances(self, candidates, vector)
+
+    monkeypatch.setattr(ThemeSimilarityIndex, "_distances", recording)
+    return compared
+
+
+class TestParseColor:
+    """parse_color関数のテスト"""
+
+    def test_formats(self):
+        """16進数・rgb()・基本色名を解釈し、不透明度は無視する"""
+        assert parse_color("#1E3A5F") == (30, 58, 95)
+        assert parse_color("#abc") == (170, 187, 204)
+        assert parse_color("#1e3a5f80") == (30, 58, 95)
+        assert parse_color("rgba(10, 20, 30, 0.5)") == (10, 20, 30)
+        assert parse_color("rgb(100%, 0%, 40%)") == (255, 0, 102)
+        assert parse_color(" White ") == (255, 255, 255)
+
+    def test_invalid(self):
+        """解釈できない色値はNoneとする"""
+        for value in ("#12345", "#ggg", "#1_2345", "transparent", "", None, 42):
+            assert parse_color(value) is None
+
+
+class TestColorIndex:
+    """ColorIndexクラスのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前処理"""
+        self.entries = random_entries(3000)
+        self.index = ColorIndex(self.entries)
+        self.lab = to_lab(self.index.colors)
+
+    def brute_force(self, color):
+        """全色との色差を近い順に取得"""
+        query = to_lab([color])[0]
+        return sorted(np.sqrt(((self.lab - query) ** 2).sum(axis=1)).tolist())
+
+    def test_nearest_matches_brute_force(self):
+        """最近傍の検索結果が全件比較の結果と一致する"""
+        for color in ("#000000", "#ff00ff", "#7f8081", "#10e0a0"):
+            expected = self.brute_force(color)[:5]
+
+            matches = self.index.nearest(color, k=5)
+
+            assert [match.distance for match in matches] == pytest.approx(expected)
+
+    def test_nearest_more_than_indexed(self):
+        """kが色数より大きい場合は全色を近い順に返す"""
+        index = ColorIndex(
+            [
+                ("a", "background", "#000000"),
+                ("a", "text", "#ffffff"),
+                ("b", "primary", "#808080"),
+            ]
+        )
+
+        matches = index.nearest("#101010", k=10)
+
+        assert [match.color for match in matches] == ["#000000", "#808080", "#ffffff"]
+
+    def test_within_matches_brute_force(self):
+        """半径内の検索結果が全件比較の結果と一致し、近い順に並ぶ"""
+        for radius in (3.0, 10.0, 40.0):
+            expected = [
+                distance
+                for distance in self.brute_force("#336699")
+                if distance <= radius
+            ]
+
+            matches = self.index.within("#336699", radius)
+
+            assert [match.distance for match in matches] == pytest.approx(expected)
+
+    def test_merges_identical_colors(self):
+        """表記の異なる同じ色は1色にまとめ、全ての使用箇所を保持する"""
+        index = ColorIndex(
+            [
+                ("dark", "background", "#FFFFFF"),
+                ("light", "color_1", "#fff"),
+                ("light", "color_2", "white"),
+                ("light", "color_3", "not a color"),
+            ]
+        )
+
+        assert len(index) == 1
+        match = index.nearest("#ffffff")[0]
+        assert match.distance == pytest.approx(0.0, abs=1e-4)
+        assert match.usages == [
+            ("dark", "background"),
+            ("light", "color_1"),
+            ("light", "color_2"),
+        ]
+
+    def test_duplicate_groups(self):
+        """色差が半径以下で連なる色をまとめ、使用箇所の多い色を先頭にする"""
+        index = ColorIndex(
+            [
+                ("a", "background", "#1e1e1e"),
+                ("b", "background", "#1f1f1f"),
+                ("c", "background", "#1f1f1f"),
+                ("a", "text", "#202020"),
+                ("a", "primary", "#ff0000"),
+                ("b", "primary", "#0000ff"),
+            ]
+        )
+
+        assert index.duplicate_groups(radius=1.0) == [["#1f1f1f", "#1e1e1e", "#202020"]]
+
+    def test_from_themes(self):
+        """両形式のテーマと入れ子の色設定・QSSから抽出した色を対象とする"""
+        themes = {
+            "studio": {
+                "colors": {"background": "#101010", "button": {"hover": "#ff8800"}}
+            },
+            "manager": {"backgroundColor": "#ffffff"},
+            "qss": {"type": "qss", "colors": {"color_1": "#123456"}},
+        }
+
+        index = ColorIndex.from_themes(themes)
+
+        assert index.nearest("#ff8800")[0].usages == [("studio", "button.hover")]
+        assert index.nearest("#ffffff")[0].usages == [("manager", "background")]
+        assert index.nearest("#123456")[0].usages == [("qss", "color_1")]
+
+    def test_invalid_query(self):
+        """解釈できない色の検索・不正なセルの大きさはValueErrorとする"""
+        with pytest.raises(ValueError, match="色値"):
+            self.index.nearest("unknown")
+        with pytest.raises(ValueError, match="cell_size"):
+            ColorIndex([], cell_size=0)
+        assert ColorIndex([]).nearest("#000000") == []
+
+
+class TestThemeSimilarityIndex:
+    """ThemeSimilarityIndexクラスのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前処理"""
+        rng = np.random.default_rng(0)
+        bases = rng.integers(0, 256, (40, len(SIMILARITY_ROLES), 3))
+        self.themes = {}
+        for base_index, base in enumerate(bases):
+            for variant in range(25):
+                noisy = np.clip(base + rng.normal(0, 4, base.shape), 0, 255)
+                self.themes[f"family_{base_index}_{variant}"] = make_theme(
+                    "#{:02x}{:02x}{:02x}".format(*rgb)
+                    for rgb in noisy.astype(int).tolist()
+                )
+
+    def test_finds_same_family(self):
+        """同じ配色から派生したテーマを似たテーマとして返し、自身は除く"""
+        index = ThemeSimilarityIndex(self.themes)
+
+        matches = index.similar("family_3_0", k=10)
+
+        assert len(matches) == 10
+        assert all(match.name.startswith("family_3_") for match in matches)
+        assert "family_3_0" not in [match.name for match in matches]
+        distances = [match.distance for match in matches]
+        assert distances == sorted(distances)
+
+    def test_lsh_matches_exact_search(self, monkeypatch):
+        """LSHで候補を絞り込んだ結果が全件比較の結果と一致する"""
+        exact = ThemeSimilarityIndex(self.themes)
+        hashed = ThemeSimilarityIndex(self.themes, lsh_threshold=1)
+
+        for name in ("family_0_0", "family_17_5", "family_39_24"):
+            expected = [match.name for match in exact.similar(name, k=5)]
+            compared = record_compared(monkeypatch)
+
+            assert [match.name for match in hashed.similar(name, k=5)] == expected
+            # 近い候補が見つかるため、全件を比較せずにLSHの候補のみで確定する
+            assert len(compared) == 1
+            assert compared[0] < len(self.themes) - 1
+
+    def test_lsh_falls_back_for_distant_themes(self, monkeypatch):
+        """似たテーマがなく候補が遠い場合は全件を比較し、結果が一致する"""
+        rng = np.random.default_rng(1)
+        themes = {
+            f"random_{index}": make_theme(
+                "#{:02x}{:02x}{:02x}".format(*rgb) for rgb in colors
+            )
+            for index, colors in enumerate(
+                rng.integers(0, 256, (2000, len(SIMILARITY_ROLES), 3)).tolist()
+            )
+        }
+        exact = ThemeSimilarityIndex(themes)
+        # バケットを広げ、k件以上の遠い候補が見つかるようにする
+        hashed = ThemeSimilarityIndex(themes, lsh_threshold=1, bucket_width=150.0)
+
+        for name in ("random_0", "random_999", "random_1999"):
+            expected = [match.name for match in exact.similar(name, k=10)]
+            compared = record_compared(monkeypatch)
+
+            assert [match.name for match in hashed.similar(name, k=10)] == expected
+            # LSHの候補を評価した後に全件を比較し直す
+            assert compared[0] < len(themes) - 1
+            assert compared[-1] == len(themes) - 1
+
+    def test_similar_to_theme_data(self):
+        """未登録のテーマデータに似た登録済みのテーマを返す"""
+        index = ThemeSimilarityIndex(self.themes, lsh_threshold=1)
+
+        matches = index.similar_to(self.themes["family_8_3"], k=1)
+
+        assert matches[0].name == "family_8_3"
+        assert matches[0].distance == pytest.approx(0.0, abs=1e-3)
+        with pytest.raises(KeyError):
+            index.similar("missing")
+
+    def test_palette_only_themes(self):
+        """ロールを持たないテーマは明度順の色で比較する"""
+        qss = {"colors": {"color_1": "#ffffff", "color_2": "#000000"}}
+
+        roles = theme_role_colors(qss)
+
+        assert roles[0] == "#000000"
+        assert roles[-1] == "#ffffff"
+        assert len(roles) == len(SIMILARITY_ROLES)
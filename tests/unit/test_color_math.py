@@ -0,0 +1,47 @@
+"""
+色の計算の単体テスト
+
+sRGBとCIE L*a*b*の相互変換と、NumPyのインポートのテストを行います
+"""
+
+import builtins
+
+import pytest
+
+from qt_theme_studio.utilities.color_math import import_numpy, lab_to_srgb, srgb_to_lab
+
+np = pytest.importorskip("numpy")
+
+
+class TestLabConversion:
+    """srgb_to_lab・lab_to_srgb関数のテスト"""
+
+    def test_round_trip(self):
+        """L*a*b*を経由しても元の色に戻る"""
+        rgb = np.random.default_rng(0).integers(0, 256, (500, 3)).astype(np.uint8)
+
+        assert (lab_to_srgb(srgb_to_lab(rgb)) == rgb).all()
+
+    def test_out_of_gamut(self):
+        """sRGBの範囲外の色は切り詰める"""
+        rgb = lab_to_srgb(np.array([[50.0, 200.0, 0.0], [120.0, 0.0, 0.0]]))
+
+        assert rgb.dtype == np.uint8
+        assert rgb[1].tolist() == [255, 255, 255]
+
+
+class TestImportNumpy:
+    """import_numpy関数のテスト"""
+
+    def test_missing_numpy(self, monkeypatch):
+        """未インストールの場合は機能名と追加依存関係を案内する"""
+        original_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name == "numpy":
+                raise ImportError(name)
+            return original_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+        with pytest.raises(ImportError, match=r"(?s)視覚回帰テスト.*\[visual\]"):
+            import_numpy("visual", "視覚回帰テスト")
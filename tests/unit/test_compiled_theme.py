@@ -0,0 +1,172 @@
+"""
+コンパイル済みテーマの単体テスト
+
+CompiledThemeのロール解決・不変性・形式変換のテストを行います
+"""
+
+import pytest
+
+from qt_theme_studio.themes import CompiledTheme, as_compiled_theme, resolve_roles
+
+
+class TestResolveRoles:
+    """resolve_roles関数のテスト"""
+
+    def test_defaults_for_empty_colors(self):
+        """色設定が空の場合は既定値で全ロールを解決"""
+        roles = resolve_roles({})
+
+        assert roles["background"] == "#ffffff"
+        assert roles["text"] == "#333333"
+        assert roles["accent"] == "#007acc"
+        assert roles["input_background"] == "#ffffff"
+
+    def test_fallback_chain(self):
+        """未定義のロールは参照先ロールの解決済みの色を使用"""
+        roles = resolve_roles({"primary": "#111111", "input_border": "#222222"})
+
+        assert roles["accent"] == "#111111"
+        assert roles["button_hover"] == "#111111"
+        assert roles["focus_border"] == "#222222"
+
+    def test_focus_border_prefers_accent(self):
+        """focus_borderはaccent、input_borderの順に参照"""
+        assert resolve_roles({"accent": "#abcdef"})["focus_border"] == "#abcdef"
+        assert (
+            resolve_roles({"focus_border": "#000000", "accent": "#abcdef"})[
+                "focus_border"
+            ]
+            == "#000000"
+        )
+
+    def test_showcase_defaults(self):
+        """ショーケースの押下色はホバー色、タブ等の下地は淡い灰色が既定"""
+        roles = resolve_roles({"primary": "#111111", "button_hover": "#222222"})
+
+        assert roles["button_pressed"] == "#111111"
+        assert roles["showcase_button_pressed"] == "#222222"
+        for role in (
+            "tab_background",
+            "scrollbar_background",
+            "progress_background",
+            "slider_groove",
+        ):
+            assert roles[role] == "#f0f0f0"
+        assert resolve_roles({"background": "#333333"})["tab_background"] == "#333333"
+        assert (
+            resolve_roles({"background": "#333333", "input_background": "#444444"})[
+                "tab_background"
+            ]
+            == "#444444"
+        )
+
+    def test_empty_values_are_ignored(self):
+        """空文字やNoneはフォールバックの対象"""
+        roles = resolve_roles({"primary": "", "text": None, "background": " #000 "})
+
+        assert roles["primary"] == "#007acc"
+        assert roles["text"] == "#333333"
+        assert roles["background"] == "#000"
+
+
+class TestCompiledTheme:
+    """CompiledThemeクラスのテスト"""
+
+    def test_from_studio_format(self):
+        """Qt-Theme-Studio形式から構築"""
+        theme = CompiledTheme.from_data(
+            {"name": "t", "colors": {"primary": "#123456", "custom": "#654321"}}
+        )
+
+        assert theme.name == "t"
+        assert theme.display_name == "t"
+        assert theme.role("button_background") == "#123456"
+        assert theme.to_studio()["colors"]["custom"] == "#654321"
+
+    def test_from_qt_theme_manager_format(self):
+        """qt-theme-manager形式から構築し、追加項目を引き継ぐ"""
+        data = {
+            "display_name": "表示名",
+            "primaryColor": "#111111",
+            "backgroundColor": "#222222",
+            "panel": {"background": "#333333"},
+        }
+
+        theme = CompiledTheme.from_data(data, "fallback")
+
+        assert theme.name == "fallback"
+        assert theme.roles["primary"] == "#111111"
+        assert theme.roles["input_background"] == "#222222"
+        converted = theme.to_qt_theme_manager()
+        assert converted["panel"] == {"background": "#333333"}
+        assert converted["name"] == "fallback"
+        assert converted["textColor"] == "#333333"
+
+    def test_colors_take_precedence(self):
+        """両形式に同じ色がある場合はcolorsを優先"""
+        theme = CompiledTheme.from_data(
+            {"primaryColor": "#111111", "colors": {"primary": "#999999"}}
+        )
+
+        assert theme.roles["primary"] == "#999999"
+
+    def test_preview_dict_uses_display_name(self):
+        """プレビュー用データは表示名と全ロールを含む"""
+        theme = CompiledTheme.from_data({"name": "dark", "display_name": "ダーク"})
+
+        preview = theme.to_preview_dict()
+
+        assert preview["name"] == "ダーク"
+        assert set(preview["colors"]) >= set(theme.roles)
+
+    def test_immutable(self):
+        """属性とロールは変更できない"""
+        theme = CompiledTheme.from_data({"name": "t"})
+
+        with pytest.raises(AttributeError):
+            theme.name = "other"
+        with pytest.raises(AttributeError):
+            del theme.roles
+        with pytest.raises(TypeError):
+            theme.roles["primary"] = "#000000"
+
+    def test_conversions_are_copies(self):
+        """変換結果を変更してもテーマには影響しない"""
+        theme = CompiledTheme.from_data({"name": "t", "colors": {"primary": "#1"}})
+
+        theme.to_studio()["colors"]["primary"] = "#2"
+        theme.to_qt_theme_manager()["button"]["background"] = "#2"
+
+        assert theme.to_studio()["colors"]["primary"] == "#1"
+        assert theme.to_qt_theme_manager()["button"]["background"] == "#1"
+
+    def test_hash_and_equality(self):
+        """同じ内容のテーマは等価で同じハッシュを持つ"""
+        first = CompiledTheme.from_data({"name": "t", "colors": {"a": "#1", "b": "#2"}})
+        second = CompiledTheme.from_data(
+            {"colors": {"b": "#2", "a": "#1"}, "name": "t"}
+        )
+        third = CompiledTheme.from_data({"name": "t", "colors": {"a": "#3"}})
+
+        assert first == second
+        assert hash(first) == hash(second)
+        assert first.content_hash == second.content_hash
+        assert first != third
+        assert len({first, second, third}) == 2
+
+    def test_hash_includes_extra_items(self):
+        """引き継ぐ項目のみが異なるテーマは等価でなく、ハッシュも異なる"""
+        base = {"name": "t", "primaryColor": "#111111"}
+        first = CompiledTheme.from_data({**base, "panel": {"background": "#222222"}})
+        second = CompiledTheme.from_data({**base, "panel": {"background": "#333333"}})
+
+        assert first.to_studio() == second.to_studio()
+        assert first != second
+        assert first.content_hash != second.content_hash
+
+    def test_as_compiled_theme(self):
+        """コンパイル済みテーマはそのまま返す"""
+        theme = CompiledTheme.from_data({"name": "t"})
+
+        assert as_compiled_theme(theme) is theme
+        assert as_compiled_theme({"name": "t"}) == theme
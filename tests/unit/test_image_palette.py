@@ -0,0 +1,127 @@
+"""
+画像からのパレット抽出の単体テスト
+
+k-means法によるクラスタリングと、代表色の背景色・プライマリ色・アクセント色への
+割り当て、画像からのテーマ生成のテストを行います
+"""
+
+import pytest
+
+from qt_theme_studio.generators.image_palette import (
+    extract_palette,
+    kmeans,
+    load_image_pixels,
+)
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+
+def make_image(mode="RGB", size=(200, 100)):
+    """背景の灰色が大部分を占め、赤と青の領域を持つ画像を作成"""
+    background = (40, 40, 48, 255) if mode == "RGBA" else (40, 40, 48)
+    image = Image.new(mode, size, background)
+    width, height = size
+    image.paste((220, 30, 30), (0, 0, width // 4, height // 2))
+    image.paste((30, 90, 230), (width - width // 8, 0, width, height // 2))
+    return image
+
+
+class TestKMeans:
+    """k-means法のテスト"""
+
+    def test_separates_clusters_and_stops_early(self):
+        """離れた点の集まりを分離し、収束した時点で反復を終了する"""
+        rng = np.random.default_rng(0)
+        centers = np.array([[0.0, 0.0, 0.0], [50.0, 50.0, 0.0], [90.0, -40.0, 30.0]])
+        points = np.concatenate(
+            [center + rng.normal(0, 1, (300, 3)) for center in centers]
+        )
+
+        found, labels, iterations = kmeans(points, 3, np.random.default_rng(1))
+
+        assert iterations < 10
+        assert len(set(labels[:300])) == len(set(labels[300:600])) == 1
+        assert len(set(labels[::300])) == 3
+        for center in centers:
+            assert np.sqrt(((found - center) ** 2).sum(axis=1)).min() < 1.0
+
+    def test_fewer_distinct_points_than_clusters(self):
+        """異なる点がk個未満の場合は代表色の数を減らす"""
+        points = np.array([[10.0, 0.0, 0.0]] * 50 + [[80.0, 0.0, 0.0]] * 50)
+
+        found, labels, _iterations = kmeans(points, 6, np.random.default_rng(0))
+
+        assert len(found) == 2
+        assert len(set(labels)) == 2
+
+
+class TestExtractPalette:
+    """extract_palette関数のテスト"""
+
+    def test_roles(self):
+        """割合の大きい灰色を背景色、鮮やかな色をプライマリ色・アクセント色に割り当てる"""
+        palette = extract_palette(make_image(), k=3)
+
+        assert palette.colors[0] == "#282830"
+        assert palette.weights == sorted(palette.weights, reverse=True)
+        assert sum(palette.weights) == pytest.approx(1.0)
+        roles = palette.roles()
+        assert roles["background"] == "#282830"
+        assert {roles["primary"], roles["accent"]} == {"#dc1e1e", "#1e5ae6"}
+
+    def test_grayscale_image_has_no_accent_colors(self):
+        """無彩色の画像ではプライマリ色・アクセント色を割り当てない"""
+        image = Image.new("RGB", (100, 100), (30, 30, 30))
+        image.paste((200, 200, 200), (0, 0, 30, 30))
+
+        roles = extract_palette(image).roles()
+
+        assert roles == {"background": "#1e1e1e", "primary": None, "accent": None}
+
+    def test_is_deterministic(self):
+        """同じ画像とシードからは同じパレットを抽出する"""
+        image = make_image(size=(400, 300))
+
+        assert extract_palette(image).to_dict() == extract_palette(image).to_dict()
+
+    def test_excludes_transparent_pixels(self):
+        """半透明の画素は抽出の対象外とし、不透明な画素がない場合はValueErrorとする"""
+        image = make_image("RGBA")
+        image.paste((255, 255, 255, 0), (0, 50, 200, 100))
+
+        pixels = load_image_pixels(image)
+        assert len(pixels) == 200 * 50
+        assert "#ffffff" not in extract_palette(image, k=4).colors
+        with pytest.raises(ValueError, match="不透明な画素"):
+            extract_palette(Image.new("RGBA", (10, 10), (0, 0, 0, 0)))
+
+    def test_downsamples_large_images(self, tmp_path):
+        """大きな画像は縮小してデコードする"""
+        path = tmp_path / "photo.jpg"
+        make_image(size=(4000, 3000)).save(path, quality=95)
+
+        pixels = load_image_pixels(path, max_pixels=100 * 100)
+
+        assert len(pixels) <= 100 * 100
+        assert extract_palette(path, k=3).roles()["background"] is not None
+
+
+class TestThemeFromImage:
+    """画像からのテーマ生成のテスト"""
+
+    def test_generates_theme_with_extracted_colors(self):
+        """抽出した色を基準色とし、既存の形式のテーマデータを生成する"""
+        from qt_theme_studio.generators.theme_generator import ThemeGenerator
+        from qt_theme_studio.validators.theme_schema import get_validator
+
+        image = make_image()
+        roles = extract_palette(image).roles()
+
+        theme = ThemeGenerator().generate_theme_from_image(image)
+
+        assert theme["name"] == "auto_image"
+        assert theme["backgroundColor"] == roles["background"]
+        assert theme["primaryColor"] == roles["primary"]
+        assert theme["accentColor"] == roles["accent"]
+        assert get_validator("theme").validate(theme).is_valid
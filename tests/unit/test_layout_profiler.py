@@ -0,0 +1,101 @@
+"""
+レイアウト・描画プロファイラーの単体テスト
+
+リサイズストームの計測とウィジェットクラスごとの集計のテストを行います
+"""
+
+import pytest
+
+from qt_theme_studio.views.layout_profiler import (
+    PHASE_LAYOUT,
+    PHASE_PAINT,
+    LayoutProfile,
+    LayoutProfiler,
+    size_sweep,
+)
+
+
+@pytest.fixture
+def qt_modules():
+    qt_widgets = pytest.importorskip("PySide6.QtWidgets")
+    from PySide6 import QtCore, QtGui
+
+    if qt_widgets.QApplication.instance() is None:
+        qt_widgets.QApplication([])
+    return {"QtCore": QtCore, "QtGui": QtGui, "QtWidgets": qt_widgets}
+
+
+@pytest.fixture
+def form(qt_modules):
+    """ボタンとラベルを持つ表示済みのフォーム"""
+    qt_widgets = qt_modules["QtWidgets"]
+    root = qt_widgets.QWidget()
+    layout = qt_widgets.QVBoxLayout(root)
+    layout.addWidget(qt_widgets.QPushButton("button"))
+    layout.addWidget(qt_widgets.QLabel("label"))
+    root.resize(300, 200)
+    root.show()
+    qt_widgets.QApplication.processEvents()
+    return root
+
+
+class TestSizeSweep:
+    """size_sweep関数のテスト"""
+
+    def test_interpolates_sizes(self):
+        """開始から終了までを等間隔に補間する"""
+        assert size_sweep((100, 100), (300, 200), 3) == [
+            (100, 100),
+            (200, 150),
+            (300, 200),
+        ]
+
+    def test_single_step(self):
+        """サイズ数が2未満の場合は開始サイズのみを返す"""
+        assert size_sweep((100, 100), (300, 200), 1) == [(100, 100)]
+
+
+class TestLayoutProfiler:
+    """LayoutProfilerクラスのテスト"""
+
+    def test_profiles_each_size_and_scale(self, form, qt_modules):
+        """サイズとスケール係数の組ごとにレイアウトと描画を計測する"""
+        profile = LayoutProfiler(form, qt_modules).profile(
+            [(320, 240), (480, 360)], [1.0, 2.0]
+        )
+
+        assert [(s["size"], s["scale"]) for s in profile.samples] == [
+            ((320, 240), 1.0),
+            ((480, 360), 1.0),
+            ((320, 240), 2.0),
+            ((480, 360), 2.0),
+        ]
+        for sample in profile.samples:
+            assert sample["layout_ns"] > 0
+            assert sample["paint_ns"] > 0
+            assert sample["events"]["paint_events"] >= 3
+        assert profile.phase_stats(PHASE_LAYOUT)["count"] == 4
+        assert profile.phase_stats(PHASE_PAINT)["mean_ms"] > 0
+
+    def test_collects_costs_per_widget_class(self, form, qt_modules):
+        """ウィジェットクラスごとにイベント数とコストを集計する"""
+        profile = LayoutProfiler(form, qt_modules).profile([(320, 240), (480, 360)])
+
+        button = profile.class_costs["QPushButton"]
+        assert button["paint_events"] == 2
+        assert button["resize_events"] >= 1
+        assert button["paint_ns"] > 0
+        assert len(profile.class_durations("QPushButton")) == 2
+        assert "QPushButton" in profile.to_dict()["classes"]
+
+    def test_restores_original_size(self, form, qt_modules):
+        """計測後は元のサイズに戻す"""
+        original_size = form.size()
+        profiler = LayoutProfiler(form, qt_modules)
+        profiler.profile([(640, 480)])
+
+        assert form.size() == original_size
+
+    def test_empty_profile_stats(self):
+        """計測値がない場合の統計値は0とする"""
+        assert LayoutProfile().phase_stats(PHASE_LAYOUT)["count"] == 0
@@ -4,10 +4,35 @@
 Qt-Theme-Studioのメインウィンドウのテストを行います
 """
 
+import json
 from unittest.mock import Mock, patch
 
+import pytest
 from PySide6.QtGui import QColor
 
+from qt_theme_studio.utilities.autosave import autosave_path, get_write_behind_queue
+
+SAMPLE_THEME = {
+    "name": "sample",
+    "display_name": "Sample",
+    "colors": {"background": "#ffffff", "text": "#000000", "primary": "#007acc"},
+}
+
+
+@pytest.fixture
+def studio_window(tmp_path):
+    """実際のメインウィンドウ(メッセージボックスは表示しない)"""
+    from qt_theme_studio.views import main_window
+
+    with patch.object(main_window, "QMessageBox"):
+        window = main_window.QtThemeStudioMainWindow()
+        window.autosave_dir = tmp_path / "autosave"
+        window.themes["sample"] = json.loads(json.dumps(SAMPLE_THEME))
+        window.add_theme_to_menu("sample", "Sample")
+        window.on_theme_selected("sample", "Sample")
+        yield window
+        window.close()
+
 
 class TestQtThemeStudioMainWindow:
     """QtThemeStudioMainWindowクラスのテスト"""
@@ -293,3 +318,59 @@ class TestQtThemeStudioMainWindow:
         # テーマを追加
         self.main_window.themes["Test Theme"] = test_theme
         assert "Test Theme" in self.main_window.themes
+
+
+@pytest.mark.usefixtures("qt_application")
+class TestMainWindowAutosave:
+    """編集したテーマの自動保存のテスト"""
+
+    def read_autosave(self, window):
+        """書き込み遅延保存を完了させ、自動保存したテーマを読み込む"""
+        assert get_write_behind_queue().flush(timeout=10.0)
+        path = autosave_path("sample", window.autosave_dir)
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def test_edit_and_undo_are_autosaved(self, studio_window):
+        """編集・元に戻す・やり直しの結果を書き込み遅延で自動保存する"""
+        studio_window.edit_current_theme(("colors", "background"), "#101010")
+        assert self.read_autosave(studio_window)["colors"]["background"] == "#101010"
+
+        studio_window.undo_theme_edit()
+        assert self.read_autosave(studio_window)["colors"]["background"] == "#ffffff"
+
+        studio_window.redo_theme_edit()
+        assert self.read_autosave(studio_window)["colors"]["background"] == "#101010"
+
+
+@pytest.mark.usefixtures("qt_application")
+class TestMainWindowHotReload:
+    """テーマファイルのホットリロードのテスト"""
+
+    def test_selected_theme_deleted_from_disk(self, studio_window, tmp_path):
+        """選択中のテーマのファイルが削除されたら残っている最初のテーマを選択する"""
+        from qt_theme_studio.views import main_window
+
+        folder = tmp_path / "themes"
+        folder.mkdir()
+        for name in ("ghost", "other"):
+            theme = {**SAMPLE_THEME, "name": name, "display_name": name.title()}
+            (folder / f"{name}.json").write_text(json.dumps(theme), encoding="utf-8")
+
+        with patch.object(main_window, "QFileDialog") as dialog_class:
+            dialog = dialog_class.return_value
+            dialog.exec.return_value = dialog_class.DialogCode.Accepted
+            dialog.selectedFiles.return_value = [str(folder)]
+            studio_window.watch_theme_directory()
+        studio_window.on_theme_selected("ghost", "Ghost")
+        assert studio_window.theme_button.text() == "Ghost"
+
+        (folder / "ghost.json").unlink()
+        studio_window.theme_watcher.poll()
+
+        assert "ghost" not in studio_window.themes
+        assert studio_window.current_theme_name == "sample"
+        assert studio_window.theme_button.text() == "Sample"
+        assert [action.text() for action in studio_window.theme_menu.actions()] == [
+            "Sample",
+            "Other",
+        ]
@@ -0,0 +1,139 @@
+"""
+メトリクスレジストリの単体テスト
+
+カウンター・ゲージ・ヒストグラムの集計とPrometheus出力をテストします
+"""
+
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from qt_theme_studio.logger import get_logger
+from qt_theme_studio.utilities.metrics import (
+    LatencyHistogram,
+    LogHistogram,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+
+
+class TestLatencyHistogram:
+    """LatencyHistogramクラスのテスト"""
+
+    def test_percentiles(self) -> None:
+        """パーセンタイル計算のテスト"""
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.observe(i / 1000)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 1000
+        assert snapshot["p50"] == pytest.approx(0.5, rel=0.02)
+        assert snapshot["p95"] == pytest.approx(0.95, rel=0.02)
+        assert snapshot["p99"] == pytest.approx(0.99, rel=0.02)
+        assert snapshot["max"] == 1.0
+
+    def test_empty_histogram(self) -> None:
+        """空のヒストグラムのテスト"""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(95) == 0.0
+        assert histogram.snapshot()["mean"] == 0.0
+
+    def test_merge_and_round_trip(self) -> None:
+        """統合と辞書形式での保存・復元のテスト"""
+        first = LatencyHistogram()
+        second = LatencyHistogram()
+        for i in range(1, 501):
+            first.observe(i / 1000)
+            second.observe((i + 500) / 1000)
+
+        merged = LogHistogram.from_dict(first.to_dict())
+        merged.merge(second)
+
+        assert merged.count == 1000
+        assert merged.min == 0.001
+        assert merged.percentile(95) == pytest.approx(0.95, rel=0.02)
+        assert merged.mean == pytest.approx(0.5005)
+        with pytest.raises(ValueError):
+            merged.merge(LogHistogram(precision=0.05))
+
+
+class TestMetricsRegistry:
+    """MetricsRegistryクラスのテスト"""
+
+    def setup_method(self) -> None:
+        """各テストメソッドの前処理"""
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge(self) -> None:
+        """カウンターとゲージのテスト"""
+        self.registry.inc("loads_total", labels={"kind": "json"})
+        self.registry.inc("loads_total", 2, labels={"kind": "json"})
+        self.registry.set_gauge("themes_loaded", 16)
+
+        snapshot = self.registry.snapshot()
+        counter = snapshot["qt_theme_studio_loads_total"]
+        assert counter["type"] == "counter"
+        assert counter["series"][0]["value"] == 3.0
+        assert snapshot["qt_theme_studio_themes_loaded"]["series"][0]["value"] == 16
+
+    def test_type_conflict(self) -> None:
+        """異なる種類での再登録のテスト"""
+        self.registry.inc("conflict")
+        with pytest.raises(ValueError):
+            self.registry.set_gauge("conflict", 1)
+
+    def test_time_records_duration(self) -> None:
+        """所要時間計測のテスト"""
+        with self.registry.time("apply_theme"):
+            pass
+
+        stats = self.registry.get_percentiles("apply_theme")
+        assert stats["count"] == 1
+        assert self.registry.get_percentiles("unknown")["count"] == 0
+
+    def test_prometheus_text(self) -> None:
+        """Prometheusテキスト形式出力のテスト"""
+        self.registry.observe_duration("apply_theme", 0.003)
+        self.registry.observe_duration("apply_theme", 0.2)
+        self.registry.inc("errors_total", labels={"operation": 'a"b'})
+
+        text = self.registry.to_prometheus_text()
+        name = "qt_theme_studio_operation_duration_seconds"
+        assert f"# TYPE {name} histogram" in text
+        assert f'{name}_bucket{{operation="apply_theme",le="0.005"}} 1' in text
+        assert f'{name}_bucket{{operation="apply_theme",le="+Inf"}} 2' in text
+        assert f'{name}_count{{operation="apply_theme"}} 2' in text
+        assert 'qt_theme_studio_errors_total{operation="a\\"b"} 1.0' in text
+
+    def test_export_prometheus(self, temp_dir: Path) -> None:
+        """ファイル出力のテスト"""
+        self.registry.set_gauge("themes_loaded", 3)
+        output_file = temp_dir / "metrics" / "app.prom"
+
+        assert self.registry.export_prometheus(output_file)
+        assert "qt_theme_studio_themes_loaded 3.0" in output_file.read_text()
+
+    def test_http_endpoint(self) -> None:
+        """HTTPエンドポイントのテスト"""
+        self.registry.set_gauge("themes_loaded", 5)
+        server = self.registry.start_http_server(port=0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                body = response.read().decode("utf-8")
+            assert "qt_theme_studio_themes_loaded 5.0" in body
+        finally:
+            self.registry.stop_http_server()
+
+    def test_performance_timer_feeds_registry(self) -> None:
+        """performance_timerからの記録のテスト"""
+        registry = get_metrics_registry()
+        before = registry.get_percentiles("test.performance_timer")["count"]
+
+        with get_logger().performance_timer("test.performance_timer"):
+            pass
+
+        after = registry.get_percentiles("test.performance_timer")["count"]
+        assert after == before + 1
@@ -0,0 +1,127 @@
+"""
+パレットによるテーマ適用の単体テスト
+
+QPaletteの構築・キャッシュと、ウィジェットへの適用・解除のテストを行います
+"""
+
+import pytest
+
+from qt_theme_studio.themes import CompiledTheme
+from qt_theme_studio.views.palette import (
+    APPLY_MODE_PALETTE,
+    APPLY_MODE_STYLESHEET,
+    apply_palette,
+    build_palette,
+    clear_palette_cache,
+    reset_palette,
+    theme_palette,
+    to_qcolor,
+    validate_apply_mode,
+)
+
+DARK = {
+    "name": "dark",
+    "colors": {
+        "background": "#101010",
+        "text": "#eeeeee",
+        "primary": "#ff8800",
+        "input_background": "#202020",
+        "disabled_text": "#555555",
+    },
+}
+LIGHT = {"name": "light", "colors": {"background": "#ffffff", "text": "#000000"}}
+
+
+@pytest.fixture
+def qt_modules():
+    qt_widgets = pytest.importorskip("PySide6.QtWidgets")
+    from PySide6 import QtCore, QtGui
+
+    if qt_widgets.QApplication.instance() is None:
+        qt_widgets.QApplication([])
+    clear_palette_cache()
+    return {
+        "QtCore": QtCore,
+        "QtGui": QtGui,
+        "QtWidgets": qt_widgets,
+        "framework": "PySide6",
+    }
+
+
+class TestApplyMode:
+    """適用方式の検証のテスト"""
+
+    def test_validate_apply_mode(self):
+        """既知の適用方式はそのまま返し、未知の方式はValueErrorとする"""
+        assert validate_apply_mode(APPLY_MODE_PALETTE) == APPLY_MODE_PALETTE
+        assert validate_apply_mode(APPLY_MODE_STYLESHEET) == APPLY_MODE_STYLESHEET
+        with pytest.raises(ValueError, match="未知のテーマ適用方式"):
+            validate_apply_mode("qml")
+
+
+class TestBuildPalette:
+    """QPaletteの構築のテスト"""
+
+    def test_to_qcolor_moves_alpha(self, qt_modules):
+        """#rrggbbaaのアルファ値を末尾として解釈し、不正な値は灰色にする"""
+        qt_gui = qt_modules["QtGui"]
+        color = to_qcolor("#ff000080", qt_gui)
+        assert (color.red(), color.alpha()) == (255, 0x80)
+        assert to_qcolor("not-a-color", qt_gui).name() == "#808080"
+
+    def test_roles_and_disabled_group(self, qt_modules):
+        """テーマのロールを全カラーグループに設定し、無効グループはdisabled_*を使う"""
+        qt_gui = qt_modules["QtGui"]
+        palette_class = qt_gui.QPalette
+        theme = CompiledTheme.from_data(DARK)
+        palette = build_palette(theme, qt_modules)
+
+        role = palette_class.ColorRole
+        group = palette_class.ColorGroup
+        for color_group in (group.Active, group.Inactive):
+            assert palette.color(color_group, role.Window).name() == "#101010"
+            assert palette.color(color_group, role.WindowText).name() == "#eeeeee"
+            assert palette.color(color_group, role.Base).name() == "#202020"
+        assert palette.color(group.Disabled, role.WindowText).name() == "#555555"
+        assert palette.color(group.Disabled, role.Text).name() == "#555555"
+
+    def test_theme_palette_is_cached_by_content(self, qt_modules):
+        """同じ内容のテーマには構築済みのパレットを返す"""
+        first = theme_palette(CompiledTheme.from_data(DARK), qt_modules)
+        again = theme_palette(CompiledTheme.from_data(dict(DARK)), qt_modules)
+        other = theme_palette(CompiledTheme.from_data(LIGHT), qt_modules)
+
+        assert again is first
+        assert other is not first
+
+
+class TestApplyPalette:
+    """ウィジェットへのパレット適用のテスト"""
+
+    def test_propagates_to_children(self, qt_modules):
+        """最上位に設定したパレットが子ウィジェットへ伝播する"""
+        qt_widgets = qt_modules["QtWidgets"]
+        role = qt_modules["QtGui"].QPalette.ColorRole
+        top = qt_widgets.QWidget()
+        top.setStyleSheet("QWidget { color: red; }")
+        child = qt_widgets.QLabel("label", top)
+        top.show()
+        qt_widgets.QApplication.processEvents()
+
+        apply_palette(top, CompiledTheme.from_data(DARK), qt_modules)
+
+        assert top.styleSheet() == ""
+        assert child.palette().color(role.Window).name() == "#101010"
+
+    def test_reset_palette(self, qt_modules):
+        """解除するとアプリケーションのパレットへ戻る"""
+        qt_widgets = qt_modules["QtWidgets"]
+        role = qt_modules["QtGui"].QPalette.ColorRole
+        top = qt_widgets.QWidget()
+        child = qt_widgets.QLabel("label", top)
+        default_window = child.palette().color(role.Window).name()
+
+        apply_palette(top, CompiledTheme.from_data(DARK), qt_modules)
+        reset_palette(top, qt_modules)
+
+        assert child.palette().color(role.Window).name() == default_window
@@ -0,0 +1,115 @@
+"""
+パレット探索の単体テスト
+
+WCAGコントラスト比の計算と、パレットの最適化・テーマ候補の生成のテストを行います
+"""
+
+import pytest
+
+from qt_theme_studio.generators.palette_optimizer import (
+    PARALLEL_THRESHOLD,
+    PaletteOptimizer,
+    SearchSpace,
+    contrast_ratio,
+    hex_to_hsl,
+    hsl_to_hex,
+)
+
+pytest.importorskip("numpy")
+
+# 候補数を抑えた探索空間(テストの実行時間を短くするため)
+SMALL_SPACE = SearchSpace(
+    background_offsets=(-0.04, 0.0, 0.04),
+    hue_rotations=(0, 60, 120, 180, 240, 300),
+    primary_lightness=(0.3, 0.5, 0.7),
+    primary_saturation=(0.5, 0.8),
+    accent_offsets=(30.0, 180.0),
+    text_lightness=(0.05, 0.95),
+)
+
+
+class TestContrast:
+    """色変換とコントラスト比のテスト"""
+
+    def test_contrast_ratio(self):
+        """白と黒は21:1、同じ色は1:1になる"""
+        assert contrast_ratio("#ffffff", "#000000") == pytest.approx(21.0)
+        assert contrast_ratio("#000000", "#ffffff") == pytest.approx(21.0)
+        assert contrast_ratio("#777777", "#777777") == pytest.approx(1.0)
+
+    def test_hsl_round_trip(self):
+        """HSLを経由しても元の色に戻り、不正な形式はValueErrorとする"""
+        for color in ("#1e3a5f", "#ffffff", "#ff8800"):
+            assert hsl_to_hex(*hex_to_hsl(color)) == color
+        with pytest.raises(ValueError, match="#rrggbb"):
+            hex_to_hsl("#fff")
+
+
+class TestPaletteOptimizer:
+    """PaletteOptimizerクラスのテスト"""
+
+    def test_returns_compliant_candidates(self):
+        """スコアの降順に、WCAGの下限を満たす候補を色相の異なるプライマリ色で返す"""
+        candidates = PaletteOptimizer(SMALL_SPACE, max_workers=1).optimize(
+            "#1e3a5f", top_k=4
+        )
+
+        assert len(candidates) == 4
+        scores = [candidate.score for candidate in candidates]
+        assert scores == sorted(scores, reverse=True)
+        assert all(candidate.is_compliant for candidate in candidates)
+        assert len({candidate.colors["primary"] for candidate in candidates}) == 4
+        best = candidates[0]
+        assert best.contrast["text"] == pytest.approx(
+            contrast_ratio(best.colors["text"], best.colors["background"])
+        )
+        assert best.contrast["text"] >= 4.5
+
+    def test_mid_tone_backgrounds(self):
+        """中間の明度の背景色でも下限を満たす候補を返し、満たせない場合は空とする"""
+        optimizer = PaletteOptimizer(max_workers=1)
+        for color in ("#808080", "#ff0000", "#777777"):
+            candidates = optimizer.optimize(color, top_k=3)
+
+            assert len(candidates) == 3
+            assert all(candidate.is_compliant for candidate in candidates)
+
+        gray_text = SearchSpace(text_lightness=(0.5,))
+        assert PaletteOptimizer(gray_text, max_workers=1).optimize("#808080") == []
+
+    def test_parallel_matches_sequential(self):
+        """並列に評価した結果が逐次評価の結果と一致する"""
+        sequential = PaletteOptimizer(SMALL_SPACE, max_workers=1).optimize("#ffffff")
+        parallel = PaletteOptimizer(
+            SMALL_SPACE, max_workers=2, parallel_threshold=1
+        ).optimize("#ffffff")
+
+        assert [candidate.colors for candidate in parallel] == [
+            candidate.colors for candidate in sequential
+        ]
+
+    def test_default_space_is_sequential(self):
+        """既定の探索空間はプロセスプールを使わずに評価する"""
+        assert SearchSpace().size < PARALLEL_THRESHOLD
+
+    def test_generates_themes_in_schema(self):
+        """最適化した候補から既存の形式のテーマデータを生成する"""
+        from PySide6.QtGui import QColor
+
+        from qt_theme_studio.generators.theme_generator import ThemeGenerator
+        from qt_theme_studio.validators.theme_schema import get_validator
+
+        optimizer = PaletteOptimizer(SMALL_SPACE, max_workers=1)
+        themes = ThemeGenerator().generate_optimized_themes(
+            QColor("#2d1b45"), top_k=2, optimizer=optimizer
+        )
+
+        assert [theme["name"] for theme in themes] == [
+            "auto_optimized_1",
+            "auto_optimized_2",
+        ]
+        best = optimizer.optimize("#2d1b45", top_k=1)[0]
+        assert themes[0]["colors"]["primary"] == best.colors["primary"]
+        assert themes[0]["button"]["text"] == best.colors["button_text"]
+        for theme in themes:
+            assert get_validator("theme").validate(theme).is_valid
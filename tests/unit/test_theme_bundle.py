@@ -0,0 +1,220 @@
+"""
+テーマバンドルの単体テスト
+
+バンドルファイルの索引作成と遅延読み込みのテストを行います
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from qt_theme_studio.themes import ThemeBundle, bundle as bundle_module, scan_bundle
+
+BUNDLE_PATH = (
+    Path(__file__).parent.parent.parent / "themes" / "import" / "theme_settings.json"
+)
+
+
+class TestScanBundle:
+    """scan_bundle関数のテスト"""
+
+    def test_spans_match_full_parse(self):
+        """同梱バンドルの各テーマのバイト範囲が完全な解析結果と一致"""
+        data = BUNDLE_PATH.read_bytes()
+        themes = json.loads(data)["available_themes"]
+
+        entries = scan_bundle(data)
+
+        assert [entry.name for entry in entries] == list(themes)
+        for entry in entries:
+            assert json.loads(data[entry.start : entry.end]) == themes[entry.name]
+            assert entry.display_name == themes[entry.name]["display_name"]
+
+    def test_edge_cases(self):
+        """入れ子・文字列内の括弧・オブジェクト以外の値を正しく扱う"""
+        nested = {}
+        for key in "abcdefghij":
+            nested = {key: nested}
+        document = {
+            "other": [{"available_themes": {"x": {}}}],
+            "available_themes": {
+                "a": {
+                    "meta": {"display_name": "入れ子"},
+                    "note": '{"display_name": "文字列"}',
+                    "display_name": "直下",
+                },
+                "deep": {"tree": nested, "display_name": "深い"},
+                "scalar": 5,
+                "plain": {},
+            },
+            "after": {"z": 1},
+        }
+        data = json.dumps(document, ensure_ascii=False).encode("utf-8")
+
+        entries = scan_bundle(data)
+
+        assert [(e.name, e.display_name) for e in entries] == [
+            ("a", "直下"),
+            ("deep", "深い"),
+            ("plain", "plain"),
+        ]
+        for entry in entries:
+            assert (
+                json.loads(data[entry.start : entry.end])
+                == document["available_themes"][entry.name]
+            )
+
+    @pytest.mark.parametrize(
+        "note", ["plain", "{括弧}", 'エスケープ"'], ids=["plain", "brace", "escape"]
+    )
+    def test_display_name_position(self, note):
+        """表示名の位置・値の種類によらず、直下の"display_name"を取得"""
+        themes = {
+            "after_nested": {
+                "colors": {"display_name": "入れ子", "panel": {"a": "b"}},
+                "display_name": "後ろ",
+            },
+            "value_only": {"label": "display_name", "sub": {"display_name": "x"}},
+            "not_string": {"display_name": 5},
+            "note": {"display_name": "注記", "note": note},
+        }
+        data = json.dumps({"available_themes": themes}, ensure_ascii=False).encode()
+
+        entries = scan_bundle(data)
+
+        assert [(e.name, e.display_name) for e in entries] == [
+            ("after_nested", "後ろ"),
+            ("value_only", "value_only"),
+            ("not_string", "not_string"),
+            ("note", "注記"),
+        ]
+        for entry in entries:
+            assert json.loads(data[entry.start : entry.end]) == themes[entry.name]
+
+    def test_not_a_bundle(self):
+        """単一テーマファイルはNone"""
+        assert scan_bundle(b'{"name": "t", "colors": {}}') is None
+        assert scan_bundle(b"[]") is None
+        assert scan_bundle(b'{"available_themes": {}}') == []
+
+
+class TestThemeBundle:
+    """ThemeBundleクラスのテスト"""
+
+    def _write_bundle(self, path, count):
+        themes = {
+            f"theme_{i}": {"display_name": f"テーマ{i}", "colors": {"primary": "#1"}}
+            for i in range(count)
+        }
+        path.write_text(
+            json.dumps({"available_themes": themes}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        return themes
+
+    def test_lazy_load(self, tmp_path):
+        """名前と表示名を索引から取得し、テーマは個別に解析"""
+        path = tmp_path / "bundle.json"
+        themes = self._write_bundle(path, 3)
+
+        bundle = ThemeBundle(path)
+
+        assert bundle.is_bundle
+        assert bundle.names() == list(themes)
+        assert "theme_1" in bundle
+        assert bundle.display_name("theme_2") == "テーマ2"
+        assert bundle.load_theme("theme_1") == themes["theme_1"]
+        assert bundle.load_all() == themes
+
+    def test_index_file_is_reused(self, tmp_path, monkeypatch):
+        """有効な索引ファイルがあれば再走査しない"""
+        monkeypatch.setattr(bundle_module, "LAZY_BUNDLE_MIN_SIZE", 0)
+        path = tmp_path / "bundle.json"
+        self._write_bundle(path, 2)
+        ThemeBundle(path)
+        assert (tmp_path / ".bundle.json.index.json").exists()
+
+        def fail_scan(_self, _size):
+            raise AssertionError("再走査された")
+
+        monkeypatch.setattr(ThemeBundle, "_scan_file", fail_scan)
+        assert ThemeBundle(path).names() == ["theme_0", "theme_1"]
+
+    def test_reindex_when_file_changes(self, tmp_path):
+        """ファイルが変更された場合は索引を作り直す"""
+        path = tmp_path / "bundle.json"
+        self._write_bundle(path, 1)
+        bundle = ThemeBundle(path)
+
+        themes = self._write_bundle(path, 4)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert bundle.load_theme("theme_3") == themes["theme_3"]
+        assert ThemeBundle(path).names() == list(themes)
+
+    def test_single_theme_file(self, tmp_path, monkeypatch):
+        """単一テーマファイルはバンドルとして扱わず、索引ファイルも保存しない"""
+        monkeypatch.setattr(bundle_module, "LAZY_BUNDLE_MIN_SIZE", 0)
+        path = tmp_path / "single.json"
+        path.write_text('{"name": "t", "colors": {}}', encoding="utf-8")
+
+        single = ThemeBundle(path)
+        assert not single.is_bundle
+        assert len(single) == 0
+        assert not single.index_path.exists()
+
+    def test_small_bundle_has_no_index_file(self, tmp_path):
+        """小さなバンドルは索引ファイルを保存しない"""
+        path = tmp_path / "bundle.json"
+        self._write_bundle(path, 2)
+
+        small = ThemeBundle(path)
+
+        assert len(small) == 2
+        assert not small.index_path.exists()
+
+    @pytest.mark.slow
+    def test_cold_index_not_slower_than_json_load(self, tmp_path):
+        """索引ファイルなしの索引作成はjson.loadによる全体の解析より遅くない"""
+        source = json.loads(BUNDLE_PATH.read_bytes())["available_themes"]
+        themes = {
+            f"{name}_{index}": theme
+            for index in range(10000 // len(source))
+            for name, theme in source.items()
+        }
+        path = tmp_path / "bundle.json"
+        path.write_text(
+            json.dumps({"available_themes": themes}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+        def load_json():
+            with path.open(encoding="utf-8") as f:
+                json.load(f)
+
+        def scan_index():
+            assert len(ThemeBundle(path, use_index_file=False)) == len(themes)
+
+        # 交互にこのスレッドのCPU時間を計測し、それぞれの最短時間を比較する
+        # (負荷の変動や他のテストが残したスレッドの影響を抑える)
+        best = {load_json: float("inf"), scan_index: float("inf")}
+        for _ in range(7):
+            for function in best:
+                started = time.thread_time()
+                function()
+                best[function] = min(best[function], time.thread_time() - started)
+        assert best[scan_index] <= best[load_json]
+
+    def test_without_index_file(self, tmp_path):
+        """索引ファイルを使用しない設定では保存しない"""
+        path = tmp_path / "bundle.json"
+        self._write_bundle(path, 2)
+
+        unindexed = ThemeBundle(path, use_index_file=False)
+
+        assert len(unindexed) == 2
+        assert not unindexed.index_path.exists()
@@ -0,0 +1,218 @@
+"""
+テーマ編集履歴の単体テスト
+
+構造共有する永続マップと、元に戻す・やり直し・連続した編集のまとめのテストを行います
+"""
+
+import random
+
+import pytest
+
+from qt_theme_studio.themes.history import (
+    EMPTY_MAP,
+    PersistentMap,
+    ThemeEditHistory,
+)
+
+THEME = {
+    "name": "dark",
+    "colors": {"background": "#101010", "text": "#eeeeee", "primary": "#ff8800"},
+    "fonts": {"family": "Meiryo", "sizes": [10, 12]},
+}
+
+
+class CollidingKey:
+    """ハッシュ値が常に一致するキー"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.name == self.name
+
+
+class FakeClock:
+    """テスト用の時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPersistentMap:
+    """PersistentMapクラスのテスト"""
+
+    def test_round_trip(self):
+        """辞書との相互変換で内容が保たれ、リストはタプルとして保持される"""
+        theme = PersistentMap.from_dict(THEME)
+
+        assert theme.to_dict() == THEME
+        assert isinstance(theme["colors"], PersistentMap)
+        assert theme.get_in(("fonts", "sizes")) == (10, 12)
+        assert len(theme) == 3
+
+    def test_set_in_shares_untouched_subtrees(self):
+        """入れ子の値の変更は元のマップを変えず、変更のない部分木を共有する"""
+        theme = PersistentMap.from_dict(THEME)
+
+        edited = theme.set_in(("colors", "background"), "#000000")
+
+        assert edited.get_in(("colors", "background")) == "#000000"
+        assert theme.get_in(("colors", "background")) == "#101010"
+        assert edited["fonts"] is theme["fonts"]
+        assert edited.set_in(("colors", "background"), "#000000") == edited
+
+    def test_matches_dict_under_random_operations(self):
+        """ランダムな追加・削除の結果が辞書と内容・順序ともに一致する"""
+        rng = random.Random(0)
+        expected = {}
+        current = EMPTY_MAP
+        for index in range(3000):
+            key = rng.randrange(500)
+            if rng.random() < 0.3:
+                expected.pop(key, None)
+                current = current.delete(key)
+            else:
+                expected[key] = index
+                current = current.set(key, index)
+
+        assert list(current.items()) == list(expected.items())
+        assert len(current) == len(expected)
+
+    def test_keeps_insertion_order(self):
+        """反復・辞書への変換は元の辞書のキーの順序を保つ"""
+        theme = PersistentMap.from_dict(THEME)
+
+        edited = theme.set_in(("colors", "accent"), "#00ff00").delete("name")
+
+        assert list(theme.to_dict()["colors"]) == list(THEME["colors"])
+        assert list(edited) == ["colors", "fonts"]
+        assert list(edited["colors"]) == [*THEME["colors"], "accent"]
+
+    def test_update_from_follows_key_order(self):
+        """辞書で置き換える場合は辞書のキーの順序に合わせる"""
+        theme = PersistentMap.from_dict(THEME)
+        reordered = {key: THEME[key] for key in reversed(THEME)}
+
+        replaced = theme.update_from(reordered)
+
+        assert list(replaced.to_dict()) == list(reordered)
+        assert replaced["colors"] is theme["colors"]
+        with pytest.raises(ValueError, match="キーの組"):
+            theme.reorder(["name", "name", "fonts"])
+
+    def test_hash_collisions(self):
+        """ハッシュ値が一致するキーも区別して設定・削除できる"""
+        first, second = CollidingKey("a"), CollidingKey("b")
+        both = EMPTY_MAP.set(first, 1).set(second, 2)
+
+        assert (both[first], both[second]) == (1, 2)
+        assert both.delete(first).get(first) is None
+        assert len(both.delete(first)) == 1
+        with pytest.raises(KeyError):
+            both.delete(second)[second]
+
+    def test_update_from_shares_equal_subtrees(self):
+        """辞書で置き換える場合も、内容が同じ部分木は共有する"""
+        theme = PersistentMap.from_dict(THEME)
+        changed = dict(THEME, name="renamed")
+
+        replaced = theme.update_from(changed)
+
+        assert replaced.to_dict() == changed
+        assert replaced["colors"] is theme["colors"]
+        assert theme.update_from(THEME) is theme
+
+    def test_set_in_requires_path(self):
+        """空のパスはValueErrorとする"""
+        with pytest.raises(ValueError, match="パスが空"):
+            EMPTY_MAP.set_in((), 1)
+
+
+class TestThemeEditHistory:
+    """ThemeEditHistoryクラスのテスト"""
+
+    def test_undo_and_redo(self):
+        """元に戻す・やり直しで各時点の状態を復元する"""
+        history = ThemeEditHistory(THEME, coalesce_seconds=0)
+        history.edit(("colors", "background"), "#000000", "背景色")
+        history.edit(("colors", "text"), "#ffffff", "文字色")
+
+        assert history.undo_label == "文字色"
+        assert history.undo().get_in(("colors", "text")) == "#eeeeee"
+        assert history.undo().to_dict() == THEME
+        assert history.undo() is None
+        assert history.redo_label == "背景色"
+        assert history.redo().get_in(("colors", "background")) == "#000000"
+
+    def test_coalesces_rapid_edits(self):
+        """同じパスへの連続した編集は間隔内であれば1件にまとめる"""
+        clock = FakeClock()
+        history = ThemeEditHistory(THEME, coalesce_seconds=0.5, clock=clock)
+        for index in range(10):
+            clock.now += 0.1
+            history.edit(("colors", "background"), f"#00000{index}")
+
+        assert len(history) == 2
+        clock.now += 1.0
+        history.edit(("colors", "background"), "#123456")
+        assert len(history) == 3
+        assert history.undo().get_in(("colors", "background")) == "#000009"
+
+    def test_seal_ends_coalescing(self):
+        """seal後の編集は間隔内でも別の履歴にする"""
+        history = ThemeEditHistory(THEME, clock=FakeClock())
+        history.edit(("colors", "background"), "#000000")
+        history.seal()
+        history.edit(("colors", "background"), "#111111")
+
+        assert len(history) == 3
+
+    def test_edit_discards_redo(self):
+        """元に戻した後の編集でやり直し可能な履歴を破棄する"""
+        history = ThemeEditHistory(THEME, coalesce_seconds=0)
+        history.edit(("colors", "background"), "#000000")
+        history.undo()
+        history.edit(("colors", "text"), "#ffffff")
+
+        assert not history.can_redo
+        assert history.current.get_in(("colors", "background")) == "#101010"
+
+    def test_bounded_entries(self):
+        """上限件数を超えた古い履歴から破棄する"""
+        history = ThemeEditHistory(THEME, max_entries=3, coalesce_seconds=0)
+        for index in range(5):
+            history.edit(("colors", "background"), f"#00000{index}")
+
+        assert len(history) == 3
+        assert history.undo() is not None
+        assert history.undo().get_in(("colors", "background")) == "#000002"
+        assert not history.can_undo
+
+    def test_snapshots_share_structure(self):
+        """各履歴は変更されたパス以外の部分木を共有する"""
+        history = ThemeEditHistory(THEME, coalesce_seconds=0)
+        before = history.current
+        after = history.edit(("colors", "background"), "#000000")
+
+        assert after["fonts"] is before["fonts"]
+        assert history.replace(THEME, "再読み込み")["fonts"] is before["fonts"]
+        assert history.current.to_dict() == THEME
+
+    def test_edit_many_records_one_entry(self):
+        """複数のパスの変更を1件の履歴にまとめ、同じパスの組の連続した変更はまとめる"""
+        clock = FakeClock()
+        history = ThemeEditHistory(THEME, clock=clock)
+        changes = {("colors", "primary"): "#ff0000", ("colors", "text"): "#000000"}
+        history.edit_many(changes, "基本色")
+        clock.now += 0.1
+        history.edit_many(dict.fromkeys(changes, "#111111"), "基本色")
+
+        assert len(history) == 2
+        assert history.current.get_in(("colors", "text")) == "#111111"
+        assert history.undo().to_dict() == THEME
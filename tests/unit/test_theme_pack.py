@@ -0,0 +1,151 @@
+"""
+テーマパックの単体テスト
+
+バイナリのテーマパック形式の書き込み・読み込み・変換のテストを行います
+"""
+
+import json
+
+import pytest
+
+from qt_theme_studio.adapters.theme_adapter import ThemeAdapter
+from qt_theme_studio.themes import (
+    ThemePack,
+    ThemePackError,
+    json_to_pack,
+    pack_to_json,
+    read_pack,
+    write_pack,
+)
+
+THEMES = {
+    "light": {
+        "name": "light",
+        "display_name": "ライト",
+        "primaryColor": "#007acc",
+        "accentColor": "#0078D4",
+        "button": {"background": "#f0f0f080", "text": "#000"},
+        "opacity": 0.5,
+        "radius": 4,
+        "huge": 2**80,
+        "tags": ["a", None, True, False, {"nested": "rgb(1, 2, 3)"}],
+        "empty": "",
+    },
+    "dark": {"name": "dark", "colors": {"background": "#1a1a1a"}},
+    "無名": {},
+}
+
+
+class TestThemePack:
+    """ThemePackクラスのテスト"""
+
+    def test_round_trip(self, tmp_path):
+        """書き込んだテーマが値と型を保ったまま読み込める"""
+        path = tmp_path / "themes.qtpack"
+
+        assert write_pack(THEMES, path) == 3
+
+        loaded = read_pack(path)
+        assert loaded == THEMES
+        assert list(loaded) == list(THEMES)
+        assert loaded["light"]["accentColor"] == "#0078D4"
+        assert isinstance(loaded["light"]["radius"], int)
+
+    def test_lookup(self, tmp_path):
+        """名前一覧・表示名・名前による個別読み込み"""
+        path = tmp_path / "themes.qtpack"
+        write_pack(THEMES, path)
+
+        with ThemePack(path) as pack:
+            assert pack.names() == ["light", "dark", "無名"]
+            assert len(pack) == 3
+            assert "dark" in pack
+            assert "missing" not in pack
+            assert pack.display_name("light") == "ライト"
+            assert pack.display_name("無名") == "無名"
+            assert pack.load_theme("dark") == THEMES["dark"]
+            with pytest.raises(KeyError):
+                pack.load_theme("missing")
+            with pytest.raises(IndexError):
+                pack.load_theme_at(3)
+
+    def test_many_themes_binary_search(self, tmp_path):
+        """多数のテーマでも名前で正しく参照できる"""
+        themes = {f"theme_{i}": {"index": i} for i in range(500)}
+        path = tmp_path / "many.qtpack"
+        write_pack(themes, path)
+
+        with ThemePack(path) as pack:
+            for name in ("theme_0", "theme_250", "theme_499"):
+                assert pack.load_theme(name) == themes[name]
+
+    def test_empty_pack(self, tmp_path):
+        """テーマがないパック"""
+        path = tmp_path / "empty.qtpack"
+        write_pack({}, path)
+
+        with ThemePack(path) as pack:
+            assert pack.names() == []
+            assert "x" not in pack
+
+    def test_invalid_files(self, tmp_path):
+        """不正なファイルはThemePackError"""
+        empty = tmp_path / "empty.qtpack"
+        empty.write_bytes(b"")
+        not_pack = tmp_path / "theme.qtpack"
+        not_pack.write_text('{"name": "t"}' * 4, encoding="utf-8")
+        truncated = tmp_path / "truncated.qtpack"
+        write_pack(THEMES, truncated)
+        truncated.write_bytes(truncated.read_bytes()[:-1])
+
+        for path in (empty, not_pack, truncated):
+            with pytest.raises(ThemePackError):
+                ThemePack(path)
+
+    def test_unsupported_value(self, tmp_path):
+        """JSONで表現できない値はパックできない"""
+        with pytest.raises(ThemePackError):
+            write_pack({"t": {"value": object()}}, tmp_path / "bad.qtpack")
+
+
+class TestPackConversion:
+    """JSONとの相互変換のテスト"""
+
+    def test_bundle_conversion(self, tmp_path):
+        """バンドルのJSONをパックへ変換し、元に戻せる"""
+        source = tmp_path / "bundle.json"
+        source.write_text(
+            json.dumps({"available_themes": THEMES}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+        assert json_to_pack(source, tmp_path / "bundle.qtpack") == 3
+        assert pack_to_json(tmp_path / "bundle.qtpack", tmp_path / "out.json") == 3
+
+        with (tmp_path / "out.json").open(encoding="utf-8") as f:
+            assert json.load(f) == {"available_themes": THEMES}
+
+    def test_single_theme_conversion(self, tmp_path):
+        """単一テーマのJSONは単一テーマとして変換される"""
+        source = tmp_path / "light.json"
+        source.write_text(json.dumps(THEMES["light"]), encoding="utf-8")
+
+        json_to_pack(source, tmp_path / "light.qtpack")
+        pack_to_json(tmp_path / "light.qtpack", tmp_path / "out.json")
+
+        with (tmp_path / "out.json").open(encoding="utf-8") as f:
+            assert json.load(f) == THEMES["light"]
+
+
+class TestThemeAdapterPack:
+    """ThemeAdapterのテーマパック対応のテスト"""
+
+    def test_save_and_load(self, tmp_path):
+        """.qtpack拡張子で保存・読み込みできる"""
+        adapter = ThemeAdapter()
+        adapter._is_initialized = True
+        path = tmp_path / "light.qtpack"
+
+        assert adapter.save_theme(THEMES["light"], path)
+
+        assert adapter.load_theme(path) == THEMES["light"]
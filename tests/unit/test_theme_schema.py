@@ -0,0 +1,242 @@
+"""
+テーマスキーマ検証の単体テスト
+
+コンパイル済みスキーマ検証器と一括検証APIのテストを行います
+"""
+
+import io
+import json
+
+import pytest
+
+from qt_theme_studio.adapters.theme_adapter import (
+    ThemeAdapter,
+    ThemeValidationError,
+)
+from qt_theme_studio.validators import (
+    batch,
+    compile_schema,
+    get_validator,
+    is_valid_color,
+    validate_theme_files,
+    write_ndjson,
+)
+
+
+class TestIsValidColor:
+    """is_valid_color関数のテスト"""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "#fff",
+            "#007acc",
+            "#007acc80",
+            " #ABCDEF ",
+            "rgb(1, 2, 3)",
+            "RGBA(0,0,0,0.5)",
+        ],
+    )
+    def test_valid_colors(self, value):
+        """有効な色値"""
+        assert is_valid_color(value)
+
+    @pytest.mark.parametrize(
+        "value", ["#ggg", "#12345", "rgb(", "rgb(1,2)", "notacolor", None, 123]
+    )
+    def test_invalid_colors(self, value):
+        """無効な色値"""
+        assert not is_valid_color(value)
+
+    def test_named_colors(self):
+        """基本色名は大文字小文字を区別しない"""
+        assert is_valid_color("Transparent")
+        assert is_valid_color("lightgrey")
+
+
+class TestCompileSchema:
+    """compile_schema関数のテスト"""
+
+    def test_nested_paths_and_severity(self):
+        """ネストしたフィールドのパスと重大度が記録される"""
+        validator = compile_schema(
+            {
+                "type": "object",
+                "fields": {
+                    "size": {"type": "integer", "minimum": 1, "maximum": 10},
+                    "tags": {"type": "array", "items": {"type": "string"}},
+                    "button": {
+                        "type": "object",
+                        "fields": {"text": {"type": "color", "severity": "warning"}},
+                    },
+                },
+            }
+        )
+
+        result = validator.validate(
+            {"size": 20, "tags": ["a", 1], "button": {"text": "#xyz"}}
+        )
+
+        assert [issue.path for issue in result.errors] == ["size", "tags[1]"]
+        assert [issue.code for issue in result.errors] == ["range", "type"]
+        assert [issue.path for issue in result.warnings] == ["button.text"]
+        assert result.is_valid is False
+
+    def test_type_failure_stops_nested_checks(self):
+        """型が不正な場合は子フィールドを検証しない"""
+        validator = compile_schema(
+            {"type": "object", "fields": {"name": {"required": True}}}
+        )
+
+        result = validator.validate([])
+
+        assert [issue.code for issue in result.issues] == ["type"]
+
+    def test_bool_is_not_a_number(self):
+        """真偽値は数値として扱わない"""
+        validator = compile_schema({"type": "number"})
+
+        assert validator.is_valid(1.5)
+        assert not validator.is_valid(True)
+
+    def test_unknown_type_raises(self):
+        """未知の型はコンパイル時にエラー"""
+        with pytest.raises(ValueError):
+            compile_schema({"type": "unknown"})
+
+
+class TestThemeSchemas:
+    """組み込みスキーマのテスト"""
+
+    def test_theme_schema_messages(self):
+        """テーマスキーマが従来と同じメッセージを返す"""
+        result = get_validator("theme").validate(
+            {"name": "", "colors": {"primary": "#12"}}
+        )
+
+        assert result.error_messages == ["テーマ名は空でない文字列である必要があります"]
+        assert "バージョン情報が設定されていません" in result.warning_messages
+        assert "無効な色値が検出されました: primary = #12" in result.warning_messages
+
+    def test_non_string_color_is_warning(self):
+        """文字列以外の色値は例外ではなく警告になる"""
+        result = get_validator("theme").validate({"name": "t", "colors": {"a": 1}})
+
+        assert result.is_valid
+        assert "colors.a" in [issue.path for issue in result.warnings]
+
+    def test_quality_schema_requires_colors(self):
+        """品質チェック用スキーマは色設定を必須とする"""
+        result = get_validator("quality").validate({"description": "x"})
+
+        assert result.error_messages == [
+            "必須フィールドが不足: name",
+            "必須フィールドが不足: colors",
+        ]
+
+    def test_qt_theme_manager_schema(self):
+        """qt-theme-manager形式の必須色とウィジェット色を検証"""
+        result = get_validator("qt_theme_manager").validate(
+            {
+                "name": "t",
+                "primaryColor": "#007acc",
+                "backgroundColor": "",
+                "textColor": "#000",
+                "button": {"background": "bad"},
+            }
+        )
+
+        assert result.error_messages == [
+            "必須フィールドが不足: backgroundColor",
+            "無効な色形式: button.background = bad",
+        ]
+
+    def test_unknown_schema_name(self):
+        """未知のスキーマ名はKeyError"""
+        with pytest.raises(KeyError):
+            get_validator("missing")
+
+
+class TestThemeAdapterValidation:
+    """ThemeAdapterの検証がスキーマを使用することのテスト"""
+
+    def test_validate_theme(self):
+        """validate_themeが従来形式の結果を返す"""
+        result = ThemeAdapter().validate_theme({"name": "t", "version": "1.0"})
+
+        assert result["is_valid"] is True
+        assert result["errors"] == []
+        assert result["warnings"] == ["メタデータが設定されていません"]
+
+    def test_validate_theme_data_raises(self):
+        """不正なテーマデータで例外を送出"""
+        with pytest.raises(ThemeValidationError, match="必須フィールド"):
+            ThemeAdapter()._validate_theme_data({})
+
+
+class TestBatchValidation:
+    """一括検証APIのテスト"""
+
+    def _write_themes(self, tmp_path, count):
+        paths = []
+        for index in range(count):
+            path = tmp_path / f"theme_{index}.json"
+            theme = {"name": f"theme {index}", "colors": {"primary": "#007acc"}}
+            if index % 3 == 0:
+                theme["colors"]["primary"] = "bad"
+            if index % 5 == 0:
+                del theme["name"]
+            path.write_text(json.dumps(theme), encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    def test_sequential_results_in_order(self, tmp_path):
+        """逐次実行で入力順に結果を返す"""
+        paths = self._write_themes(tmp_path, 6)
+
+        records = list(validate_theme_files(paths, max_workers=1))
+
+        assert [record["file"] for record in records] == [str(p) for p in paths]
+        assert [record["is_valid"] for record in records] == [
+            False,
+            True,
+            True,
+            True,
+            True,
+            False,
+        ]
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        """プロセスプールでの結果が逐次実行と一致する"""
+        paths = self._write_themes(tmp_path, batch.PARALLEL_THRESHOLD + 4)
+
+        sequential = list(validate_theme_files(paths, max_workers=1))
+        parallel = list(validate_theme_files(paths, max_workers=2))
+
+        def strip_timing(records):
+            return [{k: v for k, v in r.items() if k != "elapsed_ms"} for r in records]
+
+        assert strip_timing(parallel) == strip_timing(sequential)
+
+    def test_load_error_is_reported(self, tmp_path):
+        """読み込めないファイルはloadエラーとして記録"""
+        broken = tmp_path / "broken.json"
+        broken.write_text("{", encoding="utf-8")
+
+        records = list(validate_theme_files([broken, tmp_path / "none.json"]))
+
+        assert all(record["errors"][0]["code"] == "load" for record in records)
+
+    def test_write_ndjson(self, tmp_path):
+        """NDJSON形式で1行1ファイルを出力し集計を返す"""
+        paths = self._write_themes(tmp_path, 4)
+        stream = io.StringIO()
+
+        summary = write_ndjson(validate_theme_files(paths), stream)
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 4
+        assert json.loads(lines[1])["file"] == str(paths[1])
+        assert summary["files"] == 4
+        assert summary["invalid"] == 1
+        assert summary["warnings"] > 0
@@ -0,0 +1,201 @@
+"""
+テーマファイル監視の単体テスト
+
+テーマファイルの変更検出と差分の再解析のテストを行います
+"""
+
+import json
+import os
+
+import pytest
+
+from qt_theme_studio.themes import (
+    ThemeFileTracker,
+    ThemeFileWatcher,
+    list_theme_files,
+    write_pack,
+)
+from qt_theme_studio.themes import watcher as watcher_module
+
+
+def _write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    # 同じ秒内の書き込みでも変更として扱われるように更新時刻を進める
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _bundle(**themes):
+    return {"available_themes": themes}
+
+
+class TestThemeFileTracker:
+    """ThemeFileTrackerクラスのテスト"""
+
+    def test_only_changed_bundle_theme_is_parsed(self, tmp_path, monkeypatch):
+        """バンドル内で変更されたテーマだけを解析する"""
+        path = tmp_path / "bundle.json"
+        themes = {
+            "light": {"name": "light", "backgroundColor": "#ffffff"},
+            "dark": {"name": "dark", "backgroundColor": "#000000"},
+        }
+        _write_json(path, _bundle(**themes))
+        tracker = ThemeFileTracker()
+        tracker.track(path)
+
+        parsed = []
+        original_loads = json.loads
+
+        def counting_loads(data, *args, **kwargs):
+            if data.lstrip()[:1] == b"{":
+                parsed.append(data)
+            return original_loads(data, *args, **kwargs)
+
+        monkeypatch.setattr(watcher_module.json, "loads", counting_loads)
+        themes["dark"]["backgroundColor"] = "#111111"
+        _write_json(path, _bundle(**themes))
+
+        changes = tracker.check(path)
+
+        assert changes.changed == {"dark": themes["dark"]}
+        assert changes.added == {}
+        assert changes.removed == []
+        assert len(parsed) == 1
+
+    def test_added_and_removed_themes(self, tmp_path):
+        """バンドルへのテーマの追加・削除"""
+        path = tmp_path / "bundle.json"
+        _write_json(path, _bundle(light={"name": "light"}, dark={"name": "dark"}))
+        tracker = ThemeFileTracker()
+        tracker.track(path)
+
+        _write_json(path, _bundle(light={"name": "light"}, blue={"name": "blue"}))
+        changes = tracker.check(path)
+
+        assert changes.added == {"blue": {"name": "blue"}}
+        assert changes.changed == {}
+        assert changes.removed == ["dark"]
+
+    def test_unchanged_content(self, tmp_path):
+        """更新時刻だけが変わった場合は変更なし"""
+        path = tmp_path / "theme.json"
+        _write_json(path, {"name": "light"})
+        tracker = ThemeFileTracker()
+        tracker.track(path)
+
+        assert tracker.check(path) is None
+        _write_json(path, {"name": "light"})
+        assert tracker.check(path) is None
+
+    def test_single_theme_fallback_name(self, tmp_path):
+        """名前のない単一テーマは追跡開始時の名前で通知する"""
+        path = tmp_path / "theme.json"
+        _write_json(path, {"backgroundColor": "#ffffff"})
+        tracker = ThemeFileTracker()
+        tracker.track(path, fallback_name="custom_1")
+
+        _write_json(path, {"backgroundColor": "#eeeeee"})
+        changes = tracker.check(path)
+
+        assert changes.changed == {"custom_1": {"backgroundColor": "#eeeeee"}}
+
+    def test_parse_error_keeps_previous_state(self, tmp_path):
+        """保存途中の不正な内容は無視し、次の変更で差分を求める"""
+        path = tmp_path / "theme.json"
+        _write_json(path, {"name": "light", "textColor": "#000000"})
+        tracker = ThemeFileTracker()
+        tracker.track(path)
+
+        path.write_text('{"name": "li', encoding="utf-8")
+        assert tracker.check(path) is None
+
+        _write_json(path, {"name": "light", "textColor": "#333333"})
+        changes = tracker.check(path)
+        assert changes.changed == {"light": {"name": "light", "textColor": "#333333"}}
+
+    def test_deleted_file(self, tmp_path):
+        """削除されたファイルのテーマは削除として通知し、追跡を終了する"""
+        path = tmp_path / "bundle.json"
+        _write_json(path, _bundle(light={"name": "light"}, dark={"name": "dark"}))
+        tracker = ThemeFileTracker()
+        tracker.track(path)
+
+        path.unlink()
+        changes = tracker.check(path)
+
+        assert sorted(changes.removed) == ["dark", "light"]
+        assert not tracker.is_tracked(path)
+
+    def test_theme_pack(self, tmp_path):
+        """テーマパックの変更はテーマ単位で比較する"""
+        path = tmp_path / "themes.qtpack"
+        write_pack({"light": {"name": "light"}, "dark": {"name": "dark"}}, path)
+        tracker = ThemeFileTracker()
+        tracker.track(path)
+
+        write_pack({"light": {"name": "light"}, "dark": {"name": "dark!"}}, path)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        changes = tracker.check(path)
+
+        assert changes.changed == {"dark": {"name": "dark!"}}
+        assert changes.added == {}
+
+    def test_track_with_load(self, tmp_path):
+        """load=Trueの場合は現在のテーマを追加として返す"""
+        path = tmp_path / "bundle.json"
+        _write_json(path, _bundle(light={"name": "light"}))
+
+        changes = ThemeFileTracker().track(path, load=True)
+
+        assert changes.added == {"light": {"name": "light"}}
+
+    def test_list_theme_files(self, tmp_path):
+        """隠しファイル・対象外の拡張子を除外する"""
+        (tmp_path / "a.json").write_text("{}", encoding="utf-8")
+        (tmp_path / "b.qtpack").write_bytes(b"")
+        (tmp_path / ".bundle.index.json").write_text("{}", encoding="utf-8")
+        (tmp_path / "notes.txt").write_text("", encoding="utf-8")
+
+        names = [path.name for path in list_theme_files(tmp_path)]
+
+        assert names == ["a.json", "b.qtpack"]
+
+
+class TestThemeFileWatcher:
+    """ThemeFileWatcherクラスのテスト"""
+
+    @pytest.fixture
+    def qt_app(self):
+        qt_widgets = pytest.importorskip("PySide6.QtWidgets")
+        app = qt_widgets.QApplication.instance()
+        if app is None:
+            app = qt_widgets.QApplication([])
+        return app
+
+    def test_directory_watch(self, qt_app, tmp_path):
+        """フォルダ内の既存・追加・変更されたテーマを通知する"""
+        _write_json(tmp_path / "light.json", {"name": "light"})
+        received = []
+        watcher = ThemeFileWatcher(received.append, poll_interval_ms=0)
+
+        initial = watcher.watch_directory(tmp_path)
+        assert [changes.added for changes in initial] == [{"light": {"name": "light"}}]
+
+        _write_json(tmp_path / "dark.json", {"name": "dark"})
+        _write_json(tmp_path / "light.json", {"name": "light", "textColor": "#111"})
+        watcher.poll()
+
+        added = {}
+        changed = {}
+        for changes in received:
+            added.update(changes.added)
+            changed.update(changes.changed)
+        assert added == {"dark": {"name": "dark"}}
+        assert changed == {"light": {"name": "light", "textColor": "#111"}}
+
+        received.clear()
+        (tmp_path / "dark.json").unlink()
+        watcher.poll()
+        assert [changes.removed for changes in received] == [["dark"]]
+        watcher.stop()
@@ -0,0 +1,165 @@
+"""
+テーマのサムネイルの単体テスト
+
+サムネイルのディスクキャッシュとバックグラウンド描画のテストを行います
+"""
+
+import os
+
+import pytest
+
+from qt_theme_studio.themes import CompiledTheme
+from qt_theme_studio.views.thumbnails import (
+    ThumbnailCache,
+    ThumbnailRenderer,
+    render_thumbnail,
+    thumbnail_key,
+)
+
+LIGHT = {"name": "light", "colors": {"background": "#ffffff", "primary": "#007acc"}}
+DARK = {"name": "dark", "colors": {"background": "#101010", "primary": "#ff8800"}}
+
+
+@pytest.fixture
+def qt_modules():
+    qt_widgets = pytest.importorskip("PySide6.QtWidgets")
+    from PySide6 import QtCore, QtGui
+
+    if qt_widgets.QApplication.instance() is None:
+        qt_widgets.QApplication([])
+    return {"QtCore": QtCore, "QtGui": QtGui, "QtWidgets": qt_widgets}
+
+
+class TestThumbnailCache:
+    """ThumbnailCacheクラスのテスト"""
+
+    def test_put_and_get(self, tmp_path):
+        """保存したデータを取得でき、別のインスタンスからも参照できる"""
+        cache = ThumbnailCache(tmp_path)
+        cache.put("a", b"png-a")
+
+        assert cache.get("a") == b"png-a"
+        assert cache.get("missing") is None
+        assert cache.stats == {"hits": 1, "misses": 1, "evicted": 0}
+
+        reopened = ThumbnailCache(tmp_path)
+        assert "a" in reopened
+        assert reopened.total_bytes == len(b"png-a")
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """上限を超えた場合は最後に使用された時刻が古いものから削除する"""
+        cache = ThumbnailCache(tmp_path, max_bytes=25)
+        for index, key in enumerate(("a", "b")):
+            cache.put(key, b"x" * 10)
+            os.utime(tmp_path / f"{key}.png", (1000 + index, 1000 + index))
+        # 再読み込みで更新時刻を反映し、"a"を使用して最新にする
+        cache = ThumbnailCache(tmp_path, max_bytes=25)
+        assert cache.get("a") is not None
+
+        cache.put("c", b"x" * 10)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert not (tmp_path / "b.png").exists()
+        assert cache.total_bytes == 20
+
+    def test_clear(self, tmp_path):
+        """全て削除"""
+        cache = ThumbnailCache(tmp_path)
+        cache.put("a", b"data")
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_key_includes_size_and_hash(self):
+        """サイズや内容が異なるサムネイルは別のキー"""
+        light = CompiledTheme.from_data(LIGHT)
+        dark = CompiledTheme.from_data(DARK)
+
+        assert thumbnail_key(light.content_hash, 160, 100) != thumbnail_key(
+            dark.content_hash, 160, 100
+        )
+        assert thumbnail_key(light.content_hash, 160, 100) != thumbnail_key(
+            light.content_hash, 80, 50
+        )
+
+
+class TestRenderThumbnail:
+    """render_thumbnail関数のテスト"""
+
+    def test_uses_theme_colors(self, qt_modules):
+        """背景とタイトルにテーマの色が使われる"""
+        roles = CompiledTheme.from_data(DARK).roles
+
+        image = render_thumbnail(roles, 160, 100, qt_modules)
+
+        assert (image.width(), image.height()) == (160, 100)
+        assert image.pixelColor(2, 5).name() == "#ff8800"
+        assert image.pixelColor(80, 72).name() == "#101010"
+
+
+class TestThumbnailRenderer:
+    """ThumbnailRendererクラスのテスト"""
+
+    def test_renders_in_background_and_caches(self, qt_modules, tmp_path):
+        """同じ内容の要求は1回の描画にまとめ、ディスクキャッシュに保存する"""
+        renderer = ThumbnailRenderer(qt_modules, ThumbnailCache(tmp_path))
+        received = []
+        light = CompiledTheme.from_data(LIGHT)
+
+        assert renderer.request(light, received.append) is None
+        assert renderer.request(CompiledTheme.from_data(LIGHT), received.append) is None
+        assert renderer.wait_for_done(5000)
+
+        assert len(received) == 2
+        assert received[0].width() == 160
+        assert renderer.stats["rendered"] == 1
+        assert renderer.pending_count == 0
+        assert len(renderer.cache) == 1
+
+        # メモリにある場合はすぐに返す
+        assert renderer.request(light, received.append) is not None
+
+    def test_reads_disk_cache(self, qt_modules, tmp_path):
+        """別のインスタンスではディスクキャッシュから読み込む"""
+        first = ThumbnailRenderer(qt_modules, ThumbnailCache(tmp_path))
+        first.request(CompiledTheme.from_data(DARK), lambda image: None)
+        first.wait_for_done(5000)
+
+        second = ThumbnailRenderer(qt_modules, ThumbnailCache(tmp_path))
+        received = []
+        second.request(CompiledTheme.from_data(DARK), received.append)
+        second.wait_for_done(5000)
+
+        assert second.stats["disk_hits"] == 1
+        assert second.stats["rendered"] == 0
+        assert received[0].pixelColor(2, 5).name() == "#ff8800"
+
+    def test_failed_render_calls_back_with_none(self, qt_modules, monkeypatch):
+        """描画に失敗した場合はコールバックへNoneを渡し、次の要求で描画をやり直す"""
+
+        def failing_render(*_args):
+            raise RuntimeError("描画エラー")
+
+        monkeypatch.setattr(
+            "qt_theme_studio.views.thumbnails.render_thumbnail", failing_render
+        )
+        renderer = ThumbnailRenderer(qt_modules)
+        received = []
+        light = CompiledTheme.from_data(LIGHT)
+
+        renderer.request(light, received.append)
+        renderer.request(light, received.append)
+        assert renderer.wait_for_done(5000)
+
+        assert received == [None, None]
+        assert renderer.stats["failed"] == 1
+        assert renderer.pending_count == 0
+
+        monkeypatch.undo()
+        assert renderer.request(light, received.append) is None
+        assert renderer.wait_for_done(5000)
+        assert received[2].width() == 160
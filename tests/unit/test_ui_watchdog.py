@@ -0,0 +1,108 @@
+"""
+UIスレッド監視の単体テスト
+
+イベントループ停止の検出と集計をテストします
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+
+from qt_theme_studio.utilities.ui_watchdog import StallRecord, UIThreadWatchdog
+
+
+def _spin_event_loop(duration: float) -> None:
+    """指定時間イベントループを処理する"""
+    from PySide6.QtCore import QCoreApplication
+
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.mark.usefixtures("qt_application")
+class TestUIThreadWatchdog:
+    """UIThreadWatchdogクラスのテスト"""
+
+    def test_stall_record_to_dict(self) -> None:
+        """停止記録の辞書変換のテスト"""
+        record = StallRecord(datetime.now(), 0.5, ["a.py:1 in f"], "a.py:1 in f")
+        data = record.to_dict()
+        assert data["duration"] == 0.5
+        assert data["location"] == "a.py:1 in f"
+        assert data["stack"] == ["a.py:1 in f"]
+
+    def test_stall_location_prefers_application_frame(self) -> None:
+        """停止箇所の特定のテスト"""
+        watchdog = UIThreadWatchdog()
+        stack = [
+            "/app/qt_theme_studio/views/preview.py:10 in apply_theme",
+            "/usr/lib/python3/json/encoder.py:200 in encode",
+        ]
+        assert watchdog._stall_location(stack) == stack[0]
+        assert watchdog._stall_location([]) == "unknown"
+
+    def test_no_stall_while_event_loop_runs(self) -> None:
+        """イベントループが応答している場合のテスト"""
+        watchdog = UIThreadWatchdog(threshold=0.2, interval=0.02)
+        watchdog.start()
+        try:
+            assert watchdog.is_running
+            _spin_event_loop(0.2)
+        finally:
+            watchdog.stop()
+
+        assert not watchdog.is_running
+        assert watchdog.get_stall_report()["total_stalls"] == 0
+
+    def test_detects_blocking_call(self) -> None:
+        """GUIスレッドのブロッキング検出のテスト"""
+        watchdog = UIThreadWatchdog(threshold=0.05, interval=0.01)
+        watchdog.start()
+        try:
+            _spin_event_loop(0.05)
+            time.sleep(0.3)  # GUIスレッドをブロック
+            _spin_event_loop(0.1)
+        finally:
+            watchdog.stop()
+
+        report = watchdog.get_stall_report()
+        assert report["total_stalls"] >= 1
+        assert report["max_stall_time"] >= 0.05
+        stall = watchdog.records[0]
+        assert any("test_detects_blocking_call" in entry for entry in stall.stack)
+
+    def test_stall_starts_at_last_heartbeat(self) -> None:
+        """停止の開始時刻は閾値の超過時刻ではなく最後のハートビートの送信時刻"""
+        threshold = 0.1
+        watchdog = UIThreadWatchdog(threshold=threshold, interval=0.01)
+        watchdog.start()
+        try:
+            _spin_event_loop(0.05)
+            blocked_at = datetime.now()
+            time.sleep(0.3)  # GUIスレッドをブロック
+            resumed_at = datetime.now()
+            _spin_event_loop(0.1)
+        finally:
+            watchdog.stop()
+
+        stall = watchdog.records[0]
+        tolerance = timedelta(seconds=threshold / 2)
+        assert stall.started_at < blocked_at + tolerance
+        recovered_at = stall.started_at + timedelta(seconds=stall.duration)
+        assert abs(recovered_at - resumed_at) < tolerance
+
+    def test_export_stall_report(self, temp_dir: Any) -> None:
+        """停止レポートのエクスポートのテスト"""
+        watchdog = UIThreadWatchdog()
+        watchdog._record_stall(datetime.now(), 0.3, ["x.py:1 in f"])
+
+        output_file = temp_dir / "stalls.json"
+        assert watchdog.export_stall_report(output_file)
+        assert output_file.exists()
+
+        report = watchdog.get_stall_report()
+        assert report["locations"][0]["count"] == 1
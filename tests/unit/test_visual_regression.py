@@ -0,0 +1,199 @@
+"""
+視覚回帰テストの単体テスト
+
+描画結果と基準画像の比較・差分の集計・基準画像の作成のテストを行います
+"""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from qt_theme_studio.validators.visual_regression import (  # noqa: E402
+    baseline_name,
+    baseline_root,
+    check_visual_regression,
+    compare_images,
+    qimage_to_array,
+    render_showcase,
+    srgb_to_lab,
+)
+
+
+def _solid(color, width=20, height=10):
+    """単色のRGBA配列"""
+    array = np.zeros((height, width, 4), dtype=np.uint8)
+    array[...] = (*color, 255)
+    return array
+
+
+class TestCompareImages:
+    """compare_images関数のテスト"""
+
+    def test_identical(self):
+        """同じ画像は差分なし"""
+        image = _solid((10, 20, 30))
+
+        diff = compare_images(image, image.copy(), [("all", 0, 0, 20, 10)])
+
+        assert diff.is_identical
+        assert not diff.exceeds()
+        assert diff.regions[0]["visible_pixels"] == 0
+
+    def test_changes_are_counted_per_region(self):
+        """変化した画素を領域ごとに集計する"""
+        baseline = _solid((255, 255, 255))
+        actual = baseline.copy()
+        actual[0:2, 0:5] = (255, 0, 0, 255)
+
+        diff = compare_images(
+            actual, baseline, [("left", 0, 0, 10, 10), ("right", 10, 0, 10, 10)]
+        )
+
+        assert diff.changed_pixels == 10
+        assert diff.visible_pixels == 10
+        assert diff.exceeds()
+        assert diff.regions[0]["visible_pixels"] == 10
+        assert diff.regions[0]["max_delta_e"] > 50
+        assert diff.regions[1]["visible_pixels"] == 0
+        assert diff.mask[0:2, 0:5].all()
+
+    def test_imperceptible_change_is_not_failure(self):
+        """知覚できない色差は変化として数えるが失敗にしない"""
+        baseline = _solid((120, 120, 120))
+        actual = _solid((123, 123, 123))
+
+        diff = compare_images(actual, baseline)
+
+        assert diff.changed_pixels == 200
+        assert diff.visible_pixels == 0
+        assert not diff.exceeds()
+
+    def test_max_changed_ratio(self):
+        """許容する割合以下の変化は失敗にしない"""
+        baseline = _solid((0, 0, 0))
+        actual = baseline.copy()
+        actual[0, 0] = (255, 255, 255, 255)
+
+        diff = compare_images(actual, baseline)
+
+        assert diff.exceeds(0.0)
+        assert not diff.exceeds(0.01)
+
+    def test_size_mismatch(self):
+        """サイズが異なる場合は失敗"""
+        diff = compare_images(_solid((0, 0, 0), 20, 10), _solid((0, 0, 0), 20, 12))
+
+        assert diff.size_mismatch
+        assert diff.exceeds(1.0)
+
+    def test_lab_conversion(self):
+        """白・黒の明度"""
+        lab = srgb_to_lab(np.array([[255, 255, 255], [0, 0, 0]], dtype=np.uint8))
+
+        assert lab[0] == pytest.approx([100.0, 0.0, 0.0], abs=0.05)
+        assert lab[1] == pytest.approx([0.0, 0.0, 0.0], abs=0.05)
+
+
+class TestQImageToArray:
+    """qimage_to_array関数のテスト"""
+
+    def test_shares_pixel_data(self):
+        """RGBA8888形式のQImageは複製せずに参照する"""
+        qt_gui = pytest.importorskip("PySide6.QtGui")
+        image = qt_gui.QImage(5, 3, qt_gui.QImage.Format.Format_RGBA8888)
+        image.fill(qt_gui.QColor(10, 20, 30))
+
+        array, owner = qimage_to_array(image)
+
+        assert owner is image
+        assert array.shape == (3, 5, 4)
+        assert tuple(array[2, 4]) == (10, 20, 30, 255)
+        image.setPixelColor(0, 0, qt_gui.QColor(200, 100, 50))
+        assert tuple(array[0, 0]) == (200, 100, 50, 255)
+
+
+class TestBaselineName:
+    """基準画像の名前のテスト"""
+
+    def test_same_stem_in_different_folders(self, tmp_path):
+        """別のフォルダにある同名のテーマファイルは別の基準画像とする"""
+        files = [tmp_path / "dark" / "theme.json", tmp_path / "light" / "theme.json"]
+
+        root = baseline_root(files)
+
+        assert root == tmp_path
+        assert [baseline_name(path, root) for path in files] == [
+            "dark/theme",
+            "light/theme",
+        ]
+
+    def test_single_file_uses_stem(self, tmp_path):
+        """1ファイルのみ・基準フォルダの外のファイルはファイル名のみとする"""
+        theme_file = tmp_path / "dark" / "theme.v2.json"
+
+        assert baseline_name(theme_file, baseline_root([theme_file])) == "theme.v2"
+        assert baseline_name(theme_file, tmp_path / "other") == "theme.v2"
+        assert baseline_name(theme_file) == "theme.v2"
+        assert baseline_root([]) is None
+
+
+class TestCheckVisualRegression:
+    """check_visual_regression関数のテスト"""
+
+    def test_baseline_workflow(self, tmp_path):
+        """基準画像の作成・一致・変化の検出と差分画像の出力"""
+        pytest.importorskip("PySide6.QtWidgets")
+        theme_file = tmp_path / "dark.json"
+        theme = {
+            "name": "dark",
+            "colors": {
+                "background": "#1a1a1a",
+                "text": "#eeeeee",
+                "primary": "#ff8800",
+            },
+        }
+        theme_file.write_text(json.dumps(theme), encoding="utf-8")
+        baseline_dir = tmp_path / "baselines"
+
+        missing = check_visual_regression(str(theme_file), baseline_dir)
+        assert missing["status"] == "missing"
+        assert not missing["is_valid"]
+
+        created = check_visual_regression(str(theme_file), baseline_dir, update=True)
+        assert created["status"] == "created"
+        assert (baseline_dir / "dark.png").exists()
+
+        passed = check_visual_regression(str(theme_file), baseline_dir)
+        assert passed["status"] == "passed"
+        assert passed["diff"]["visible_pixels"] == 0
+        assert len(passed["diff"]["regions"]) == 6
+
+        theme["colors"]["primary"] = "#0088ff"
+        theme_file.write_text(json.dumps(theme), encoding="utf-8")
+        failed = check_visual_regression(
+            str(theme_file), baseline_dir, output_dir=tmp_path / "out"
+        )
+        assert failed["status"] == "failed"
+        assert {error["code"] for error in failed["errors"]} == {"visual"}
+        assert (tmp_path / "out" / "dark.diff.png").exists()
+
+    def test_render_releases_widgets(self):
+        """イベントループがなくても描画したショーケースのウィジェットを解放する"""
+        qt_widgets = pytest.importorskip("PySide6.QtWidgets")
+        theme = {"name": "dark", "colors": {"background": "#1a1a1a"}}
+
+        render_showcase(theme)
+        widget_count = len(qt_widgets.QApplication.allWidgets())
+        for _ in range(3):
+            render_showcase(theme)
+
+        assert len(qt_widgets.QApplication.allWidgets()) == widget_count
+
+    def test_load_error(self, tmp_path):
+        """読み込めないテーマファイルはloadエラー"""
+        record = check_visual_regression(str(tmp_path / "none.json"), tmp_path)
+
+        assert record["status"] == "error"
+        assert record["errors"][0]["code"] == "load"